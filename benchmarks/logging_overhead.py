@@ -0,0 +1,94 @@
+"""Benchmark of stage logging overhead with logging disabled.
+
+Compares, with INFO disabled:
+
+- a `stage_info` call with eagerly formatted array ranges (the
+  previous stage code) against the same call with lazy fields,
+- a full kernel run over the bundled samples.
+
+Usage
+-----
+    python -m benchmarks.logging_overhead [--points N] [--repeat R]
+"""
+
+import argparse
+import logging
+import timeit
+from pathlib import Path
+
+import numpy as np
+from saxs.core.data.reader import DataReader
+from saxs.core.pipeline.scheduler.scheduler import LeanScheduler
+from saxs.logging.logger import get_stage_logger, lazy, lazy_range
+from saxs.processing.kernel.default_kernel import DefaultKernel
+
+SAMPLES_PATH = Path(__file__).resolve().parent.parent / "assets" / "samples"
+
+logger = get_stage_logger("benchmarks.logging_overhead")
+
+
+def eager_call(q: np.ndarray, intensity: np.ndarray) -> None:
+    """Log with eagerly formatted fields."""
+    logger.stage_info(
+        "BenchStage",
+        "Eager fields",
+        data_points=len(q),
+        q_range=f"[{min(q):.4f}, {max(q):.4f}]",
+        intensity_range=f"[{min(intensity):.4f}, {max(intensity):.4f}]",
+        peak_q=f"{q[len(q) // 2]:.4f}",
+    )
+
+
+def lazy_call(q: np.ndarray, intensity: np.ndarray) -> None:
+    """Log with lazy fields."""
+    logger.stage_info(
+        "BenchStage",
+        "Lazy fields",
+        data_points=len(q),
+        q_range=lazy_range(q),
+        intensity_range=lazy_range(intensity),
+        peak_q=lazy("{:.4f}".format, q[len(q) // 2]),
+    )
+
+
+def run_kernel() -> None:
+    """Run the default kernel over the bundled samples."""
+    for _path in sorted(SAMPLES_PATH.glob("*.csv")):
+        _reader = DataReader(_path)
+        _q, _i, _di = _reader.read_data()
+        DefaultKernel(LeanScheduler()).run(
+            _reader.create_sample(_q, _i, _di),
+        )
+
+
+def best_of(func, repeat: int, number: int) -> float:  # noqa: ANN001
+    """Return the best time per call in microseconds."""
+    _best = min(timeit.repeat(func, repeat=repeat, number=number))
+    return _best / number * 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    _parser = argparse.ArgumentParser(description=__doc__)
+    _parser.add_argument("--points", type=int, default=1000)
+    _parser.add_argument("--repeat", type=int, default=5)
+    _args = _parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    _q = np.linspace(0.01, 0.2, _args.points)
+    _intensity = np.random.default_rng(0).random(_args.points)
+
+    _eager = best_of(lambda: eager_call(_q, _intensity), _args.repeat, 200)
+    _lazy = best_of(lambda: lazy_call(_q, _intensity), _args.repeat, 200)
+    _kernel = best_of(run_kernel, _args.repeat, 1)
+
+    print(f"stage_info, {_args.points} points, INFO disabled")  # noqa: T201
+    print(f"  eager fields : {_eager:10.2f} us/call")  # noqa: T201
+    print(f"  lazy fields  : {_lazy:10.2f} us/call")  # noqa: T201
+    print(f"kernel run over {SAMPLES_PATH.name}/*.csv")  # noqa: T201
+    print(f"  total        : {_kernel / 1e3:10.2f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
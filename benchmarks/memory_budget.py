@@ -0,0 +1,88 @@
+"""Benchmark of stage memory with allocation budgets.
+
+Runs the default kernel over the bundled samples under
+`tracemalloc` and prints the net and peak allocation of every stage
+class and the peak of every sample. Exits with status 1 if a stage
+exceeds its peak allocation budget.
+
+Usage
+-----
+    python -m benchmarks.memory_budget [--budget BYTES]
+        [--stage-budget STAGE=BYTES ...] [--repeat R] [--json PATH]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from saxs.core.data.reader import DataReader
+from saxs.core.pipeline.scheduler.memory_stats import MemoryStatsCollector
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.processing.kernel.default_kernel import DefaultKernel
+
+SAMPLES_PATH = Path(__file__).resolve().parent.parent / "assets" / "samples"
+
+
+def parse_stage_budget(value: str) -> tuple[str, int]:
+    """Parse a "Stage=bytes" budget."""
+    _stage, _, _bytes = value.partition("=")
+    return _stage, int(_bytes)
+
+
+def main() -> int:
+    """Run the benchmark and print the results."""
+    _parser = argparse.ArgumentParser(description=__doc__)
+    _parser.add_argument("--budget", type=int, default=None)
+    _parser.add_argument(
+        "--stage-budget",
+        type=parse_stage_budget,
+        action="append",
+        default=[],
+    )
+    _parser.add_argument("--repeat", type=int, default=1)
+    _parser.add_argument("--json", default=None)
+    _args = _parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    _memory = MemoryStatsCollector(
+        stage_budgets=dict(_args.stage_budget),
+        default_budget=_args.budget,
+    )
+    _kernel = DefaultKernel(BaseScheduler(hooks=[_memory]))
+    for _ in range(_args.repeat):
+        for _path in sorted(SAMPLES_PATH.glob("*.csv")):
+            _reader = DataReader(_path)
+            _q, _i, _di = _reader.read_data()
+            _kernel.run(_reader.create_sample(_q, _i, _di))
+    _memory.close()
+
+    _stats = _memory.to_dict()
+    if _args.json is not None:
+        _memory.to_json(_args.json)
+
+    _header = f"{'stage':<20}{'runs':>8}{'net max':>12}{'peak max':>12}"
+    print(_header)  # noqa: T201
+    for _name, _stage in _stats["stages"].items():
+        print(  # noqa: T201
+            f"{_name:<20}{_stage['count']:>8}"
+            f"{_stage['allocated_max']:>12}{_stage['peak_max']:>12}",
+        )
+    print(  # noqa: T201
+        f"samples: {_stats['samples']['count']}, "
+        f"peak max {_stats['samples']['peak_max']} bytes, "
+        f"max rss {_stats['max_rss']} bytes",
+    )
+
+    for _violation in _stats["violations"]:
+        print(  # noqa: T201
+            f"OVER BUDGET {_violation['stage']} "
+            f"(sample {_violation['sample_id']}): "
+            f"{_violation['peak']} > {_violation['budget']} bytes",
+        )
+    return 1 if _stats["violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
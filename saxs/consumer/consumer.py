@@ -1,9 +1,14 @@
-"""Python consumer for Go SAXS stream producer via duplex pipes."""
+"""Python consumer for Go SAXS stream producer via duplex pipes.
+
+Frames, payload bytes, CRC failures and decode times are counted in
+the default metrics registry (see `saxs.metrics`).
+"""
 
 from __future__ import annotations
 
 import struct
 import subprocess
+import time
 import zlib
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
@@ -12,6 +17,9 @@ from typing import TYPE_CHECKING
 
 import msgpack
 
+from saxs.metrics.registry import DEFAULT_REGISTRY
+from saxs.tracing.tracer import span
+
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterator
     from types import TracebackType
@@ -34,6 +42,24 @@ COMPRESSION_NONE = 0x00
 COMPRESSION_LZ4 = 0x01
 COMPRESSION_ZSTD = 0x02
 
+FRAMES = DEFAULT_REGISTRY.counter(
+    "saxs_consumer_frames_total",
+    "Frames read from the producer, by message type.",
+    ("msg_type",),
+)
+FRAME_BYTES = DEFAULT_REGISTRY.counter(
+    "saxs_consumer_bytes_total",
+    "Bytes read from the producer, headers and footers included.",
+)
+CRC_FAILURES = DEFAULT_REGISTRY.counter(
+    "saxs_consumer_crc_failures_total",
+    "Frames failing the CRC32 check.",
+)
+DECODE_SECONDS = DEFAULT_REGISTRY.histogram(
+    "saxs_consumer_decode_seconds",
+    "Decompression and decoding time of frame payloads.",
+)
+
 
 @dataclass
 class SAXSSample:
@@ -282,21 +308,42 @@ class GoStreamConsumer:
             if len(footer) < FOOTER_SIZE:
                 raise ProtocolError("Incomplete footer")
 
+            FRAMES.labels(msg_type).inc()
+            FRAME_BYTES.inc(HEADER_SIZE + payload_len + FOOTER_SIZE)
+
             # Verify CRC if enabled
             if self.verify_crc:
                 expected_crc = struct.unpack("<I", footer)[0]
                 actual_crc = zlib.crc32(payload) & 0xFFFFFFFF
                 if expected_crc != actual_crc:
+                    CRC_FAILURES.inc()
                     raise ProtocolError(
                         f"CRC mismatch: expected {expected_crc:#x}, got {actual_crc:#x}"
                     )
 
-            # Decompress if needed
-            if compression != COMPRESSION_NONE:
-                payload = self._decompress(payload, compression)
+            _start = time.perf_counter()
+            with span(
+                "decode_frame",
+                "consumer",
+                msg_type=msg_type,
+                payload_bytes=payload_len,
+            ) as _args:
+                # Decompress if needed
+                if compression != COMPRESSION_NONE:
+                    payload = self._decompress(payload, compression)
+
+                # Parse message
+                msg = self._parse_message(
+                    msg_type,
+                    version,
+                    compression,
+                    payload,
+                )
+                if _args is not None and msg.sample is not None:
+                    _args["sample_id"] = msg.sample.id
+            DECODE_SECONDS.observe(time.perf_counter() - _start)
 
-            # Parse message
-            yield self._parse_message(msg_type, version, compression, payload)
+            yield msg
 
     def _read_exact(self, stream, size: int) -> bytes:
         """Read exactly size bytes from stream."""
@@ -43,6 +43,17 @@ class Buffer(Generic[T]):
             raise KeyError(msg)
         self._registry[id_] = item
 
+    def unregister(self, id_: str) -> T:
+        """
+        Remove and return the item registered under a given ID.
+
+        Raises an error if the ID is not registered.
+        """
+        if id_ not in self._registry:
+            msg = f"ID '{id_}' is not registered."
+            raise KeyError(msg)
+        return self._registry.pop(id_)
+
     def get(self, id_: str) -> T | None:
         """Retrieve the item by ID. Returns None if not found."""
         return self._registry.get(id_)
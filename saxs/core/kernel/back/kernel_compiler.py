@@ -45,6 +45,11 @@ from specs.
 stages and policies.
 - Designed to integrate seamlessly with YAML-based pipeline
 definitions.
+- The linked stages are resolved into a `TransitionTable` for
+schedulers that chain stages without request objects.
+- With `fuse=True`, `StageFuser` replaces runs of policy-free
+stages of the execution order with a single `FusedStage`; the
+resulting order is available from `get_execution_order`.
 """
 
 from saxs.core.kernel.back.buffer import Buffer
@@ -58,12 +63,14 @@ from saxs.core.kernel.back.runtime_spec import (
     StageSpec,
 )
 from saxs.core.kernel.back.stage_builder import StageBuilder
+from saxs.core.kernel.back.stage_fuser import StageFuser
 from saxs.core.kernel.back.stage_linker import StageLinker
 from saxs.core.kernel.front.declarative_specs import (
     PolicyDeclSpec,
     StageDeclSpec,
 )
 from saxs.core.kernel.front.parser import DeclarativePipeline
+from saxs.core.pipeline.scheduler.transition_table import TransitionTable
 from saxs.core.stage.abstract_stage import IAbstractStage
 from saxs.core.stage.policy.abstract_chaining_policy import (
     IAbstractChainingPolicy,
@@ -79,12 +86,32 @@ class BaseCompiler:
     This class provides the core functionality to transform
     declarative stage and policy specifications into fully
     instantiated and linked objects for the SAXS pipeline.
+
+    Parameters
+    ----------
+    fuse : bool, optional
+        Fuse linear chains of policy-free stages of the execution
+        order into single stages (default: False).
     """
 
+    def __init__(self, fuse: bool = False):
+        self.fuse = fuse
+        self.execution_order: list[str] | None = None
+        self.transition_table: TransitionTable | None = None
+
+    def get_execution_order(self) -> list[str] | None:
+        """Return the execution order of the last build."""
+        return self.execution_order
+
+    def get_transition_table(self) -> TransitionTable | None:
+        """Return the transition table of the last build."""
+        return self.transition_table
+
     def build(
         self,
         stage_specs: Buffer[StageSpec],
         policy_specs: Buffer[PolicySpec],
+        execution_order: list[str] | None = None,
     ) -> tuple[Buffer[IAbstractStage], Buffer[IAbstractChainingPolicy]]:
         """
         Build and link stage and policy instances.
@@ -96,6 +123,8 @@ class BaseCompiler:
            `StageBuilder` and `PolicyBuilder`.
         3. Links the stage and policy objects according to
             dependencies using `StageLinker` and `PolicyLinker`.
+        4. Optionally fuses linear stage chains using `StageFuser`.
+        5. Resolves the stage chaining into a `TransitionTable`.
 
         Parameters
         ----------
@@ -103,6 +132,8 @@ class BaseCompiler:
             Buffer containing declarative policy specifications.
         stage_decl_specs : Buffer[StageDeclSpec]
             Buffer containing declarative stage specifications.
+        execution_order : list[str] | None, optional
+            Initial stage order, required for fusion.
 
         Returns
         -------
@@ -136,6 +167,21 @@ class BaseCompiler:
             policy_instance,
         )
 
+        self.execution_order = (
+            None if execution_order is None else list(execution_order)
+        )
+        if self.fuse and execution_order is not None:
+            self.execution_order = StageFuser.fuse(
+                stage_specs,
+                policy_specs,
+                linked_stage_instance,
+                execution_order,
+            )
+
+        self.transition_table = TransitionTable.compile(
+            linked_stage_instance.values(),
+        )
+
         return linked_stage_instance, linked_policy_instance
 
 
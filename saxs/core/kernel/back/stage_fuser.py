@@ -0,0 +1,107 @@
+"""Stage fuser module.
+
+This module provides the StageFuser class, an optional compilation
+pass that replaces runs of consecutive policy-free stages in the
+execution order with a single `FusedStage`.
+
+A stage joins a run when it owns no chaining policy, no policy can
+insert it again at runtime, and it supports array-level processing
+(see `FusedStage.is_fusable`). Runs of a single stage are left as
+they are.
+
+Classes
+-------
+StageFuser
+    Static pass fusing linear stage chains of a compiled kernel.
+"""
+
+from saxs.core.kernel.back.buffer import Buffer
+from saxs.core.kernel.back.runtime_spec import PolicySpec, StageSpec
+from saxs.core.stage.abstract_stage import IAbstractStage
+from saxs.core.stage.fused_stage import FusedStage
+
+FUSED_ID_SEPARATOR = "+"
+
+
+class StageFuser:
+    """Stage Fuser class.
+
+    Fuses linear chains of already built and linked stage
+    instances.
+    """
+
+    @staticmethod
+    def fuse(
+        stage_specs: Buffer[StageSpec],
+        policy_specs: Buffer[PolicySpec],
+        stage_instances: Buffer[IAbstractStage],
+        execution_order: list[str],
+    ) -> list[str]:
+        """
+        Fuse runs of policy-free stages in the execution order.
+
+        Fused members are unregistered from `stage_instances` and
+        the fused stage is registered under the member ids joined
+        by `FUSED_ID_SEPARATOR`.
+
+        Parameters
+        ----------
+        stage_specs : Buffer[StageSpec]
+            Stage declarations.
+        policy_specs : Buffer[PolicySpec]
+            Policy declarations.
+        stage_instances : Buffer[IAbstractStage]
+            Linked stage instances, updated in place.
+        execution_order : list[str]
+            Initial stage order.
+
+        Returns
+        -------
+        list[str]
+            Execution order referring to the fused stages.
+        """
+        _targeted = {
+            _stage_id
+            for _policy in policy_specs.values()
+            for _stage_id in _policy.pending_stages or []
+        }
+
+        def _fusable(stage_id: str) -> bool:
+            _spec = stage_specs.get(stage_id)
+            _stage = stage_instances.get(stage_id)
+            return (
+                _spec is not None
+                and _stage is not None
+                and _spec.policy_id is None
+                and stage_id not in _targeted
+                and FusedStage.is_fusable(_stage)
+            )
+
+        _order: list[str] = []
+        _run: list[str] = []
+
+        def _flush() -> None:
+            if len(_run) < 2:  # noqa: PLR2004
+                _order.extend(_run)
+            else:
+                _fused_id = FUSED_ID_SEPARATOR.join(_run)
+                _members = [stage_instances.unregister(_id) for _id in _run]
+                stage_instances.register(
+                    _fused_id,
+                    FusedStage(_members, stage_ids=list(_run)),
+                )
+                _order.append(_fused_id)
+            _run.clear()
+
+        for _stage_id in execution_order:
+            if _fusable(_stage_id) and _stage_id not in _run:
+                _run.append(_stage_id)
+                continue
+            _flush()
+            if _fusable(_stage_id):
+                _run.append(_stage_id)
+            else:
+                _order.append(_stage_id)
+        _flush()
+
+        return _order
@@ -9,7 +9,17 @@ scheduler integration, and initial sample processing.
 The `BaseKernel` serves as a high-level orchestrator, bridging
 between the compiler that generates stage and policy instances, and
 the pipeline that executes them sequentially under a scheduling
-strategy.
+strategy. An optional `KernelResultCache` short-circuits runs whose
+input sample, kernel definition and run settings were seen before;
+a kernel or sample without a reproducible identity runs uncached.
+With `fuse`,
+linear chains of policy-free stages run as single fused stages.
+With `share_compiled`, kernels of the same definition share one set
+of compiled stage and policy instances per process. With
+`sample_log_capacity`, the stage and scheduler logs of each sample
+are buffered and written only if the sample fails or ends partial.
+With `profile` or the `SAXS_PROFILE` environment variable, stage
+executions are profiled per stage class (see `StageProfiler`).
 
 Classes
 --------
@@ -23,18 +33,35 @@ from typing import TYPE_CHECKING
 from saxs.core.kernel.abstract_kernel import (
     IAbstractKernel,
 )
-from saxs.core.kernel.back.kernel_compiler import BaseCompiler
+from saxs.core.kernel.compiled_kernel import (
+    DEFAULT_COMPILED_KERNEL_CACHE,
+    CompiledKernelCache,
+)
+from saxs.core.kernel.result_cache import KernelResultCache
 from saxs.core.pipeline.pipeline import Pipeline
+from saxs.core.pipeline.scheduler.scheduler import LeanScheduler
 from saxs.core.stage.abstract_stage import IAbstractStage
+from saxs.core.types.digest import ContentIdentityError
 from saxs.core.types.sample import SAXSSample
+from saxs.core.types.sample_objects import ESampleMetadataKeys
+from saxs.logging.logger import get_kernel_logger
+from saxs.logging.sample_context import sample_log_context
+from saxs.tracing.profiler import (
+    EProfileMode,
+    StageProfiler,
+    get_env_profiler,
+)
 
 if TYPE_CHECKING:
     from saxs.core.kernel.back.buffer import Buffer
+    from saxs.core.kernel.back.runtime_spec import PolicySpec, StageSpec
     from saxs.core.pipeline.scheduler.scheduler import IAbstractScheduler
     from saxs.core.stage.policy.abstract_chaining_policy import (
         IAbstractChainingPolicy,
     )
 
+logger = get_kernel_logger(__name__)
+
 
 class BaseKernel(IAbstractKernel):
     """
@@ -43,83 +70,214 @@ class BaseKernel(IAbstractKernel):
     Encapsulates orchestration of:
     - pipeline building
     - scheduler wiring
-    - sample creation.
+    - sample creation
+    - optional result caching.
+
+    Parameters
+    ----------
+    scheduler : IAbstractScheduler
+        Scheduler executing the pipeline.
+    result_cache : KernelResultCache | None, optional
+        Cache of final samples keyed by input content, kernel
+        fingerprint and run settings, disabled if None. It is
+        bypassed if the kernel definition has no reproducible
+        identity (`fingerprint` is then None).
+    fuse : bool, optional
+        Fuse linear chains of policy-free stages (default: False).
+    share_compiled : bool, optional
+        Reuse the process-wide compiled instances of the same
+        kernel definition (default: False).
+    sample_log_capacity : int | None, optional
+        Keep the last stage and scheduler log calls of each sample
+        in a ring buffer of this size, written out only if the run
+        raises or the sample ends partial; logged directly if None.
+        Samples of `run_many` then run one after another.
+    profile : StageProfiler | EProfileMode | str | None, optional
+        Profile stage executions with this profiler, or with a new
+        one of this mode ("cprofile" or "sampling"), available as
+        `profiler` and dumped by the caller. If None, the
+        process-wide profiler requested by the `SAXS_PROFILE`
+        environment variable is used, if any.
     """
 
     def __init__(
         self,
         scheduler: "IAbstractScheduler",
+        result_cache: KernelResultCache | None = None,
+        fuse: bool = False,
+        share_compiled: bool = False,
+        sample_log_capacity: int | None = None,
+        profile: StageProfiler | EProfileMode | str | None = None,
     ):
         self.scheduler = scheduler
+        self.result_cache = result_cache
+        self.fuse = fuse
+        self.share_compiled = share_compiled
+        self.sample_log_capacity = sample_log_capacity
         self.execution_order: list[str] = []
 
+        self.profiler: StageProfiler | None = (
+            get_env_profiler()
+            if profile is None
+            else profile
+            if isinstance(profile, StageProfiler)
+            else StageProfiler(profile)
+        )
+        if (
+            self.profiler is not None
+            and self.profiler not in scheduler.get_hooks()
+        ):
+            scheduler.add_hook(self.profiler)
+
         self.build()
 
     def build(self) -> None:
         """Build entry stages and submit them to scheduler."""
         _stage_decl, _policy_decl, _execution_order = self.define()
 
-        _comp = BaseCompiler()
+        # Keep the declarations for fingerprinting and inspection
+        self.stage_specs: Buffer[StageSpec] = _stage_decl
+        self.policy_specs: Buffer[PolicySpec] = _policy_decl
+        self.execution_order = list(_execution_order)
+        self.fingerprint: str | None = None
+        if self.result_cache is not None:
+            try:
+                self.fingerprint = KernelResultCache.fingerprint(
+                    _stage_decl,
+                    _policy_decl,
+                    _execution_order,
+                )
+            except ContentIdentityError as e:
+                logger.kernel_info(
+                    "Result cache disabled",
+                    reason=str(e),
+                )
 
-        self.stage_buffer: Buffer[IAbstractStage]
-        self.policy_buffer: Buffer[IAbstractChainingPolicy]
+        _compiled = (
+            DEFAULT_COMPILED_KERNEL_CACHE.get_or_compile
+            if self.share_compiled
+            else CompiledKernelCache.compile
+        )(_stage_decl, _policy_decl, _execution_order, fuse=self.fuse)
 
-        self.stage_buffer, self.policy_buffer = _comp.build(
-            _stage_decl,
-            _policy_decl,
+        self.stage_buffer: Buffer[IAbstractStage] = _compiled.stage_buffer
+        self.policy_buffer: Buffer[IAbstractChainingPolicy] = (
+            _compiled.policy_buffer
         )
 
-        _initial_stages = self._get_initial_stage(_execution_order)
+        _initial_stages = _compiled.initial_stages()
+
+        _transition_table = _compiled.transition_table
+        if (
+            isinstance(self.scheduler, LeanScheduler)
+            and _transition_table is not None
+        ):
+            self.scheduler.set_transition_table(_transition_table)
 
         self.pipeline = Pipeline.with_stages(
             _initial_stages,
             scheduler=self.scheduler,
         )
 
-    def _get_initial_stage(
-        self,
-        _execution_order: list[str],
-    ) -> list[IAbstractStage]:
-        """Get init stages ordered.
+    def run(self, init_sample: SAXSSample) -> SAXSSample:
+        """Run the kernel pipeline on the given sample.
 
-        Retrieve the initial stages in order from the compiled stage
-        buffer.
+        This method executes the pipeline using the configured
+        scheduler until all stages have completed processing. With
+        a result cache, a stored result for the same input content
+        and kernel fingerprint is returned without scheduling.
 
         Parameters
         ----------
-        _execution_order : list of str
-            Ordered list of stage identifiers defining the execution
-            sequence.
+        init_sample : SAXSSample
+            The initial SAXS sample to process through the pipeline.
 
         Returns
         -------
-        list of AbstractStage
-            A list of stage instances corresponding to the provided
-            execution order.
+        SAXSSample
+            The final processed sample after pipeline completion.
         """
-        _initial_stages: list[IAbstractStage] = []
+        if self.sample_log_capacity is not None:
+            _sample_id = (
+                init_sample.get_metadata()
+                .unwrap()
+                .get(ESampleMetadataKeys.SAMPLE_ID.value)
+            )
+            with sample_log_context(
+                self.sample_log_capacity,
+                sample_id=_sample_id,
+            ) as _buffer:
+                _result = self._run(init_sample)
+                _buffer.finish(_result)
+            return _result
 
-        for _stage_id in _execution_order:
-            _stage = self.stage_buffer.get(_stage_id)
-            if _stage:
-                _initial_stages.append(_stage)
+        return self._run(init_sample)
 
-        return _initial_stages
+    def _result_key(self, sample: SAXSSample) -> str | None:
+        """Return the result cache key of a sample, None if uncached."""
+        if self.result_cache is None or self.fingerprint is None:
+            return None
+        try:
+            return KernelResultCache.make_key(
+                sample,
+                self.fingerprint,
+                self.scheduler.get_budget(),
+            )
+        except ContentIdentityError:
+            return None
 
-    def run(self, init_sample: SAXSSample) -> SAXSSample:
-        """Run the kernel pipeline on the given sample.
+    def _run(self, init_sample: SAXSSample) -> SAXSSample:
+        _key = self._result_key(init_sample)
+        if self.result_cache is None or _key is None:
+            return self.pipeline.run(init_sample)
 
-        This method executes the pipeline using the configured
-        scheduler until all stages have completed processing.
+        _cached = self.result_cache.get(_key)
+        if _cached is not None:
+            return _cached
+
+        _result = self.pipeline.run(init_sample)
+        self.result_cache.put(_key, _result)
+        return _result
+
+    def run_many(self, init_samples: list[SAXSSample]) -> list[SAXSSample]:
+        """Run the kernel pipeline on several samples.
+
+        The scheduler decides whether samples run one after another
+        or interleaved (see `InterleavingScheduler`). With a result
+        cache, only samples without a stored result are scheduled.
+        With `sample_log_capacity`, samples run one after another
+        through `run`, each with its own log buffer.
 
         Parameters
         ----------
-        init_sample : SAXSSample
-            The initial SAXS sample to process through the pipeline.
+        init_samples : list of SAXSSample
+            The initial SAXS samples.
 
         Returns
         -------
-        SAXSSample
-            The final processed sample after pipeline completion.
+        list of SAXSSample
+            The processed samples, in input order.
         """
-        return self.pipeline.run(init_sample)
+        if self.sample_log_capacity is not None:
+            return [self.run(_sample) for _sample in init_samples]
+
+        if self.result_cache is None or self.fingerprint is None:
+            return self.pipeline.run_many(init_samples)
+
+        _results: list[SAXSSample | None] = []
+        _missing: list[tuple[int, str | None]] = []
+        for _index, _sample in enumerate(init_samples):
+            _key = self._result_key(_sample)
+            _cached = None if _key is None else self.result_cache.get(_key)
+            _results.append(_cached)
+            if _cached is None:
+                _missing.append((_index, _key))
+
+        _computed = self.pipeline.run_many(
+            [init_samples[_index] for _index, _ in _missing],
+        )
+        for (_index, _key), _result in zip(_missing, _computed, strict=True):
+            if _key is not None:
+                self.result_cache.put(_key, _result)
+            _results[_index] = _result
+
+        return [_result for _result in _results if _result is not None]
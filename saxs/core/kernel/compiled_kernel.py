@@ -0,0 +1,184 @@
+"""
+Module: compiled_kernel.
+
+Process-wide sharing of compiled kernels.
+
+Compiling a kernel instantiates and links every stage and policy.
+Kernels with the same definition can share these instances, since
+stages keep their per-sample state in the sample and flow metadata.
+`CompiledKernelCache` memoizes compilation results by the kernel
+fingerprint (see `KernelResultCache.fingerprint`), so that creating
+many kernels, or one kernel per worker task, compiles once per
+process. Definitions without a reproducible fingerprint are
+compiled every time.
+
+Classes
+-------
+CompiledKernel
+    Linked stages and policies of a kernel definition.
+CompiledKernelCache
+    Memoization of compiled kernels by fingerprint.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.kernel.back.kernel_compiler import BaseCompiler
+from saxs.core.kernel.result_cache import KernelResultCache
+from saxs.core.types.digest import ContentIdentityError
+
+if TYPE_CHECKING:
+    from saxs.core.kernel.back.buffer import Buffer
+    from saxs.core.kernel.back.runtime_spec import PolicySpec, StageSpec
+    from saxs.core.pipeline.scheduler.transition_table import (
+        TransitionTable,
+    )
+    from saxs.core.stage.abstract_stage import IAbstractStage
+    from saxs.core.stage.policy.abstract_chaining_policy import (
+        IAbstractChainingPolicy,
+    )
+
+
+@dataclass(frozen=True)
+class CompiledKernel:
+    """
+    Linked stages and policies of a kernel definition.
+
+    Attributes
+    ----------
+    stage_buffer : Buffer[IAbstractStage]
+        Linked stage instances.
+    policy_buffer : Buffer[IAbstractChainingPolicy]
+        Linked policy instances.
+    execution_order : list[str]
+        Initial stage order, after fusion if enabled.
+    transition_table : TransitionTable | None
+        Resolved stage chaining.
+    """
+
+    stage_buffer: "Buffer[IAbstractStage[Any]]"
+    policy_buffer: "Buffer[IAbstractChainingPolicy]"
+    execution_order: list[str]
+    transition_table: "TransitionTable | None"
+
+    def initial_stages(self) -> list["IAbstractStage[Any]"]:
+        """Return the initial stage instances in execution order."""
+        return [
+            _stage
+            for _stage_id in self.execution_order
+            if (_stage := self.stage_buffer.get(_stage_id)) is not None
+        ]
+
+
+class CompiledKernelCache:
+    """
+    Memoization of compiled kernels by fingerprint.
+
+    Attributes
+    ----------
+    hits : int
+        Compilations served from the cache.
+    misses : int
+        Compilations performed.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[str, bool], CompiledKernel] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def compile(
+        stage_specs: "Buffer[StageSpec]",
+        policy_specs: "Buffer[PolicySpec]",
+        execution_order: list[str],
+        fuse: bool = False,
+    ) -> CompiledKernel:
+        """Compile a kernel definition without caching."""
+        _compiler = BaseCompiler(fuse=fuse)
+        _stages, _policies = _compiler.build(
+            stage_specs,
+            policy_specs,
+            execution_order,
+        )
+        return CompiledKernel(
+            stage_buffer=_stages,
+            policy_buffer=_policies,
+            execution_order=(
+                _compiler.get_execution_order() or list(execution_order)
+            ),
+            transition_table=_compiler.get_transition_table(),
+        )
+
+    def get_or_compile(
+        self,
+        stage_specs: "Buffer[StageSpec]",
+        policy_specs: "Buffer[PolicySpec]",
+        execution_order: list[str],
+        fuse: bool = False,
+    ) -> CompiledKernel:
+        """
+        Return the compiled kernel of a definition.
+
+        Parameters
+        ----------
+        stage_specs : Buffer[StageSpec]
+            Stage declarations.
+        policy_specs : Buffer[PolicySpec]
+            Policy declarations.
+        execution_order : list[str]
+            Initial stage order.
+        fuse : bool, optional
+            Fuse linear stage chains.
+
+        Returns
+        -------
+        CompiledKernel
+            Shared compiled kernel.
+        """
+        try:
+            _key = (
+                KernelResultCache.fingerprint(
+                    stage_specs,
+                    policy_specs,
+                    execution_order,
+                ),
+                fuse,
+            )
+        except ContentIdentityError:
+            with self._lock:
+                self.misses += 1
+            return self.compile(
+                stage_specs,
+                policy_specs,
+                execution_order,
+                fuse,
+            )
+
+        with self._lock:
+            _compiled = self._entries.get(_key)
+            if _compiled is not None:
+                self.hits += 1
+                return _compiled
+
+            _compiled = self.compile(
+                stage_specs,
+                policy_specs,
+                execution_order,
+                fuse,
+            )
+            self._entries[_key] = _compiled
+            self.misses += 1
+            return _compiled
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+DEFAULT_COMPILED_KERNEL_CACHE = CompiledKernelCache()
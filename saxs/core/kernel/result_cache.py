@@ -0,0 +1,358 @@
+"""
+Module: result_cache.
+
+Persistent whole-pipeline result cache for kernels.
+
+Archives are re-processed many times with only a few samples or
+configuration values changing between runs. `KernelResultCache`
+stores the final `SAXSSample` of a kernel run under a key made of
+
+- a content hash of the input sample arrays and metadata,
+- a fingerprint of the compiled kernel: the code version of the
+  `saxs` package, stage and policy classes, their metadata values
+  and kwargs, conditions and the execution order, and
+- the process-wide settings the stages read at run time, published
+  by the modules that own them (see
+  `register_settings_component`), and the scheduler budget.
+
+Entries are pickled files in a local directory. Reads refresh the
+file modification time, and the oldest files are evicted once the
+directory exceeds its size bound. The cache tracks the directory
+size across its writes and scans the directory only when the bound
+is crossed; entries written by other processes sharing the
+directory are counted at the next scan. Partial results of samples
+whose budget was exhausted are not stored.
+
+Classes
+-------
+KernelResultCache
+    Directory-backed, size-bounded cache of kernel results.
+
+Functions
+---------
+register_settings_component
+    Register process-wide state that stage results depend on.
+get_code_version
+    Return the version and source digest of the `saxs` package.
+"""
+
+import hashlib
+import pickle
+import tempfile
+import threading
+from collections.abc import Callable
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.types.digest import update_digest
+from saxs.core.types.sample import ESAXSSampleKeys, SAXSSample
+from saxs.core.types.sample_objects import ESampleMetadataKeys
+
+if TYPE_CHECKING:
+    from saxs.core.kernel.back.buffer import Buffer
+    from saxs.core.kernel.back.runtime_spec import PolicySpec, StageSpec
+
+DEFAULT_RESULT_CACHE_BYTES = 256 * 1024 * 1024
+
+_ENTRY_SUFFIX = ".pkl"
+
+# Root of the `saxs` package, whose sources version cached results
+_PACKAGE_PATH = Path(__file__).resolve().parents[2]
+
+_SETTINGS_COMPONENTS: dict[str, Callable[[SAXSSample], Any]] = {}
+
+
+def register_settings_component(
+    name: str,
+    component: Callable[[SAXSSample], Any],
+) -> None:
+    """
+    Register process-wide state that stage results depend on.
+
+    The value returned by `component` for the input sample is part
+    of every result cache key, e.g. the default fitting engine set
+    by `Fitting.configure`, or the warm-start parameters stored for
+    the series of the sample.
+
+    Parameters
+    ----------
+    name : str
+        Component name; registering a name again replaces it.
+    component : Callable[[SAXSSample], Any]
+        Returns the state for an input sample, hashable by
+        `update_digest`.
+    """
+    _SETTINGS_COMPONENTS[name] = component
+
+
+@lru_cache(maxsize=1)
+def get_code_version() -> str:
+    """
+    Return the version and source digest of the `saxs` package.
+
+    The digest covers every Python source of the package, so a
+    code change invalidates cached results even without a version
+    bump.
+
+    Returns
+    -------
+    str
+        `"<version>:<hex digest>"`.
+    """
+    try:
+        _version = metadata.version("saxs")
+    except metadata.PackageNotFoundError:
+        _version = "unknown"
+
+    _digest = hashlib.blake2b(digest_size=20)
+    for _path in sorted(_PACKAGE_PATH.rglob("*.py")):
+        _digest.update(_path.relative_to(_PACKAGE_PATH).as_posix().encode())
+        _digest.update(_path.read_bytes())
+    return f"{_version}:{_digest.hexdigest()}"
+
+
+class KernelResultCache:
+    """
+    Size-bounded cache of kernel results in a local directory.
+
+    Parameters
+    ----------
+    directory : str | Path
+        Cache directory, created if missing.
+    max_bytes : int, optional
+        Size bound of the directory; least recently used entries
+        are evicted beyond it.
+
+    Attributes
+    ----------
+    hits : int
+        Runs served from the cache.
+    misses : int
+        Runs that executed the pipeline.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int = DEFAULT_RESULT_CACHE_BYTES,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Bytes of the entries, unknown until the first scan
+        self._size: int | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(
+        stage_specs: "Buffer[StageSpec]",
+        policy_specs: "Buffer[PolicySpec]",
+        execution_order: list[str],
+    ) -> str:
+        """
+        Return the fingerprint of a compiled kernel definition.
+
+        Parameters
+        ----------
+        stage_specs : Buffer[StageSpec]
+            Stage declarations of the kernel.
+        policy_specs : Buffer[PolicySpec]
+            Policy declarations of the kernel.
+        execution_order : list[str]
+            Initial stage order.
+
+        Returns
+        -------
+        str
+            Hex digest of the definition.
+
+        Raises
+        ------
+        ContentIdentityError
+            If a metadata value has no reproducible identity.
+        """
+        _digest = hashlib.blake2b(digest_size=20)
+        update_digest(_digest, get_code_version())
+
+        for _id, _spec in sorted(stage_specs.items()):
+            update_digest(
+                _digest,
+                (
+                    _id,
+                    _spec.stage_cls,
+                    _spec.metadata,
+                    _spec.kwargs,
+                    _spec.policy_id,
+                    _spec.before,
+                    _spec.after,
+                ),
+            )
+
+        for _id, _spec in sorted(policy_specs.items()):
+            update_digest(
+                _digest,
+                (
+                    _id,
+                    _spec.policy_cls,
+                    _spec.condition,
+                    _spec.condition_kwargs,
+                    _spec.pending_stages,
+                ),
+            )
+
+        update_digest(_digest, list(execution_order))
+
+        return _digest.hexdigest()
+
+    @staticmethod
+    def make_key(
+        sample: SAXSSample,
+        fingerprint: str,
+        context: Any = None,  # noqa: ANN401
+    ) -> str:
+        """
+        Return the cache key of a sample run by a kernel.
+
+        Parameters
+        ----------
+        sample : SAXSSample
+            Input sample.
+        fingerprint : str
+            Kernel fingerprint from `fingerprint`.
+        context : Any, optional
+            Run settings outside the kernel definition, e.g. the
+            scheduler budget.
+
+        Returns
+        -------
+        str
+            Hex digest of the sample content, fingerprint, context
+            and registered settings components.
+
+        Raises
+        ------
+        ContentIdentityError
+            If the sample metadata, the context or a settings
+            component has no reproducible identity.
+        """
+        _digest = hashlib.blake2b(digest_size=20)
+        _digest.update(fingerprint.encode())
+        update_digest(_digest, context)
+        for _name, _component in sorted(_SETTINGS_COMPONENTS.items()):
+            update_digest(_digest, _name)
+            update_digest(_digest, _component(sample))
+
+        for _key in (
+            ESAXSSampleKeys.Q_VALUES,
+            ESAXSSampleKeys.INTENSITY,
+            ESAXSSampleKeys.INTENSITY_ERROR,
+        ):
+            update_digest(_digest, sample[_key])
+        update_digest(_digest, sample.get_metadata())
+
+        return _digest.hexdigest()
+
+    @staticmethod
+    def is_cacheable(result: SAXSSample) -> bool:
+        """Return whether a result is complete, i.e. not partial."""
+        return not result.get_metadata().unwrap().get(
+            ESampleMetadataKeys.PARTIAL.value,
+            False,
+        )
+
+    def get(self, key: str) -> SAXSSample | None:
+        """
+        Return the cached result for `key`, None on a miss.
+
+        An entry that fails to load for any reason, e.g. truncated,
+        or pickled by code whose classes have since moved, counts
+        as a miss and is deleted.
+        """
+        _path = self._path(key)
+        try:
+            with _path.open("rb") as _file:
+                _result: SAXSSample = pickle.load(_file)  # noqa: S301
+        except FileNotFoundError:
+            _result = None
+        except Exception:  # noqa: BLE001
+            _path.unlink(missing_ok=True)
+            _result = None
+
+        if _result is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # Refresh recency for eviction
+        _path.touch()
+        with self._lock:
+            self.hits += 1
+        return _result
+
+    def put(self, key: str, result: SAXSSample) -> None:
+        """
+        Store a result and evict old entries beyond the bound.
+
+        Partial results (see `is_cacheable`) are not stored.
+        """
+        if not self.is_cacheable(result):
+            return
+
+        _path = self._path(key)
+        # A unique name per writer, so that threads and processes
+        # storing the same key never write into one file
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory,
+            prefix=f"{key}.",
+            suffix=".tmp",
+            delete=False,
+        ) as _file:
+            pickle.dump(result, _file, protocol=pickle.HIGHEST_PROTOCOL)
+            _written = _file.tell()
+        try:
+            _replaced = _path.stat().st_size
+        except OSError:
+            _replaced = 0
+        Path(_file.name).replace(_path)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += _written - _replaced
+            _scan = self._size is None or self._size > self.max_bytes
+        if _scan:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries beyond `max_bytes`."""
+        _entries = []
+        for _path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                _stat = _path.stat()
+            except OSError:
+                continue
+            _entries.append((_stat.st_mtime, _stat.st_size, _path))
+
+        _total = sum(_size for _, _size, _ in _entries)
+        for _, _size, _path in sorted(_entries, key=lambda _e: _e[0]):
+            if _total <= self.max_bytes:
+                break
+            _path.unlink(missing_ok=True)
+            _total -= _size
+        with self._lock:
+            self._size = _total
+
+    def clear(self) -> None:
+        """Delete all entries and reset the counters."""
+        for _path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            _path.unlink(missing_ok=True)
+        with self._lock:
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_ENTRY_SUFFIX}"
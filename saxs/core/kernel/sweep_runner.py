@@ -0,0 +1,326 @@
+"""
+Module: sweep_runner.
+
+Prefix-sharing execution of parameter sweeps over a kernel.
+
+Tuning stage parameters means running many kernels that differ in
+a few metadata values only. `SweepRunner` expands a parameter grid
+over a base kernel and arranges the sweep points in a tree keyed on
+the stage prefix: the leading policy-free stages of the execution
+order (e.g. cut -> filter -> background) run once per distinct
+combination of their own parameters, and their outputs fan out to
+the branches that differ further down. Samples are deep-copied at
+branch points only. The remaining stages (the policy-driven tail)
+run per sweep point under a fresh scheduler.
+
+Classes
+-------
+SweepPoint
+    Parameter overrides of one sweep point.
+SweepResult
+    Final sample of one sweep point.
+SweepRunner
+    Runs a parameter grid over a base kernel with prefix sharing.
+"""
+
+import copy
+import dataclasses
+import itertools
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.kernel.back.buffer import Buffer
+from saxs.core.kernel.back.kernel_compiler import BaseCompiler
+from saxs.core.kernel.back.runtime_spec import StageSpec
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.core.stage.abstract_stage import IAbstractStage
+from saxs.core.types.flow_metadata import FlowMetadata
+from saxs.core.types.sample import SAXSSample
+
+if TYPE_CHECKING:
+    from saxs.core.kernel.base_kernel import BaseKernel
+    from saxs.core.pipeline.scheduler.scheduler import IAbstractScheduler
+
+# stage id -> metadata key -> value
+SweepOverrides = dict[str, dict[str, Any]]
+# stage id -> metadata key -> values to sweep
+SweepGrid = Mapping[str, Mapping[str, Sequence[Any]]]
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """
+    Parameter overrides of one sweep point.
+
+    Attributes
+    ----------
+    overrides : SweepOverrides
+        Metadata values per stage id.
+    """
+
+    overrides: SweepOverrides = field(default_factory=dict)
+
+    def stage_key(self, stage_id: str) -> tuple[tuple[str, Any], ...]:
+        """Return a hashable key of the overrides of a stage."""
+        return tuple(
+            sorted(
+                (_key, repr(_value))
+                for _key, _value in self.overrides.get(stage_id, {}).items()
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """
+    Final sample of one sweep point.
+
+    Attributes
+    ----------
+    point : SweepPoint
+        The sweep point.
+    sample : SAXSSample
+        Result of the kernel run with the point's overrides.
+    """
+
+    point: SweepPoint
+    sample: SAXSSample
+
+
+class SweepRunner:
+    """
+    Run a parameter grid over a base kernel with prefix sharing.
+
+    Parameters
+    ----------
+    kernel : BaseKernel
+        Built base kernel providing the stage and policy specs.
+    grid : SweepGrid
+        Values to sweep per stage id and metadata key. The sweep
+        points are the Cartesian product of all values.
+    scheduler_factory : Callable[[], IAbstractScheduler], optional
+        Builds a fresh scheduler for the tail of each point.
+
+    Attributes
+    ----------
+    points : list[SweepPoint]
+        Expanded sweep points.
+    prefix : list[str]
+        Stage ids shared through the execution tree.
+    stage_runs : int
+        Prefix stage executions of the last run.
+
+    Examples
+    --------
+    >>> runner = SweepRunner(
+    ...     DefaultKernel(BaseScheduler()),
+    ...     {"cut": {"cut_point": [50, 100]},
+    ...      "find_peaks": {"prominence": [0.2, 0.3, 0.5]}},
+    ... )
+    >>> results = runner.run(sample)  # 6 points, cut runs twice
+    """
+
+    def __init__(
+        self,
+        kernel: "BaseKernel",
+        grid: SweepGrid,
+        scheduler_factory: Callable[
+            [],
+            "IAbstractScheduler",
+        ] = BaseScheduler,
+    ):
+        self.stage_specs = kernel.stage_specs
+        self.policy_specs = kernel.policy_specs
+        self.execution_order = list(kernel.execution_order)
+        self.scheduler_factory = scheduler_factory
+
+        self.points = self._expand(grid)
+        self.prefix = self._shared_prefix()
+        self.stage_runs = 0
+
+    def _expand(self, grid: SweepGrid) -> list[SweepPoint]:
+        """Expand the grid into the Cartesian product of points."""
+        _axes = [
+            (_stage_id, _key, list(_values))
+            for _stage_id, _params in grid.items()
+            for _key, _values in _params.items()
+        ]
+
+        for _stage_id, _, _ in _axes:
+            if not self.stage_specs.contains(_stage_id):
+                msg = f"Sweep targets unknown stage '{_stage_id}'."
+                raise KeyError(msg)
+
+        _points: list[SweepPoint] = []
+        for _combination in itertools.product(
+            *(_values for _, _, _values in _axes),
+        ):
+            _overrides: SweepOverrides = {}
+            for (_stage_id, _key, _), _value in zip(
+                _axes,
+                _combination,
+                strict=True,
+            ):
+                _overrides.setdefault(_stage_id, {})[_key] = _value
+            _points.append(SweepPoint(_overrides))
+
+        return _points
+
+    def _shared_prefix(self) -> list[str]:
+        """
+        Return the leading policy-free stages of the execution order.
+
+        A stage is policy-free when it owns no chaining policy and
+        no policy can insert it again at runtime.
+        """
+        _targeted = {
+            _stage_id
+            for _policy in self.policy_specs.values()
+            for _stage_id in _policy.pending_stages or []
+        }
+
+        _prefix: list[str] = []
+        for _stage_id in self.execution_order:
+            _spec = self.stage_specs.get(_stage_id)
+            if (
+                _spec is None
+                or _spec.policy_id is not None
+                or _stage_id in _targeted
+            ):
+                break
+            _prefix.append(_stage_id)
+        return _prefix
+
+    def _compile(
+        self,
+        point: SweepPoint,
+    ) -> Buffer[IAbstractStage[Any]]:
+        """Compile the base specs with the overrides of a point."""
+        _specs: Buffer[StageSpec] = Buffer()
+
+        for _stage_id, _spec in self.stage_specs.items():
+            _overrides = point.overrides.get(_stage_id)
+            if _overrides:
+                if _spec.metadata is None:
+                    msg = (
+                        f"Stage '{_stage_id}' has no metadata to "
+                        f"override with {sorted(_overrides)}."
+                    )
+                    raise ValueError(msg)
+                _spec = dataclasses.replace(
+                    _spec,
+                    metadata=dataclasses.replace(
+                        _spec.metadata,
+                        value={**_spec.metadata.unwrap(), **_overrides},
+                    ),
+                )
+            _specs.register(_stage_id, _spec)
+
+        _stages, _ = BaseCompiler().build(_specs, self.policy_specs)
+        return _stages
+
+    def run(self, init_sample: SAXSSample) -> list[SweepResult]:
+        """
+        Run every sweep point on a sample.
+
+        Parameters
+        ----------
+        init_sample : SAXSSample
+            Input sample; it is not modified.
+
+        Returns
+        -------
+        list[SweepResult]
+            One result per sweep point, in grid order.
+        """
+        self.stage_runs = 0
+        _compiled = [self._compile(_point) for _point in self.points]
+        _results: list[SweepResult | None] = [None] * len(self.points)
+
+        self._run_node(
+            0,
+            list(range(len(self.points))),
+            copy.deepcopy(init_sample),
+            FlowMetadata(value={}),
+            _compiled,
+            _results,
+        )
+
+        return [_result for _result in _results if _result is not None]
+
+    def _run_node(  # noqa: PLR0913
+        self,
+        depth: int,
+        indices: list[int],
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+        compiled: list[Buffer[IAbstractStage[Any]]],
+        results: list[SweepResult | None],
+    ) -> None:
+        """Run one prefix stage per group of points, then recurse."""
+        if depth == len(self.prefix):
+            self._run_leaves(indices, sample, flow_metadata, compiled, results)
+            return
+
+        _stage_id = self.prefix[depth]
+        _groups: dict[tuple[tuple[str, Any], ...], list[int]] = {}
+        for _index in indices:
+            _key = self.points[_index].stage_key(_stage_id)
+            _groups.setdefault(_key, []).append(_index)
+
+        _group_list = list(_groups.values())
+        for _n, _group in enumerate(_group_list):
+            # The last branch may consume the parent state
+            _sample, _flow = (
+                (sample, flow_metadata)
+                if _n == len(_group_list) - 1
+                else copy.deepcopy((sample, flow_metadata))
+            )
+            _stage = compiled[_group[0]].get(_stage_id)
+            if _stage is not None:
+                _sample, _flow = _stage.process(_sample, _flow)
+                self.stage_runs += 1
+
+            self._run_node(
+                depth + 1,
+                _group,
+                _sample,
+                _flow,
+                compiled,
+                results,
+            )
+
+    def _run_leaves(  # noqa: PLR0913
+        self,
+        indices: list[int],
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+        compiled: list[Buffer[IAbstractStage[Any]]],
+        results: list[SweepResult | None],
+    ) -> None:
+        """Run the policy-driven tail of each point."""
+        _tail = self.execution_order[len(self.prefix) :]
+
+        for _n, _index in enumerate(indices):
+            _sample, _flow = (
+                (sample, flow_metadata)
+                if _n == len(indices) - 1
+                else copy.deepcopy((sample, flow_metadata))
+            )
+
+            _stages = [
+                _stage
+                for _stage_id in _tail
+                if (_stage := compiled[_index].get(_stage_id)) is not None
+            ]
+
+            if _stages:
+                _scheduler = self.scheduler_factory()
+                _scheduler.enqueue_initial_stages(_stages)
+                _sample = _scheduler.run(
+                    init_sample=_sample,
+                    init_flow_metadata=_flow,
+                )
+
+            results[_index] = SweepResult(self.points[_index], _sample)
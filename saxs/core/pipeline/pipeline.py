@@ -93,6 +93,8 @@ class Pipeline:
 
         Enqueues the initial stages into the scheduler, then
         delegates execution to the scheduler's `run` method.
+        In-place stages copy the arrays of the caller before writing
+        them (see `SAXSSample.get_writable`).
 
         Parameters
         ----------
@@ -114,3 +116,26 @@ class Pipeline:
                 value={},
             ),  # defaut dict without name
         )
+
+    def run_many(self, init_samples: list[SAXSSample]) -> list[SAXSSample]:
+        """Run the pipeline on several samples.
+
+        Enqueues the initial stages once, then delegates to the
+        scheduler's `run_many`, which may interleave the samples.
+
+        Parameters
+        ----------
+        init_samples : list of SAXSSample
+            Samples to process.
+
+        Returns
+        -------
+        list of SAXSSample
+            Processed samples, in input order.
+        """
+        self.scheduler.enqueue_initial_stages(self.init_stages)
+
+        return self.scheduler.run_many(
+            init_samples,
+            [FlowMetadata(value={}) for _ in init_samples],
+        )
@@ -0,0 +1,188 @@
+"""
+budget.py.
+
+This module defines per-sample execution budgets for schedulers.
+
+A pathological sample can loop between stages for a long time or
+stall in an expensive fit. A `SchedulerBudget` bounds the work spent
+on one sample by
+
+- the number of stage executions (`max_steps`),
+- the number of processed peaks (`max_peaks`, counted from
+  `ESampleMetadataKeys.PEAK_VISITS`),
+- the elapsed wall time (`max_wall_time`, checked between steps),
+- the function evaluations of each fit (`maxfev`).
+
+The evaluation limit is published through a context variable for
+the duration of each stage (see `get_fit_evaluation_limit`); fitting
+code reads it and raises `BudgetExhaustedError` when a fit runs out
+of evaluations. A sample whose budget is exhausted stops cleanly:
+its remaining stages are dropped and the sample is flagged with
+`ESampleMetadataKeys.PARTIAL` and the exhausted budget.
+
+Classes
+--------
+EBudgetExhausted
+    Budget that ended a sample early.
+BudgetExhaustedError
+    Raised when a fit exceeds the evaluation limit.
+SchedulerBudget
+    Per-sample limits.
+BudgetTracker
+    Budget consumption of one sample.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.types.sample_objects import ESampleMetadataKeys
+
+if TYPE_CHECKING:
+    from saxs.core.stage.abstract_stage import IAbstractStage
+    from saxs.core.types.flow_metadata import FlowMetadata
+    from saxs.core.types.sample import SAXSSample
+
+_FIT_EVALUATION_LIMIT: ContextVar[int | None] = ContextVar(
+    "fit_evaluation_limit",
+    default=None,
+)
+
+
+def get_fit_evaluation_limit() -> int | None:
+    """Return the fit evaluation limit of the running stage, if any."""
+    return _FIT_EVALUATION_LIMIT.get()
+
+
+class EBudgetExhausted(Enum):
+    """Budget that ended a sample early."""
+
+    STEPS = "max_steps"
+    PEAKS = "max_peaks"
+    WALL_TIME = "max_wall_time"
+    MAXFEV = "maxfev"
+
+
+class BudgetExhaustedError(RuntimeError):
+    """Raised when a fit exceeds the evaluation limit."""
+
+
+@dataclass(frozen=True)
+class SchedulerBudget:
+    """
+    Per-sample limits; None disables a limit.
+
+    Attributes
+    ----------
+    max_steps : int | None
+        Maximum number of stage executions.
+    max_peaks : int | None
+        Maximum number of processed peaks.
+    max_wall_time : float | None
+        Maximum elapsed time in seconds, checked between steps.
+    maxfev : int | None
+        Maximum function evaluations per fit.
+    """
+
+    max_steps: int | None = None
+    max_peaks: int | None = None
+    max_wall_time: float | None = None
+    maxfev: int | None = None
+
+    def start(self) -> "BudgetTracker":
+        """Return a tracker for a new sample."""
+        return BudgetTracker(self)
+
+
+class BudgetTracker:
+    """
+    Budget consumption of one sample.
+
+    Parameters
+    ----------
+    budget : SchedulerBudget
+        Limits to enforce.
+
+    Attributes
+    ----------
+    steps : int
+        Stage executions so far.
+    exhausted : EBudgetExhausted | None
+        Budget that ended the sample, None while within budget.
+    """
+
+    def __init__(self, budget: SchedulerBudget):
+        self.budget = budget
+        self.steps = 0
+        self.exhausted: EBudgetExhausted | None = None
+        self._start = time.monotonic()
+
+    def check(self, sample: "SAXSSample") -> bool:
+        """
+        Return whether the sample may run another stage.
+
+        Records the exhausted budget otherwise.
+        """
+        if self.exhausted is not None:
+            return False
+
+        _budget = self.budget
+        if _budget.max_steps is not None and self.steps >= _budget.max_steps:
+            self.exhausted = EBudgetExhausted.STEPS
+        elif (
+            _budget.max_peaks is not None
+            and self._peaks(sample) >= _budget.max_peaks
+        ):
+            self.exhausted = EBudgetExhausted.PEAKS
+        elif (
+            _budget.max_wall_time is not None
+            and time.monotonic() - self._start >= _budget.max_wall_time
+        ):
+            self.exhausted = EBudgetExhausted.WALL_TIME
+
+        return self.exhausted is None
+
+    def process(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: "SAXSSample",
+        flow_metadata: "FlowMetadata",
+    ) -> tuple["SAXSSample", "FlowMetadata"]:
+        """
+        Run a stage under the fit evaluation limit.
+
+        A fit running out of evaluations ends the sample: the stage
+        output is discarded and the exhausted budget is recorded.
+        """
+        self.steps += 1
+        _token = _FIT_EVALUATION_LIMIT.set(self.budget.maxfev)
+        try:
+            return stage.process(sample=sample, flow_metadata=flow_metadata)
+        except BudgetExhaustedError:
+            self.exhausted = EBudgetExhausted.MAXFEV
+            return sample, flow_metadata
+        finally:
+            _FIT_EVALUATION_LIMIT.reset(_token)
+
+    def finalize(self, sample: "SAXSSample") -> "SAXSSample":
+        """Flag the sample as partial if its budget was exhausted."""
+        if self.exhausted is not None:
+            sample.set_metadata(
+                ESampleMetadataKeys.PARTIAL,
+                True,  # noqa: FBT003
+            )
+            sample.set_metadata(
+                ESampleMetadataKeys.BUDGET_EXHAUSTED,
+                self.exhausted.value,
+            )
+        return sample
+
+    @staticmethod
+    def _peaks(sample: "SAXSSample") -> int:
+        _visits = sample.get_metadata().unwrap().get(
+            ESampleMetadataKeys.PEAK_VISITS.value,
+            {},
+        )
+        return sum(_visits.values())
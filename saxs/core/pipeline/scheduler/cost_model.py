@@ -0,0 +1,154 @@
+"""
+cost_model.py.
+
+This module defines cost models ordering the pending work of a
+`PriorityScheduler`. A cost model maps a pending stage, together
+with the sample it will process, to a priority: lower runs first.
+
+Classes
+--------
+IAbstractCostModel
+    Base class of cost models.
+FifoCostModel
+    Constant cost; ties keep insertion order.
+ShortestJobFirstCostModel
+    Orders work by sample length.
+CheapestPeakFirstCostModel
+    Orders work by the estimated remaining peak processing.
+DeadlineCostModel
+    Orders work by sample deadline (earliest deadline first).
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Sized
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.types.flow_metadata import FlowMetadata, FlowMetadataKeys
+from saxs.core.types.sample import ESAXSSampleKeys, SAXSSample
+from saxs.core.types.sample_objects import ESampleMetadataKeys
+
+if TYPE_CHECKING:
+    from saxs.core.pipeline.scheduler.abstract_stage_request import (
+        ApprovalMetadata,
+    )
+    from saxs.core.stage.abstract_stage import IAbstractStage
+
+
+class IAbstractCostModel(ABC):
+    """Abstract cost model of pending scheduler work."""
+
+    @abstractmethod
+    def cost(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+        approval_metadata: "ApprovalMetadata | None" = None,
+    ) -> float:
+        """
+        Return the priority of running a stage on a sample.
+
+        Parameters
+        ----------
+        stage : IAbstractStage
+            Pending stage.
+        sample : SAXSSample
+            Sample the stage will process.
+        flow_metadata : FlowMetadata
+            Flow metadata of the sample.
+        approval_metadata : ApprovalMetadata | None, optional
+            Metadata of the request that inserted the stage, None
+            for initial stages.
+
+        Returns
+        -------
+        float
+            Priority; lower values run first.
+        """
+
+
+class FifoCostModel(IAbstractCostModel):
+    """Constant cost, so that work runs in insertion order."""
+
+    def cost(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+        approval_metadata: "ApprovalMetadata | None" = None,
+    ) -> float:
+        """Return zero."""
+        _ = stage, sample, flow_metadata, approval_metadata
+        return 0.0
+
+
+class ShortestJobFirstCostModel(IAbstractCostModel):
+    """Cost proportional to the number of points of the sample."""
+
+    def cost(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+        approval_metadata: "ApprovalMetadata | None" = None,
+    ) -> float:
+        """Return the sample length."""
+        _ = stage, flow_metadata, approval_metadata
+        return float(len(sample[ESAXSSampleKeys.Q_VALUES]))
+
+
+class CheapestPeakFirstCostModel(IAbstractCostModel):
+    """
+    Cost of the peak processing left for the sample.
+
+    Estimated as the number of unprocessed peaks (plus the one in
+    progress) times the sample length, so samples close to
+    completion finish before peak-rich ones. Before peak finding,
+    or once the peaks are exhausted, the unprocessed entry is not
+    a collection (e.g. an `ERuntimeConstants` marker) and counts as
+    no peak.
+    """
+
+    def cost(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+        approval_metadata: "ApprovalMetadata | None" = None,
+    ) -> float:
+        """Return the estimated remaining peak work."""
+        _ = stage, approval_metadata
+        _unprocessed = flow_metadata.unwrap().get(
+            FlowMetadataKeys.UNPROCESSED.value,
+        )
+        _peaks = len(_unprocessed) if isinstance(_unprocessed, Sized) else 0
+        return float((_peaks + 1) * len(sample[ESAXSSampleKeys.Q_VALUES]))
+
+
+class DeadlineCostModel(IAbstractCostModel):
+    """
+    Earliest deadline first.
+
+    The deadline is read from the approval metadata, then from the
+    sample metadata (`ESampleMetadataKeys.DEADLINE`), as a
+    `time.monotonic()` timestamp. Work without a deadline runs last.
+    """
+
+    def cost(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+        approval_metadata: "ApprovalMetadata | None" = None,
+    ) -> float:
+        """Return the deadline of the work."""
+        _ = stage, flow_metadata
+        _key = ESampleMetadataKeys.DEADLINE.value
+
+        if approval_metadata is not None:
+            _deadline = approval_metadata.unwrap().get(_key)
+            if _deadline is not None:
+                return float(_deadline)
+
+        return float(sample.get_metadata().unwrap().get(_key, math.inf))
@@ -0,0 +1,91 @@
+"""
+hooks.py.
+
+This module defines the instrumentation interface of schedulers.
+
+A scheduler notifies its registered hooks around every stage
+execution and for every stage request its insertion policy decides.
+Hooks observe the run without changing it, e.g. to collect timings
+(see `scheduler_stats`). Schedulers check for registered hooks once
+per step, so a scheduler without hooks runs as before.
+
+Classes
+--------
+IAbstractSchedulerHook
+    Observer of scheduler events.
+"""
+
+from abc import ABC
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from saxs.core.pipeline.scheduler.abstract_stage_request import (
+        StageApprovalRequest,
+    )
+    from saxs.core.pipeline.scheduler.policy.insertion_policy import (
+        InsertionPolicy,
+    )
+    from saxs.core.stage.abstract_stage import IAbstractStage
+    from saxs.core.types.sample import SAXSSample
+
+
+class IAbstractSchedulerHook(ABC):  # noqa: B024
+    """Observer of scheduler events.
+
+    Every method is a no-op by default; override the events of
+    interest. Hooks must not modify the stage, sample or request.
+    """
+
+    def on_stage_start(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: "SAXSSample",
+        queue_depth: int,
+    ) -> None:
+        """Called before a stage processes a sample.
+
+        Parameters
+        ----------
+        stage : IAbstractStage
+            Stage about to run.
+        sample : SAXSSample
+            Sample it processes.
+        queue_depth : int
+            Number of stages still pending.
+        """
+
+    def on_stage_end(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: "SAXSSample",
+    ) -> None:
+        """Called after a stage processed a sample.
+
+        Also called, with the input sample, if the stage raised;
+        errors of the hook are then suppressed.
+        """
+
+    def on_request(
+        self,
+        request: "StageApprovalRequest",
+        policy: "InsertionPolicy",
+    ) -> None:
+        """Called when the insertion policy approves a request."""
+
+    def on_reject(
+        self,
+        request: "StageApprovalRequest",
+        policy: "InsertionPolicy",
+    ) -> None:
+        """Called when the insertion policy rejects a request."""
+
+    def on_sample_end(self, sample: "SAXSSample", steps: int) -> None:
+        """Called when a sample has no pending stages left.
+
+        Parameters
+        ----------
+        sample : SAXSSample
+            Final sample.
+        steps : int
+            Number of stages run on the sample.
+        """
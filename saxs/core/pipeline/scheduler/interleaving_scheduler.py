@@ -0,0 +1,280 @@
+"""
+interleaving_scheduler.py.
+
+This module defines `InterleavingScheduler`, a scheduler running
+many samples through one set of compiled stage instances. Its queue
+holds one entry per (sample, stage) pair, so the work of different
+samples interleaves in FIFO order while each sample still sees its
+own stages in order. A sample retires as soon as its last pending
+stage has run, independently of the others, which makes the
+scheduler a natural fit for streaming, batching and asynchronous
+consumers.
+
+Classes
+--------
+InterleavingScheduler
+    FIFO scheduler over (sample, stage) entries.
+"""
+
+from collections import deque
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.pipeline.scheduler.budget import (
+    BudgetTracker,
+    SchedulerBudget,
+)
+from saxs.core.pipeline.scheduler.hooks import IAbstractSchedulerHook
+from saxs.core.pipeline.scheduler.scheduler import IAbstractScheduler
+from saxs.core.stage.abstract_stage import IAbstractStage
+from saxs.core.types.flow_metadata import FlowMetadata
+from saxs.core.types.sample import SAXSSample
+from saxs.logging.logger import get_scheduler_logger
+
+if TYPE_CHECKING:
+    from saxs.core.pipeline.scheduler.policy.insertion_policy import (
+        InsertionPolicy,
+    )
+
+logger = get_scheduler_logger(__name__)
+
+
+@dataclass(eq=False)
+class _SampleSlot:
+    """In-flight state of one submitted sample."""
+
+    ticket: int
+    sample: SAXSSample
+    flow_metadata: FlowMetadata
+    pending: int = 0
+    steps: int = 0
+    tracker: BudgetTracker | None = None
+    policy: "InsertionPolicy | None" = None
+    done: bool = False
+
+
+class InterleavingScheduler(IAbstractScheduler):
+    """FIFO scheduler over (sample, stage) entries.
+
+    `enqueue_initial_stages` sets the stages every submitted sample
+    starts with; calling it again replaces them, so a `Pipeline`
+    can enqueue on every run.
+
+    Parameters
+    ----------
+    init_stages : list of AbstractStage, optional
+        Initial stages of every sample.
+    insertion_policy : InsertionPolicy, optional
+        Policy controlling insertion of requested stages; every
+        submitted sample gets its own reset copy.
+    on_retire : Callable[[int, SAXSSample], None], optional
+        Called with the ticket and final sample of each retired
+        sample.
+    budget : SchedulerBudget, optional
+        Per-sample execution limits. A sample exhausting its budget
+        retires at once, flagged as partial.
+    hooks : list of IAbstractSchedulerHook, optional
+        Observers of scheduler events.
+
+    Examples
+    --------
+    >>> scheduler = InterleavingScheduler(init_stages=stages)
+    >>> tickets = [scheduler.submit(sample) for sample in samples]
+    >>> for ticket, result in scheduler.iter_completed():
+    ...     store(ticket, result)
+    """
+
+    def __init__(
+        self,
+        init_stages: list[IAbstractStage[Any]] | None = None,
+        insertion_policy: "InsertionPolicy | None" = None,
+        on_retire: Callable[[int, SAXSSample], None] | None = None,
+        budget: SchedulerBudget | None = None,
+        hooks: list[IAbstractSchedulerHook] | None = None,
+    ):
+        super().__init__(init_stages, insertion_policy, budget, hooks)
+        self._initial_stages: list[IAbstractStage[Any]] = list(self._queue)
+        self._queue.clear()
+
+        self._entries: deque[tuple[_SampleSlot, IAbstractStage[Any]]] = (
+            deque()
+        )
+        # Samples without initial stages retire at submission
+        self._retired: deque[tuple[int, SAXSSample]] = deque()
+        self._next_ticket = 0
+        self.on_retire = on_retire
+
+    def enqueue_initial_stages(
+        self,
+        initial_stages: list[IAbstractStage[Any]],
+    ) -> None:
+        """Set the initial stages of subsequently submitted samples.
+
+        Parameters
+        ----------
+        initial_stages : list of AbstractStage
+            List of stage instances every sample starts with.
+        """
+        self._initial_stages = list(initial_stages)
+
+    def submit(
+        self,
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata | None = None,
+    ) -> int:
+        """Add a sample to the queue.
+
+        Parameters
+        ----------
+        sample : SAXSSample
+            Sample to process.
+        flow_metadata : FlowMetadata, optional
+            Initial flow metadata, empty if None.
+
+        Returns
+        -------
+        int
+            Ticket identifying the sample on retirement.
+        """
+        _slot = _SampleSlot(
+            ticket=self._next_ticket,
+            sample=sample,
+            flow_metadata=(
+                FlowMetadata(value={})
+                if flow_metadata is None
+                else flow_metadata
+            ),
+            tracker=self._start_budget(),
+            policy=self._sample_policy(),
+        )
+        self._next_ticket += 1
+
+        for _stage in self._initial_stages:
+            self._entries.append((_slot, _stage))
+        _slot.pending = len(self._initial_stages)
+
+        if not _slot.pending:
+            self._retire(_slot)
+            self._retired.append((_slot.ticket, _slot.sample))
+
+        return _slot.ticket
+
+    def iter_completed(self) -> Iterator[tuple[int, SAXSSample]]:
+        """Run queued entries, yielding samples as they retire.
+
+        Yields
+        ------
+        tuple[int, SAXSSample]
+            Ticket and final sample of each retired sample.
+        """
+        entries = self._entries
+
+        while self._retired:
+            yield self._retired.popleft()
+
+        while entries:
+            _slot, stage = entries.popleft()
+            if _slot.done:
+                continue
+
+            _tracker = _slot.tracker
+            if _tracker is None or _tracker.check(_slot.sample):
+                _slot.steps += 1
+                _slot.sample, _slot.flow_metadata = self._process_hooked(
+                    _tracker,
+                    stage,
+                    _slot.sample,
+                    _slot.flow_metadata,
+                    _slot.steps,
+                    len(entries),
+                )
+
+            if _tracker is not None and _tracker.exhausted is not None:
+                # Drop the remaining entries of the sample
+                _slot.sample = _tracker.finalize(_slot.sample)
+                self._retire(_slot)
+                yield _slot.ticket, _slot.sample
+                continue
+
+            _slot.pending -= 1
+
+            for req in stage.request_stage(_slot.flow_metadata):
+                if self._approve(req, _slot.policy):
+                    entries.append((_slot, req.stage))
+                    _slot.pending += 1
+
+            if not _slot.pending:
+                self._retire(_slot)
+                yield _slot.ticket, _slot.sample
+
+    def run_many(
+        self,
+        init_samples: list[SAXSSample],
+        init_flow_metadata: list[FlowMetadata] | None = None,
+    ) -> list[SAXSSample]:
+        """Interleave a batch of samples until all have retired.
+
+        Parameters
+        ----------
+        init_samples : list of SAXSSample
+            Samples to process.
+        init_flow_metadata : list of FlowMetadata, optional
+            Initial flow metadata per sample, empty if None.
+
+        Returns
+        -------
+        list of SAXSSample
+            Processed samples, in input order.
+        """
+        _flows = init_flow_metadata or [None] * len(init_samples)
+        _tickets = {
+            self.submit(_sample, _flow): _index
+            for _index, (_sample, _flow) in enumerate(
+                zip(init_samples, _flows, strict=True),
+            )
+        }
+
+        logger.scheduler_info(
+            "Pipeline started",
+            samples=len(init_samples),
+            queue_size=len(self._entries),
+        )
+
+        _results: list[SAXSSample] = list(init_samples)
+        for _ticket, _sample in self.iter_completed():
+            if _ticket in _tickets:
+                _results[_tickets[_ticket]] = _sample
+
+        logger.scheduler_info(
+            "Pipeline completed",
+            samples=len(init_samples),
+        )
+        return _results
+
+    def run(
+        self,
+        init_sample: SAXSSample,
+        init_flow_metadata: FlowMetadata,
+    ) -> SAXSSample:
+        """Process a single sample.
+
+        Parameters
+        ----------
+        init_sample : SAXSSample
+            The initial sample to process.
+
+        Returns
+        -------
+        SAXSSample
+            The final processed sample after all stages complete.
+        """
+        return self.run_many([init_sample], [init_flow_metadata])[0]
+
+    def _retire(self, slot: _SampleSlot) -> None:
+        slot.done = True
+        self._record_sample(slot.tracker)
+        for _hook in self._hooks:
+            _hook.on_sample_end(slot.sample, slot.steps)
+        if self.on_retire is not None:
+            self.on_retire(slot.ticket, slot.sample)
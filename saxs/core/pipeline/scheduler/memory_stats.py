@@ -0,0 +1,301 @@
+"""
+memory_stats.py.
+
+This module defines `MemoryStatsCollector`, a scheduler hook
+accounting the memory allocated by stages with `tracemalloc`:
+
+- per stage class: the bytes still allocated when the stage ends
+  (net allocation) and the peak allocated while it runs, both
+  relative to the stage start,
+- per sample: the net allocation and peak over all its stages, and
+  the peak resident set size of the process when it ends.
+
+Allocation budgets per stage class turn the collector into a
+regression check (see `benchmarks/memory_budget.py`): a stage whose
+peak exceeds its budget is recorded as a violation and, in strict
+mode, raises `MemoryBudgetError` unless the stage itself failed.
+
+`tracemalloc` traces every allocation of the process and slows the
+run down noticeably; the collector is meant for benchmarks and
+investigations. It starts tracing on the first stage if needed and
+stops it in `close`. The peak is process-wide, so stages running in
+parallel threads are not separated.
+
+Classes
+--------
+MemoryBudgetError
+    Raised when a stage exceeds its allocation budget.
+MemoryStatsCollector
+    Hook accounting stage and sample memory.
+"""
+
+import json
+import sys
+import threading
+import tracemalloc
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.pipeline.scheduler.hooks import IAbstractSchedulerHook
+from saxs.tracing.tracer import sample_trace_id
+
+try:
+    import resource
+except ImportError:  # pragma: no cover, not available on Windows
+    resource = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from saxs.core.stage.abstract_stage import IAbstractStage
+    from saxs.core.types.sample import SAXSSample
+
+DEFAULT_MAX_SAMPLE_RECORDS = 10_000
+
+
+def get_max_rss() -> int | None:
+    """Return the peak resident set size of the process in bytes."""
+    if resource is None:
+        return None
+    _max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux, bytes on macOS
+    return _max_rss if sys.platform == "darwin" else _max_rss * 1024
+
+
+class MemoryBudgetError(RuntimeError):
+    """Raised when a stage exceeds its allocation budget."""
+
+
+class _StageMemory:
+    """Allocation totals of one stage class."""
+
+    __slots__ = ("allocated", "count", "max_allocated", "max_peak", "peak")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.allocated = 0
+        self.max_allocated = 0
+        self.peak = 0
+        self.max_peak = 0
+
+    def add(self, allocated: int, peak: int) -> None:
+        self.count += 1
+        self.allocated += allocated
+        self.max_allocated = max(self.max_allocated, allocated)
+        self.peak += peak
+        self.max_peak = max(self.max_peak, peak)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "allocated_total": self.allocated,
+            "allocated_max": self.max_allocated,
+            "peak_mean": self.peak / self.count if self.count else 0.0,
+            "peak_max": self.max_peak,
+        }
+
+
+class MemoryStatsCollector(IAbstractSchedulerHook):
+    """
+    Hook accounting stage and sample memory with `tracemalloc`.
+
+    Parameters
+    ----------
+    stage_budgets : dict[str, int] | None, optional
+        Peak allocation budget in bytes per stage class name.
+    default_budget : int | None, optional
+        Budget of stages absent from `stage_budgets`, unlimited if
+        None.
+    strict : bool, optional
+        Also raise `MemoryBudgetError` on the first violation
+        (default: False). The violation of a stage that raised is
+        only recorded, the stage error propagates.
+    max_sample_records : int, optional
+        Number of most recent per-sample records kept.
+
+    Examples
+    --------
+    >>> memory = MemoryStatsCollector(default_budget=1 << 20)
+    >>> scheduler = BaseScheduler(hooks=[memory])
+    >>> ...
+    >>> memory.close()
+    >>> memory.get_violations()
+    """
+
+    def __init__(
+        self,
+        stage_budgets: dict[str, int] | None = None,
+        default_budget: int | None = None,
+        strict: bool = False,
+        max_sample_records: int = DEFAULT_MAX_SAMPLE_RECORDS,
+    ):
+        self.stage_budgets = dict(stage_budgets or {})
+        self.default_budget = default_budget
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._started_tracing = False
+        # Traced memory when the running stage started, per thread
+        self._running: dict[int, int] = {}
+        # Start and peak traced memory of the samples running, by id
+        self._samples: dict[str, list[int]] = {}
+        self._stages: dict[str, _StageMemory] = {}
+        self._sample_records: deque[dict[str, Any]] = deque(
+            maxlen=max_sample_records,
+        )
+        self._sample_count = 0
+        self._sample_max_peak = 0
+        self._violations: list[dict[str, Any]] = []
+
+    def on_stage_start(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: "SAXSSample",
+        queue_depth: int,
+    ) -> None:
+        """Record the traced memory and reset the peak."""
+        _ = stage, queue_depth
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        _current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        with self._lock:
+            self._running[threading.get_ident()] = _current
+            self._samples.setdefault(
+                sample_trace_id(sample),
+                [_current, 0],
+            )
+
+    def on_stage_end(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: "SAXSSample",
+    ) -> None:
+        """Account the stage and check its budget."""
+        _current, _peak = tracemalloc.get_traced_memory()
+        _name = type(stage).__name__
+        with self._lock:
+            _start = self._running.pop(threading.get_ident(), None)
+            if _start is None:
+                return
+            _allocated, _stage_peak = _current - _start, _peak - _start
+            _memory = self._stages.get(_name)
+            if _memory is None:
+                _memory = self._stages[_name] = _StageMemory()
+            _memory.add(_allocated, _stage_peak)
+
+            _sample = self._samples.get(sample_trace_id(sample))
+            if _sample is not None:
+                _sample[1] = max(_sample[1], _peak - _sample[0])
+
+            _budget = self.stage_budgets.get(_name, self.default_budget)
+            if _budget is None or _stage_peak <= _budget:
+                return
+            _violation = {
+                "stage": _name,
+                "sample_id": sample_trace_id(sample),
+                "peak": _stage_peak,
+                "budget": _budget,
+            }
+            self._violations.append(_violation)
+
+        if self.strict:
+            msg = (
+                f"{_name} allocated {_stage_peak} bytes at peak, "
+                f"budget is {_budget}."
+            )
+            raise MemoryBudgetError(msg)
+
+    def on_sample_end(self, sample: "SAXSSample", steps: int) -> None:
+        """Record the memory of the finished sample."""
+        _current, _ = tracemalloc.get_traced_memory()
+        _id = sample_trace_id(sample)
+        with self._lock:
+            _sample = self._samples.pop(_id, None)
+            if _sample is None:
+                return
+            _start, _peak = _sample
+            self._sample_count += 1
+            self._sample_max_peak = max(self._sample_max_peak, _peak)
+            self._sample_records.append(
+                {
+                    "sample_id": _id,
+                    "steps": steps,
+                    "allocated": _current - _start,
+                    "peak": _peak,
+                    "max_rss": get_max_rss(),
+                },
+            )
+
+    def get_violations(self) -> list[dict[str, Any]]:
+        """Return the recorded budget violations."""
+        with self._lock:
+            return list(self._violations)
+
+    def close(self) -> None:
+        """Stop tracing if the collector started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def reset(self) -> None:
+        """Drop all collected statistics."""
+        with self._lock:
+            self._running.clear()
+            self._samples.clear()
+            self._stages.clear()
+            self._sample_records.clear()
+            self._sample_count = 0
+            self._sample_max_peak = 0
+            self._violations.clear()
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the collected statistics as plain data.
+
+        Returns
+        -------
+        dict[str, Any]
+            Per-stage allocation totals in bytes, sorted by peak,
+            per-sample records, budget violations and the peak
+            resident set size of the process.
+        """
+        with self._lock:
+            return {
+                "stages": {
+                    _name: _memory.to_dict()
+                    for _name, _memory in sorted(
+                        self._stages.items(),
+                        key=lambda _item: _item[1].max_peak,
+                        reverse=True,
+                    )
+                },
+                "samples": {
+                    "count": self._sample_count,
+                    "peak_max": self._sample_max_peak,
+                    "records": list(self._sample_records),
+                },
+                "violations": list(self._violations),
+                "max_rss": get_max_rss(),
+            }
+
+    def to_json(self, path: str | None = None, indent: int = 2) -> str:
+        """
+        Return the collected statistics as JSON.
+
+        Parameters
+        ----------
+        path : str | None, optional
+            File to also write the JSON to.
+        indent : int, optional
+            JSON indentation.
+
+        Returns
+        -------
+        str
+            JSON document of `to_dict`.
+        """
+        _document = json.dumps(self.to_dict(), indent=indent)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as _file:
+                _file.write(_document)
+        return _document
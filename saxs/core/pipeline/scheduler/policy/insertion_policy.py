@@ -23,6 +23,9 @@ class InsertionPolicy(ABC):
         False otherwise.
         """
 
+    def reset(self) -> None:
+        """Reset per-sample state before a new sample runs."""
+
 
 class AlwaysInsertPolicy(InsertionPolicy):
     def __call__(self, request: StageApprovalRequest) -> bool:
@@ -35,11 +38,15 @@ class NeverInsertPolicy(InsertionPolicy):
 
 
 class SaturationInsertPolicy(InsertionPolicy):
-    _calls = 0
-    _saturation = 6
+    """Insert at most `saturation` stages per sample."""
 
     def __init__(self, saturation: int = 6):
         self._saturation = saturation
+        self._calls = 0
+
+    def reset(self) -> None:
+        """Restart the insertion count."""
+        self._calls = 0
 
     def __call__(self, request: StageApprovalRequest) -> bool:
         if self._calls < self._saturation:
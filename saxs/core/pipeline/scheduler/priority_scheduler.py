@@ -0,0 +1,281 @@
+"""
+priority_scheduler.py.
+
+This module defines `PriorityScheduler`, a scheduler ordering
+pending work with a binary heap instead of a FIFO queue. It can
+interleave several samples: each sample keeps its own FIFO of
+pending stages, and the heap holds one entry per active sample,
+ranked by the priority of its next stage. Small samples therefore
+do not wait behind large multi-peak ones.
+
+The priority of a stage comes from the request that inserted it
+(`ESampleMetadataKeys.PRIORITY` in the approval metadata) or, if
+absent, from a pluggable cost model (see `cost_model`). Ties run in
+insertion order, so with a constant cost the scheduler behaves like
+`BaseScheduler`.
+
+Classes
+--------
+PriorityScheduler
+    Scheduler executing the cheapest pending work first.
+"""
+
+import heapq
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.pipeline.scheduler.budget import (
+    BudgetTracker,
+    SchedulerBudget,
+)
+from saxs.core.pipeline.scheduler.cost_model import (
+    FifoCostModel,
+    IAbstractCostModel,
+)
+from saxs.core.pipeline.scheduler.hooks import IAbstractSchedulerHook
+from saxs.core.pipeline.scheduler.scheduler import IAbstractScheduler
+from saxs.core.stage.abstract_stage import IAbstractStage
+from saxs.core.types.flow_metadata import FlowMetadata
+from saxs.core.types.sample import SAXSSample
+from saxs.core.types.sample_objects import ESampleMetadataKeys
+from saxs.logging.logger import get_scheduler_logger
+
+if TYPE_CHECKING:
+    from saxs.core.pipeline.scheduler.abstract_stage_request import (
+        ApprovalMetadata,
+    )
+    from saxs.core.pipeline.scheduler.policy.insertion_policy import (
+        InsertionPolicy,
+    )
+
+logger = get_scheduler_logger(__name__)
+
+
+@dataclass(eq=False)
+class _SampleState:
+    """Pending work of one sample."""
+
+    index: int
+    sample: SAXSSample
+    flow_metadata: FlowMetadata
+    pending: deque[
+        tuple[IAbstractStage[Any], "ApprovalMetadata | None"]
+    ] = field(default_factory=deque)
+    steps: int = 0
+    tracker: BudgetTracker | None = None
+    policy: "InsertionPolicy | None" = None
+
+
+class PriorityScheduler(IAbstractScheduler):
+    """Scheduler executing the cheapest pending work first.
+
+    Parameters
+    ----------
+    init_stages : list of AbstractStage, optional
+        Initial stages.
+    insertion_policy : InsertionPolicy, optional
+        Policy controlling insertion of requested stages; every
+        sample gets its own reset copy.
+    cost_model : IAbstractCostModel, optional
+        Priority of pending stages without an explicit request
+        priority (default: `FifoCostModel`).
+    budget : SchedulerBudget, optional
+        Per-sample execution limits.
+    hooks : list of IAbstractSchedulerHook, optional
+        Observers of scheduler events.
+
+    Examples
+    --------
+    >>> scheduler = PriorityScheduler(
+    ...     cost_model=ShortestJobFirstCostModel(),
+    ... )
+    >>> scheduler.enqueue_initial_stages(stages)
+    >>> results = scheduler.run_many(samples)
+    """
+
+    def __init__(
+        self,
+        init_stages: list[IAbstractStage[Any]] | None = None,
+        insertion_policy: "InsertionPolicy | None" = None,
+        cost_model: IAbstractCostModel | None = None,
+        budget: SchedulerBudget | None = None,
+        hooks: list[IAbstractSchedulerHook] | None = None,
+    ):
+        super().__init__(init_stages, insertion_policy, budget, hooks)
+        self.cost_model = cost_model or FifoCostModel()
+        self._sequence = itertools.count()
+
+    def priority(
+        self,
+        stage: IAbstractStage[Any],
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+        approval_metadata: "ApprovalMetadata | None" = None,
+    ) -> float:
+        """
+        Return the priority of a pending stage.
+
+        An explicit `ESampleMetadataKeys.PRIORITY` in the approval
+        metadata wins over the cost model.
+        """
+        if approval_metadata is not None:
+            _priority = approval_metadata.unwrap().get(
+                ESampleMetadataKeys.PRIORITY.value,
+            )
+            if _priority is not None:
+                return float(_priority)
+
+        return self.cost_model.cost(
+            stage,
+            sample,
+            flow_metadata,
+            approval_metadata,
+        )
+
+    def run(
+        self,
+        init_sample: SAXSSample,
+        init_flow_metadata: FlowMetadata,
+    ) -> SAXSSample:
+        """Execute the pending stages on a single sample.
+
+        Parameters
+        ----------
+        init_sample : SAXSSample
+            The initial sample to process.
+
+        Returns
+        -------
+        SAXSSample
+            The final processed sample after all stages complete.
+        """
+        return self.run_many([init_sample], [init_flow_metadata])[0]
+
+    def run_many(
+        self,
+        init_samples: list[SAXSSample],
+        init_flow_metadata: list[FlowMetadata] | None = None,
+    ) -> list[SAXSSample]:
+        """Interleave the pending stages over several samples.
+
+        Every sample runs the enqueued initial stages. At each step
+        the sample whose next stage has the lowest priority runs
+        that stage.
+
+        Parameters
+        ----------
+        init_samples : list of SAXSSample
+            Samples to process.
+        init_flow_metadata : list of FlowMetadata, optional
+            Initial flow metadata per sample, empty if None.
+
+        Returns
+        -------
+        list of SAXSSample
+            Processed samples, in input order.
+        """
+        _initial = list(self._queue)
+        self._queue.clear()
+
+        _flows = init_flow_metadata or [
+            FlowMetadata(value={}) for _ in init_samples
+        ]
+
+        heap: list[tuple[float, int, _SampleState]] = []
+        _results: list[SAXSSample] = list(init_samples)
+
+        for _index, (_sample, _flow) in enumerate(
+            zip(init_samples, _flows, strict=True),
+        ):
+            _state = _SampleState(
+                _index,
+                _sample,
+                _flow,
+                tracker=self._start_budget(),
+                policy=self._sample_policy(),
+            )
+            _state.pending.extend((_stage, None) for _stage in _initial)
+            self._push(heap, _state)
+
+        logger.scheduler_info(
+            "Pipeline started",
+            samples=len(init_samples),
+            queue_size=len(_initial),
+            cost_model=type(self.cost_model).__name__,
+        )
+
+        step = 0
+        while heap:
+            _, _, _state = heapq.heappop(heap)
+            _tracker = _state.tracker
+
+            if _tracker is not None and not _tracker.check(_state.sample):
+                _results[_state.index] = self._finish(_state)
+                continue
+
+            stage, _ = _state.pending.popleft()
+
+            _state.steps += 1
+            _state.sample, _state.flow_metadata = self._process_hooked(
+                _tracker,
+                stage,
+                _state.sample,
+                _state.flow_metadata,
+                _state.steps,
+                len(_state.pending),
+            )
+            step += 1
+
+            if _tracker is not None and _tracker.exhausted is not None:
+                _results[_state.index] = self._finish(_state)
+                continue
+
+            for req in stage.request_stage(_state.flow_metadata):
+                if self._approve(req, _state.policy):
+                    _state.pending.append((req.stage, req.approval_metadata))
+
+            if _state.pending:
+                self._push(heap, _state)
+            else:
+                _results[_state.index] = self._finish(_state)
+
+        logger.scheduler_info(
+            "Pipeline completed",
+            total_steps=step,
+        )
+        return _results
+
+    def _finish(self, state: _SampleState) -> SAXSSample:
+        """Return the final sample, flagged if its budget ran out."""
+        _sample = state.sample
+        if state.tracker is not None:
+            _sample = state.tracker.finalize(_sample)
+        self._record_sample(state.tracker)
+        for _hook in self._hooks:
+            _hook.on_sample_end(_sample, state.steps)
+        return _sample
+
+    def _push(
+        self,
+        heap: list[tuple[float, int, _SampleState]],
+        state: _SampleState,
+    ) -> None:
+        """Rank a sample by the priority of its next stage."""
+        if not state.pending:
+            return
+        _stage, _approval_metadata = state.pending[0]
+        heapq.heappush(
+            heap,
+            (
+                self.priority(
+                    _stage,
+                    state.sample,
+                    state.flow_metadata,
+                    _approval_metadata,
+                ),
+                next(self._sequence),
+                state,
+            ),
+        )
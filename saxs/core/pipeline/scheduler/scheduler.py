@@ -15,8 +15,17 @@ IAbstractScheduler
 BaseScheduler
     Concrete scheduler that executes stages sequentially and manages
     new stage requests according to an insertion policy.
+LeanScheduler
+    Sequential scheduler that chains stages through a precompiled
+    transition table instead of request objects.
+
+Every stage execution and finished sample is counted in the default
+metrics registry (see `saxs.metrics`).
 """
 
+import contextlib
+import copy
+import time
 from abc import ABC, abstractmethod
 from collections import deque
 from typing import TYPE_CHECKING, Any
@@ -24,11 +33,18 @@ from typing import TYPE_CHECKING, Any
 from saxs.logging.logger import get_scheduler_logger
 
 logger = get_scheduler_logger(__name__)
+from saxs.core.pipeline.scheduler.budget import (
+    BudgetTracker,
+    SchedulerBudget,
+)
+from saxs.core.pipeline.scheduler.hooks import IAbstractSchedulerHook
 from saxs.core.pipeline.scheduler.policy.insertion_policy import (
     AlwaysInsertPolicy,
     InsertionPolicy,
 )
+from saxs.core.pipeline.scheduler.transition_table import TransitionTable
 from saxs.core.stage.abstract_stage import IAbstractStage
+from saxs.core.stage.request.abst_request import EvalMetadata
 from saxs.core.types.flow_metadata import FlowMetadata
 from saxs.core.types.metadata import TMetadataKeys, TMetadataSchemaDict
 from saxs.core.types.sample import SAXSSample
@@ -37,12 +53,30 @@ from saxs.core.types.scheduler_metadata import (
     SchedulerMetadata,
 )
 from saxs.core.types.stage_metadata import TAbstractStageMetadata
+from saxs.metrics.registry import DEFAULT_REGISTRY
+from saxs.tracing.tracer import get_active_tracer, sample_trace_id
 
 if TYPE_CHECKING:
     from saxs.core.pipeline.scheduler.abstract_stage_request import (
         StageApprovalRequest,
     )
 
+STAGE_RUNS = DEFAULT_REGISTRY.counter(
+    "saxs_scheduler_stage_runs_total",
+    "Stage executions.",
+    ("stage",),
+)
+STAGE_SECONDS = DEFAULT_REGISTRY.histogram(
+    "saxs_scheduler_stage_seconds",
+    "Wall time of stage executions.",
+    ("stage",),
+)
+SAMPLES = DEFAULT_REGISTRY.counter(
+    "saxs_scheduler_samples_total",
+    "Samples finished, by outcome (complete or partial).",
+    ("outcome",),
+)
+
 
 class IAbstractScheduler(ABC):
     """Abstract base class for all schedulers.
@@ -60,6 +94,10 @@ class IAbstractScheduler(ABC):
         Queue holding pending stages to execute.
     _insertion_policy : InsertionPolicy
         Policy controlling how new stages are added to the queue.
+    _budget : SchedulerBudget | None
+        Per-sample execution limits, unlimited if None.
+    _hooks : list[IAbstractSchedulerHook]
+        Observers of scheduler events.
     """
 
     _metadata: SchedulerMetadata
@@ -68,6 +106,8 @@ class IAbstractScheduler(ABC):
         self,
         init_stages: list[IAbstractStage[Any]] | None = None,
         insertion_policy: InsertionPolicy | None = None,
+        budget: SchedulerBudget | None = None,
+        hooks: list[IAbstractSchedulerHook] | None = None,
     ):
         logger.scheduler_info(
             "Initializing scheduler",
@@ -78,6 +118,172 @@ class IAbstractScheduler(ABC):
         )
         self._queue = deque(init_stages or [])
         self._insertion_policy = insertion_policy or AlwaysInsertPolicy()
+        self._budget = budget
+        self._hooks: list[IAbstractSchedulerHook] = list(hooks or [])
+
+    def add_hook(self, hook: IAbstractSchedulerHook) -> None:
+        """Register an observer of scheduler events."""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: IAbstractSchedulerHook) -> None:
+        """Unregister an observer of scheduler events."""
+        self._hooks.remove(hook)
+
+    def get_hooks(self) -> list[IAbstractSchedulerHook]:
+        """Return the registered observers."""
+        return list(self._hooks)
+
+    def get_budget(self) -> SchedulerBudget | None:
+        """Return the per-sample execution limits, if any."""
+        return self._budget
+
+    def _approve(
+        self,
+        request: "StageApprovalRequest",
+        policy: InsertionPolicy | None = None,
+    ) -> bool:
+        """Apply the insertion policy, notifying the hooks.
+
+        Parameters
+        ----------
+        request : StageApprovalRequest
+            Request to approve.
+        policy : InsertionPolicy | None, optional
+            Policy of the requesting sample (see `_sample_policy`),
+            the scheduler policy if None.
+        """
+        _policy = self._insertion_policy if policy is None else policy
+        _approved = _policy(request)
+        for _hook in self._hooks:
+            if _approved:
+                _hook.on_request(request, _policy)
+            else:
+                _hook.on_reject(request, _policy)
+        return _approved
+
+    def _sample_policy(self) -> InsertionPolicy:
+        """Return a reset copy of the insertion policy for one sample.
+
+        Schedulers interleaving samples keep one copy per sample in
+        flight, so that stateful policies such as
+        `SaturationInsertPolicy` count each sample on its own.
+        """
+        _policy = copy.deepcopy(self._insertion_policy)
+        _policy.reset()
+        return _policy
+
+    def _start_budget(self) -> BudgetTracker | None:
+        """Return the budget tracker of a new sample, if limited."""
+        return self._budget.start() if self._budget is not None else None
+
+    @staticmethod
+    def _record_sample(tracker: BudgetTracker | None) -> None:
+        """Count a finished sample."""
+        SAMPLES.labels(
+            "partial"
+            if tracker is not None and tracker.exhausted is not None
+            else "complete",
+        ).inc()
+
+    def _process_hooked(  # noqa: PLR0913
+        self,
+        tracker: BudgetTracker | None,
+        stage: IAbstractStage[Any],
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+        step: int,
+        queue_depth: int,
+    ) -> tuple[SAXSSample, FlowMetadata]:
+        """Run a stage between the stage hooks of the scheduler.
+
+        The end hooks also run, with the input sample, if the stage
+        raises, so that hooks timing a stage never leak its start.
+        Their errors are then suppressed, the stage error propagates.
+        """
+        hooks = self._hooks
+        if not hooks:
+            return self._process_stage(
+                tracker,
+                stage,
+                sample,
+                flow_metadata,
+                step,
+            )
+
+        for _hook in hooks:
+            _hook.on_stage_start(stage, sample, queue_depth)
+
+        try:
+            _sample, flow_metadata = self._process_stage(
+                tracker,
+                stage,
+                sample,
+                flow_metadata,
+                step,
+            )
+        except BaseException:
+            for _hook in hooks:
+                with contextlib.suppress(Exception):
+                    _hook.on_stage_end(stage, sample)
+            raise
+
+        for _hook in hooks:
+            _hook.on_stage_end(stage, _sample)
+
+        return _sample, flow_metadata
+
+    @staticmethod
+    def _process_stage(
+        tracker: BudgetTracker | None,
+        stage: IAbstractStage[Any],
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+        step: int = 0,
+    ) -> tuple[SAXSSample, FlowMetadata]:
+        """Run a stage, under the sample budget if there is one.
+
+        The execution is counted and timed in the metrics, and
+        recorded as a span when tracing is enabled.
+        """
+        _name = type(stage).__name__
+        _start = time.perf_counter()
+
+        _tracer = get_active_tracer()
+        if _tracer is None:
+            _result = IAbstractScheduler._run_stage(
+                tracker,
+                stage,
+                sample,
+                flow_metadata,
+            )
+        else:
+            with _tracer.span(
+                _name,
+                "stage",
+                sample_id=sample_trace_id(sample),
+                step=step,
+            ):
+                _result = IAbstractScheduler._run_stage(
+                    tracker,
+                    stage,
+                    sample,
+                    flow_metadata,
+                )
+
+        STAGE_SECONDS.labels(_name).observe(time.perf_counter() - _start)
+        STAGE_RUNS.labels(_name).inc()
+        return _result
+
+    @staticmethod
+    def _run_stage(
+        tracker: BudgetTracker | None,
+        stage: IAbstractStage[Any],
+        sample: SAXSSample,
+        flow_metadata: FlowMetadata,
+    ) -> tuple[SAXSSample, FlowMetadata]:
+        if tracker is None:
+            return stage.process(sample=sample, flow_metadata=flow_metadata)
+        return tracker.process(stage, sample, flow_metadata)
 
     @abstractmethod
     def run(
@@ -111,6 +317,41 @@ class IAbstractScheduler(ABC):
         """
         self._queue.extend(initial_stages)
 
+    def run_many(
+        self,
+        init_samples: list[SAXSSample],
+        init_flow_metadata: list[FlowMetadata] | None = None,
+    ) -> list[SAXSSample]:
+        """Run the pipeline on several samples.
+
+        The default implementation runs the samples one after
+        another, re-enqueueing the initial stages for each.
+        Interleaving schedulers override it.
+
+        Parameters
+        ----------
+        init_samples : list of SAXSSample
+            Samples to process.
+        init_flow_metadata : list of FlowMetadata, optional
+            Initial flow metadata per sample, empty if None.
+
+        Returns
+        -------
+        list of SAXSSample
+            Processed samples, in input order.
+        """
+        _initial = list(self._queue)
+        _flows = init_flow_metadata or [
+            FlowMetadata(value={}) for _ in init_samples
+        ]
+
+        _results: list[SAXSSample] = []
+        for _sample, _flow in zip(init_samples, _flows, strict=True):
+            self._queue.clear()
+            self._queue.extend(_initial)
+            _results.append(self.run(_sample, _flow))
+        return _results
+
 
 class BaseScheduler(IAbstractScheduler):
     """Concrete scheduler that executes stages sequentially.
@@ -150,12 +391,19 @@ class BaseScheduler(IAbstractScheduler):
         _flow_metadata = init_flow_metadata
         step = 1
 
+        self._insertion_policy.reset()
+        tracker = self._start_budget()
+        hooks = self._hooks
+
         logger.scheduler_info(
             "Pipeline started",
             queue_size=len(queue),
         )
 
         while queue:
+            if tracker is not None and not tracker.check(_sample):
+                break
+
             stage: IAbstractStage[Any] = queue.popleft()
             stage_name = stage.__class__.__name__
 
@@ -165,11 +413,18 @@ class BaseScheduler(IAbstractScheduler):
             )
 
             # Process stage
-            _sample, _flow_metadata = stage.process(
-                sample=_sample,
-                flow_metadata=_flow_metadata,
+            _sample, _flow_metadata = self._process_hooked(
+                tracker,
+                stage,
+                _sample,
+                _flow_metadata,
+                step,
+                len(queue),
             )
 
+            if tracker is not None and tracker.exhausted is not None:
+                break
+
             logger.scheduler_info(
                 f"{stage_name} completed",
             )
@@ -186,7 +441,7 @@ class BaseScheduler(IAbstractScheduler):
 
             for req in requests:
                 req_stage_name = req.stage.__class__.__name__
-                if self._insertion_policy(req):  # scheduler policy decides
+                if self._approve(req):  # scheduler policy decides
                     queue.append(req.stage)
                     logger.scheduler_info(
                         f"Approved: {req_stage_name}",
@@ -200,6 +455,19 @@ class BaseScheduler(IAbstractScheduler):
 
             step += 1
 
+        if tracker is not None and tracker.exhausted is not None:
+            logger.scheduler_info(
+                "Budget exhausted, sample ends partial",
+                budget=tracker.exhausted.value,
+                dropped_stages=len(queue),
+            )
+            queue.clear()
+            _sample = tracker.finalize(_sample)
+
+        self._record_sample(tracker)
+        for _hook in hooks:
+            _hook.on_sample_end(_sample, step - 1)
+
         logger.scheduler_info(
             "Pipeline completed",
             total_steps=step - 1,
@@ -244,3 +512,150 @@ class BaseScheduler(IAbstractScheduler):
             self._metadata[ESchedulerMetadataDictKeys.PROCESSED] = (
                 processed + 1
             )
+
+
+class LeanScheduler(BaseScheduler):
+    """Sequential scheduler walking a precompiled transition table.
+
+    Executes stages in FIFO order like `BaseScheduler`, but decides
+    which stage follows from a `TransitionTable` compiled with the
+    kernel: each step writes the condition inputs into an
+    `EvalMetadata` reused through the run and evaluates the condition
+    directly, without building request objects or logging per step.
+    The table holds no per-run state, so kernels sharing a compiled
+    pipeline may run it concurrently.
+    Stages unknown to the table are resolved on first use.
+
+    Insertion policies other than `AlwaysInsertPolicy` and
+    registered hooks need the request objects, so they (and
+    `debug=True`) run the `BaseScheduler` loop.
+
+    Parameters
+    ----------
+    init_stages : list of AbstractStage, optional
+        Initial stages.
+    insertion_policy : InsertionPolicy, optional
+        Policy controlling insertion of requested stages.
+    transition_table : TransitionTable, optional
+        Precompiled transitions, typically from the kernel compiler.
+    debug : bool, optional
+        Use the request-object loop of `BaseScheduler`.
+    budget : SchedulerBudget, optional
+        Per-sample execution limits.
+    hooks : list of IAbstractSchedulerHook, optional
+        Observers of scheduler events.
+    """
+
+    def __init__(
+        self,
+        init_stages: list[IAbstractStage[Any]] | None = None,
+        insertion_policy: InsertionPolicy | None = None,
+        transition_table: TransitionTable | None = None,
+        debug: bool = False,
+        budget: SchedulerBudget | None = None,
+        hooks: list[IAbstractSchedulerHook] | None = None,
+    ):
+        super().__init__(init_stages, insertion_policy, budget, hooks)
+        self._transition_table = transition_table or TransitionTable()
+        self.debug = debug
+
+    def set_transition_table(self, transition_table: TransitionTable) -> None:
+        """Use a precompiled transition table."""
+        self._transition_table = transition_table
+
+    def get_transition_table(self) -> TransitionTable:
+        """Return the transition table."""
+        return self._transition_table
+
+    def run(
+        self,
+        init_sample: SAXSSample,
+        init_flow_metadata: FlowMetadata,
+    ) -> SAXSSample:
+        """Execute all stages, chaining through the transition table.
+
+        Parameters
+        ----------
+        init_sample : SAXSSample
+            The initial sample to process.
+
+        Returns
+        -------
+        SAXSSample
+            The final processed sample after all stages complete.
+        """
+        if (
+            self.debug
+            or self._hooks
+            or not isinstance(self._insertion_policy, AlwaysInsertPolicy)
+        ):
+            return super().run(init_sample, init_flow_metadata)
+
+        queue = self._queue
+        table = self._transition_table
+
+        _sample = init_sample
+        _flow_metadata = init_flow_metadata
+        step = 0
+
+        tracker = self._start_budget()
+        # Per run: the table is shared by kernels of one definition
+        _eval_metadata = EvalMetadata(value={})
+
+        logger.scheduler_info(
+            "Pipeline started",
+            queue_size=len(queue),
+        )
+
+        while queue:
+            if tracker is not None and not tracker.check(_sample):
+                break
+
+            stage: IAbstractStage[Any] = queue.popleft()
+
+            step += 1
+            _sample, _flow_metadata = self._process_stage(
+                tracker,
+                stage,
+                _sample,
+                _flow_metadata,
+                step,
+            )
+
+            if tracker is not None and tracker.exhausted is not None:
+                break
+
+            _transition = table.get(stage)
+            if _transition is None:
+                continue
+
+            if _transition.dynamic:
+                queue.extend(
+                    _request.stage
+                    for _request in stage.request_stage(_flow_metadata)
+                )
+                continue
+
+            if (
+                _transition.stage.update_eval_metadata(
+                    _flow_metadata,
+                    _eval_metadata,
+                )
+                and _transition.condition is not None
+                and _transition.next_stage is not None
+                and _transition.condition.evaluate(
+                    eval_metadata=_eval_metadata,
+                )
+            ):
+                queue.append(_transition.next_stage)
+
+        if tracker is not None and tracker.exhausted is not None:
+            queue.clear()
+            _sample = tracker.finalize(_sample)
+
+        self._record_sample(tracker)
+        logger.scheduler_info(
+            "Pipeline completed",
+            total_steps=step,
+        )
+        return _sample
@@ -0,0 +1,290 @@
+"""
+scheduler_stats.py.
+
+This module defines `SchedulerStatsCollector`, a scheduler hook
+recording where the processing time goes:
+
+- wall and CPU time histograms per stage class,
+- the queue depth before every step,
+- approved and rejected requests per insertion policy,
+- the number of steps run per sample, in total and for the most
+  recent samples.
+
+The collected statistics are plain data, exported with `to_dict` or
+`to_json`.
+
+Classes
+--------
+TimeHistogram
+    Histogram of durations over fixed buckets.
+SchedulerStatsCollector
+    Hook collecting scheduler statistics.
+"""
+
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.pipeline.scheduler.hooks import IAbstractSchedulerHook
+
+if TYPE_CHECKING:
+    from saxs.core.pipeline.scheduler.abstract_stage_request import (
+        StageApprovalRequest,
+    )
+    from saxs.core.pipeline.scheduler.policy.insertion_policy import (
+        InsertionPolicy,
+    )
+    from saxs.core.stage.abstract_stage import IAbstractStage
+    from saxs.core.types.sample import SAXSSample
+
+# Upper bucket bounds in seconds, the last bucket is unbounded
+DEFAULT_TIME_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+DEFAULT_MAX_QUEUE_SAMPLES = 10_000
+DEFAULT_MAX_STEP_SAMPLES = 10_000
+
+
+class TimeHistogram:
+    """
+    Histogram of durations over fixed buckets.
+
+    Parameters
+    ----------
+    buckets : tuple[float, ...]
+        Increasing upper bucket bounds in seconds.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_TIME_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a duration."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the histogram as plain data."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "buckets": [
+                {"le": _bound, "count": _count}
+                for _bound, _count in zip(
+                    (*self.buckets, "inf"),
+                    self.counts,
+                    strict=True,
+                )
+            ],
+        }
+
+
+class SchedulerStatsCollector(IAbstractSchedulerHook):
+    """
+    Hook collecting scheduler statistics.
+
+    Thread-safe; one collector can observe several schedulers.
+
+    Parameters
+    ----------
+    buckets : tuple[float, ...], optional
+        Upper bounds of the time histogram buckets in seconds.
+    max_queue_samples : int, optional
+        Number of most recent queue depth samples kept.
+    max_step_samples : int, optional
+        Number of most recent per-sample step counts kept; the
+        sample count, total and maximum cover all samples.
+
+    Examples
+    --------
+    >>> stats = SchedulerStatsCollector()
+    >>> scheduler = BaseScheduler(hooks=[stats])
+    >>> ...
+    >>> stats.to_json("scheduler_stats.json")
+    """
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = DEFAULT_TIME_BUCKETS,
+        max_queue_samples: int = DEFAULT_MAX_QUEUE_SAMPLES,
+        max_step_samples: int = DEFAULT_MAX_STEP_SAMPLES,
+    ):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        # Start times of running stages, per thread
+        self._running: dict[int, tuple[float, float]] = {}
+        self._wall_time: dict[str, TimeHistogram] = {}
+        self._cpu_time: dict[str, TimeHistogram] = {}
+        self._queue_depth: deque[tuple[float, int]] = deque(
+            maxlen=max_queue_samples,
+        )
+        self._policies: dict[str, dict[str, int]] = {}
+        self._steps_per_sample: deque[int] = deque(maxlen=max_step_samples)
+        self._sample_count = 0
+        self._total_steps = 0
+        self._max_steps = 0
+
+    def on_stage_start(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: "SAXSSample",
+        queue_depth: int,
+    ) -> None:
+        """Record the queue depth and start timing the stage."""
+        _ = stage, sample
+        _now = time.perf_counter()
+        with self._lock:
+            self._queue_depth.append((_now - self._origin, queue_depth))
+            self._running[threading.get_ident()] = (
+                _now,
+                time.thread_time(),
+            )
+
+    def on_stage_end(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: "SAXSSample",
+    ) -> None:
+        """Record the wall and CPU time of the stage."""
+        _ = sample
+        _wall, _cpu = time.perf_counter(), time.thread_time()
+        _name = type(stage).__name__
+        with self._lock:
+            _start = self._running.pop(threading.get_ident(), None)
+            if _start is None:
+                return
+            self._histogram(self._wall_time, _name).observe(_wall - _start[0])
+            self._histogram(self._cpu_time, _name).observe(_cpu - _start[1])
+
+    def on_request(
+        self,
+        request: "StageApprovalRequest",
+        policy: "InsertionPolicy",
+    ) -> None:
+        """Count an approved request."""
+        _ = request
+        self._count(policy, "approved")
+
+    def on_reject(
+        self,
+        request: "StageApprovalRequest",
+        policy: "InsertionPolicy",
+    ) -> None:
+        """Count a rejected request."""
+        _ = request
+        self._count(policy, "rejected")
+
+    def on_sample_end(self, sample: "SAXSSample", steps: int) -> None:
+        """Record the steps run on a sample."""
+        _ = sample
+        with self._lock:
+            self._steps_per_sample.append(steps)
+            self._sample_count += 1
+            self._total_steps += steps
+            self._max_steps = max(self._max_steps, steps)
+
+    def reset(self) -> None:
+        """Drop all collected statistics."""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._running.clear()
+            self._wall_time.clear()
+            self._cpu_time.clear()
+            self._queue_depth.clear()
+            self._policies.clear()
+            self._steps_per_sample.clear()
+            self._sample_count = 0
+            self._total_steps = 0
+            self._max_steps = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the collected statistics as plain data.
+
+        Returns
+        -------
+        dict[str, Any]
+            Per-stage wall and CPU time histograms, queue depth
+            samples as `(seconds, depth)` pairs, request decisions
+            per policy and steps per sample, listed for the most
+            recent samples.
+        """
+        with self._lock:
+            return {
+                "stages": {
+                    _name: {
+                        "wall_time": _histogram.to_dict(),
+                        "cpu_time": self._cpu_time[_name].to_dict(),
+                    }
+                    for _name, _histogram in sorted(
+                        self._wall_time.items(),
+                        key=lambda _item: _item[1].total,
+                        reverse=True,
+                    )
+                },
+                "queue_depth": [list(_s) for _s in self._queue_depth],
+                "policies": {
+                    _name: dict(_counts)
+                    for _name, _counts in self._policies.items()
+                },
+                "samples": {
+                    "count": self._sample_count,
+                    "total_steps": self._total_steps,
+                    "max_steps": self._max_steps,
+                    "steps": list(self._steps_per_sample),
+                },
+            }
+
+    def to_json(self, path: str | None = None, indent: int = 2) -> str:
+        """
+        Return the collected statistics as JSON.
+
+        Parameters
+        ----------
+        path : str | None, optional
+            File to also write the JSON to.
+        indent : int, optional
+            JSON indentation.
+
+        Returns
+        -------
+        str
+            JSON document of `to_dict`.
+        """
+        _document = json.dumps(self.to_dict(), indent=indent)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as _file:
+                _file.write(_document)
+        return _document
+
+    def _histogram(
+        self,
+        histograms: dict[str, TimeHistogram],
+        name: str,
+    ) -> TimeHistogram:
+        _histogram = histograms.get(name)
+        if _histogram is None:
+            _histogram = histograms[name] = TimeHistogram(self.buckets)
+        return _histogram
+
+    def _count(self, policy: "InsertionPolicy", decision: str) -> None:
+        _name = type(policy).__name__
+        with self._lock:
+            _counts = self._policies.setdefault(
+                _name,
+                {"approved": 0, "rejected": 0},
+            )
+            _counts[decision] += 1
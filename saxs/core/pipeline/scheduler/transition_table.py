@@ -0,0 +1,152 @@
+"""
+transition_table.py.
+
+This module defines the static transition table of a compiled
+pipeline. For every linked stage the table resolves, once, what the
+stage's chaining policy would do at runtime: which condition decides
+and which stage follows. A scheduler walking the table evaluates the
+condition on its own `EvalMetadata` instead of building
+`StageRequest` and `StageApprovalRequest` objects at each step. The
+table holds no per-run state and can be shared between runs.
+
+Only `SingleStageChainingPolicy` semantics are resolved statically.
+Stages linked to other policies keep a dynamic transition that goes
+through `request_stage`.
+
+Classes
+--------
+Transition
+    Resolved chaining of one stage.
+TransitionTable
+    Transitions of all stages of a compiled pipeline.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.stage.abstract_cond_stage import IAbstractRequestingStage
+from saxs.core.stage.abstract_stage import IAbstractStage
+from saxs.core.stage.policy.single_stage_policy import (
+    SingleStageChainingPolicy,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from saxs.core.pipeline.condition.abstract_condition import (
+        StageCondition,
+    )
+
+
+@dataclass(frozen=True)
+class Transition:
+    """
+    Resolved chaining of one stage.
+
+    Attributes
+    ----------
+    stage : IAbstractRequestingStage
+        Stage the transition starts from.
+    condition : StageCondition | None
+        Condition deciding whether `next_stage` follows; None never
+        passes.
+    next_stage : IAbstractStage | None
+        Stage enqueued when the condition passes.
+    dynamic : bool
+        The policy is not resolved statically; the scheduler must
+        call `stage.request_stage`.
+    """
+
+    stage: IAbstractRequestingStage[Any]
+    condition: "StageCondition | None" = None
+    next_stage: IAbstractStage[Any] | None = None
+    dynamic: bool = False
+
+
+class TransitionTable:
+    """
+    Transitions of all stages of a compiled pipeline.
+
+    Stages that never request another stage have no entry. The
+    table is keyed by stage identity, since the same stage instance
+    is enqueued again on every loop through it.
+    """
+
+    def __init__(self):
+        # Stage id -> (stage, transition); the stage keeps its id live
+        self._transitions: dict[
+            int,
+            tuple[IAbstractStage[Any], Transition | None],
+        ] = {}
+
+    @classmethod
+    def compile(
+        cls,
+        stages: "Iterable[IAbstractStage[Any]]",
+    ) -> "TransitionTable":
+        """
+        Resolve the transitions of linked stage instances.
+
+        Parameters
+        ----------
+        stages : Iterable[IAbstractStage]
+            Linked stage instances.
+
+        Returns
+        -------
+        TransitionTable
+            The resolved table.
+        """
+        _table = cls()
+        for _stage in stages:
+            _table.add(_stage)
+        return _table
+
+    @staticmethod
+    def resolve(stage: IAbstractStage[Any]) -> Transition | None:
+        """
+        Resolve the transition of a single stage.
+
+        Mirrors `IAbstractRequestingStage.request_stage`: a missing
+        policy falls back to `default_policy()`.
+        """
+        if not isinstance(stage, IAbstractRequestingStage):
+            return None
+
+        if stage.policy is None:
+            stage.policy = stage.default_policy()
+
+        _policy = stage.policy
+        if not _policy:
+            return None
+
+        if type(_policy).request is not SingleStageChainingPolicy.request:
+            return Transition(stage=stage, dynamic=True)
+
+        return Transition(
+            stage=stage,
+            condition=_policy.condition or None,
+            next_stage=(
+                _policy.pending_stages[0] if _policy.pending_stages else None
+            ),
+        )
+
+    def add(self, stage: IAbstractStage[Any]) -> Transition | None:
+        """Resolve and store the transition of a stage."""
+        _transition = self.resolve(stage)
+        self._transitions[id(stage)] = (stage, _transition)
+        return _transition
+
+    def get(self, stage: IAbstractStage[Any]) -> Transition | None:
+        """Return the transition of a stage, resolving it if unseen."""
+        _entry = self._transitions.get(id(stage))
+        if _entry is None:
+            return self.add(stage)
+        return _entry[1]
+
+    def __len__(self) -> int:
+        """Return the number of stages with a transition."""
+        return sum(
+            _transition is not None
+            for _, _transition in self._transitions.values()
+        )
@@ -30,6 +30,7 @@ from saxs.core.stage.policy.abstract_chaining_policy import (
     IAbstractChainingPolicy,
 )
 from saxs.core.stage.request.abst_request import (
+   EvalMetadata,
    IAbstractStageRequest,
 )
 from saxs.core.types.flow_metadata import FlowMetadata
@@ -94,6 +95,34 @@ class IAbstractRequestingStage(
 
         return self.policy.request(_request)
 
+    def update_eval_metadata(
+        self,
+        metadata: FlowMetadata,
+        eval_metadata: EvalMetadata,
+    ) -> bool:
+        """
+        Write the condition inputs of a request into `eval_metadata`.
+
+        Used by schedulers walking a precompiled transition table
+        instead of calling `request_stage`. Must apply the same flow
+        metadata side effects as `create_request`. The default
+        implementation delegates to `create_request`; subclasses
+        may override it to avoid building request objects.
+
+        Returns
+        -------
+            bool: False if no request is made.
+        """
+        _request = self.create_request(metadata)
+
+        if not _request:
+            return False
+
+        _values = eval_metadata.unwrap()
+        _values.clear()
+        _values.update(_request.condition_eval_metadata.unwrap())
+        return True
+
     def default_policy(
         self,
     ) -> IAbstractChainingPolicy | None:
@@ -15,7 +15,7 @@ Classes:
 """
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, TypeVar
 
 from saxs.core.types.flow_metadata import FlowMetadata
 from saxs.core.types.sample import SAXSSample
@@ -46,8 +46,16 @@ class IAbstractStage(ABC, Generic[TStageMetadata]):
     ----------
         metadata (AbstractStageMetadata): Metadata specific to this
         stage.
+        inplace (bool): Whether the stage writes its results into
+        the arrays owned by the incoming sample instead of
+        allocating new ones. Such stages obtain the arrays they
+        overwrite with `SAXSSample.get_writable`, which copies
+        arrays of the caller once; other stages never modify the
+        arrays they receive.
     """
 
+    inplace: ClassVar[bool] = False
+
     def __init__(
         self,
         metadata: TStageMetadata,
@@ -0,0 +1,185 @@
+"""
+Module: fused_stage.
+
+Array-level stages and their fusion into a single stage.
+
+Linear preprocessing chains (e.g. cut -> filter -> background) pass
+the same three arrays from stage to stage. Run one by one, every
+stage wraps its outputs back into the sample, walks the scheduler
+queue and logs full-array statistics. A `FusedStage` runs such a
+chain as one stage: the arrays are extracted once, each member
+transforms them through `process_arrays`, and the sample is updated
+once at the end, without per-member queue round trips or logging.
+Members compute into the buffers their own computation allocates
+(e.g. the background model evaluation receives the subtraction), or
+into the incoming arrays when the sample owns them and the member
+is `inplace`, so the chain creates no further intermediate arrays.
+
+Classes
+-------
+SampleArrays
+    Arrays and metadata threaded through a fused chain.
+IAbstractFusableStage
+    Stage exposing an array-level processing entry point.
+FusedStage
+    Stage running a chain of fusable stages in a single pass.
+"""
+
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+from saxs.core.stage.abstract_stage import IAbstractStage, TStageMetadata
+from saxs.core.types.sample import ESAXSSampleKeys, SAXSSample
+from saxs.logging.logger import get_stage_logger
+
+logger = get_stage_logger(__name__)
+
+
+@dataclass(frozen=True)
+class SampleArrays:
+    """
+    Arrays and metadata threaded through a fused chain.
+
+    Attributes
+    ----------
+    q_values : NDArray[np.float64]
+        Scattering vector values.
+    intensity : NDArray[np.float64]
+        Intensity values.
+    intensity_error : NDArray[np.float64]
+        Intensity errors.
+    metadata : dict[str, Any]
+        Read-only view of the sample metadata.
+    owned : frozenset[ESAXSSampleKeys]
+        Keys of the arrays owned by the sample, which `inplace`
+        stages may overwrite (see `SAXSSample.set_owned`).
+    """
+
+    q_values: NDArray[np.float64]
+    intensity: NDArray[np.float64]
+    intensity_error: NDArray[np.float64]
+    metadata: dict[str, Any]
+    owned: frozenset[ESAXSSampleKeys] = frozenset()
+
+    @classmethod
+    def from_sample(cls, sample: SAXSSample) -> "SampleArrays":
+        """Extract the arrays and metadata of a sample."""
+        return cls(
+            q_values=sample[ESAXSSampleKeys.Q_VALUES],
+            intensity=sample[ESAXSSampleKeys.INTENSITY],
+            intensity_error=sample[ESAXSSampleKeys.INTENSITY_ERROR],
+            metadata=sample.get_metadata().unwrap(),
+            owned=frozenset(
+                _key for _key in SAXSSample.ARRAY_KEYS if sample.is_owned(_key)
+            ),
+        )
+
+    def to_sample(self, sample: SAXSSample) -> SAXSSample:
+        """Write the arrays and their ownership back into a sample."""
+        for _key, _array in (
+            (ESAXSSampleKeys.Q_VALUES, self.q_values),
+            (ESAXSSampleKeys.INTENSITY, self.intensity),
+            (ESAXSSampleKeys.INTENSITY_ERROR, self.intensity_error),
+        ):
+            if _key in self.owned:
+                sample.set_owned(_key, _array)
+            else:
+                sample[_key] = _array
+        return sample
+
+
+class IAbstractFusableStage(IAbstractStage[TStageMetadata]):
+    """
+    Stage exposing an array-level processing entry point.
+
+    `process_arrays` must compute exactly what `_process` stores in
+    the sample, without logging. It must not modify arrays missing
+    from `SampleArrays.owned`, which may be the caller's data; an
+    `inplace` stage may overwrite owned ones, and adds the arrays it
+    allocates to `owned`.
+    """
+
+    @abstractmethod
+    def process_arrays(
+        self,
+        arrays: SampleArrays,
+    ) -> SampleArrays:
+        """
+        Transform the sample arrays.
+
+        Parameters
+        ----------
+        arrays : SampleArrays
+            Input arrays.
+
+        Returns
+        -------
+        SampleArrays
+            Output arrays.
+        """
+        raise NotImplementedError
+
+
+class FusedStage(IAbstractStage[Any]):
+    """
+    Stage running a chain of fusable stages in a single pass.
+
+    Parameters
+    ----------
+    stages : list[IAbstractFusableStage]
+        Member stages in execution order.
+    stage_ids : list[str] | None, optional
+        Ids of the members, for logging and inspection.
+    """
+
+    # Members may write into the arrays of the sample
+    inplace: ClassVar[bool] = True
+
+    def __init__(
+        self,
+        stages: list[IAbstractFusableStage[Any]],
+        stage_ids: list[str] | None = None,
+    ):
+        super().__init__(metadata=None)
+        self.stages = stages
+        self.stage_ids = stage_ids or [type(_s).__name__ for _s in stages]
+
+    @staticmethod
+    def is_fusable(stage: IAbstractStage[Any]) -> bool:
+        """
+        Return whether a stage can run inside a fused chain.
+
+        The stage must implement `process_arrays` and keep the
+        default flow-metadata hooks and stage requests, since the
+        fused stage does not call them per member.
+        """
+        if not isinstance(stage, IAbstractFusableStage):
+            return False
+
+        _cls = type(stage)
+        return (
+            _cls._prehandle_flow_metadata  # noqa: SLF001
+            is IAbstractStage._prehandle_flow_metadata  # noqa: SLF001
+            and _cls._posthandle_flow_metadata  # noqa: SLF001
+            is IAbstractStage._posthandle_flow_metadata  # noqa: SLF001
+            and _cls.request_stage is IAbstractStage.request_stage
+        )
+
+    def _process(self, sample: SAXSSample) -> SAXSSample:
+        _arrays = SampleArrays.from_sample(sample)
+
+        for _stage in self.stages:
+            _arrays = _stage.process_arrays(_arrays)
+
+        logger.stage_info(
+            "FusedStage",
+            "Fused chain complete",
+            stages="+".join(self.stage_ids),
+            remaining_points=len(_arrays.q_values),
+        )
+
+        return _arrays.to_sample(sample)
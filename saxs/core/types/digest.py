@@ -0,0 +1,207 @@
+"""
+Module: digest.
+
+Canonical content hashing of pipeline values.
+
+`update_digest` feeds a canonical byte representation of a value
+into a `hashlib` digest, so that equal content gives equal keys
+across processes. It understands scalars, NumPy arrays and
+scalars, containers, enums, classes, data wrappers
+(`TBaseDataType`), modules (by name and version), functions,
+`functools.partial` objects and objects exposing a `cache_key`
+attribute or method. A function is hashed by its bytecode, its
+constants (recursively into nested code objects), its defaults,
+its closure contents and the values of the globals it reads. Any
+other value raises `ContentIdentityError` so that callers never key
+on an identity they cannot reproduce.
+
+Classes
+-------
+ContentIdentityError
+    Raised when a value has no reproducible content identity.
+
+Functions
+---------
+update_digest
+    Feed the canonical representation of a value into a digest.
+"""
+
+import functools
+from enum import Enum
+from types import CodeType, FunctionType, MethodType, ModuleType
+from typing import Any
+
+import numpy as np
+
+from saxs.core.types.abstract_data import TBaseDataType
+
+
+class ContentIdentityError(TypeError):
+    """Raised when a value has no reproducible content identity."""
+
+
+def update_digest(digest: Any, value: Any) -> None:  # noqa: ANN401
+    """
+    Feed a canonical byte representation of `value` into `digest`.
+
+    Parameters
+    ----------
+    digest : Any
+        A `hashlib` hash object.
+    value : Any
+        Value to hash.
+
+    Raises
+    ------
+    ContentIdentityError
+        If the value, or a value it refers to, has no canonical
+        representation.
+    """
+    _update(digest, value, set())
+
+
+def _update_leaf(digest: Any, value: Any) -> bool:  # noqa: ANN401
+    """Hash a value that refers to no other value, if it is one."""
+    if value is None or isinstance(value, (bool, int, float, complex, str)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, bytes):
+        digest.update(f"bytes:{len(value)};".encode())
+        digest.update(value)
+    elif value is Ellipsis:
+        digest.update(b"ellipsis;")
+    elif isinstance(value, Enum):
+        digest.update(f"{type(value).__qualname__}.{value.name};".encode())
+    elif isinstance(value, np.generic):
+        digest.update(f"{value.dtype}:{value.item()!r};".encode())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"nd:{value.dtype}:{value.shape};".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, type):
+        digest.update(f"cls:{value.__module__}.{value.__qualname__};".encode())
+    elif isinstance(value, ModuleType):
+        _version = getattr(value, "__version__", "")
+        digest.update(f"module:{value.__name__}:{_version};".encode())
+    else:
+        return False
+    return True
+
+
+def _update(  # noqa: C901, PLR0912
+    digest: Any,  # noqa: ANN401
+    value: Any,  # noqa: ANN401
+    seen: set[int],
+) -> None:
+    if _update_leaf(digest, value):
+        return
+
+    if isinstance(value, (tuple, list)):
+        digest.update(f"{type(value).__name__}:{len(value)}(".encode())
+        for _item in value:
+            _update(digest, _item, seen)
+        digest.update(b")")
+    elif isinstance(value, (set, frozenset)):
+        digest.update(f"set:{len(value)}(".encode())
+        for _item in sorted(value, key=repr):
+            _update(digest, _item, seen)
+        digest.update(b")")
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}(".encode())
+        for _key in sorted(value, key=repr):
+            _update(digest, _key, seen)
+            _update(digest, value[_key], seen)
+        digest.update(b")")
+    elif hasattr(value, "cache_key"):
+        _key = value.cache_key
+        _update(digest, _key() if callable(_key) else _key, seen)
+    elif isinstance(value, TBaseDataType):
+        digest.update(f"data:{type(value).__qualname__}(".encode())
+        _update(digest, value.unwrap(), seen)
+        digest.update(b")")
+    elif isinstance(value, functools.partial):
+        digest.update(b"partial(")
+        _update(digest, value.func, seen)
+        _update(digest, value.args, seen)
+        _update(digest, value.keywords, seen)
+        digest.update(b")")
+    elif isinstance(value, FunctionType):
+        _update_function(digest, value, seen)
+    elif isinstance(value, MethodType):
+        digest.update(b"method(")
+        _update(digest, value.__func__, seen)
+        _update(digest, value.__self__, seen)
+        digest.update(b")")
+    else:
+        msg = f"Cannot derive a content identity for {type(value)}."
+        raise ContentIdentityError(msg)
+
+
+def _update_function(
+    digest: Any,  # noqa: ANN401
+    func: FunctionType,
+    seen: set[int],
+) -> None:
+    """
+    Hash a function by its code and everything the code refers to.
+
+    The code object is hashed with its constants, recursively into
+    nested code objects (lambdas, comprehensions), and with its
+    names. Defaults, closure cells and the referenced globals are
+    hashed by value, so two functions differing only in a constant,
+    a default or a module-level parameter get different keys. A
+    function already being hashed, e.g. a recursive one, is
+    referenced by name.
+    """
+    digest.update(f"fn:{func.__module__}.{func.__qualname__}".encode())
+    if id(func) in seen:
+        digest.update(b":ref;")
+        return
+    digest.update(b"(")
+    seen.add(id(func))
+
+    _names = _update_code(digest, func.__code__)
+    _update(digest, func.__defaults__, seen)
+    _update(digest, func.__kwdefaults__, seen)
+
+    for _cell in func.__closure__ or ():
+        try:
+            _contents = _cell.cell_contents
+        except ValueError:
+            msg = f"Closure of {func.__qualname__} has an empty cell."
+            raise ContentIdentityError(msg) from None
+        _update(digest, _contents, seen)
+
+    # Globals read by the code, in a stable order; attribute names
+    # and builtins are not in the module namespace and are skipped
+    _globals = func.__globals__
+    for _name in sorted(_names):
+        if _name in _globals:
+            _update(digest, _name, seen)
+            _update(digest, _globals[_name], seen)
+
+    seen.discard(id(func))
+    digest.update(b")")
+
+
+def _update_code(digest: Any, code: CodeType) -> set[str]:  # noqa: ANN401
+    """
+    Hash a code object and its nested code objects.
+
+    Returns
+    -------
+    set[str]
+        Names referenced by the code and its nested code objects.
+    """
+    digest.update(f"code:{code.co_argcount}:{code.co_flags};".encode())
+    digest.update(code.co_code)
+    _update(digest, code.co_varnames, set())
+    _update(digest, code.co_names, set())
+
+    _names = set(code.co_names)
+    digest.update(f"consts:{len(code.co_consts)}(".encode())
+    for _const in code.co_consts:
+        if isinstance(_const, CodeType):
+            _names |= _update_code(digest, _const)
+        else:
+            _update(digest, _const, set())
+    digest.update(b")")
+    return _names
@@ -24,7 +24,7 @@ class FlowMetadataDict(MetadataSchemaDict, total=False):
     """
 
     sample: str
-    processed_peaks: dict[int, np.float64]
+    processed_peaks: set[int]
     unprocessed_peaks: dict[int, np.float64] | ERuntimeConstants
     current: dict[int, np.float64] | ERuntimeConstants  # simplify
 
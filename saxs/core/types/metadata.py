@@ -8,7 +8,17 @@ container.
 """
 
 from enum import Enum
-from typing import Any, Generic, TypedDict, TypeVar, get_type_hints
+from types import UnionType
+from typing import (
+    Any,
+    Generic,
+    TypedDict,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 
 from saxs.core.types.abstract_data import TBaseDataType
 
@@ -27,6 +37,26 @@ TMetadataSchemaDict = TypeVar("TMetadataSchemaDict", bound=MetadataSchemaDict)
 TMetadataKeys = TypeVar("TMetadataKeys", bound=EMetadataSchemaKeys)
 
 
+def _runtime_types(expected_type: Any) -> tuple[type, ...]:
+    """
+    Return the classes a value of an annotated type is checked against.
+
+    Unions are split into their members and parameterized generics
+    such as `dict[int, float]` reduced to their origin (`dict`),
+    since `isinstance` accepts neither. An empty tuple means the
+    type is not checked (`Any`, type variables, literals).
+    """
+    if get_origin(expected_type) in {Union, UnionType}:
+        _members = [_runtime_types(_m) for _m in get_args(expected_type)]
+        if not all(_members):
+            return ()
+        return tuple(_type for _types in _members for _type in _types)
+    _origin = get_origin(expected_type) or expected_type
+    if _origin is Any or not isinstance(_origin, type):
+        return ()
+    return (_origin,)
+
+
 class Metadata(type):
     """Define metadata metaclass."""
 
@@ -171,13 +201,15 @@ class TAbstractMetadata(
         # --- Runtime type safety ---
         expected_type = hints.get(key.value)
 
-        if expected_type is not None and not isinstance(
-            _value,
-            expected_type.__origin__
-            if hasattr(expected_type, "__origin__")
-            else expected_type,
-        ):
-            msg = f"Invalid type for '{key}': expected {expected_type}, got {type(_value)}"
+        _types = (
+            _runtime_types(expected_type) if expected_type is not None else ()
+        )
+
+        if _types and not isinstance(value, _types):
+            msg = (
+                f"Invalid type for '{key}': expected {expected_type}, "
+                f"got {type(value)}"
+            )
             raise TypeError(msg)
 
         try:
@@ -115,9 +115,20 @@ class SAXSSample(TBaseDataType[SAXSSampleDict]):
     - Only array-like keys (q_values, intensity, intensity_err) are
       directly gettable and settable using the dict-like interface.
     - Metadata must be accessed via the 'metadata' key.
+    - Arrays are owned by the caller unless stored with
+      `set_owned`, e.g. the fresh result of a stage. Stages
+      declaring `inplace` overwrite owned arrays only, and obtain
+      them with `get_writable`, which copies a caller array once.
     """
 
     Keys: type[ESAXSSampleKeys] = ESAXSSampleKeys
+    ARRAY_KEYS: tuple[ESAXSSampleKeys, ...] = (
+        ESAXSSampleKeys.Q_VALUES,
+        ESAXSSampleKeys.INTENSITY,
+        ESAXSSampleKeys.INTENSITY_ERROR,
+    )
+    # Keys of the arrays owned by the sample, see `set_owned`
+    _owned: frozenset[ESAXSSampleKeys] = frozenset()
 
     def __getitem__(
         self,
@@ -155,6 +166,51 @@ class SAXSSample(TBaseDataType[SAXSSampleDict]):
             msg = f"Invalid SAXSSample key: {key}. Only array like keys \
                     supported"
             raise KeyError(msg)
+        self._owned = self._owned - {key}
+
+    def set_owned(
+        self,
+        key: ESAXSSampleKeys,
+        _value: NDArray[np.float64],
+    ) -> None:
+        """Store an array owned by the sample.
+
+        In-place stages may overwrite an owned array, so it must not
+        be referenced outside of the sample.
+
+        Parameters
+        ----------
+        key : ESAXSSampleKeys
+            Array key.
+        _value : NDArray[np.float64]
+            Array handed over to the sample.
+        """
+        self[key] = _value
+        self._owned = self._owned | {key}
+
+    def is_owned(self, key: ESAXSSampleKeys) -> bool:
+        """Return whether the array under `key` is owned by the sample."""
+        return key in self._owned
+
+    def get_writable(self, key: ESAXSSampleKeys) -> NDArray[np.float64]:
+        """Return an array of the sample that may be written in place.
+
+        An array the sample does not own, e.g. one of the caller, is
+        copied once and the copy, owned by the sample, replaces it.
+
+        Parameters
+        ----------
+        key : ESAXSSampleKeys
+            Array key.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            Owned array stored under `key`.
+        """
+        if key not in self._owned:
+            self.set_owned(key, np.array(self[key]))
+        return self[key]
 
     def get_metadata(self) -> SampleMetadata:
         """Getter for metadata."""
@@ -78,6 +78,13 @@ class ESampleMetadataKeys(EMetadataSchemaKeys):
     UNPROCESSED = FlowMetadataKeys.UNPROCESSED.value
     PROCESSED = FlowMetadataKeys.PROCESSED.value
     CURRENT = "current_peak"
+    SERIES = "series"
+    PEAK_VISITS = "peak_visits"
+    PRIORITY = "priority"
+    DEADLINE = "deadline"
+    PARTIAL = "partial"
+    BUDGET_EXHAUSTED = "budget_exhausted"
+    SAMPLE_ID = "sample_id"
 
 
 class SampleMetadataDict(MetadataSchemaDict):
@@ -85,6 +92,13 @@ class SampleMetadataDict(MetadataSchemaDict):
 
     current_peak: np.int64 | ERuntimeConstants
     unprocessed_peaks: list[np.int64]
+    series: str
+    peak_visits: dict[int, int]
+    priority: float
+    deadline: float
+    partial: bool
+    budget_exhausted: str
+    sample_id: str
 
 
 @dataclass(frozen=False)
@@ -13,6 +13,13 @@ Features
 - Multiple log levels with distinct styling
 - Performance tracking support
 - Modular logger factory pattern
+- Lazy context fields, evaluated only when the level is enabled
+- Optional asynchronous mode: records are formatted and written by
+  a background thread, fed through a bounded queue
+- Per-sample capture: inside a `sample_log_context`, stage and
+  scheduler calls are buffered and written only if the sample fails
+- Structured records: component calls keep their fields as a
+  `LogEvent`, so sinks (see `structured`) can write them unformatted
 
 Classes
 -------
@@ -22,6 +29,14 @@ LogIcons
     Unicode icons for different log levels and components.
 LogFormatter
     Custom formatter with color support and visual enhancements.
+LazyField
+    Log context value computed only when the message is emitted.
+LogEvent
+    Message of a component call, formatted on demand.
+ELogQueueOverflow
+    Behavior of the asynchronous mode when its queue is full.
+QueuedLogHandler
+    Handler passing records to the background writer.
 ComponentLogger
     Enhanced logger class with component-specific formatting.
 LoggerFactory
@@ -29,15 +44,39 @@ LoggerFactory
 
 Functions
 ---------
+lazy(func: Callable[..., Any], *args: Any) -> LazyField
+    Defer a log context value to emission time.
+lazy_range(values: Any, spec: str = ".4f") -> LazyField
+    Defer the "[min, max]" summary of an array.
 get_logger(name: str, component: str = "default") -> logging.Logger
     Returns a configured component-specific logger instance.
-setup_logging(level: int = logging.INFO, enable_colors: bool = True) -> None
+setup_logging(level: int = logging.INFO, enable_colors: bool = True,
+              async_mode: bool = False, ...) -> None
     Configure global logging settings.
 """
 
+import atexit
 import logging
+import queue
 import sys
-from typing import Any, ClassVar
+import threading
+from collections.abc import Callable
+from contextvars import ContextVar
+from enum import Enum
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from saxs.logging.sample_context import SampleLogBuffer
+
+DEFAULT_LOG_QUEUE_SIZE = 10_000
+
+# Buffer of the enclosing `sample_log_context`, if any
+SAMPLE_LOG_BUFFER: ContextVar["SampleLogBuffer | None"] = ContextVar(
+    "sample_log_buffer",
+    default=None,
+)
 
 
 class LogColors:
@@ -294,6 +333,242 @@ class LogFormatter(logging.Formatter):
         )
 
 
+class LazyField:
+    """Log context value computed only when the message is emitted.
+
+    The component logging methods evaluate lazy fields after checking
+    the log level, so expensive summaries (array ranges, formatted
+    peak lists) cost nothing while the level is disabled.
+
+    Parameters
+    ----------
+    func : Callable[..., Any]
+        Function computing the value.
+    *args : Any
+        Arguments of `func`.
+    """
+
+    __slots__ = ("args", "func")
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+
+    def evaluate(self) -> Any:  # noqa: ANN401
+        """Compute the value."""
+        return self.func(*self.args)
+
+    def snapshot(self) -> "LazyField":
+        """Return the field detached from the arrays it reads.
+
+        A field kept past its call, e.g. by a sample log buffer,
+        would otherwise see arrays overwritten by in-place stages.
+        Array arguments are copied.
+        """
+        return LazyField(
+            self.func,
+            *(
+                np.array(_arg) if isinstance(_arg, np.ndarray) else _arg
+                for _arg in self.args
+            ),
+        )
+
+    def __str__(self) -> str:
+        return str(self.evaluate())
+
+
+class _LazyRange(LazyField):
+    """Deferred "[min, max]" summary, snapshotted as its bounds."""
+
+    __slots__ = ()
+
+    def snapshot(self) -> LazyField:
+        """Return the field with the bounds computed now."""
+        _values, _spec = self.args
+        return LazyField(_format_bounds, *_bounds(_values), _spec)
+
+
+def lazy(func: Callable[..., Any], *args: Any) -> LazyField:
+    """Defer a log context value to emission time.
+
+    Parameters
+    ----------
+    func : Callable[..., Any]
+        Function computing the value, e.g. `"{:.4f}".format`.
+    *args : Any
+        Arguments of `func`.
+
+    Returns
+    -------
+    LazyField
+        Deferred value.
+
+    Examples
+    --------
+    >>> logger.stage_info("Stage", "Done", peak_q=lazy("{:.4f}".format, q))
+    """
+    return LazyField(func, *args)
+
+
+def _bounds(values: Any) -> tuple[Any, Any]:  # noqa: ANN401
+    if hasattr(values, "min"):
+        return values.min(), values.max()
+    return min(values), max(values)
+
+
+def _format_bounds(low: Any, high: Any, spec: str) -> str:  # noqa: ANN401
+    return f"[{low:{spec}}, {high:{spec}}]"
+
+
+def _format_range(values: Any, spec: str) -> str:  # noqa: ANN401
+    return _format_bounds(*_bounds(values), spec)
+
+
+def lazy_range(values: Any, spec: str = ".4f") -> LazyField:  # noqa: ANN401
+    """Defer the "[min, max]" summary of an array.
+
+    Parameters
+    ----------
+    values : Any
+        Array or sequence of numbers.
+    spec : str, optional
+        Format spec of the bounds (default: ".4f").
+
+    Returns
+    -------
+    LazyField
+        Deferred range string.
+    """
+    return _LazyRange(_format_range, values, spec)
+
+
+def _context(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Evaluate the lazy fields of log context."""
+    return {
+        _key: _value.evaluate() if isinstance(_value, LazyField) else _value
+        for _key, _value in kwargs.items()
+    }
+
+
+class LogEvent:
+    """Message of a component call, formatted on demand.
+
+    The component logging methods pass a `LogEvent` as the record
+    message. Text handlers format it through `str`; structured sinks
+    read its fields directly.
+
+    Parameters
+    ----------
+    kind : str
+        "stage", "scheduler", "pipeline" or "kernel".
+    args : tuple[Any, ...]
+        Positional arguments of the call, see
+        `ComponentLogger.format_call`.
+    fields : dict[str, Any]
+        Context fields of the call, possibly lazy.
+    """
+
+    __slots__ = ("args", "fields", "kind")
+
+    def __init__(
+        self,
+        kind: str,
+        args: tuple[Any, ...],
+        fields: dict[str, Any],
+    ):
+        self.kind = kind
+        self.args = args
+        self.fields = fields
+
+    def freeze(self) -> "LogEvent":
+        """Return the event with its lazy fields evaluated."""
+        return LogEvent(self.kind, self.args, _context(self.fields))
+
+    def __str__(self) -> str:
+        return ComponentLogger.format_call(self.kind, self.args, self.fields)
+
+
+class ELogQueueOverflow(Enum):
+    """Behavior of the asynchronous mode when its queue is full."""
+
+    DROP = "drop"
+    BLOCK = "block"
+
+
+class _AsyncLogWriter:
+    """Background thread writing queued records to their handlers.
+
+    Parameters
+    ----------
+    queue_size : int
+        Maximum number of pending records.
+    overflow : ELogQueueOverflow
+        Drop new records or block the caller when the queue is full.
+    """
+
+    def __init__(self, queue_size: int, overflow: ELogQueueOverflow):
+        self.queue: queue.Queue[
+            tuple[logging.Handler, logging.LogRecord] | None
+        ] = queue.Queue(maxsize=queue_size)
+        self.overflow = overflow
+        self.dropped = 0
+        self._thread = threading.Thread(
+            target=self._run,
+            name="saxs-log-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def put(self, target: logging.Handler, record: logging.LogRecord) -> None:
+        """Queue a record for `target`."""
+        if self.overflow is ELogQueueOverflow.BLOCK:
+            self.queue.put((target, record))
+            return
+        try:
+            self.queue.put_nowait((target, record))
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self) -> None:
+        """Write the pending records and stop the thread."""
+        self.queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while (_item := self.queue.get()) is not None:
+            _target, _record = _item
+            _target.handle(_record)
+
+
+class QueuedLogHandler(logging.Handler):
+    """Handler passing records to the background writer.
+
+    Formatting and writing happen on the writer thread, in `target`.
+
+    Parameters
+    ----------
+    writer : _AsyncLogWriter
+        Background writer.
+    target : logging.Handler
+        Handler formatting and writing the records.
+    """
+
+    def __init__(self, writer: _AsyncLogWriter, target: logging.Handler):
+        super().__init__()
+        self.writer = writer
+        self.target = target
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue the record."""
+        # Freeze the message, its arguments may change after the call
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        elif isinstance(record.msg, LogEvent):
+            record.msg = record.msg.freeze()
+        self.writer.put(self.target, record)
+
+
 class ComponentLogger(logging.Logger):
     """Enhanced logger class with component-specific formatting.
 
@@ -326,6 +601,16 @@ class ComponentLogger(logging.Logger):
         super().__init__(name, level)
         self.component = component
 
+    def makeRecord(  # noqa: N802
+        self,
+        *args: Any,
+        **kwargs: Any,
+    ) -> logging.LogRecord:
+        """Create a record tagged with the component of the logger."""
+        record = super().makeRecord(*args, **kwargs)
+        record.component = self.component
+        return record
+
     def separator(self, char: str = "=", length: int = 80) -> None:
         """Log a visual separator line.
 
@@ -419,12 +704,16 @@ class ComponentLogger(logging.Logger):
         action : str
             Action being performed.
         **kwargs : Any
-            Additional context information.
+            Additional context information; `LazyField` values are
+            evaluated only if INFO is enabled.
         """
-        msg = f"[{stage_name}] {action} \n|"
-        if kwargs:
-            msg += "|".join(f"  {k}={v} \n" for k, v in kwargs.items())
-        self.info(msg)
+        _buffer = SAMPLE_LOG_BUFFER.get()
+        if _buffer is not None:
+            _buffer.append(self, "stage", (stage_name, action), kwargs)
+            return
+        if not self.isEnabledFor(logging.INFO):
+            return
+        self.info(LogEvent("stage", (stage_name, action), kwargs))
 
     def scheduler_info(
         self,
@@ -441,15 +730,60 @@ class ComponentLogger(logging.Logger):
         queue_size : int, optional
             Current queue size.
         **kwargs : Any
-            Additional context information.
+            Additional context information; `LazyField` values are
+            evaluated only if INFO is enabled.
         """
+        _buffer = SAMPLE_LOG_BUFFER.get()
+        if _buffer is not None:
+            _buffer.append(self, "scheduler", (action, queue_size), kwargs)
+            return
+        if not self.isEnabledFor(logging.INFO):
+            return
+        self.info(LogEvent("scheduler", (action, queue_size), kwargs))
+
+    @staticmethod
+    def format_call(
+        kind: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> str:
+        """Build the message of a component call.
+
+        Parameters
+        ----------
+        kind : str
+            "stage", "scheduler", "pipeline" or "kernel".
+        args : tuple[Any, ...]
+            Positional arguments of the call: `(stage_name, action)`
+            for stages, `(action, queue_size)` for schedulers and
+            `(action,)` otherwise.
+        kwargs : dict[str, Any]
+            Context fields of the call.
+
+        Returns
+        -------
+        str
+            Log message.
+        """
+        if kind == "stage":
+            stage_name, action = args
+            msg = f"[{stage_name}] {action} \n|"
+            if kwargs:
+                msg += "|".join(
+                    f"  {k}={v} \n" for k, v in _context(kwargs).items()
+                )
+            return msg
+
+        action, queue_size = (*args, None)[:2]
         msg = action
         if queue_size is not None:
             msg += f" | Queue: {queue_size}"
         if kwargs:
-            context = " | ".join(f"{k}={v}" for k, v in kwargs.items())
+            context = " | ".join(
+                f"{k}={v}" for k, v in _context(kwargs).items()
+            )
             msg += f" | {context}"
-        self.info(msg)
+        return msg
 
     def pipeline_info(self, action: str, **kwargs: Any) -> None:
         """Log pipeline-specific information.
@@ -459,13 +793,12 @@ class ComponentLogger(logging.Logger):
         action : str
             Pipeline action.
         **kwargs : Any
-            Additional context information.
+            Additional context information; `LazyField` values are
+            evaluated only if INFO is enabled.
         """
-        context = " | ".join(f"{k}={v}" for k, v in kwargs.items())
-        msg = action
-        if context:
-            msg += f" | {context}"
-        self.info(msg)
+        if not self.isEnabledFor(logging.INFO):
+            return
+        self.info(LogEvent("pipeline", (action,), kwargs))
 
     def kernel_info(self, action: str, **kwargs: Any) -> None:
         """Log kernel-specific information.
@@ -475,13 +808,12 @@ class ComponentLogger(logging.Logger):
         action : str
             Kernel action.
         **kwargs : Any
-            Additional context information.
+            Additional context information; `LazyField` values are
+            evaluated only if INFO is enabled.
         """
-        context = " | ".join(f"{k}={v}" for k, v in kwargs.items())
-        msg = action
-        if context:
-            msg += f" | {context}"
-        self.info(msg)
+        if not self.isEnabledFor(logging.INFO):
+            return
+        self.info(LogEvent("kernel", (action,), kwargs))
 
 
 class LoggerFactory:
@@ -498,29 +830,154 @@ class LoggerFactory:
         Default logging level.
     _loggers : dict[str, ComponentLogger]
         Cache of created loggers.
+    _async_writer : _AsyncLogWriter | None
+        Background writer of the asynchronous mode, None if off.
+    _console : bool
+        Whether loggers write formatted text to stdout.
+    _sinks : list[logging.Handler]
+        Extra handlers shared by all loggers, e.g. structured sinks.
     """
 
     _enable_colors: bool = True
     _default_level: int = logging.INFO
     _loggers: dict[str, ComponentLogger] = {}
+    _async_writer: _AsyncLogWriter | None = None
+    _console: bool = True
+    _sinks: list[logging.Handler] = []
+    _atexit_registered: bool = False
+    _dropped_records: int = 0
 
     @classmethod
     def configure(
         cls,
         level: int = logging.INFO,
         enable_colors: bool = True,
+        async_mode: bool = False,
+        queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
+        overflow: ELogQueueOverflow | str = ELogQueueOverflow.DROP,
+        console: bool = True,
     ) -> None:
         """Configure global logger factory settings.
 
+        In asynchronous mode the logging call only queues the record;
+        a background thread formats and writes it. Pending records
+        are written at interpreter exit or on `shutdown`.
+
         Parameters
         ----------
         level : int, optional
             Default logging level (default: logging.INFO).
         enable_colors : bool, optional
             Enable ANSI colors (default: True).
+        async_mode : bool, optional
+            Format and write records on a background thread
+            (default: False).
+        queue_size : int, optional
+            Maximum number of pending records in asynchronous mode.
+        overflow : ELogQueueOverflow | str, optional
+            Drop new records (default) or block the caller when the
+            queue is full.
+        console : bool, optional
+            Write formatted text to stdout (default: True); disable
+            to log only to sinks (see `add_sink`).
         """
         cls._default_level = level
         cls._enable_colors = enable_colors
+        cls._console = console
+
+        cls.shutdown()
+        if not async_mode:
+            cls._attach_handlers()
+            return
+
+        cls._async_writer = _AsyncLogWriter(
+            queue_size,
+            ELogQueueOverflow(overflow),
+        )
+        if not cls._atexit_registered:
+            atexit.register(cls.shutdown)
+            cls._atexit_registered = True
+        cls._attach_handlers()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Leave the asynchronous mode, writing the pending records.
+
+        Loggers write synchronously afterwards. Does nothing in
+        synchronous mode.
+        """
+        _writer = cls._async_writer
+        if _writer is None:
+            return
+
+        cls._async_writer = None
+        cls._attach_handlers()
+        _writer.stop()
+
+        cls._dropped_records += _writer.dropped
+        if _writer.dropped:
+            sys.stderr.write(
+                f"saxs.logging: {_writer.dropped} log record(s) dropped\n",
+            )
+
+    @classmethod
+    def get_dropped_records(cls) -> int:
+        """Return the records dropped by the asynchronous mode."""
+        _writer = cls._async_writer
+        _pending = 0 if _writer is None else _writer.dropped
+        return cls._dropped_records + _pending
+
+    @classmethod
+    def add_sink(cls, handler: logging.Handler) -> None:
+        """Attach a handler to all loggers, present and future.
+
+        Sinks receive the records synchronously, in every mode.
+
+        Parameters
+        ----------
+        handler : logging.Handler
+            Handler, e.g. a `StructuredLogHandler`.
+        """
+        if handler not in cls._sinks:
+            cls._sinks.append(handler)
+            cls._attach_handlers()
+
+    @classmethod
+    def remove_sink(cls, handler: logging.Handler) -> None:
+        """Detach a handler added with `add_sink` and flush it."""
+        if handler in cls._sinks:
+            cls._sinks.remove(handler)
+            cls._attach_handlers()
+        handler.flush()
+
+    @classmethod
+    def _attach_handlers(cls) -> None:
+        """Give the existing loggers handlers of the current mode."""
+        for _logger in cls._loggers.values():
+            cls._set_handlers(_logger)
+
+    @classmethod
+    def _set_handlers(cls, logger: ComponentLogger) -> None:
+        """Replace the handlers of a logger by the current ones."""
+        logger.handlers.clear()
+        if cls._console:
+            logger.addHandler(cls._create_handler(logger.component))
+        for _sink in cls._sinks:
+            logger.addHandler(_sink)
+
+    @classmethod
+    def _create_handler(cls, component: str) -> logging.Handler:
+        """Return the output handler of a component logger."""
+        handler = logging.StreamHandler(sys.stdout)
+        formatter = LogFormatter(
+            enable_colors=cls._enable_colors,
+            component=component,
+        )
+        handler.setFormatter(formatter)
+
+        if cls._async_writer is not None:
+            return QueuedLogHandler(cls._async_writer, handler)
+        return handler
 
     @classmethod
     def get_logger(
@@ -557,17 +1014,8 @@ class LoggerFactory:
             level=level or cls._default_level,
         )
 
-        # Create and attach handler with custom formatter
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = LogFormatter(
-            enable_colors=cls._enable_colors,
-            component=component,
-        )
-        handler.setFormatter(formatter)
-
-        # Remove any existing handlers and add our custom one
-        logger.handlers.clear()
-        logger.addHandler(handler)
+        # Attach the console handler and the sinks
+        cls._set_handlers(logger)
         logger.propagate = False
 
         # Cache the logger
@@ -606,6 +1054,10 @@ def get_logger(name: str, component: str = "default") -> ComponentLogger:
 def setup_logging(
     level: int = logging.INFO,
     enable_colors: bool = True,
+    async_mode: bool = False,
+    queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
+    overflow: ELogQueueOverflow | str = ELogQueueOverflow.DROP,
+    console: bool = True,
 ) -> None:
     """Configure global logging settings.
 
@@ -615,6 +1067,15 @@ def setup_logging(
         Logging level (default: logging.INFO).
     enable_colors : bool, optional
         Enable ANSI colors in output (default: True).
+    async_mode : bool, optional
+        Format and write records on a background thread
+        (default: False).
+    queue_size : int, optional
+        Maximum number of pending records in asynchronous mode.
+    overflow : ELogQueueOverflow | str, optional
+        "drop" (default) or "block" when the queue is full.
+    console : bool, optional
+        Write formatted text to stdout (default: True).
 
     Examples
     --------
@@ -622,7 +1083,14 @@ def setup_logging(
     >>> import logging
     >>> setup_logging(level=logging.DEBUG, enable_colors=True)
     """
-    LoggerFactory.configure(level=level, enable_colors=enable_colors)
+    LoggerFactory.configure(
+        level=level,
+        enable_colors=enable_colors,
+        async_mode=async_mode,
+        queue_size=queue_size,
+        overflow=overflow,
+        console=console,
+    )
 
 
 # Create default logger for backwards compatibility
@@ -0,0 +1,217 @@
+"""Per-sample log capture for SAXS runs.
+
+Inside a `sample_log_context`, the `stage_info` and `scheduler_info`
+calls of component loggers are not emitted. They are appended,
+unformatted, to a fixed-size ring buffer of the sample. The buffer is
+written out through the original loggers only when the sample fails
+(an exception leaves the context) or ends flagged (partial result,
+see `SampleLogBuffer.finish`), and discarded otherwise.
+
+In-place stages overwrite the arrays that lazy fields (see
+`LazyField`) read, so buffered fields are snapshotted at call time:
+array ranges are reduced to their bounds and other array arguments
+are copied, while formatting is still deferred to the dump. A dump
+thus shows the values of call time.
+
+Classes
+-------
+SampleLogBuffer
+    Ring buffer of the log calls of one sample.
+
+Functions
+---------
+sample_log_context(capacity: int = DEFAULT_SAMPLE_LOG_CAPACITY,
+                   sample_id: str | None = None) -> SampleLogBuffer
+    Capture the log calls of the enclosed block.
+"""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.types.sample_objects import ESampleMetadataKeys
+from saxs.logging.logger import (
+    SAMPLE_LOG_BUFFER,
+    LazyField,
+    LogEvent,
+    get_logger,
+)
+
+if TYPE_CHECKING:
+    from saxs.core.types.sample import SAXSSample
+    from saxs.logging.logger import ComponentLogger
+
+DEFAULT_SAMPLE_LOG_CAPACITY = 256
+
+logger = get_logger(__name__, "default")
+
+
+class SampleLogBuffer:
+    """Ring buffer of the log calls of one sample.
+
+    Parameters
+    ----------
+    capacity : int
+        Number of most recent calls kept.
+    sample_id : str | None, optional
+        Sample identifier shown when the buffer is dumped.
+
+    Attributes
+    ----------
+    dropped : int
+        Calls evicted from the full buffer.
+    """
+
+    def __init__(self, capacity: int, sample_id: str | None = None):
+        self.capacity = capacity
+        self.sample_id = sample_id
+        self.dropped = 0
+        self._records: deque[
+            tuple[
+                float,
+                "ComponentLogger",
+                str,
+                tuple[Any, ...],
+                dict[str, Any],
+            ]
+        ] = deque(maxlen=capacity)
+
+    def append(
+        self,
+        component_logger: "ComponentLogger",
+        kind: str,
+        args: tuple[Any, ...],
+        fields: dict[str, Any],
+    ) -> None:
+        """Store a log call, snapshotting its lazy fields."""
+        if len(self._records) == self.capacity:
+            self.dropped += 1
+        self._records.append(
+            (
+                time.time(),
+                component_logger,
+                kind,
+                args,
+                {
+                    _key: (
+                        _value.snapshot()
+                        if isinstance(_value, LazyField)
+                        else _value
+                    )
+                    for _key, _value in fields.items()
+                },
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def dump(self, reason: str) -> None:
+        """Emit the buffered calls through their loggers.
+
+        Records are emitted at their original level regardless of
+        the logger level, preceded by a header with the reason.
+
+        Parameters
+        ----------
+        reason : str
+            Why the sample is reported, e.g. the exception.
+        """
+        logger.warning(
+            "Sample log dump | sample=%s | reason=%s | records=%d | "
+            "dropped=%d",
+            self.sample_id,
+            reason,
+            len(self._records),
+            self.dropped,
+        )
+
+        # Emitted outside the context, the loggers write normally
+        _token = SAMPLE_LOG_BUFFER.set(None)
+        try:
+            for _created, _logger, _kind, _args, _fields in self._records:
+                _record = _logger.makeRecord(
+                    _logger.name,
+                    logging.INFO,
+                    "(sample log)",
+                    0,
+                    LogEvent(_kind, _args, _fields),
+                    None,
+                    None,
+                )
+                _record.created = _created
+                _logger.callHandlers(_record)
+        finally:
+            SAMPLE_LOG_BUFFER.reset(_token)
+
+        self.discard()
+
+    def discard(self) -> None:
+        """Drop the buffered calls."""
+        self._records.clear()
+        self.dropped = 0
+
+    def finish(self, sample: "SAXSSample") -> None:
+        """Dump the buffer if the sample is flagged, else discard it.
+
+        Parameters
+        ----------
+        sample : SAXSSample
+            Final sample; flagged samples carry a true
+            `ESampleMetadataKeys.PARTIAL`.
+        """
+        _metadata = sample.get_metadata().unwrap()
+        if _metadata.get(ESampleMetadataKeys.PARTIAL.value):
+            _reason = _metadata.get(
+                ESampleMetadataKeys.BUDGET_EXHAUSTED.value,
+            )
+            self.dump(f"partial result ({_reason})")
+        else:
+            self.discard()
+
+
+@contextmanager
+def sample_log_context(
+    capacity: int = DEFAULT_SAMPLE_LOG_CAPACITY,
+    sample_id: str | None = None,
+) -> Iterator[SampleLogBuffer]:
+    """Capture the log calls of the enclosed block.
+
+    The buffer is dumped if an exception leaves the block; otherwise
+    the caller decides with `SampleLogBuffer.finish`, and whatever is
+    left is discarded on exit.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Number of most recent calls kept.
+    sample_id : str | None, optional
+        Sample identifier shown when the buffer is dumped.
+
+    Yields
+    ------
+    SampleLogBuffer
+        Buffer of the block.
+
+    Examples
+    --------
+    >>> with sample_log_context(sample_id="run-42") as buffer:
+    ...     result = kernel.run(sample)
+    ...     buffer.finish(result)
+    """
+    _buffer = SampleLogBuffer(capacity, sample_id)
+    _token = SAMPLE_LOG_BUFFER.set(_buffer)
+    try:
+        yield _buffer
+    except BaseException as e:
+        SAMPLE_LOG_BUFFER.reset(_token)
+        _token = None
+        _buffer.dump(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        if _token is not None:
+            SAMPLE_LOG_BUFFER.reset(_token)
+        _buffer.discard()
@@ -0,0 +1,360 @@
+"""Structured log sink for SAXS batch runs.
+
+`StructuredLogHandler` writes one record per log event as JSON lines
+or msgpack, instead of the decorated text of `LogFormatter`. Records
+of component calls keep their fields unformatted:
+
+    {"ts": 1760000000.0, "level": "INFO", "logger": "...",
+     "component": "stage", "kind": "stage", "stage": "CutStage",
+     "action": "Truncation complete", "fields": {"removed_points": 100}}
+
+Scheduler records carry "queue_size" instead of "stage"; other
+records carry their message as "action" and no fields.
+
+Encoded records are buffered and written in large chunks. The file
+rotates by size: `run.jsonl` becomes `run.jsonl.1`, `run.jsonl.1`
+becomes `run.jsonl.2`, and so on up to `backup_count`.
+
+`read_structured_log` iterates the records of such files and
+`summarize_structured_log` aggregates them per stage, so large runs
+can be analyzed without parsing text.
+
+Classes
+-------
+EStructuredFormat
+    Encoding of structured records.
+StructuredLogHandler
+    Handler writing structured records to rotating files.
+
+Functions
+---------
+add_structured_sink(path, fmt="jsonl", ...) -> StructuredLogHandler
+    Write the records of all loggers to a structured file.
+read_structured_log(paths, fmt=None) -> Iterator[dict[str, Any]]
+    Iterate the records of structured log files.
+summarize_structured_log(paths, fmt=None) -> dict[str, Any]
+    Aggregate structured records per component and stage.
+"""
+
+import json
+import logging
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+import msgpack
+from saxs.logging.logger import LogEvent, LoggerFactory, _context
+
+DEFAULT_STRUCTURED_BUFFER_SIZE = 1 << 20
+DEFAULT_STRUCTURED_MAX_BYTES = 256 << 20
+DEFAULT_STRUCTURED_BACKUP_COUNT = 5
+
+
+class EStructuredFormat(Enum):
+    """Encoding of structured records."""
+
+    JSONL = "jsonl"
+    MSGPACK = "msgpack"
+
+
+def _default(value: Any) -> Any:  # noqa: ANN401
+    """Encode values unknown to JSON and msgpack, e.g. numpy scalars."""
+    if hasattr(value, "item") and getattr(value, "ndim", None) == 0:
+        return value.item()
+    return str(value)
+
+
+class StructuredLogHandler(logging.Handler):
+    """Handler writing structured records to rotating files.
+
+    Parameters
+    ----------
+    path : str | Path
+        File the records are written to.
+    fmt : EStructuredFormat | str, optional
+        "jsonl" (default) or "msgpack".
+    buffer_size : int, optional
+        Bytes buffered before a write.
+    max_bytes : int, optional
+        Size at which the file rotates, never if 0.
+    backup_count : int, optional
+        Number of rotated files kept.
+
+    Examples
+    --------
+    >>> handler = add_structured_sink("run.jsonl")
+    >>> kernel.run_many(samples)
+    >>> LoggerFactory.remove_sink(handler)
+    >>> summarize_structured_log(["run.jsonl"])
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        fmt: EStructuredFormat | str = EStructuredFormat.JSONL,
+        buffer_size: int = DEFAULT_STRUCTURED_BUFFER_SIZE,
+        max_bytes: int = DEFAULT_STRUCTURED_MAX_BYTES,
+        backup_count: int = DEFAULT_STRUCTURED_BACKUP_COUNT,
+    ):
+        super().__init__()
+        self.path = Path(path)
+        self.fmt = EStructuredFormat(fmt)
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._buffer = bytearray()
+        self._packer = msgpack.Packer(default=_default)
+        self._file = open(self.path, "ab")  # noqa: SIM115
+        self._size = self._file.tell()
+
+    @staticmethod
+    def to_dict(record: logging.LogRecord) -> dict[str, Any]:
+        """Return the structured form of a record."""
+        _entry: dict[str, Any] = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "component": getattr(record, "component", None),
+        }
+
+        _event = record.msg
+        if not isinstance(_event, LogEvent):
+            _entry["kind"] = None
+            _entry["action"] = record.getMessage()
+            _entry["fields"] = {}
+            return _entry
+
+        _entry["kind"] = _event.kind
+        if _event.kind == "stage":
+            _entry["stage"], _entry["action"] = _event.args
+        else:
+            _entry["action"] = _event.args[0]
+            if _event.kind == "scheduler":
+                _entry["queue_size"] = _event.args[1]
+        _entry["fields"] = _context(_event.fields)
+        return _entry
+
+    def encode(self, record: logging.LogRecord) -> bytes:
+        """Encode a record in the format of the handler."""
+        _entry = self.to_dict(record)
+        if self.fmt is EStructuredFormat.MSGPACK:
+            return self._packer.pack(_entry)
+        return (json.dumps(_entry, default=_default) + "\n").encode()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer the encoded record, writing full buffers."""
+        try:
+            self._buffer += self.encode(record)
+            if len(self._buffer) >= self.buffer_size:
+                self._write()
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+
+    def flush(self) -> None:
+        """Write the buffered records."""
+        with self.lock:
+            if self._buffer:
+                self._write()
+            self._file.flush()
+
+    def close(self) -> None:
+        """Write the buffered records and close the file."""
+        with self.lock:
+            if not self._file.closed:
+                if self._buffer:
+                    self._write()
+                self._file.close()
+        super().close()
+
+    def _write(self) -> None:
+        if (
+            self.max_bytes
+            and self._size
+            and self._size + len(self._buffer) > self.max_bytes
+        ):
+            self._rotate()
+        self._file.write(self._buffer)
+        self._size += len(self._buffer)
+        self._buffer.clear()
+
+    def _rotate(self) -> None:
+        """Shift the rotated files and reopen an empty one."""
+        self._file.close()
+        if self.backup_count > 0:
+            for _index in range(self.backup_count - 1, 0, -1):
+                _source = self._backup(_index)
+                if _source.exists():
+                    os.replace(_source, self._backup(_index + 1))
+            os.replace(self.path, self._backup(1))
+        self._file = open(self.path, "wb")  # noqa: SIM115
+        self._size = 0
+
+    def _backup(self, index: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{index}")
+
+
+def add_structured_sink(
+    path: str | Path,
+    fmt: EStructuredFormat | str = EStructuredFormat.JSONL,
+    buffer_size: int = DEFAULT_STRUCTURED_BUFFER_SIZE,
+    max_bytes: int = DEFAULT_STRUCTURED_MAX_BYTES,
+    backup_count: int = DEFAULT_STRUCTURED_BACKUP_COUNT,
+) -> StructuredLogHandler:
+    """Write the records of all loggers to a structured file.
+
+    The handler is registered with `LoggerFactory.add_sink`; detach
+    it with `LoggerFactory.remove_sink` and `close` it at the end of
+    the run. Records below the logger level are not written, and
+    `setup_logging(console=False)` leaves the structured file as the
+    only output.
+
+    Parameters
+    ----------
+    path : str | Path
+        File the records are written to.
+    fmt : EStructuredFormat | str, optional
+        "jsonl" (default) or "msgpack".
+    buffer_size : int, optional
+        Bytes buffered before a write.
+    max_bytes : int, optional
+        Size at which the file rotates, never if 0.
+    backup_count : int, optional
+        Number of rotated files kept.
+
+    Returns
+    -------
+    StructuredLogHandler
+        The registered handler.
+    """
+    _handler = StructuredLogHandler(
+        path,
+        fmt=fmt,
+        buffer_size=buffer_size,
+        max_bytes=max_bytes,
+        backup_count=backup_count,
+    )
+    LoggerFactory.add_sink(_handler)
+    return _handler
+
+
+def _detect_format(path: Path) -> EStructuredFormat:
+    """Guess the format of a file from its name."""
+    _suffixes = [_s for _s in path.suffixes if not _s[1:].isdigit()]
+    if _suffixes and _suffixes[-1] in {".msgpack", ".mpk"}:
+        return EStructuredFormat.MSGPACK
+    return EStructuredFormat.JSONL
+
+
+def read_structured_log(
+    paths: Iterable[str | Path],
+    fmt: EStructuredFormat | str | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Iterate the records of structured log files.
+
+    Parameters
+    ----------
+    paths : Iterable[str | Path]
+        Files written by `StructuredLogHandler`, rotated ones
+        included; pass them oldest first to keep records in order.
+    fmt : EStructuredFormat | str | None, optional
+        Format of the files, guessed from their names if None
+        (".msgpack" or ".mpk" for msgpack, JSON lines otherwise).
+
+    Yields
+    ------
+    dict[str, Any]
+        Structured records, see `StructuredLogHandler.to_dict`.
+    """
+    for _path in map(Path, paths):
+        _fmt = (
+            _detect_format(_path) if fmt is None else EStructuredFormat(fmt)
+        )
+        with open(_path, "rb") as _file:
+            if _fmt is EStructuredFormat.MSGPACK:
+                yield from msgpack.Unpacker(_file, raw=False)
+                continue
+            for _line in _file:
+                if _line.strip():
+                    yield json.loads(_line)
+
+
+def _field_stats() -> dict[str, float]:
+    return {
+        "count": 0,
+        "total": 0.0,
+        "min": float("inf"),
+        "max": float("-inf"),
+    }
+
+
+def summarize_structured_log(
+    paths: Iterable[str | Path],
+    fmt: EStructuredFormat | str | None = None,
+) -> dict[str, Any]:
+    """Aggregate structured records per component and stage.
+
+    Parameters
+    ----------
+    paths : Iterable[str | Path]
+        Files written by `StructuredLogHandler`.
+    fmt : EStructuredFormat | str | None, optional
+        Format of the files, guessed from their names if None.
+
+    Returns
+    -------
+    dict[str, Any]
+        Record count, counts per level and component, and per
+        stage: record count, counts per action and count, total,
+        mean, min and max of every numeric field.
+    """
+    _levels: dict[str, int] = {}
+    _components: dict[str, int] = {}
+    _stages: dict[str, dict[str, Any]] = {}
+    _records = 0
+
+    for _entry in read_structured_log(paths, fmt):
+        _records += 1
+        _levels[_entry["level"]] = _levels.get(_entry["level"], 0) + 1
+        _component = str(_entry.get("component"))
+        _components[_component] = _components.get(_component, 0) + 1
+
+        _stage = _entry.get("stage")
+        if _stage is None:
+            continue
+        _summary = _stages.setdefault(
+            _stage,
+            {"records": 0, "actions": {}, "fields": {}},
+        )
+        _summary["records"] += 1
+        _actions = _summary["actions"]
+        _actions[_entry["action"]] = _actions.get(_entry["action"], 0) + 1
+        for _name, _value in _entry["fields"].items():
+            if isinstance(_value, bool) or not isinstance(
+                _value,
+                int | float,
+            ):
+                continue
+            _stats = _summary["fields"].setdefault(_name, _field_stats())
+            _stats["count"] += 1
+            _stats["total"] += _value
+            _stats["min"] = min(_stats["min"], _value)
+            _stats["max"] = max(_stats["max"], _value)
+
+    for _summary in _stages.values():
+        for _stats in _summary["fields"].values():
+            _stats["mean"] = _stats["total"] / _stats["count"]
+
+    return {
+        "records": _records,
+        "levels": _levels,
+        "components": _components,
+        "stages": _stages,
+    }
+
+
+if __name__ == "__main__":
+    # python -m saxs.logging.structured run.jsonl.1 run.jsonl
+    json.dump(summarize_structured_log(sys.argv[1:]), sys.stdout, indent=2)
@@ -0,0 +1,25 @@
+"""SAXS in-process metrics package."""
+
+from saxs.metrics.exporter import (
+    TextfileExporter,
+    render_text,
+    write_textfile,
+)
+from saxs.metrics.registry import (
+    DEFAULT_REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+)
+
+__all__ = [
+    "DEFAULT_REGISTRY",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "TextfileExporter",
+    "render_text",
+    "write_textfile",
+]
@@ -0,0 +1,245 @@
+"""
+Module: exporter.
+
+Export of a `MetricsRegistry` in the Prometheus text exposition
+format, to a file read by the textfile collector of node_exporter
+(`--collector.textfile.directory`). No network service runs in the
+process: `TextfileExporter` rewrites the file periodically from a
+background thread, atomically, so the collector never reads a
+partial file.
+
+Classes
+-------
+TextfileExporter
+    Periodic writer of a metrics file.
+
+Functions
+---------
+render_text(registry, const_labels=None) -> str
+    Render metrics in the Prometheus text format.
+write_textfile(path, registry, const_labels=None) -> None
+    Atomically write metrics to a file.
+"""
+
+import math
+import tempfile
+import threading
+from pathlib import Path
+from types import TracebackType
+
+from saxs.metrics.registry import DEFAULT_REGISTRY, MetricsRegistry
+
+DEFAULT_EXPORT_INTERVAL = 15.0
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if value == int(value) and abs(value) < 1 << 53:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    _pairs = ",".join(f'{_k}="{_escape(_v)}"' for _k, _v in labels.items())
+    return f"{{{_pairs}}}"
+
+
+def render_text(
+    registry: MetricsRegistry = DEFAULT_REGISTRY,
+    const_labels: dict[str, str] | None = None,
+) -> str:
+    """
+    Render metrics in the Prometheus text format.
+
+    Parameters
+    ----------
+    registry : MetricsRegistry, optional
+        Metrics to render, the package metrics by default.
+    const_labels : dict[str, str] | None, optional
+        Labels added to every sample, e.g. `{"worker": "3"}`.
+
+    Returns
+    -------
+    str
+        Text exposition of the metrics.
+    """
+    _const = dict(const_labels or {})
+    _lines: list[str] = []
+
+    for _metric in registry.collect():
+        _samples = _metric.collect()
+        if not _samples:
+            continue
+
+        _help = _metric.documentation.replace("\\", "\\\\").replace(
+            "\n",
+            "\\n",
+        )
+        _lines.append(f"# HELP {_metric.name} {_help}")
+        _lines.append(f"# TYPE {_metric.name} {_metric.kind}")
+
+        for _values, _value in sorted(_samples):
+            _labels = {
+                **_const,
+                **dict(zip(_metric.labelnames, _values, strict=True)),
+            }
+            if _metric.kind != "histogram":
+                _lines.append(
+                    f"{_metric.name}{_format_labels(_labels)} "
+                    f"{_format_value(_value)}",
+                )
+                continue
+
+            _counts, _sum = _value
+            _cumulative = 0.0
+            for _bound, _count in zip(
+                (*_metric.buckets, math.inf),
+                _counts,
+                strict=True,
+            ):
+                _cumulative += _count
+                _bucket = _format_labels(
+                    {**_labels, "le": _format_value(_bound)},
+                )
+                _lines.append(
+                    f"{_metric.name}_bucket{_bucket} "
+                    f"{_format_value(_cumulative)}",
+                )
+            _lines.append(
+                f"{_metric.name}_sum{_format_labels(_labels)} "
+                f"{_format_value(_sum)}",
+            )
+            _lines.append(
+                f"{_metric.name}_count{_format_labels(_labels)} "
+                f"{_format_value(_cumulative)}",
+            )
+
+    return "\n".join(_lines) + "\n" if _lines else ""
+
+
+def write_textfile(
+    path: str | Path,
+    registry: MetricsRegistry = DEFAULT_REGISTRY,
+    const_labels: dict[str, str] | None = None,
+) -> None:
+    """
+    Atomically write metrics to a file.
+
+    The text is written to a uniquely named temporary file next to
+    `path`, then renamed over it.
+
+    Parameters
+    ----------
+    path : str | Path
+        Metrics file, named `*.prom` for the textfile collector.
+    registry : MetricsRegistry, optional
+        Metrics to write, the package metrics by default.
+    const_labels : dict[str, str] | None, optional
+        Labels added to every sample.
+    """
+    _path = Path(path)
+    _text = render_text(registry, const_labels)
+    # A unique name per writer, so that the exporter thread and a
+    # direct write never share a temporary file
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=_path.parent,
+        prefix=f".{_path.name}.",
+        suffix=".tmp",
+        delete=False,
+    ) as _file:
+        _file.write(_text)
+    # Temporary files are private, the collector may run as another user
+    Path(_file.name).chmod(0o644)
+    Path(_file.name).replace(_path)
+
+
+class TextfileExporter:
+    """
+    Periodic writer of a metrics file.
+
+    Parameters
+    ----------
+    path : str | Path
+        Metrics file, named `*.prom` for the textfile collector.
+        Worker processes of a batch run need distinct files and
+        distinct `const_labels`.
+    registry : MetricsRegistry, optional
+        Metrics to write, the package metrics by default.
+    interval : float, optional
+        Seconds between writes.
+    const_labels : dict[str, str] | None, optional
+        Labels added to every sample.
+
+    Examples
+    --------
+    >>> with TextfileExporter("/var/lib/node_exporter/saxs.prom"):
+    ...     kernel.run_many(samples)
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        registry: MetricsRegistry = DEFAULT_REGISTRY,
+        interval: float = DEFAULT_EXPORT_INTERVAL,
+        const_labels: dict[str, str] | None = None,
+    ):
+        self.path = Path(path)
+        self.registry = registry
+        self.interval = interval
+        self.const_labels = const_labels
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start writing the file periodically."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="saxs-metrics-exporter",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the periodic writes and write the final values."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+    def write(self) -> None:
+        """Write the current values."""
+        write_textfile(self.path, self.registry, self.const_labels)
+
+    def __enter__(self) -> "TextfileExporter":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
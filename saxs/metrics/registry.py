@@ -0,0 +1,337 @@
+"""
+Module: registry.
+
+In-process metrics of SAXS runs: counters, gauges and fixed-bucket
+histograms, collected in a `MetricsRegistry` and exported in the
+Prometheus text format (see `exporter`).
+
+Counters and histograms are updated without locks. Each thread
+accumulates into its own cell, created on its first update, and
+`MetricsRegistry.collect` sums the cells of all threads. Gauges hold
+a single value and take a lock on update; they are meant for values
+set occasionally, e.g. a configured limit.
+
+Metrics are process-local. The default registry is reset in forked
+children, so every worker counts from zero; workers export their own
+file with a distinguishing label (see `TextfileExporter`).
+
+Classes
+-------
+Counter
+    Monotonic counter.
+Gauge
+    Value that goes up and down.
+Histogram
+    Distribution of observations over fixed buckets.
+MetricsRegistry
+    Collection of metrics.
+
+Attributes
+----------
+DEFAULT_REGISTRY : MetricsRegistry
+    Registry of the metrics instrumented in the package.
+"""
+
+import bisect
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Generic, TypeVar
+
+# Upper bucket bounds in seconds, the last bucket is unbounded
+DEFAULT_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+
+class _ThreadCells:
+    """Per-thread accumulators of a metric, summed on collection."""
+
+    __slots__ = ("_cells", "_local", "_lock", "size")
+
+    def __init__(self, size: int):
+        self.size = size
+        self._cells: list[list[float]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def get(self) -> list[float]:
+        """Return the cell of the calling thread."""
+        try:
+            return self._local.cell
+        except AttributeError:
+            _cell = [0.0] * self.size
+            with self._lock:
+                self._cells.append(_cell)
+            self._local.cell = _cell
+            return _cell
+
+    def total(self) -> list[float]:
+        """Return the element-wise sum of the cells of all threads."""
+        with self._lock:
+            _cells = list(self._cells)
+        if not _cells:
+            return [0.0] * self.size
+        return [sum(_column) for _column in zip(*_cells, strict=True)]
+
+
+class _CounterChild:
+    __slots__ = ("_cells",)
+
+    def __init__(self) -> None:
+        self._cells = _ThreadCells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter by a non-negative amount."""
+        self._cells.get()[0] += amount
+
+    def value(self) -> float:
+        """Return the current value."""
+        return self._cells.total()[0]
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "_value")
+
+    def __init__(self) -> None:
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge."""
+        with self._lock:
+            self._value -= amount
+
+    def value(self) -> float:
+        """Return the current value."""
+        return self._value
+
+
+class _HistogramChild:
+    __slots__ = ("_cells", "buckets")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        # One count per bucket, the unbounded one included, then sum
+        self._cells = _ThreadCells(len(buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        _cell = self._cells.get()
+        _cell[bisect.bisect_left(self.buckets, value)] += 1
+        _cell[-1] += value
+
+    def value(self) -> tuple[list[float], float]:
+        """Return the counts per bucket and the sum of observations."""
+        _total = self._cells.total()
+        return _total[:-1], _total[-1]
+
+
+TChild = TypeVar("TChild", _CounterChild, _GaugeChild, _HistogramChild)
+
+
+class _Metric(ABC, Generic[TChild]):
+    """Metric family: one child per combination of label values."""
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], TChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any) -> TChild:
+        """Return the child of the given label values."""
+        _key = tuple(map(str, values))
+        _child = self._children.get(_key)
+        if _child is not None:
+            return _child
+
+        if len(_key) != len(self.labelnames):
+            msg = (
+                f"{self.name} takes labels {self.labelnames}, "
+                f"got {len(_key)} values."
+            )
+            raise ValueError(msg)
+        with self._lock:
+            return self._children.setdefault(_key, self._new_child())
+
+    def collect(self) -> list[tuple[tuple[str, ...], Any]]:
+        """Return the label values and value of every child."""
+        with self._lock:
+            _children = list(self._children.items())
+        return [(_key, _child.value()) for _key, _child in _children]
+
+    def reset(self) -> None:
+        """Drop all children."""
+        self._children = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_child(self) -> TChild:
+        """Return a child holding the value of one label set."""
+
+
+class Counter(_Metric[_CounterChild]):
+    """
+    Monotonic counter.
+
+    Examples
+    --------
+    >>> FRAMES = DEFAULT_REGISTRY.counter(
+    ...     "saxs_frames_total", "Frames read.", ("type",)
+    ... )
+    >>> FRAMES.labels("sample").inc()
+    """
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter of a metric without labels."""
+        self.labels().inc(amount)
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+
+class Gauge(_Metric[_GaugeChild]):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        """Set the gauge of a metric without labels."""
+        self.labels().set(value)
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+
+class Histogram(_Metric[_HistogramChild]):
+    """
+    Distribution of observations over fixed buckets.
+
+    Parameters
+    ----------
+    name : str
+        Metric name.
+    documentation : str
+        Help text.
+    labelnames : tuple[str, ...], optional
+        Label names.
+    buckets : tuple[float, ...], optional
+        Increasing upper bucket bounds; an unbounded bucket is
+        added.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float) -> None:
+        """Add an observation to a metric without labels."""
+        self.labels().observe(value)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics.
+
+    Registering a metric under an existing name returns the existing
+    metric, so modules can declare their metrics at import time.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric[Any]] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+    ) -> Counter:
+        """Register a counter, or return the one of that name."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+    ) -> Gauge:
+        """Register a gauge, or return the one of that name."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Register a histogram, or return the one of that name."""
+        return self._register(
+            Histogram(name, documentation, labelnames, buckets),
+        )
+
+    def get(self, name: str) -> "_Metric[Any] | None":
+        """Return the metric of that name, if registered."""
+        return self._metrics.get(name)
+
+    def collect(self) -> list["_Metric[Any]"]:
+        """Return the registered metrics, sorted by name."""
+        with self._lock:
+            return [self._metrics[_name] for _name in sorted(self._metrics)]
+
+    def reset(self) -> None:
+        """Drop the values of all metrics, keeping them registered."""
+        for _metric in self._metrics.values():
+            _metric.reset()
+
+    def _register(self, metric: "_Metric[Any]") -> Any:  # noqa: ANN401
+        with self._lock:
+            _existing = self._metrics.get(metric.name)
+            if _existing is None:
+                self._metrics[metric.name] = metric
+                return metric
+
+        if type(_existing) is not type(metric):
+            msg = (
+                f"Metric {metric.name} is already registered as a "
+                f"{_existing.kind}."
+            )
+            raise ValueError(msg)
+        return _existing
+
+
+DEFAULT_REGISTRY = MetricsRegistry()
+
+# Forked workers count from zero instead of inheriting the parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=DEFAULT_REGISTRY.reset)
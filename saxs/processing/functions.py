@@ -5,6 +5,9 @@ Simple functions.
 
 import numpy as np
 from numpy.typing import NDArray
+from scipy.ndimage import (  # pyright: ignore[reportMissingTypeStubs]
+    correlate1d,
+)
 
 
 def background_exponent(
@@ -143,21 +146,46 @@ def gaussian_sum(
 def moving_average(
     data: NDArray[np.float64],
     window_size: int,
+    out: NDArray[np.float64] | None = None,
 ) -> NDArray[np.float64]:
     """
-    Compute moving average of a 1D array.
+    Compute moving average along the last axis.
+
+    A 1D array without `out` is averaged by convolution with a box
+    window. Otherwise the window is correlated with the data, into
+    `out` if given, which may be `data` itself; a 2D array is
+    averaged row by row. Points beyond the edges count as zeros in
+    all cases. Every average sums its own window, so its rounding
+    error is relative to the window and not to the whole profile,
+    unlike a running or cumulative sum on profiles spanning many
+    decades.
 
     Parameters
     ----------
     data : np.ndarray
-        input data array
+        input data array, 1D or 2D (n_samples, n_points)
     window_size : int
         size of the moving window
+    out : np.ndarray, optional
+        array of the shape of data receiving the result
 
     Returns
     -------
     np.ndarray
-        smoothed array of same length as data
+        smoothed array of the shape of data, `out` if given
     """
     window = np.ones(window_size) / window_size
-    return np.convolve(data, window, mode="same")  # pyright: ignore[reportReturnType]
+    if out is None and np.ndim(data) == 1:
+        return np.convolve(data, window, mode="same")  # pyright: ignore[reportReturnType]
+
+    # With origin 0, each output averages the window_size points
+    # starting window_size // 2 before it, the window alignment of
+    # np.convolve with mode "same"
+    return correlate1d(
+        data,
+        window,
+        axis=-1,
+        output=out,
+        mode="constant",
+        cval=0.0,
+    )
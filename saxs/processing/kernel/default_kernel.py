@@ -41,6 +41,7 @@ from saxs.processing.stage.background.background import (
 )
 from saxs.processing.stage.cut.cut import DEFAULT_CUT_META, CutStage
 from saxs.processing.stage.filter.filter import FilterStage
+from saxs.processing.stage.filter.types import DEFAULT_FILTER_META
 from saxs.processing.stage.peak.find_peak import FindPeakStage
 from saxs.processing.stage.peak.process_peak import (
     ProcessPeakStage,
@@ -121,6 +122,7 @@ class DefaultKernel(BaseKernel):
             StageSpec(
                 id_="filter",
                 stage_cls=FilterStage,
+                metadata=DEFAULT_FILTER_META,
             ),
         )
         _kernel_registry.register_stage(
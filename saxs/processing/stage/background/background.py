@@ -7,19 +7,39 @@ background from intensity data using a user-defined or default
 background function.
 
 The module relies on `scipy.optimize.curve_fit` for fitting and
-supports logging of intermediate and final processing states.
+supports logging of intermediate and final processing states. A
+closed-form linearized mode (`EBackgroundMode.LINEAR`) skips the
+iterative fit; `fit_background_batch` applies it to a whole batch
+of samples in a single solve.
 """
 
-from saxs.logging.logger import get_stage_logger
-from saxs.core.stage.abstract_stage import IAbstractStage
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from saxs.logging.logger import get_stage_logger, lazy, lazy_range
+from saxs.core.stage.fused_stage import IAbstractFusableStage, SampleArrays
 from saxs.core.types.sample import ESAXSSampleKeys, SAXSSample
+from saxs.core.types.sample_objects import ESampleMetadataKeys
 from saxs.processing.functions import background_hyperbole
 from saxs.processing.stage.background.types import (
     BACKGROUND_COEF,
+    DEFAULT_REFINE_STEPS,
     BackgroundStageMetadata,
+    EBackgroundMode,
     EBackMetadataKeys,
 )
+from saxs.processing.stage.common.engine import (
+    FitResult,
+    LinearizedEngine,
+)
 from saxs.processing.stage.common.fitting import Fitting
+from saxs.processing.stage.common.linearized import fit_linearized
+from saxs.processing.stage.common.warm_start import (
+    DEFAULT_WARM_START_CACHE,
+)
 
 logger = get_stage_logger(__name__)
 
@@ -31,7 +51,7 @@ DEFAULT_BACKG_META = BackgroundStageMetadata(
 )
 
 
-class BackgroundStage(IAbstractStage[BackgroundStageMetadata]):
+class BackgroundStage(IAbstractFusableStage[BackgroundStageMetadata]):
     """
     Stage to fit and subtract background from SAXS intensity data.
 
@@ -87,44 +107,199 @@ class BackgroundStage(IAbstractStage[BackgroundStageMetadata]):
             "BackgroundStage",
             "Starting background fitting",
             data_points=len(q_vals),
-            q_range=f"[{min(q_vals):.4f}, {max(q_vals):.4f}]",
-            intensity_range=f"[{min(intensity):.4f}, {max(intensity):.4f}]",
+            q_range=lazy_range(q_vals),
+            intensity_range=lazy_range(intensity),
         )
 
         # Fit background
+        _mode = self.metadata.get_mode()
+
         logger.stage_info(
             "BackgroundStage",
             "Fitting hyperbolic function",
             function="I(q) = a/(q-b) + c",
+            mode=_mode.value,
         )
 
-        popt, _ = Fitting.curve_fit(
-            _background_func,
+        popt = self.fit_background(
             q_vals,
             intensity,
             error,
-            p0=(3.0, 2.0),
+            sample.get_metadata().unwrap(),
         )
 
         logger.stage_info(
             "BackgroundStage",
             "Fit successful",
-            param_a=f"{popt[0]:.4f}",
-            param_b=f"{popt[1]:.4f}",
+            param_a=lazy("{:.4f}".format, popt[0]),
+            param_b=lazy("{:.4f}".format, popt[1]),
         )
 
         # Subtract background
         background = _background_func(q_vals, *popt)
-        _subtracted_intensity = intensity - _background_coef * background
+        _subtracted_intensity = _background_coef * background
+        np.subtract(
+            intensity,
+            _subtracted_intensity,
+            out=_subtracted_intensity,
+        )
 
         logger.stage_info(
             "BackgroundStage",
             "Background subtraction complete",
             bg_coefficient=_background_coef,
-            bg_range=f"[{min(background):.4f}, {max(background):.4f}]",
-            final_intensity=f"[{min(_subtracted_intensity):.4f}, {max(_subtracted_intensity):.4f}]",
+            bg_range=lazy_range(background),
+            final_intensity=lazy_range(_subtracted_intensity),
         )
 
-        sample[ESAXSSampleKeys.INTENSITY] = _subtracted_intensity
+        sample.set_owned(ESAXSSampleKeys.INTENSITY, _subtracted_intensity)
 
         return sample
+
+    def fit_background(
+        self,
+        q_vals: NDArray[np.float64],
+        intensity: NDArray[np.float64],
+        error: NDArray[np.float64],
+        sample_metadata: dict[str, Any],
+    ) -> NDArray[np.float64]:
+        """
+        Fit the background function to intensity data.
+
+        Parameters
+        ----------
+        q_vals : NDArray[np.float64]
+            Array of scattering vector values.
+        intensity : NDArray[np.float64]
+            Array of measured intensities.
+        error : NDArray[np.float64]
+            Array of intensity measurement errors.
+        sample_metadata : dict[str, Any]
+            Sample metadata, read for the series of warm starts.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            Optimal parameters of the background function.
+        """
+        _background_func = self.metadata[EBackMetadataKeys.BACKGROUND_FUNC]
+        _mode = self.metadata.get_mode()
+
+        _engine = (
+            LinearizedEngine(self.metadata.get_refine_steps())
+            if _mode is EBackgroundMode.LINEAR
+            else self.metadata.get_fit_engine()
+        )
+
+        def _fit(p0: tuple[float, ...] | None) -> FitResult:
+            return Fitting.fit(
+                _background_func,
+                q_vals,
+                intensity,
+                error,
+                p0=p0,
+                engine=_engine,
+            )
+
+        # Warm start from the previous frame of the same series
+        _series = (
+            sample_metadata.get(ESampleMetadataKeys.SERIES.value)
+            if self.metadata.get_warm_start()
+            else None
+        )
+        return DEFAULT_WARM_START_CACHE.fit(
+            _series,
+            _background_func.__name__,
+            0,
+            (3.0, 2.0),
+            _fit,
+        ).popt
+
+    def process_arrays(
+        self,
+        arrays: SampleArrays,
+    ) -> SampleArrays:
+        """Fit and subtract the background inside the model buffer."""
+        _background_func = self.metadata[EBackMetadataKeys.BACKGROUND_FUNC]
+        _background_coef = self.metadata[EBackMetadataKeys.BACKGROUND_COEF]
+
+        popt = self.fit_background(
+            arrays.q_values,
+            arrays.intensity,
+            arrays.intensity_error,
+            arrays.metadata,
+        )
+
+        # Same operations as `_process`, reusing the model evaluation
+        _out = np.asarray(
+            _background_func(arrays.q_values, *popt),
+            dtype=np.float64,
+        )
+        if np.may_share_memory(_out, arrays.q_values):
+            _out = _out.copy()
+        np.multiply(_background_coef, _out, out=_out)
+        np.subtract(arrays.intensity, _out, out=_out)
+
+        return SampleArrays(
+            q_values=arrays.q_values,
+            intensity=_out,
+            intensity_error=arrays.intensity_error,
+            metadata=arrays.metadata,
+            owned=arrays.owned | {ESAXSSampleKeys.INTENSITY},
+        )
+
+    @staticmethod
+    def fit_background_batch(
+        q_vals: NDArray[np.float64],
+        intensity: NDArray[np.float64],
+        error: NDArray[np.float64] | None = None,
+        background_func: Callable[
+            ...,
+            NDArray[np.float64],
+        ] = background_hyperbole,
+        background_coef: float = BACKGROUND_COEF,
+        refine_steps: int = DEFAULT_REFINE_STEPS,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """
+        Fit and subtract the background of a batch of samples.
+
+        All samples share one closed-form linearized solve, so
+        the cost is a handful of vectorized reductions over the
+        `(K, N)` arrays.
+
+        Parameters
+        ----------
+        q_vals : NDArray[np.float64]
+            q-values, shape `(N,)` or `(K, N)`.
+        intensity : NDArray[np.float64]
+            Intensities, shape `(K, N)`.
+        error : NDArray[np.float64] | None, optional
+            Intensity errors, shape `(K, N)`.
+        background_func : Callable[..., NDArray[np.float64]]
+            Linearizable background function.
+        background_coef : float, optional
+            Subtraction coefficient.
+        refine_steps : int, optional
+            Gauss-Newton refinement steps.
+
+        Returns
+        -------
+        tuple[NDArray[np.float64], NDArray[np.float64]]
+            Background parameters of shape `(K, 2)` and the
+            background-subtracted intensities of shape `(K, N)`.
+        """
+        _params = fit_linearized(
+            background_func,
+            q_vals,
+            intensity,
+            error,
+            refine_steps=refine_steps,
+        )
+        _params_2d = np.atleast_2d(_params)
+        _background = background_func(
+            q_vals,
+            _params_2d[:, 0:1],
+            _params_2d[:, 1:2],
+        )
+        _subtracted = intensity - background_coef * _background
+        return _params, _subtracted.reshape(np.shape(intensity))
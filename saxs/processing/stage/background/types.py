@@ -1,5 +1,6 @@
 from collections.abc import Callable
 from dataclasses import field
+from enum import Enum
 
 import numpy as np
 from numpy.typing import NDArray
@@ -16,12 +17,36 @@ from saxs.core.types.stage_metadata import TAbstractStageMetadata
 # See TECHNICAL_INSIGHTS_LEGACY_PEAK.md section 1.3 for details.
 BACKGROUND_COEF = 0.7
 
+# Gauss-Newton steps applied after the linearized background fit
+DEFAULT_REFINE_STEPS = 2
+
+
+class EBackgroundMode(Enum):
+    """
+    Background fitting mode of `BackgroundStage`.
+
+    Attributes
+    ----------
+    NONLINEAR : str
+        Iterative `curve_fit` of the background function.
+    LINEAR : str
+        Closed-form weighted fit in log space, see
+        `saxs.processing.stage.common.linearized`.
+    """
+
+    NONLINEAR = "nonlinear"
+    LINEAR = "linear"
+
 
 class EBackMetadataKeys(EMetadataSchemaKeys):
     """Enum of keys used in BackgroundStageMetadataDict."""
 
     BACKGROUND_FUNC = "background_func"
     BACKGROUND_COEF = "background_coef"
+    BACKGROUND_MODE = "background_mode"
+    REFINE_STEPS = "refine_steps"
+    FIT_ENGINE = "fit_engine"
+    WARM_START = "warm_start"
 
 
 class BackgroundStageMetadataDict(MetadataSchemaDict, total=False):
@@ -37,6 +62,10 @@ class BackgroundStageMetadataDict(MetadataSchemaDict, total=False):
 
     background_func: Callable[..., NDArray[np.float64]]
     background_coef: float
+    background_mode: str
+    refine_steps: int
+    fit_engine: str
+    warm_start: bool
 
 
 class BackgroundStageMetadata(
@@ -64,3 +93,31 @@ class BackgroundStageMetadata(
             EBackMetadataKeys.BACKGROUND_COEF.value: 0.3,
         },
     )
+
+    def get_mode(self) -> EBackgroundMode:
+        """Return the background fitting mode (default: nonlinear)."""
+        return EBackgroundMode(
+            self.unwrap().get(
+                EBackMetadataKeys.BACKGROUND_MODE.value,
+                EBackgroundMode.NONLINEAR.value,
+            ),
+        )
+
+    def get_refine_steps(self) -> int:
+        """Return the number of Gauss-Newton refinement steps."""
+        return int(
+            self.unwrap().get(
+                EBackMetadataKeys.REFINE_STEPS.value,
+                DEFAULT_REFINE_STEPS,
+            ),
+        )
+
+    def get_fit_engine(self) -> str | None:
+        """Return the fitting engine name, None for the default."""
+        return self.unwrap().get(EBackMetadataKeys.FIT_ENGINE.value)
+
+    def get_warm_start(self) -> bool:
+        """Return whether fits are seeded from the previous frame."""
+        return bool(
+            self.unwrap().get(EBackMetadataKeys.WARM_START.value, False),
+        )
@@ -0,0 +1,319 @@
+"""
+Module: batched_lm.
+
+Vectorized Levenberg-Marquardt solver for many small fits of the
+same model.
+
+The SAXS workload consists of thousands of 2-3 parameter fits (a
+Gaussian per peak, a background per sample). Fitting them one by
+one with `scipy.optimize.curve_fit` pays the per-call overhead
+each time. Here K problems are stacked into padded `(K, N)` arrays
+with a validity mask, and every Levenberg-Marquardt update is a
+batched NumPy operation over the K problems.
+
+The model must broadcast: it is called as `func(x, *params)` with
+`x` of shape `(K, N)` and each parameter of shape `(K, 1)`, which
+holds for all functions in `saxs.processing.functions`.
+
+Classes
+-------
+EBatchedFitStatus
+    Termination reason of one problem of a batched fit.
+BatchedFitResult
+    Result of a batched fit.
+
+Functions
+---------
+pad_windows
+    Stack variable-length windows into padded arrays and a mask.
+batched_levenberg_marquardt
+    Fit K problems of the same model at once.
+"""
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+DEFAULT_MAX_ITER = 100
+DEFAULT_FTOL = 1e-8
+DEFAULT_XTOL = 1e-8
+DEFAULT_LAMBDA = 1e-3
+
+# Damping is abandoned once lambda grows beyond this value
+_MAX_LAMBDA = 1e10
+# Relative finite-difference step, as in MINPACK
+_FD_STEP = np.sqrt(np.finfo(np.float64).eps)
+
+
+class EBatchedFitStatus(Enum):
+    """
+    Termination reason of one problem of a batched fit.
+
+    Attributes
+    ----------
+    CONVERGED : str
+        The cost reduction or the step fell below its tolerance, or
+        the fit is exact.
+    STALLED : str
+        The damping grew beyond its limit without an accepted
+        step; the parameters are the last accepted ones.
+    MAX_ITER : str
+        The iteration limit was reached first.
+    """
+
+    CONVERGED = "converged"
+    STALLED = "stalled"
+    MAX_ITER = "max_iter"
+
+
+@dataclass(frozen=True)
+class BatchedFitResult:
+    """
+    Result of a batched Levenberg-Marquardt fit.
+
+    Attributes
+    ----------
+    popt : NDArray[np.float64]
+        Fitted parameters, shape `(K, P)`.
+    cost : NDArray[np.float64]
+        Final weighted sum of squared residuals, shape `(K,)`.
+    success : NDArray[np.bool_]
+        Convergence flag per problem, shape `(K,)`; False for
+        stalled problems and those out of iterations.
+    nit : NDArray[np.int64]
+        Iterations per problem, shape `(K,)`.
+    nfev : int
+        Number of batched model evaluations.
+    status : NDArray[np.str_]
+        `EBatchedFitStatus` value per problem, shape `(K,)`.
+    """
+
+    popt: NDArray[np.float64]
+    cost: NDArray[np.float64]
+    success: NDArray[np.bool_]
+    nit: NDArray[np.int64]
+    nfev: int
+    status: NDArray[np.str_]
+
+
+def pad_windows(
+    x_windows: Sequence[NDArray[np.float64]],
+    y_windows: Sequence[NDArray[np.float64]],
+    error_windows: Sequence[NDArray[np.float64]] | None = None,
+) -> tuple[
+    NDArray[np.float64],
+    NDArray[np.float64],
+    NDArray[np.float64],
+    NDArray[np.bool_],
+]:
+    """
+    Stack variable-length windows into padded arrays.
+
+    Padding repeats the last abscissa of each window, so the model
+    stays finite there, and is excluded through the mask.
+
+    Parameters
+    ----------
+    x_windows : Sequence[NDArray[np.float64]]
+        Abscissae of the K windows.
+    y_windows : Sequence[NDArray[np.float64]]
+        Ordinates of the K windows.
+    error_windows : Sequence[NDArray[np.float64]] | None, optional
+        Standard deviations of the K windows, unit if None.
+
+    Returns
+    -------
+    tuple
+        `(x, y, error, mask)`, each of shape `(K, N_max)`.
+    """
+    _count = len(x_windows)
+    _width = max((len(_x) for _x in x_windows), default=0)
+
+    _x = np.zeros((_count, _width))
+    _y = np.zeros((_count, _width))
+    _error = np.ones((_count, _width))
+    _mask = np.zeros((_count, _width), dtype=bool)
+
+    for _k, (_xw, _yw) in enumerate(zip(x_windows, y_windows, strict=True)):
+        _n = len(_xw)
+        _x[_k, :_n] = _xw
+        _x[_k, _n:] = _xw[-1] if _n else 0.0
+        _y[_k, :_n] = _yw
+        _mask[_k, :_n] = True
+        if error_windows is not None:
+            _error[_k, :_n] = error_windows[_k]
+
+    return _x, _y, _error, _mask
+
+
+def _broadcast_bounds(
+    bounds: tuple[Any, Any],
+    shape: tuple[int, int],
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    _lower = np.broadcast_to(np.asarray(bounds[0], dtype=np.float64), shape)
+    _upper = np.broadcast_to(np.asarray(bounds[1], dtype=np.float64), shape)
+    return _lower, _upper
+
+
+def batched_levenberg_marquardt(  # noqa: PLR0913, PLR0915
+    func: Callable[..., NDArray[np.float64]],
+    x_data: NDArray[np.float64],
+    y_data: NDArray[np.float64],
+    p0: NDArray[np.float64] | Sequence[float],
+    error: NDArray[np.float64] | None = None,
+    mask: NDArray[np.bool_] | None = None,
+    bounds: tuple[Any, Any] = (-np.inf, np.inf),
+    max_iter: int = DEFAULT_MAX_ITER,
+    ftol: float = DEFAULT_FTOL,
+    xtol: float = DEFAULT_XTOL,
+) -> BatchedFitResult:
+    """
+    Fit K problems of the same model with Levenberg-Marquardt.
+
+    The Jacobian is a forward finite difference, stepping inwards
+    at active upper bounds. Box bounds are enforced by projecting
+    every trial step onto the box. Problems that have converged
+    are frozen while the others keep iterating.
+
+    Parameters
+    ----------
+    func : Callable[..., NDArray[np.float64]]
+        Broadcasting model `func(x, *params)`.
+    x_data : NDArray[np.float64]
+        Abscissae, shape `(N,)` or `(K, N)`.
+    y_data : NDArray[np.float64]
+        Ordinates, shape `(K, N)`.
+    p0 : NDArray[np.float64] | Sequence[float]
+        Initial parameters, shape `(P,)` or `(K, P)`.
+    error : NDArray[np.float64] | None, optional
+        Standard deviations of `y_data`, unit if None.
+    mask : NDArray[np.bool_] | None, optional
+        Valid points (e.g. from `pad_windows`), all if None.
+    bounds : tuple[Any, Any], optional
+        Lower and upper bounds, scalars or arrays broadcastable to
+        `(K, P)`. Unbounded by default.
+    max_iter : int, optional
+        Maximum number of iterations.
+    ftol : float, optional
+        Relative cost reduction below which a problem converges.
+    xtol : float, optional
+        Relative step size below which a problem converges.
+
+    Returns
+    -------
+    BatchedFitResult
+        Fitted parameters and convergence information.
+    """
+    _y = np.atleast_2d(np.asarray(y_data, dtype=np.float64))
+    _count = _y.shape[0]
+    _x = np.broadcast_to(np.asarray(x_data, dtype=np.float64), _y.shape)
+
+    _params = np.array(
+        np.broadcast_to(
+            np.asarray(p0, dtype=np.float64),
+            (_count, np.shape(p0)[-1]),
+        ),
+    )
+    _n_params = _params.shape[1]
+
+    _weight = np.ones_like(_y) if error is None else 1.0 / np.asarray(error)
+    if mask is not None:
+        _weight = np.where(mask, _weight, 0.0)
+
+    _lower, _upper = _broadcast_bounds(bounds, _params.shape)
+    _params = np.clip(_params, _lower, _upper)
+
+    _nfev = 0
+
+    def _residuals(params: NDArray[np.float64]) -> NDArray[np.float64]:
+        nonlocal _nfev
+        _nfev += 1
+        _model = func(_x, *(params[:, _j : _j + 1] for _j in range(_n_params)))
+        return np.where(_weight != 0.0, (_y - _model) * _weight, 0.0)
+
+    _res = _residuals(_params)
+    _cost = np.einsum("kn,kn->k", _res, _res)
+    _lambda = np.full(_count, DEFAULT_LAMBDA)
+    _active = np.ones(_count, dtype=bool)
+    _success = np.zeros(_count, dtype=bool)
+    _stalled = np.zeros(_count, dtype=bool)
+    _nit = np.zeros(_count, dtype=np.int64)
+    _jac = np.empty((*_y.shape, _n_params))
+
+    for _ in range(max_iter):
+        if not _active.any():
+            break
+
+        # --- Forward-difference Jacobian of the residuals ---
+        for _j in range(_n_params):
+            _step = _FD_STEP * np.maximum(np.abs(_params[:, _j]), 1.0)
+            _step = np.where(
+                _params[:, _j] + _step > _upper[:, _j],
+                -_step,
+                _step,
+            )
+            _shifted = _params.copy()
+            _shifted[:, _j] += _step
+            _jac[..., _j] = (_residuals(_shifted) - _res) / _step[:, None]
+
+        # --- Damped normal equations, solved for all K at once ---
+        _jtj = np.einsum("kni,knj->kij", _jac, _jac)
+        _jtr = np.einsum("kni,kn->ki", _jac, _res)
+        _diag = np.maximum(np.einsum("kii->ki", _jtj), 1e-12)
+        _damped = _jtj.copy()
+        _idx = np.arange(_n_params)
+        _damped[:, _idx, _idx] += _lambda[:, None] * _diag
+
+        _delta = -np.linalg.solve(_damped, _jtr[..., None])[..., 0]
+        _delta[~_active] = 0.0
+
+        _trial = np.clip(_params + _delta, _lower, _upper)
+        _trial_res = _residuals(_trial)
+        _trial_cost = np.einsum("kn,kn->k", _trial_res, _trial_res)
+
+        _accept = _active & (_trial_cost < _cost)
+        _nit += _active
+
+        # --- Convergence tests on accepted steps ---
+        _reduction = (_cost - _trial_cost) / np.maximum(_cost, 1e-300)
+        _step_norm = np.linalg.norm(_trial - _params, axis=1)
+        _param_norm = np.linalg.norm(_params, axis=1)
+        _converged = _accept & (
+            (_reduction < ftol) | (_step_norm < xtol * (_param_norm + xtol))
+        )
+
+        _params = np.where(_accept[:, None], _trial, _params)
+        _res = np.where(_accept[:, None], _trial_res, _res)
+        _cost = np.where(_accept, _trial_cost, _cost)
+        _lambda = np.where(_accept, _lambda / 10.0, _lambda * 10.0)
+
+        # A perfect fit also converges; a damping beyond its limit
+        # ends the iteration without convergence
+        _converged |= _active & (_cost == 0.0)
+        _stalled |= _active & ~_converged & (_lambda > _MAX_LAMBDA)
+
+        _success |= _converged
+        _active &= ~(_converged | _stalled)
+
+    _status = np.where(
+        _success,
+        EBatchedFitStatus.CONVERGED.value,
+        np.where(
+            _stalled,
+            EBatchedFitStatus.STALLED.value,
+            EBatchedFitStatus.MAX_ITER.value,
+        ),
+    )
+
+    return BatchedFitResult(
+        popt=_params,
+        cost=_cost,
+        success=_success,
+        nit=_nit,
+        nfev=_nfev,
+        status=_status,
+    )
@@ -0,0 +1,499 @@
+"""
+Module: engine.
+
+Pluggable fitting engines behind `Fitting`.
+
+A fitting engine fits one model to one data window and reports,
+besides the optimal parameters, how much work the fit took. The
+built-in backends are:
+
+- `CurveFitEngine`: `scipy.optimize.curve_fit` (legacy default).
+- `LeastSquaresEngine`: `scipy.optimize.least_squares` with a
+  chosen method ("trf", "dogbox" or "lm").
+- `LinearizedEngine`: closed-form fit of models that are linear in
+  log space, see `linearized`.
+- `BatchedLMEngine`: the vectorized Levenberg-Marquardt solver of
+  `batched_lm` applied to a single problem.
+
+Custom engines subclass `IAbstractFittingEngine` and are made
+selectable by name with `register_fitting_engine`.
+
+Classes
+-------
+EFittingEngine
+    Names of the built-in engines.
+FitResult
+    Parameters and solver statistics of a single fit.
+IAbstractFittingEngine
+    Interface of a fitting engine.
+FitEvaluationLimitError
+    Fit stopped by its evaluation limit.
+
+Functions
+---------
+register_fitting_engine
+    Register an engine factory under a name.
+get_fitting_engine
+    Build a registered engine by name.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+from inspect import signature
+from typing import Any, ClassVar
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.optimize import (  # pyright: ignore[reportMissingTypeStubs]
+    curve_fit,  # pyright: ignore[reportUnknownVariableType]
+    least_squares,  # pyright: ignore[reportUnknownVariableType]
+)
+
+from saxs.processing.stage.common.batched_lm import (
+    batched_levenberg_marquardt,
+)
+from saxs.processing.stage.common.linearized import fit_linearized
+
+Bounds = tuple[list[Any], ...] | tuple[Any, ...]
+
+
+class EFittingEngine(Enum):
+    """Names of the built-in fitting engines."""
+
+    CURVE_FIT = "curve_fit"
+    LEAST_SQUARES = "least_squares"
+    LINEAR = "linear"
+    BATCHED_LM = "batched_lm"
+
+
+@dataclass(frozen=True)
+class FitResult:
+    """
+    Result of a single fit.
+
+    Attributes
+    ----------
+    popt : NDArray[np.float64]
+        Optimal parameters.
+    pcov : NDArray[np.float64]
+        Covariance of the parameters, NaN if not estimated.
+    nfev : int
+        Number of model evaluations.
+    nit : int | None
+        Number of iterations, None if not reported.
+    success : bool
+        Whether the solver converged.
+    status : str
+        Backend-specific status or message.
+    """
+
+    popt: NDArray[np.float64]
+    pcov: NDArray[np.float64]
+    nfev: int
+    nit: int | None
+    success: bool
+    status: str
+
+
+def _default_p0(
+    func: Callable[..., NDArray[np.float64]],
+    p0: tuple[float, ...] | None,
+    bounds: Bounds,
+) -> NDArray[np.float64]:
+    """
+    Return p0 or a feasible default, as `curve_fit` does.
+
+    Ones are used, moved to the middle of the box when both
+    bounds are finite, or one unit inside a single finite bound.
+    """
+    if p0 is not None:
+        return np.asarray(p0, dtype=np.float64)
+
+    _n_params = len(signature(func).parameters) - 1
+    _lower = np.broadcast_to(np.asarray(bounds[0], dtype=float), _n_params)
+    _upper = np.broadcast_to(np.asarray(bounds[1], dtype=float), _n_params)
+    _lower_finite = np.isfinite(_lower)
+    _upper_finite = np.isfinite(_upper)
+
+    _p0 = np.ones(_n_params)
+    _both = _lower_finite & _upper_finite
+    _p0[_both] = 0.5 * (_lower[_both] + _upper[_both])
+    _only_lower = _lower_finite & ~_upper_finite
+    _p0[_only_lower] = _lower[_only_lower] + 1.0
+    _only_upper = ~_lower_finite & _upper_finite
+    _p0[_only_upper] = _upper[_only_upper] - 1.0
+    return _p0
+
+
+class FitEvaluationLimitError(RuntimeError):
+    """Fit stopped by its evaluation limit without converging."""
+
+
+class _CountedModel:
+    """Model wrapper counting its evaluations."""
+
+    def __init__(self, func: Callable[..., NDArray[np.float64]]):
+        self.func = func
+        self.calls = 0
+
+    def __call__(
+        self,
+        x: NDArray[np.float64],
+        *params: float,
+    ) -> NDArray[np.float64]:
+        self.calls += 1
+        return self.func(x, *params)
+
+
+def _nan_cov(n_params: int) -> NDArray[np.float64]:
+    return np.full((n_params, n_params), np.nan)
+
+
+class IAbstractFittingEngine(ABC):
+    """
+    Interface of a fitting engine.
+
+    Attributes
+    ----------
+    name : str
+        Engine name used in statistics and the registry.
+    """
+
+    name: ClassVar[str] = "abstract"
+
+    @abstractmethod
+    def fit(
+        self,
+        func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,
+        bounds: Bounds = (-np.inf, np.inf),
+        max_nfev: int | None = None,
+    ) -> FitResult:
+        """
+        Fit `func(x, *params)` to the data.
+
+        Parameters
+        ----------
+        func : Callable[..., NDArray[np.float64]]
+            Model function.
+        x_data : NDArray[np.float64]
+            Abscissae.
+        y_data : NDArray[np.float64]
+            Ordinates.
+        error : NDArray[np.float64] | None
+            Standard deviations of `y_data`.
+        p0 : tuple[float, ...] | None
+            Initial parameters.
+        bounds : Bounds, optional
+            Lower and upper parameter bounds.
+        max_nfev : int | None, optional
+            Maximum number of model evaluations, the backend default
+            if None. Engines may treat it approximately. A fit
+            stopped by it returns an unsuccessful result with its
+            `nfev`, or raises `FitEvaluationLimitError`.
+
+        Returns
+        -------
+        FitResult
+            Parameters and solver statistics.
+        """
+
+
+class CurveFitEngine(IAbstractFittingEngine):
+    """Engine backed by `scipy.optimize.curve_fit`."""
+
+    name: ClassVar[str] = EFittingEngine.CURVE_FIT.value
+
+    def fit(
+        self,
+        func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,
+        bounds: Bounds = (-np.inf, np.inf),
+        max_nfev: int | None = None,
+    ) -> FitResult:
+        """
+        Fit with `curve_fit` and its full output.
+
+        Raises
+        ------
+        FitEvaluationLimitError
+            If `curve_fit` fails after `max_nfev` model evaluations.
+        """
+        if max_nfev is None:
+            return self._curve_fit(func, x_data, y_data, error, p0, bounds)
+
+        # "lm" (unbounded) takes maxfev, "trf" takes max_nfev
+        _unbounded = np.all(np.isneginf(bounds[0])) and np.all(
+            np.isposinf(bounds[1]),
+        )
+        # curve_fit raises on the limit without reporting it, so the
+        # evaluations are counted; the wrapper needs an explicit p0
+        _model = _CountedModel(func)
+        try:
+            return self._curve_fit(
+                _model,
+                x_data,
+                y_data,
+                error,
+                tuple(_default_p0(func, p0, bounds)),
+                bounds,
+                **{"maxfev" if _unbounded else "max_nfev": max_nfev},
+            )
+        except RuntimeError as e:
+            if _model.calls < max_nfev:
+                raise
+            msg = f"Fit stopped after {_model.calls} evaluations."
+            raise FitEvaluationLimitError(msg) from e
+
+    @staticmethod
+    def _curve_fit(  # noqa: PLR0913
+        func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,
+        bounds: Bounds,
+        **limit: int,
+    ) -> FitResult:
+        popt, pcov, infodict, mesg, ier = curve_fit(  # pyright: ignore[reportUnknownVariableType]
+            f=func,
+            xdata=x_data,
+            ydata=y_data,
+            p0=p0,
+            bounds=bounds,
+            sigma=error,
+            full_output=True,
+            **limit,
+        )
+
+        return FitResult(
+            popt=popt,
+            pcov=pcov,
+            nfev=int(infodict["nfev"]),
+            nit=None,
+            success=ier > 0,
+            status=str(mesg),
+        )
+
+
+class LeastSquaresEngine(IAbstractFittingEngine):
+    """
+    Engine backed by `scipy.optimize.least_squares`.
+
+    Parameters
+    ----------
+    method : str, optional
+        Solver method, "trf" (default), "dogbox" or "lm". The
+        "lm" method does not support bounds.
+    """
+
+    name: ClassVar[str] = EFittingEngine.LEAST_SQUARES.value
+
+    def __init__(self, method: str = "trf"):
+        self.method = method
+
+    def fit(
+        self,
+        func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,
+        bounds: Bounds = (-np.inf, np.inf),
+        max_nfev: int | None = None,
+    ) -> FitResult:
+        """Fit the weighted residuals with `least_squares`."""
+        _p0 = _default_p0(func, p0, bounds)
+        _weight = 1.0 if error is None else 1.0 / np.asarray(error)
+
+        def _residuals(params: NDArray[np.float64]) -> NDArray[np.float64]:
+            return (func(x_data, *params) - y_data) * _weight
+
+        _result = least_squares(  # pyright: ignore[reportUnknownVariableType]
+            _residuals,
+            _p0,
+            bounds=bounds,
+            method=self.method,
+            max_nfev=max_nfev,
+        )
+
+        # Covariance from the Jacobian, as curve_fit computes it
+        _, _singular, _vt = np.linalg.svd(_result.jac, full_matrices=False)
+        _threshold = (
+            np.finfo(np.float64).eps * max(_result.jac.shape) * _singular[0]
+        )
+        _singular = _singular[_singular > _threshold]
+        _vt = _vt[: _singular.size]
+        _pcov = (_vt.T / _singular**2) @ _vt
+
+        return FitResult(
+            popt=_result.x,
+            pcov=_pcov,
+            nfev=int(_result.nfev),
+            nit=None if _result.njev is None else int(_result.njev),
+            success=bool(_result.success),
+            status=str(_result.message),
+        )
+
+
+class LinearizedEngine(IAbstractFittingEngine):
+    """
+    Closed-form engine for models linear in log space.
+
+    Parameters
+    ----------
+    refine_steps : int, optional
+        Gauss-Newton refinement steps (default: 1).
+    """
+
+    name: ClassVar[str] = EFittingEngine.LINEAR.value
+
+    def __init__(self, refine_steps: int = 1):
+        self.refine_steps = refine_steps
+
+    def fit(
+        self,
+        func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,  # noqa: ARG002
+        bounds: Bounds = (-np.inf, np.inf),
+        max_nfev: int | None = None,  # noqa: ARG002
+    ) -> FitResult:
+        """Fit in closed form; `p0` and `max_nfev` are not needed."""
+        _popt = np.clip(
+            fit_linearized(
+                func,
+                x_data,
+                y_data,
+                error,
+                refine_steps=self.refine_steps,
+            ),
+            bounds[0],
+            bounds[1],
+        )
+
+        _success = bool(np.all(np.isfinite(_popt)))
+
+        return FitResult(
+            popt=_popt,
+            pcov=_nan_cov(len(_popt)),
+            nfev=self.refine_steps,
+            nit=self.refine_steps,
+            success=_success,
+            status="closed form" if _success else "singular normal equations",
+        )
+
+
+class BatchedLMEngine(IAbstractFittingEngine):
+    """Vectorized Levenberg-Marquardt applied to a single problem."""
+
+    name: ClassVar[str] = EFittingEngine.BATCHED_LM.value
+
+    def fit(
+        self,
+        func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,
+        bounds: Bounds = (-np.inf, np.inf),
+        max_nfev: int | None = None,
+    ) -> FitResult:
+        """
+        Fit with `batched_levenberg_marquardt` and K = 1.
+
+        `max_nfev` is converted to iterations, each costing one
+        model evaluation per parameter plus one.
+        """
+        _p0 = _default_p0(func, p0, bounds)
+        _options: dict[str, int] = {}
+        if max_nfev is not None:
+            _options["max_iter"] = max(1, max_nfev // (_p0.size + 1))
+
+        _result = batched_levenberg_marquardt(
+            func,
+            x_data,
+            np.asarray(y_data)[None, :],
+            _p0,
+            error=None if error is None else np.asarray(error)[None, :],
+            bounds=(bounds[0], bounds[1]),
+            **_options,
+        )
+
+        return FitResult(
+            popt=_result.popt[0],
+            pcov=_nan_cov(_result.popt.shape[1]),
+            nfev=_result.nfev,
+            nit=int(_result.nit[0]),
+            success=bool(_result.success[0]),
+            status=str(_result.status[0]),
+        )
+
+
+FITTING_ENGINES: dict[str, Callable[..., IAbstractFittingEngine]] = {
+    EFittingEngine.CURVE_FIT.value: CurveFitEngine,
+    EFittingEngine.LEAST_SQUARES.value: LeastSquaresEngine,
+    EFittingEngine.LINEAR.value: LinearizedEngine,
+    EFittingEngine.BATCHED_LM.value: BatchedLMEngine,
+}
+
+
+def register_fitting_engine(
+    name: str,
+    factory: Callable[..., IAbstractFittingEngine],
+) -> None:
+    """
+    Register a fitting engine factory under a name.
+
+    Parameters
+    ----------
+    name : str
+        Name used in stage metadata.
+    factory : Callable[..., IAbstractFittingEngine]
+        Engine class or factory accepting the engine options.
+    """
+    FITTING_ENGINES[name] = factory
+
+
+def get_fitting_engine(
+    name: str,
+    **options: Any,
+) -> IAbstractFittingEngine:
+    """
+    Build a registered fitting engine.
+
+    Parameters
+    ----------
+    name : str
+        Registered engine name.
+    **options : Any
+        Engine options, e.g. `method` for "least_squares".
+
+    Returns
+    -------
+    IAbstractFittingEngine
+        The engine instance.
+
+    Raises
+    ------
+    ValueError
+        If no engine is registered under `name`.
+    """
+    _factory = FITTING_ENGINES.get(name)
+    if _factory is None:
+        msg = (
+            f"Unknown fitting engine '{name}'. "
+            f"Available: {sorted(FITTING_ENGINES)}."
+        )
+        raise ValueError(msg)
+    return _factory(**options)
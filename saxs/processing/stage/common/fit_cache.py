@@ -0,0 +1,253 @@
+"""
+Module: fit_cache.
+
+Content-addressed memoization of fit results.
+
+Parameter sweeps and re-runs fit the same q/I/dI windows with the
+same model again and again. `FitCache` keys a fit on a BLAKE2b
+hash of the window bytes, the model identity, the engine, the
+bounds and `p0`, and stores the `FitResult` in a bounded in-memory
+LRU with an optional on-disk tier.
+
+Model identity covers the closures built per peak by the stages:
+a function is identified by its qualified name plus the values of
+its closure cells and defaults, a `functools.partial` by its
+function and bound arguments (see `saxs.core.types.digest`). An
+object may also provide its own identity through a `cache_key`
+attribute or method. Models whose identity cannot be established
+are never cached.
+
+Classes
+-------
+FitCache
+    Bounded LRU of fit results with an optional disk tier.
+"""
+
+import hashlib
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from saxs.core.types.digest import ContentIdentityError, update_digest
+from saxs.processing.stage.common.engine import (
+    FitResult,
+    IAbstractFittingEngine,
+)
+
+DEFAULT_FIT_CACHE_SIZE = 4096
+
+
+class FitCache:
+    """
+    Bounded LRU cache of fit results with an optional disk tier.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of in-memory entries.
+    directory : str | Path | None, optional
+        Directory of the on-disk tier (one `.npz` file per entry),
+        disabled if None.
+
+    Attributes
+    ----------
+    hits : int
+        Lookups served from memory.
+    disk_hits : int
+        Lookups served from the disk tier.
+    misses : int
+        Lookups that required a fit.
+    uncacheable : int
+        Calls whose model identity could not be established.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_FIT_CACHE_SIZE,
+        directory: str | Path | None = None,
+    ):
+        self.maxsize = maxsize
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._entries: OrderedDict[str, FitResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    @staticmethod
+    def make_key(  # noqa: PLR0913
+        func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,
+        bounds: tuple[Any, ...],
+        engine: IAbstractFittingEngine,
+    ) -> str | None:
+        """
+        Return the content key of a fit, None if not cacheable.
+
+        Returns
+        -------
+        str | None
+            Hex digest of the window, model, engine, bounds and
+            `p0`.
+        """
+        _digest = hashlib.blake2b(digest_size=20)
+        try:
+            for _array in (x_data, y_data, error):
+                update_digest(
+                    _digest,
+                    None if _array is None else np.asarray(_array),
+                )
+            update_digest(_digest, func)
+            update_digest(_digest, p0)
+            update_digest(_digest, tuple(bounds))
+            update_digest(_digest, engine.name)
+            update_digest(_digest, vars(engine))
+        except ContentIdentityError:
+            return None
+        return _digest.hexdigest()
+
+    def get(self, key: str) -> FitResult | None:
+        """Return the cached result for `key`, None on a miss."""
+        with self._lock:
+            _result = self._entries.get(key)
+            if _result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _result
+
+        _result = self._load(key)
+
+        with self._lock:
+            if _result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._insert(key, _result)
+            return _result
+
+    def put(self, key: str, result: FitResult) -> None:
+        """Store a result in memory and, if enabled, on disk."""
+        with self._lock:
+            self._insert(key, result)
+        self._store(key, result)
+
+    def clear(self) -> None:
+        """Drop in-memory entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+            self.uncacheable = 0
+
+    def get_counters(self) -> dict[str, int]:
+        """Return hit, miss and size counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "uncacheable": self.uncacheable,
+                "size": len(self._entries),
+            }
+
+    def fit(
+        self,
+        key: str | None,
+        fit: Callable[[], FitResult],
+    ) -> FitResult:
+        """
+        Return the cached result for `key` or compute and store it.
+
+        Parameters
+        ----------
+        key : str | None
+            Key from `make_key`; None bypasses the cache.
+        fit : Callable[[], FitResult]
+            Fit to run on a miss.
+
+        Returns
+        -------
+        FitResult
+            Cached or freshly computed result.
+        """
+        if key is None:
+            with self._lock:
+                self.uncacheable += 1
+            return fit()
+
+        _result = self.get(key)
+        if _result is None:
+            _result = fit()
+            self.put(key, _result)
+        return _result
+
+    def _insert(self, key: str, result: FitResult) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path | None:
+        if self.directory is None:
+            return None
+        return self.directory / f"{key}.npz"
+
+    def _load(self, key: str) -> FitResult | None:
+        """Read an entry from disk; a corrupt entry is deleted."""
+        _path = self._path(key)
+        if _path is None or not _path.exists():
+            return None
+        try:
+            with np.load(_path) as _data:
+                _nit = int(_data["nit"])
+                return FitResult(
+                    popt=_data["popt"],
+                    pcov=_data["pcov"],
+                    nfev=int(_data["nfev"]),
+                    nit=None if _nit < 0 else _nit,
+                    success=bool(_data["success"]),
+                    status=str(_data["status"]),
+                )
+        except (zipfile.BadZipFile, KeyError, ValueError):
+            _path.unlink(missing_ok=True)
+            return None
+        except OSError:
+            return None
+
+    def _store(self, key: str, result: FitResult) -> None:
+        _path = self._path(key)
+        if _path is None:
+            return
+        # A unique name per writer, so that concurrent processes
+        # storing the same key never write into one file
+        with tempfile.NamedTemporaryFile(
+            dir=_path.parent,
+            prefix=f"{key}.",
+            suffix=".tmp",
+            delete=False,
+        ) as _file:
+            np.savez(
+                _file,
+                popt=result.popt,
+                pcov=result.pcov,
+                nfev=result.nfev,
+                nit=-1 if result.nit is None else result.nit,
+                success=result.success,
+                status=result.status,
+            )
+        Path(_file.name).replace(_path)
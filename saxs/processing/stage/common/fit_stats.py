@@ -0,0 +1,135 @@
+"""
+Module: fit_stats.
+
+Collection of per-call fitting statistics.
+
+Every call dispatched through `Fitting.fit` produces a `FitRecord`
+(engine, model, function evaluations, iterations, convergence
+status and wall time). A `FitStats` collector accumulates the
+records and summarizes them per engine and model, which shows
+which fits dominate the processing cost.
+
+Classes
+-------
+FitRecord
+    Statistics of a single fit call.
+FitStats
+    Collector of fit records with per-model aggregation.
+"""
+
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class FitRecord:
+    """
+    Statistics of a single fit call.
+
+    Attributes
+    ----------
+    engine : str
+        Name of the fitting engine.
+    model : str
+        Name of the fitted model function.
+    nfev : int
+        Number of model evaluations.
+    nit : int | None
+        Number of iterations, None if the backend does not
+        report it.
+    success : bool
+        Whether the fit converged.
+    status : str
+        Backend-specific status or message.
+    wall_time : float
+        Wall time of the call in seconds.
+    """
+
+    engine: str
+    model: str
+    nfev: int
+    nit: int | None
+    success: bool
+    status: str
+    wall_time: float
+
+
+class FitStats:
+    """
+    Thread-safe collector of `FitRecord` objects.
+
+    Attributes
+    ----------
+    _records : list[FitRecord]
+        Records in call order.
+    """
+
+    def __init__(self) -> None:
+        self._records: list[FitRecord] = []
+        self._lock = threading.Lock()
+
+    def record(self, fit_record: FitRecord) -> None:
+        """Append a fit record."""
+        with self._lock:
+            self._records.append(fit_record)
+
+    def get_records(self) -> list[FitRecord]:
+        """Return a copy of the collected records."""
+        with self._lock:
+            return list(self._records)
+
+    def reset(self) -> None:
+        """Drop all collected records."""
+        with self._lock:
+            self._records.clear()
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """
+        Aggregate records per engine and model.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            Mapping `"engine:model"` to call count, failures,
+            total and mean nfev, total iterations and total and
+            mean wall time, sorted by total wall time.
+        """
+        _summary: dict[str, dict[str, Any]] = {}
+
+        for _record in self.get_records():
+            _key = f"{_record.engine}:{_record.model}"
+            _entry = _summary.setdefault(
+                _key,
+                {
+                    "calls": 0,
+                    "failures": 0,
+                    "nfev": 0,
+                    "nit": 0,
+                    "wall_time": 0.0,
+                },
+            )
+            _entry["calls"] += 1
+            _entry["failures"] += not _record.success
+            _entry["nfev"] += _record.nfev
+            _entry["nit"] += _record.nit or 0
+            _entry["wall_time"] += _record.wall_time
+
+        for _entry in _summary.values():
+            _entry["mean_nfev"] = _entry["nfev"] / _entry["calls"]
+            _entry["mean_wall_time"] = _entry["wall_time"] / _entry["calls"]
+
+        return dict(
+            sorted(
+                _summary.items(),
+                key=lambda _item: _item[1]["wall_time"],
+                reverse=True,
+            ),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the records and summary as plain data."""
+        return {
+            "records": [asdict(_record) for _record in self.get_records()],
+            "summary": self.summary(),
+        }
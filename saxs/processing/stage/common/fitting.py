@@ -3,20 +3,393 @@ Module: fitting.
 
 The module relies on `scipy.optimize.curve_fit` for fitting and
 supports logging of intermediate and final processing states.
+`Fitting.curve_fit_batch` fits many windows of the same model at
+once with the vectorized Levenberg-Marquardt solver in
+`batched_lm`. It is a library entry point: the stages do not call
+it, since `ProcessPeakStage` fits one peak at a time on the residual
+of the previous subtraction.
+
+Single fits are dispatched to a pluggable fitting engine (see
+`engine`). The default engine is configured class-wide with
+`Fitting.configure` and can be overridden per call, e.g. from stage
+metadata. When statistics collection is enabled, every call is
+recorded into `Fitting.get_stats()`. When a `FitCache` is
+configured, repeated fits of identical windows are served from it
+without calling the engine.
+
+Under a scheduler budget (see `saxs.core.pipeline.scheduler.budget`)
+single fits are limited to the budget's function evaluations; a fit
+running out of them raises `BudgetExhaustedError`.
+
+Engine calls, failures and function evaluations are counted per
+engine in the default metrics registry (see `saxs.metrics`); cache
+hits do not call the engine and are not counted.
+
+The default engine and its options are registered as a settings
+component of kernel result cache keys (see
+`saxs.core.kernel.result_cache`).
 """
 
+import time
 from collections.abc import Callable
-from typing import Any
+from enum import Enum
+from typing import Any, Literal
 
 import numpy as np
 from numpy.typing import NDArray
-from scipy.optimize import (  # pyright: ignore[reportMissingTypeStubs]
-    curve_fit,  # pyright: ignore[reportUnknownVariableType]
+
+from saxs.core.kernel.result_cache import register_settings_component
+from saxs.core.pipeline.scheduler.budget import (
+    BudgetExhaustedError,
+    get_fit_evaluation_limit,
+)
+from saxs.metrics.registry import DEFAULT_REGISTRY
+from saxs.processing.stage.common.batched_lm import (
+    BatchedFitResult,
+    batched_levenberg_marquardt,
 )
+from saxs.processing.stage.common.engine import (
+    CurveFitEngine,
+    FitEvaluationLimitError,
+    FitResult,
+    IAbstractFittingEngine,
+    get_fitting_engine,
+)
+from saxs.processing.stage.common.fit_cache import FitCache
+from saxs.processing.stage.common.fit_stats import FitRecord, FitStats
+from saxs.tracing.tracer import get_active_tracer
+
+FIT_CALLS = DEFAULT_REGISTRY.counter(
+    "saxs_fit_calls_total",
+    "Engine fit calls.",
+    ("engine",),
+)
+FIT_FAILURES = DEFAULT_REGISTRY.counter(
+    "saxs_fit_failures_total",
+    "Engine fit calls not converging or raising.",
+    ("engine",),
+)
+FIT_EVALUATIONS = DEFAULT_REGISTRY.counter(
+    "saxs_fit_evaluations_total",
+    "Model evaluations of engine fit calls.",
+    ("engine",),
+)
+
+
+class _Unset(Enum):
+    """Marker of a `Fitting.configure` argument left unchanged."""
+
+    UNSET = "unset"
+
+
+def _record_fit(engine: str, result: FitResult | None) -> None:
+    """Count an engine call, failed if `result` is None."""
+    FIT_CALLS.labels(engine).inc()
+    if result is None or not result.success:
+        FIT_FAILURES.labels(engine).inc()
+    if result is not None:
+        FIT_EVALUATIONS.labels(engine).inc(result.nfev)
 
 
 class Fitting:
-    """Fit methods class from scipy."""
+    """
+    Fit methods class from scipy.
+
+    Attributes
+    ----------
+    _engine : IAbstractFittingEngine
+        Default fitting engine.
+    _collect_stats : bool
+        Whether fit calls are recorded.
+    _stats : FitStats
+        Collector of fit records.
+    _cache : FitCache | None
+        Memoization of fit results, disabled if None.
+    """
+
+    _engine: IAbstractFittingEngine = CurveFitEngine()
+    _collect_stats: bool = False
+    _stats: FitStats = FitStats()
+    _cache: FitCache | None = None
+
+    @classmethod
+    def configure(
+        cls,
+        engine: str | IAbstractFittingEngine | None = None,
+        collect_stats: bool | None = None,
+        cache: FitCache | Literal[_Unset.UNSET] | None = _Unset.UNSET,
+        **engine_options: Any,
+    ) -> None:
+        """
+        Configure global fitting settings.
+
+        Only the given settings change; the others keep their
+        current value.
+
+        Parameters
+        ----------
+        engine : str | IAbstractFittingEngine | None, optional
+            Default engine, by registered name or instance. Keeps
+            the current engine if None.
+        collect_stats : bool | None, optional
+            Record every fit call. Keeps the current setting if
+            None.
+        cache : FitCache | None, optional
+            Memoize fit results in this cache, None disables the
+            cache. Keeps the current cache if not given.
+        **engine_options : Any
+            Options of the engine when given by name.
+        """
+        if engine is not None:
+            cls._engine = cls.resolve_engine(engine, **engine_options)
+        if collect_stats is not None:
+            cls._collect_stats = collect_stats
+        if cache is not _Unset.UNSET:
+            cls._cache = cache
+
+    @classmethod
+    def get_settings(cls) -> tuple[str, dict[str, Any]]:
+        """Return the default engine name and options."""
+        return cls._engine.name, vars(cls._engine)
+
+    @classmethod
+    def get_stats(cls) -> FitStats:
+        """Return the collector of fit records."""
+        return cls._stats
+
+    @classmethod
+    def get_cache(cls) -> FitCache | None:
+        """Return the configured fit cache, if any."""
+        return cls._cache
+
+    @classmethod
+    def resolve_engine(
+        cls,
+        engine: str | IAbstractFittingEngine | None,
+        **engine_options: Any,
+    ) -> IAbstractFittingEngine:
+        """
+        Return an engine instance for a name, instance or None.
+
+        None resolves to the configured default engine.
+        """
+        if engine is None:
+            return cls._engine
+        if isinstance(engine, str):
+            return get_fitting_engine(engine, **engine_options)
+        return engine
+
+    @classmethod
+    def fit(
+        cls,
+        _func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,
+        bounds: tuple[list[Any], ...] | tuple[Any, ...] = (-np.inf, np.inf),
+        engine: str | IAbstractFittingEngine | None = None,
+    ) -> FitResult:
+        """
+        Fit a model with the selected engine.
+
+        Parameters
+        ----------
+        _func : Callable[..., NDArray[np.float64]]
+            Model function.
+        x_data : NDArray[np.float64]
+            Abscissae.
+        y_data : NDArray[np.float64]
+            Ordinates.
+        error : NDArray[np.float64] | None
+            Standard deviations of `y_data`.
+        p0 : tuple[float, ...] | None
+            Initial parameters.
+        bounds : tuple, optional
+            Lower and upper parameter bounds.
+        engine : str | IAbstractFittingEngine | None, optional
+            Engine for this call, the configured default if None.
+
+        Returns
+        -------
+        FitResult
+            Parameters and solver statistics.
+        """
+        _engine = cls.resolve_engine(engine)
+
+        _tracer = get_active_tracer()
+        if _tracer is not None:
+            with _tracer.span(
+                getattr(_func, "__name__", type(_func).__name__),
+                "fit",
+                engine=_engine.name,
+                points=len(x_data),
+            ):
+                return cls._fit(
+                    _engine,
+                    _func,
+                    x_data,
+                    y_data,
+                    error,
+                    p0,
+                    bounds,
+                )
+
+        return cls._fit(_engine, _func, x_data, y_data, error, p0, bounds)
+
+    @classmethod
+    def _fit(  # noqa: PLR0913
+        cls,
+        _engine: IAbstractFittingEngine,
+        _func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,
+        bounds: tuple[list[Any], ...] | tuple[Any, ...],
+    ) -> FitResult:
+        """Fit through the cache if one is configured."""
+        if cls._cache is None:
+            return cls._run_engine(
+                _engine,
+                _func,
+                x_data,
+                y_data,
+                error,
+                p0,
+                bounds,
+            )
+
+        return cls._cache.fit(
+            FitCache.make_key(
+                _func,
+                x_data,
+                y_data,
+                error,
+                p0,
+                bounds,
+                _engine,
+            ),
+            lambda: cls._run_engine(
+                _engine,
+                _func,
+                x_data,
+                y_data,
+                error,
+                p0,
+                bounds,
+            ),
+        )
+
+    @classmethod
+    def _run_engine(  # noqa: PLR0913
+        cls,
+        engine: IAbstractFittingEngine,
+        _func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,
+        bounds: tuple[list[Any], ...] | tuple[Any, ...],
+    ) -> FitResult:
+        """Call the engine, recording the fit if stats are enabled."""
+        _limit = get_fit_evaluation_limit()
+        if _limit is not None:
+            return cls._run_limited(
+                engine,
+                _limit,
+                _func,
+                x_data,
+                y_data,
+                error,
+                p0,
+                bounds,
+            )
+
+        _start = time.perf_counter()
+        try:
+            _result = engine.fit(_func, x_data, y_data, error, p0, bounds)
+        except Exception:
+            _record_fit(engine.name, None)
+            raise
+        _elapsed = time.perf_counter() - _start
+
+        _record_fit(engine.name, _result)
+        cls._record_stats(engine, _func, _result, _elapsed)
+        return _result
+
+    @classmethod
+    def _run_limited(  # noqa: PLR0913
+        cls,
+        engine: IAbstractFittingEngine,
+        limit: int,
+        _func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: tuple[float, ...] | None,
+        bounds: tuple[list[Any], ...] | tuple[Any, ...],
+    ) -> FitResult:
+        """
+        Call the engine with at most `limit` function evaluations.
+
+        Raises
+        ------
+        BudgetExhaustedError
+            If the fit stops at the evaluation limit without
+            converging. Other engine errors propagate unchanged.
+        """
+        _start = time.perf_counter()
+        try:
+            _result = engine.fit(
+                _func,
+                x_data,
+                y_data,
+                error,
+                p0,
+                bounds,
+                max_nfev=limit,
+            )
+        except FitEvaluationLimitError as e:
+            _record_fit(engine.name, None)
+            msg = f"Fit exceeded the budget of {limit} evaluations."
+            raise BudgetExhaustedError(msg) from e
+        except Exception:
+            _record_fit(engine.name, None)
+            raise
+        _elapsed = time.perf_counter() - _start
+
+        _record_fit(engine.name, _result)
+        cls._record_stats(engine, _func, _result, _elapsed)
+
+        if not _result.success and _result.nfev >= limit:
+            msg = f"Fit exceeded the budget of {limit} evaluations."
+            raise BudgetExhaustedError(msg)
+
+        return _result
+
+    @classmethod
+    def _record_stats(
+        cls,
+        engine: IAbstractFittingEngine,
+        _func: Callable[..., NDArray[np.float64]],
+        result: FitResult,
+        elapsed: float,
+    ) -> None:
+        """Record a fit call if stats are enabled."""
+        if not cls._collect_stats:
+            return
+        cls._stats.record(
+            FitRecord(
+                engine=engine.name,
+                model=getattr(_func, "__name__", type(_func).__name__),
+                nfev=result.nfev,
+                nit=result.nit,
+                success=result.success,
+                status=result.status,
+                wall_time=elapsed,
+            ),
+        )
 
     @staticmethod
     def curve_fit(
@@ -26,6 +399,7 @@ class Fitting:
         error: NDArray[np.float64],
         p0: tuple[float, ...] | None,
         bounds: tuple[list[Any], ...] | tuple[Any, ...] = (-np.inf, np.inf),
+        engine: str | IAbstractFittingEngine | None = None,
     ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
         """
         Fit the background function to intensity data.
@@ -42,6 +416,8 @@ class Fitting:
             Array of measured intensities.
         error : NDArray[np.float64]
             Array of intensity measurement errors.
+        engine : str | IAbstractFittingEngine | None, optional
+            Fitting engine, the configured default if None.
 
         Returns
         -------
@@ -49,15 +425,66 @@ class Fitting:
             popt : Optimal parameters for the background function.
             pcov : Covariance of the fitted parameters.
         """
-        res_: tuple[NDArray[np.float64], NDArray[np.float64]] = curve_fit(  # pyright: ignore[reportUnknownVariableType]
-            f=_func,
-            xdata=x_data,
-            ydata=y_data,
-            p0=p0,
-            bounds=bounds,
-            sigma=error,
+        _result = Fitting.fit(
+            _func,
+            x_data,
+            y_data,
+            error,
+            p0,
+            bounds,
+            engine=engine,
         )
 
-        popt, _pcov = res_  # pyright: ignore[reportUnknownVariableType]
+        return _result.popt, _result.pcov
 
-        return popt, _pcov  # pyright: ignore[reportUnknownVariableType]
+    @staticmethod
+    def curve_fit_batch(
+        _func: Callable[..., NDArray[np.float64]],
+        x_data: NDArray[np.float64],
+        y_data: NDArray[np.float64],
+        error: NDArray[np.float64] | None,
+        p0: NDArray[np.float64] | tuple[float, ...],
+        bounds: tuple[Any, ...] = (-np.inf, np.inf),
+        mask: NDArray[np.bool_] | None = None,
+    ) -> BatchedFitResult:
+        """
+        Fit K problems of the same model at once.
+
+        Parameters
+        ----------
+        _func : Callable[..., NDArray[np.float64]]
+            Broadcasting model function.
+        x_data : NDArray[np.float64]
+            Abscissae, shape `(N,)` or `(K, N)`.
+        y_data : NDArray[np.float64]
+            Ordinates, shape `(K, N)`.
+        error : NDArray[np.float64] | None
+            Standard deviations, shape `(K, N)`.
+        p0 : NDArray[np.float64] | tuple[float, ...]
+            Initial parameters, shape `(P,)` or `(K, P)`.
+        bounds : tuple[Any, ...], optional
+            Box bounds broadcastable to `(K, P)`.
+        mask : NDArray[np.bool_] | None, optional
+            Valid points of padded windows.
+
+        Returns
+        -------
+        BatchedFitResult
+            Fitted parameters of shape `(K, P)` and convergence
+            flags.
+        """
+        return batched_levenberg_marquardt(
+            _func,
+            x_data,
+            y_data,
+            p0,
+            error=error,
+            mask=mask,
+            bounds=(bounds[0], bounds[1]),
+        )
+
+
+register_settings_component(
+    "fitting",
+    lambda _sample: Fitting.get_settings(),
+)
@@ -0,0 +1,310 @@
+"""
+Module: linearized.
+
+Closed-form weighted least-squares fits of two-parameter models
+that become linear after a logarithmic transform.
+
+A power law `b * x^-a` is linear in log-log space and an
+exponential `b * exp(a * x)` is linear in semi-log space, so both
+can be fitted by a single weighted linear solve instead of an
+iterative `curve_fit`. The solve is written with batched normal
+equations and therefore fits a whole batch of K samples at once.
+Optional Gauss-Newton steps in linear space remove the bias
+introduced by fitting in log space.
+
+Classes
+-------
+LinearizedModel
+    Description of a model that is linear after a transform.
+
+Functions
+---------
+get_linearized_model
+    Return the linearized description of a model function.
+fit_linearized
+    Fit a linearizable model to one sample or a batch of samples.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from saxs.processing.functions import (
+    background_exponent,
+    background_hyperbole,
+)
+
+# Relative determinant below which a 2x2 system is singular
+SINGULAR_RTOL = 1e-12
+
+
+@dataclass(frozen=True)
+class LinearizedModel:
+    """
+    Model `f(x, a, b)` that is linear after a log transform.
+
+    The model satisfies `ln f = c0 + c1 * u(x)` for a known
+    abscissa transform `u`.
+
+    Attributes
+    ----------
+    transform_x : Callable[[NDArray], NDArray]
+        Abscissa transform `u(x)`.
+    to_params : Callable[[NDArray, NDArray], NDArray]
+        Conversion of the linear coefficients `(c0, c1)` into the
+        model parameters `(a, b)`, stacked on the last axis.
+    jacobian : Callable[[NDArray, NDArray, NDArray], NDArray]
+        Derivatives of `f` with respect to `(a, b)`, evaluated
+        at `x` for parameter columns `a` and `b`, stacked on the
+        last axis.
+    domain : Callable[[NDArray], NDArray]
+        Mask of the abscissae where `u` is defined.
+    """
+
+    transform_x: Callable[[NDArray[np.float64]], NDArray[np.float64]]
+    to_params: Callable[
+        [NDArray[np.float64], NDArray[np.float64]],
+        NDArray[np.float64],
+    ]
+    jacobian: Callable[
+        [NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]],
+        NDArray[np.float64],
+    ]
+    domain: Callable[[NDArray[np.float64]], NDArray[np.bool_]] = np.isfinite
+
+
+def _hyperbole_jacobian(
+    x: NDArray[np.float64],
+    a: NDArray[np.float64],
+    b: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    _power = x ** (-a)
+    return np.stack((-b * _power * np.log(x), _power), axis=-1)
+
+
+def _exponent_jacobian(
+    x: NDArray[np.float64],
+    a: NDArray[np.float64],
+    b: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    _exp = np.exp(a * x)
+    return np.stack((b * x * _exp, _exp), axis=-1)
+
+
+HYPERBOLE_MODEL = LinearizedModel(
+    transform_x=np.log,
+    to_params=lambda c0, c1: np.stack((-c1, np.exp(c0)), axis=-1),
+    jacobian=_hyperbole_jacobian,
+    domain=lambda x: np.isfinite(x) & (x > 0.0),
+)
+
+EXPONENT_MODEL = LinearizedModel(
+    transform_x=lambda x: x,
+    to_params=lambda c0, c1: np.stack((c1, np.exp(c0)), axis=-1),
+    jacobian=_exponent_jacobian,
+)
+
+LINEARIZED_MODELS: dict[
+    Callable[..., NDArray[np.float64]],
+    LinearizedModel,
+] = {
+    background_hyperbole: HYPERBOLE_MODEL,
+    background_exponent: EXPONENT_MODEL,
+}
+
+
+def get_linearized_model(
+    func: Callable[..., NDArray[np.float64]],
+) -> LinearizedModel:
+    """
+    Return the linearized description of a model function.
+
+    Parameters
+    ----------
+    func : Callable[..., NDArray[np.float64]]
+        Model function, e.g. `background_hyperbole`.
+
+    Returns
+    -------
+    LinearizedModel
+        The registered linearized model.
+
+    Raises
+    ------
+    ValueError
+        If the function has no registered linearization.
+    """
+    _model = LINEARIZED_MODELS.get(func)
+    if _model is None:
+        _name = getattr(func, "__name__", repr(func))
+        msg = (
+            f"No linearized form registered for '{_name}'. "
+            f"Supported: {[f.__name__ for f in LINEARIZED_MODELS]}."
+        )
+        raise ValueError(msg)
+    return _model
+
+
+def _solve_2x2(
+    matrix: NDArray[np.float64],
+    rhs: NDArray[np.float64],
+) -> tuple[NDArray[np.float64], NDArray[np.bool_]]:
+    """
+    Solve a batch of symmetric 2x2 systems.
+
+    Returns
+    -------
+    tuple[NDArray[np.float64], NDArray[np.bool_]]
+        Solutions of shape `(K, 2)`, NaN for singular systems, and
+        the mask of the regular systems. A system is singular when
+        its determinant vanishes relative to the product of its
+        diagonal, e.g. fewer than two distinct valid abscissae.
+    """
+    _m00 = matrix[:, 0, 0]
+    _m01 = matrix[:, 0, 1]
+    _m11 = matrix[:, 1, 1]
+    _det = _m00 * _m11 - _m01 * _m01
+    _regular = np.isfinite(_det) & (
+        np.abs(_det) > SINGULAR_RTOL * np.abs(_m00 * _m11)
+    )
+    _det = np.where(_regular, _det, 1.0)
+    _x0 = (_m11 * rhs[:, 0] - _m01 * rhs[:, 1]) / _det
+    _x1 = (_m00 * rhs[:, 1] - _m01 * rhs[:, 0]) / _det
+    _solution = np.where(
+        _regular[:, None],
+        np.stack((_x0, _x1), axis=-1),
+        np.nan,
+    )
+    return _solution, _regular
+
+
+def _chi2(
+    func: Callable[..., NDArray[np.float64]],
+    x: NDArray[np.float64],
+    y: NDArray[np.float64],
+    inv_sigma: NDArray[np.float64],
+    params: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Weighted sum of squared residuals of each sample."""
+    _residual = (y - func(x, params[:, 0:1], params[:, 1:2])) * inv_sigma
+    return np.einsum("kn,kn->k", _residual, _residual)
+
+
+def fit_linearized(
+    func: Callable[..., NDArray[np.float64]],
+    x_data: NDArray[np.float64],
+    y_data: NDArray[np.float64],
+    error: NDArray[np.float64] | None = None,
+    refine_steps: int = 0,
+) -> NDArray[np.float64]:
+    """
+    Fit a linearizable two-parameter model in closed form.
+
+    Solves the weighted linear least-squares problem in the
+    transformed space with batched normal equations. The log
+    transform maps an error `sigma` on `y` to `sigma / y`, hence
+    the weights `(y / sigma)^2`. Points with a non-positive or
+    non-finite intensity or error, or an abscissa outside the
+    domain of the transform (`q <= 0` for the power law), get zero
+    weight. Each refinement step is a Gauss-Newton update on the
+    original (untransformed) weighted residuals; a sample stops
+    refining at the first step that does not decrease its
+    residual, and keeps its previous estimate.
+
+    Parameters
+    ----------
+    func : Callable[..., NDArray[np.float64]]
+        Model function with a registered linearization.
+    x_data : NDArray[np.float64]
+        Abscissa, shape `(N,)` or `(K, N)`.
+    y_data : NDArray[np.float64]
+        Ordinates, shape `(N,)` or `(K, N)`.
+    error : NDArray[np.float64] | None, optional
+        Standard deviations of `y_data`, same shape. Unit errors
+        are assumed if None.
+    refine_steps : int, optional
+        Number of Gauss-Newton refinement steps (default: 0).
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Parameters `(a, b)` of shape `(2,)` for a single sample or
+        `(K, 2)` for a batch. Samples whose normal equations are
+        singular, e.g. with fewer than two valid points, get NaN
+        parameters.
+    """
+    _model = get_linearized_model(func)
+
+    _single = np.ndim(y_data) == 1
+    _y = np.atleast_2d(np.asarray(y_data, dtype=np.float64))
+    _x = np.broadcast_to(np.asarray(x_data, dtype=np.float64), _y.shape)
+    _sigma = (
+        np.ones_like(_y)
+        if error is None
+        else np.broadcast_to(np.asarray(error, dtype=np.float64), _y.shape)
+    )
+
+    # --- Weighted linear solve in transformed space ---
+    _valid = (
+        np.isfinite(_y)
+        & (_y > 0.0)
+        & np.isfinite(_sigma)
+        & (_sigma > 0.0)
+        & _model.domain(_x)
+    )
+    # Invalid points are replaced by neutral values with zero weight,
+    # so that neither the transform nor the weights produce NaN
+    _x = np.where(_valid, _x, 1.0)
+    _y = np.where(_valid, _y, 1.0)
+    _inv_sigma = np.where(_valid, 1.0 / np.where(_valid, _sigma, 1.0), 0.0)
+    _log_y = np.log(_y)
+    _weights = (_y * _inv_sigma) ** 2
+    _u = _model.transform_x(_x)
+
+    _sw = _weights.sum(axis=1)
+    _swu = (_weights * _u).sum(axis=1)
+    _swuu = (_weights * _u * _u).sum(axis=1)
+    _normal = np.stack(
+        (np.stack((_sw, _swu), axis=-1), np.stack((_swu, _swuu), axis=-1)),
+        axis=1,
+    )
+    _rhs = np.stack(
+        (
+            (_weights * _log_y).sum(axis=1),
+            (_weights * _u * _log_y).sum(axis=1),
+        ),
+        axis=-1,
+    )
+    _coef, _regular = _solve_2x2(_normal, _rhs)
+    _params = _model.to_params(_coef[:, 0], _coef[:, 1])
+
+    # --- Gauss-Newton refinement in linear space ---
+    _active = _regular.copy()
+    _chi2_current = _chi2(func, _x, _y, _inv_sigma, _params)
+
+    for _ in range(refine_steps):
+        if not _active.any():
+            break
+        _a = _params[:, 0:1]
+        _b = _params[:, 1:2]
+        _residual = (_y - func(_x, _a, _b)) * _inv_sigma
+        _jac = _model.jacobian(_x, _a, _b) * _inv_sigma[..., None]
+        _jtj = np.einsum("kni,knj->kij", _jac, _jac)
+        _jtr = np.einsum("kni,kn->ki", _jac, _residual)
+        _step, _step_regular = _solve_2x2(_jtj, _jtr)
+
+        _candidate = _params + np.where(_step_regular[:, None], _step, 0.0)
+        with np.errstate(over="ignore", invalid="ignore"):
+            _chi2_candidate = _chi2(func, _x, _y, _inv_sigma, _candidate)
+
+        # Keep the previous estimate of samples whose residual grows
+        _improved = (
+            _active & _step_regular & (_chi2_candidate < _chi2_current)
+        )
+        _params = np.where(_improved[:, None], _candidate, _params)
+        _chi2_current = np.where(_improved, _chi2_candidate, _chi2_current)
+        _active = _improved
+
+    return _params[0] if _single else _params
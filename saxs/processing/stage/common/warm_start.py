@@ -0,0 +1,270 @@
+"""
+Module: warm_start.
+
+Warm-start cache for fits across consecutive frames of a series.
+
+Time-resolved runs produce many near-identical frames. Seeding
+each fit with the converged parameters of the previous frame of
+the same series lets the solver start next to the optimum. Entries
+are keyed by the series identifier, the model name and a position
+(the peak index, or 0 for a background). A lookup matches the
+closest stored position within a tolerance, since a peak may drift
+by a bin between frames.
+
+A failed warm-started fit is retried from the cold initial guess
+and the stale entry is dropped, unless it ran out of the sample
+budget. The cache keeps the most recently
+used `maxsize` (series, model) pairs, so a long-running process
+over many series does not grow without bound.
+
+The entries of `DEFAULT_WARM_START_CACHE` for the series of a sample
+seed its fits, so they are registered as a settings component of
+kernel result cache keys (see `saxs.core.kernel.result_cache`).
+
+Classes
+-------
+WarmStartCache
+    Thread-safe store of converged parameters.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+import numpy as np
+
+from saxs.core.kernel.result_cache import register_settings_component
+from saxs.core.pipeline.scheduler.budget import BudgetExhaustedError
+from saxs.core.types.sample import SAXSSample
+from saxs.core.types.sample_objects import ESampleMetadataKeys
+from saxs.processing.stage.common.engine import FitResult
+
+DEFAULT_POSITION_TOLERANCE = 2
+DEFAULT_WARM_START_CACHE_SIZE = 1024
+
+
+class WarmStartCache:
+    """
+    Store of converged fit parameters per series, model and position.
+
+    Parameters
+    ----------
+    position_tolerance : int, optional
+        Largest position shift (in bins) matched by a lookup.
+    maxsize : int, optional
+        Maximum number of (series, model) pairs kept, the least
+        recently used being evicted first.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups that returned parameters.
+    misses : int
+        Number of lookups that found nothing.
+    fallbacks : int
+        Number of warm-started fits retried from a cold start.
+    """
+
+    def __init__(
+        self,
+        position_tolerance: int = DEFAULT_POSITION_TOLERANCE,
+        maxsize: int = DEFAULT_WARM_START_CACHE_SIZE,
+    ):
+        self.position_tolerance = position_tolerance
+        self.maxsize = maxsize
+        self._entries: OrderedDict[
+            tuple[Hashable, str],
+            dict[int, tuple[float, ...]],
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+
+    def get(
+        self,
+        series: Hashable,
+        model: str,
+        position: int = 0,
+    ) -> tuple[float, ...] | None:
+        """
+        Return the parameters stored closest to `position`.
+
+        Parameters
+        ----------
+        series : Hashable
+            Series identifier.
+        model : str
+            Model name.
+        position : int, optional
+            Peak index, 0 for position-free fits.
+
+        Returns
+        -------
+        tuple[float, ...] | None
+            Stored parameters, None if none lie within the
+            tolerance.
+        """
+        with self._lock:
+            _positions = self._entries.get((series, model), {})
+            if _positions:
+                self._entries.move_to_end((series, model))
+            _nearest = min(
+                _positions,
+                key=lambda _p: abs(_p - position),
+                default=None,
+            )
+            if (
+                _nearest is None
+                or abs(_nearest - position) > self.position_tolerance
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return _positions[_nearest]
+
+    def update(
+        self,
+        series: Hashable,
+        model: str,
+        position: int,
+        params: tuple[float, ...],
+    ) -> None:
+        """Store converged parameters at `position`."""
+        with self._lock:
+            _positions = self._entries.setdefault((series, model), {})
+            self._entries.move_to_end((series, model))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            # The new entry replaces drifted neighbours of the peak
+            for _p in [
+                _p
+                for _p in _positions
+                if abs(_p - position) <= self.position_tolerance
+            ]:
+                del _positions[_p]
+            _positions[position] = tuple(float(_v) for _v in params)
+
+    def invalidate(
+        self,
+        series: Hashable,
+        model: str,
+        position: int = 0,
+    ) -> None:
+        """Drop the entries matching `position`."""
+        with self._lock:
+            _positions = self._entries.get((series, model), {})
+            for _p in [
+                _p
+                for _p in _positions
+                if abs(_p - position) <= self.position_tolerance
+            ]:
+                del _positions[_p]
+
+    def snapshot(
+        self,
+        series: Hashable | None,
+    ) -> dict[str, dict[int, tuple[float, ...]]]:
+        """Return a copy of the entries of a series, by model."""
+        with self._lock:
+            return {
+                _model: dict(_positions)
+                for (_series, _model), _positions in self._entries.items()
+                if _series == series and _positions
+            }
+
+    def reset(self) -> None:
+        """Drop all entries and counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.fallbacks = 0
+
+    def fit(  # noqa: PLR0913
+        self,
+        series: Hashable | None,
+        model: str,
+        position: int,
+        cold_p0: tuple[float, ...] | None,
+        fit: Callable[[tuple[float, ...] | None], FitResult],
+        bounds: tuple[object, object] = (-np.inf, np.inf),
+    ) -> FitResult:
+        """
+        Run a fit seeded from the cache, with a cold fallback.
+
+        Parameters
+        ----------
+        series : Hashable | None
+            Series identifier. None runs a plain cold fit and
+            leaves the cache untouched.
+        model : str
+            Model name.
+        position : int
+            Peak index, 0 for position-free fits.
+        cold_p0 : tuple[float, ...] | None
+            Initial guess of a cold start.
+        fit : Callable[[tuple[float, ...] | None], FitResult]
+            Fit call taking the initial guess.
+        bounds : tuple[object, object], optional
+            Parameter bounds; a warm guess is clipped into them.
+
+        Returns
+        -------
+        FitResult
+            Result of the warm fit, or of the cold retry.
+
+        Raises
+        ------
+        BudgetExhaustedError
+            If a fit exceeds the evaluation budget of the sample,
+            without a cold retry.
+        """
+        if series is None:
+            return fit(cold_p0)
+
+        _warm_p0 = self.get(series, model, position)
+
+        if _warm_p0 is not None:
+            _warm_p0 = tuple(
+                float(_v) for _v in np.clip(_warm_p0, bounds[0], bounds[1])
+            )
+            try:
+                _result = fit(_warm_p0)
+            except BudgetExhaustedError:
+                # The sample is out of budget, a cold retry would
+                # overspend it
+                raise
+            except (RuntimeError, ValueError):
+                _result = None
+
+            if _result is not None and _result.success:
+                self.update(series, model, position, tuple(_result.popt))
+                return _result
+
+            self.invalidate(series, model, position)
+            with self._lock:
+                self.fallbacks += 1
+
+        _result = fit(cold_p0)
+        if _result.success:
+            self.update(series, model, position, tuple(_result.popt))
+        return _result
+
+
+DEFAULT_WARM_START_CACHE = WarmStartCache()
+
+
+def _series_snapshot(
+    sample: SAXSSample,
+) -> dict[str, dict[int, tuple[float, ...]]]:
+    """Return the default cache entries of the series of a sample."""
+    _series = sample.get_metadata().unwrap().get(
+        ESampleMetadataKeys.SERIES.value,
+    )
+    if _series is None:
+        return {}
+    return DEFAULT_WARM_START_CACHE.snapshot(_series)
+
+
+register_settings_component("warm_start", _series_snapshot)
@@ -11,13 +11,13 @@ given q-index is retained.
 
 Classes
 -------
-CutStage : AbstractStage
+CutStage : IAbstractFusableStage
     A pipeline stage that slices q-values and intensity arrays
     according to the configured cut point.
 """
 
-from saxs.logging.logger import get_stage_logger
-from saxs.core.stage.abstract_stage import IAbstractStage
+from saxs.logging.logger import get_stage_logger, lazy_range
+from saxs.core.stage.fused_stage import IAbstractFusableStage, SampleArrays
 
 logger = get_stage_logger(__name__)
 from saxs.core.types.sample import (
@@ -37,7 +37,7 @@ DEFAULT_CUT_META = CutStageMetadata(
 )
 
 
-class CutStage(IAbstractStage[CutStageMetadata]):
+class CutStage(IAbstractFusableStage[CutStageMetadata]):
     """
     SAXS processing stage that trims data arrays.
 
@@ -86,15 +86,12 @@ class CutStage(IAbstractStage[CutStageMetadata]):
         )
 
         # Cut the data
-        q_values_cut = sample[ESAXSSampleKeys.Q_VALUES][cut_point:]
-        intensity_cut = sample[ESAXSSampleKeys.INTENSITY][cut_point:]
-        error_cut = sample[ESAXSSampleKeys.INTENSITY_ERROR][cut_point:]
+        _arrays = self.process_arrays(SampleArrays.from_sample(sample))
+        q_values_cut = _arrays.q_values
+        intensity_cut = _arrays.intensity
 
         # Assign
-        # (implement err intensity)
-        sample[ESAXSSampleKeys.Q_VALUES] = q_values_cut
-        sample[ESAXSSampleKeys.INTENSITY] = intensity_cut
-        sample[ESAXSSampleKeys.INTENSITY_ERROR] = error_cut
+        _arrays.to_sample(sample)
 
         # Log output info
         logger.stage_info(
@@ -102,8 +99,27 @@ class CutStage(IAbstractStage[CutStageMetadata]):
             "Truncation complete",
             removed_points=original_size - len(q_values_cut),
             remaining_points=len(q_values_cut),
-            q_range=f"[{min(q_values_cut):.4f}, {max(q_values_cut):.4f}]",
-            intensity_range=f"[{min(intensity_cut):.4f}, {max(intensity_cut):.4f}]",
+            q_range=lazy_range(q_values_cut),
+            intensity_range=lazy_range(intensity_cut),
         )
 
         return sample
+
+    def process_arrays(
+        self,
+        arrays: SampleArrays,
+    ) -> SampleArrays:
+        """Slice all arrays from the cut point (views, no copies).
+
+        The views replace the arrays, so the sample keeps owning
+        those it owned.
+        """
+        cut_point = self.get_metadata().get_cut_point()
+
+        return SampleArrays(
+            q_values=arrays.q_values[cut_point:],
+            intensity=arrays.intensity[cut_point:],
+            intensity_error=arrays.intensity_error[cut_point:],
+            metadata=arrays.metadata,
+            owned=arrays.owned,
+        )
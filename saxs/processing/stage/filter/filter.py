@@ -1,36 +1,61 @@
 """Filter Stage Module.
 
 This module defines the `FilterStage` class, which implements a SAXS
-data processing stage that applies a moving average filter to
-intensity values within a `SAXSSample`.
+data processing stage that smooths intensity values within a
+`SAXSSample` with the filter selected in its metadata (box,
+Savitzky-Golay or Gaussian, see `filters`).
 
 Classes
 -------
 FilterStage
-    Applies a moving average filter to intensity data.
+    Applies a smoothing filter to intensity data.
 """
 
-from saxs.logging.logger import get_stage_logger
-from saxs.core.stage.abstract_stage import IAbstractStage
+from typing import Any, ClassVar
+
+import numpy as np
+from numpy.typing import NDArray
+
+from saxs.logging.logger import get_stage_logger, lazy_range
+from saxs.core.stage.fused_stage import IAbstractFusableStage, SampleArrays
 
 logger = get_stage_logger(__name__)
 from saxs.core.types.sample import ESAXSSampleKeys, SAXSSample
-from saxs.processing.functions import moving_average
+from saxs.processing.stage.filter.filters import apply_filter
+from saxs.processing.stage.filter.types import (
+    DEFAULT_FILTER_META,
+    EFilterType,
+    FilterStageMetadata,
+)
 
 
-class FilterStage(IAbstractStage):
-    """Stage that applies a moving average filter to intensity data.
+class FilterStage(IAbstractFusableStage[FilterStageMetadata]):
+    """Stage that applies a smoothing filter to intensity data.
 
     This stage retrieves the intensity values from a `SAXSSample`,
-    applies a moving average filter with a fixed window size, and
-    updates the sample in place. The filtered intensity is stored
-    under the `ESAXSSampleKeys.INTENSITY` key.
+    smooths them with the filter and window of its metadata (a box
+    filter of 10 points by default), and updates the sample in
+    place. The filtered intensity is stored under the
+    `ESAXSSampleKeys.INTENSITY` key, overwriting the incoming
+    intensity when the sample owns it.
 
     The stage also logs the number of points processed.
+
+    Parameters
+    ----------
+    metadata : FilterStageMetadata | None, optional
+        Filter type and parameters, `DEFAULT_FILTER_META` if None.
     """
 
+    inplace: ClassVar[bool] = True
+
+    def __init__(self, metadata: FilterStageMetadata | None = None):
+        metadata = metadata or DEFAULT_FILTER_META
+
+        super().__init__(metadata=metadata)
+
     def _process(self, sample: SAXSSample) -> SAXSSample:
-        """Process a SAXSSample by applying a moving average filter.
+        """Process a SAXSSample by applying the smoothing filter.
 
         Parameters
         ----------
@@ -41,28 +66,88 @@ class FilterStage(IAbstractStage):
         -------
         SAXSSample
             The same sample object with filtered intensity values.
-
-        Notes
-        -----
-        The filtering uses a fixed window size of 10 points.
         """
         _intensity = sample[ESAXSSampleKeys.INTENSITY]
 
         logger.stage_info(
             "FilterStage",
-            "Applying moving average filter",
-            window_size=10,
+            "Applying filter",
+            filter_type=self.metadata.get_filter_type().value,
+            window_size=self.metadata.get_window_size(),
             data_points=len(_intensity),
-            intensity_range=f"[{min(_intensity):.4f}, {max(_intensity):.4f}]",
+            intensity_range=lazy_range(_intensity),
         )
 
-        filtered_intensity = moving_average(_intensity, 10)
-        sample[ESAXSSampleKeys.INTENSITY] = filtered_intensity
+        filtered_intensity = (
+            self.process_arrays(SampleArrays.from_sample(sample))
+            .to_sample(sample)[ESAXSSampleKeys.INTENSITY]
+        )
 
         logger.stage_info(
             "FilterStage",
             "Filtering complete",
-            smoothed_range=f"[{min(filtered_intensity):.4f}, {max(filtered_intensity):.4f}]",
+            smoothed_range=lazy_range(filtered_intensity),
         )
 
         return sample
+
+    def process_arrays(
+        self,
+        arrays: SampleArrays,
+    ) -> SampleArrays:
+        """Smooth the intensity, in place if the sample owns it."""
+        _intensity = arrays.intensity
+
+        return SampleArrays(
+            q_values=arrays.q_values,
+            intensity=self.smooth(
+                _intensity,
+                out=(
+                    _intensity
+                    if ESAXSSampleKeys.INTENSITY in arrays.owned
+                    else np.empty_like(_intensity)
+                ),
+            ),
+            intensity_error=arrays.intensity_error,
+            metadata=arrays.metadata,
+            owned=arrays.owned | {ESAXSSampleKeys.INTENSITY},
+        )
+
+    def smooth(
+        self,
+        intensity: NDArray[np.float64],
+        out: NDArray[np.float64] | None = None,
+    ) -> NDArray[np.float64]:
+        """
+        Smooth intensities with the configured filter.
+
+        Parameters
+        ----------
+        intensity : NDArray[np.float64]
+            One profile of shape `(n_points,)` or a batch of shape
+            `(n_samples, n_points)`, smoothed along the last axis.
+        out : NDArray[np.float64] | None, optional
+            Array of the shape of `intensity` receiving the result,
+            possibly `intensity` itself.
+
+        Returns
+        -------
+        NDArray[np.float64]
+            Smoothed intensities, `out` if given.
+        """
+        _filter_type = self.metadata.get_filter_type()
+        _window_size = self.metadata.get_window_size()
+        _options: dict[str, Any] = {}
+
+        if _filter_type is EFilterType.SAVGOL:
+            _options["polyorder"] = self.metadata.get_polyorder()
+        elif _filter_type is EFilterType.GAUSSIAN:
+            _options["sigma"] = self.metadata.get_sigma()
+
+        return apply_filter(
+            intensity,
+            _filter_type,
+            _window_size,
+            out=out,
+            **_options,
+        )
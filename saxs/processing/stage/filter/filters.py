@@ -0,0 +1,225 @@
+"""
+Module: filters.
+
+Smoothing filters of `FilterStage`.
+
+Every filter smooths along the last axis, so it applies to a single
+profile of shape `(n_points,)` or to a batch of shape
+`(n_samples, n_points)` at once, and can write into a preallocated
+`out`, the input itself included. Edges follow the legacy
+`np.convolve(mode="same")` smoothing: points beyond the edges count
+as zeros, and an even box window extends one point further to the
+left.
+
+- box: moving average, see
+  `saxs.processing.functions.moving_average`.
+- savgol: Savitzky-Golay filter; its coefficients depend only on
+  the window and the polynomial order and are computed once.
+- gaussian: Gaussian filter of `scipy.ndimage`, truncated to the
+  window.
+
+Functions
+---------
+box_filter
+    Moving average of a window.
+savgol_filter
+    Savitzky-Golay filter with cached coefficients.
+gaussian_filter
+    Gaussian filter truncated to a window.
+apply_filter
+    Apply a filter selected by type.
+"""
+
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy.ndimage import (  # pyright: ignore[reportMissingTypeStubs]
+    correlate1d,
+    gaussian_filter1d,
+)
+from scipy.signal import (  # pyright: ignore[reportMissingTypeStubs]
+    savgol_coeffs,
+)
+
+from saxs.processing.functions import moving_average
+from saxs.processing.stage.filter.types import (
+    DEFAULT_POLYORDER,
+    EFilterType,
+)
+
+
+def box_filter(
+    data: NDArray[np.float64],
+    window_size: int,
+    out: NDArray[np.float64] | None = None,
+) -> NDArray[np.float64]:
+    """
+    Moving average of a window.
+
+    Parameters
+    ----------
+    data : NDArray[np.float64]
+        Profiles, shape `(n_points,)` or `(n_samples, n_points)`.
+    window_size : int
+        Window in points.
+    out : NDArray[np.float64] | None, optional
+        Array of the shape of `data` receiving the result.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Smoothed profiles, `out` if given.
+    """
+    if out is None:
+        out = np.empty(np.shape(data))
+    return moving_average(data, window_size, out=out)
+
+
+@lru_cache(maxsize=32)
+def _savgol_coefficients(
+    window_size: int,
+    polyorder: int,
+) -> NDArray[np.float64]:
+    _coefficients = savgol_coeffs(window_size, polyorder, use="dot")
+    _coefficients.flags.writeable = False
+    return _coefficients
+
+
+def savgol_filter(
+    data: NDArray[np.float64],
+    window_size: int,
+    polyorder: int = DEFAULT_POLYORDER,
+    out: NDArray[np.float64] | None = None,
+) -> NDArray[np.float64]:
+    """
+    Savitzky-Golay filter with cached coefficients.
+
+    Unlike `scipy.signal.savgol_filter`, which fits the edges with
+    a polynomial, the window is padded with zeros like the box
+    filter.
+
+    Parameters
+    ----------
+    data : NDArray[np.float64]
+        Profiles, shape `(n_points,)` or `(n_samples, n_points)`.
+    window_size : int
+        Odd window in points.
+    polyorder : int, optional
+        Polynomial order, lower than `window_size`.
+    out : NDArray[np.float64] | None, optional
+        Array of the shape of `data` receiving the result.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Smoothed profiles, `out` if given.
+
+    Raises
+    ------
+    ValueError
+        If the window is even or not larger than `polyorder`.
+    """
+    if window_size % 2 == 0 or window_size <= polyorder:
+        msg = (
+            f"Savitzky-Golay filter needs an odd window larger than the "
+            f"polynomial order, got window {window_size} and order "
+            f"{polyorder}."
+        )
+        raise ValueError(msg)
+
+    return correlate1d(
+        data,
+        _savgol_coefficients(window_size, polyorder),
+        axis=-1,
+        output=out,
+        mode="constant",
+        cval=0.0,
+    )
+
+
+def gaussian_filter(
+    data: NDArray[np.float64],
+    window_size: int,
+    sigma: float,
+    out: NDArray[np.float64] | None = None,
+) -> NDArray[np.float64]:
+    """
+    Gaussian filter truncated to a window.
+
+    Parameters
+    ----------
+    data : NDArray[np.float64]
+        Profiles, shape `(n_points,)` or `(n_samples, n_points)`.
+    window_size : int
+        Window in points; the kernel spans `window_size // 2`
+        points on each side.
+    sigma : float
+        Standard deviation in points.
+    out : NDArray[np.float64] | None, optional
+        Array of the shape of `data` receiving the result.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Smoothed profiles, `out` if given.
+    """
+    return gaussian_filter1d(
+        data,
+        sigma,
+        axis=-1,
+        output=out,
+        mode="constant",
+        cval=0.0,
+        truncate=(window_size // 2) / sigma,
+    )
+
+
+FILTERS: dict[EFilterType, Callable[..., NDArray[np.float64]]] = {
+    EFilterType.BOX: box_filter,
+    EFilterType.SAVGOL: savgol_filter,
+    EFilterType.GAUSSIAN: gaussian_filter,
+}
+
+
+def apply_filter(
+    data: NDArray[np.float64],
+    filter_type: EFilterType | str,
+    window_size: int,
+    out: NDArray[np.float64] | None = None,
+    **options: Any,
+) -> NDArray[np.float64]:
+    """
+    Apply a filter selected by type.
+
+    Parameters
+    ----------
+    data : NDArray[np.float64]
+        Profiles, shape `(n_points,)` or `(n_samples, n_points)`.
+    filter_type : EFilterType | str
+        Filter, e.g. "savgol".
+    window_size : int
+        Window in points.
+    out : NDArray[np.float64] | None, optional
+        Array of the shape of `data` receiving the result.
+    **options : Any
+        Options of the filter: `polyorder` (savgol) or `sigma`
+        (gaussian).
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Smoothed profiles, `out` if given.
+
+    Examples
+    --------
+    >>> smoothed = apply_filter(intensities, "gaussian", 9, sigma=1.5)
+    """
+    return FILTERS[EFilterType(filter_type)](
+        data,
+        window_size,
+        out=out,
+        **options,
+    )
@@ -0,0 +1,165 @@
+"""
+Module: saxs_filter_stage_metadata.
+
+Defines metadata structures for the SAXS "Filter" stage.
+
+This module provides the filter types of `FilterStage`, a
+TypedDict-based schema and the corresponding metadata wrapper
+class (`FilterStageMetadata`) selecting the filter and its window.
+
+Classes
+-------
+EFilterType : Enum
+    Smoothing filters of `FilterStage`.
+EFilterStageMetadataKeys : Enum
+    Enumeration of valid keys for the FilterStage metadata
+    dictionary.
+FilterStageMetadataDict : TypedDict
+    TypedDict schema specifying the allowed metadata fields.
+FilterStageMetadata : AbstractStageMetadata
+    Concrete metadata class with convenience accessors and defaults.
+"""
+
+from dataclasses import field
+from enum import Enum
+
+from saxs.core.types.metadata import (
+    EMetadataSchemaKeys,
+    MetadataSchemaDict,
+)
+from saxs.core.types.stage_metadata import TAbstractStageMetadata
+
+DEFAULT_WINDOW_SIZE = 10
+
+# Savitzky-Golay polynomial order
+DEFAULT_POLYORDER = 2
+
+
+class EFilterType(Enum):
+    """
+    Smoothing filter of `FilterStage`.
+
+    Attributes
+    ----------
+    BOX : str
+        Moving average.
+    SAVGOL : str
+        Savitzky-Golay filter of odd window and polynomial order
+        `polyorder`.
+    GAUSSIAN : str
+        Gaussian filter truncated to the window, of width `sigma`.
+    """
+
+    BOX = "box"
+    SAVGOL = "savgol"
+    GAUSSIAN = "gaussian"
+
+
+class EFilterStageMetadataKeys(EMetadataSchemaKeys):
+    """Enum of keys used in FilterStageMetadataDict."""
+
+    FILTER_TYPE = "filter_type"
+    WINDOW_SIZE = "window_size"
+    POLYORDER = "polyorder"
+    SIGMA = "sigma"
+
+
+class FilterStageMetadataDict(MetadataSchemaDict, total=False):
+    """
+    Schema for Filter stage metadata.
+
+    Attributes
+    ----------
+    filter_type : str
+        Filter name, see `EFilterType`.
+    window_size : int
+        Number of points of the filter window.
+    polyorder : int
+        Polynomial order of the Savitzky-Golay filter.
+    sigma : float
+        Standard deviation in points of the Gaussian filter.
+    """
+
+    filter_type: str
+    window_size: int
+    polyorder: int
+    sigma: float
+
+
+class FilterStageMetadata(
+    TAbstractStageMetadata[
+        FilterStageMetadataDict,
+        EFilterStageMetadataKeys,
+    ],
+):
+    """
+    Metadata object representing the Filter stage configuration.
+
+    Attributes
+    ----------
+    value : FilterStageMetadataDict
+        Underlying metadata dictionary, defaulting to a box filter
+        of `DEFAULT_WINDOW_SIZE` points.
+    """
+
+    Keys = EFilterStageMetadataKeys
+    Dict = FilterStageMetadataDict
+
+    value: FilterStageMetadataDict = field(
+        default_factory=lambda: {
+            EFilterStageMetadataKeys.FILTER_TYPE.value: (
+                EFilterType.BOX.value
+            ),
+            EFilterStageMetadataKeys.WINDOW_SIZE.value: DEFAULT_WINDOW_SIZE,
+        },
+    )
+
+    def get_filter_type(self) -> EFilterType:
+        """Return the filter type (default: box)."""
+        return EFilterType(
+            self.unwrap().get(
+                EFilterStageMetadataKeys.FILTER_TYPE.value,
+                EFilterType.BOX.value,
+            ),
+        )
+
+    def get_window_size(self) -> int:
+        """Return the filter window in points."""
+        return int(
+            self.unwrap().get(
+                EFilterStageMetadataKeys.WINDOW_SIZE.value,
+                DEFAULT_WINDOW_SIZE,
+            ),
+        )
+
+    def get_polyorder(self) -> int:
+        """Return the Savitzky-Golay polynomial order."""
+        return int(
+            self.unwrap().get(
+                EFilterStageMetadataKeys.POLYORDER.value,
+                DEFAULT_POLYORDER,
+            ),
+        )
+
+    def get_sigma(self) -> float:
+        """
+        Return the Gaussian standard deviation in points.
+
+        Returns
+        -------
+        float
+            The configured sigma, by default a sixth of the window,
+            which then spans three sigmas on each side.
+        """
+        _sigma = self.unwrap().get(EFilterStageMetadataKeys.SIGMA.value)
+        if _sigma is None:
+            return self.get_window_size() / 6
+        return float(_sigma)
+
+
+DEFAULT_FILTER_META = FilterStageMetadata(
+    {
+        EFilterStageMetadataKeys.FILTER_TYPE.value: EFilterType.BOX.value,
+        EFilterStageMetadataKeys.WINDOW_SIZE.value: DEFAULT_WINDOW_SIZE,
+    },
+)
@@ -25,7 +25,8 @@ from scipy.signal import (  # pyright: ignore[reportMissingTypeStubs]
     find_peaks,  # # pyright: ignore[reportUnknownVariableType]
 )
 
-from saxs.logging.logger import get_stage_logger
+from saxs.logging.logger import get_stage_logger, lazy, lazy_range
+from saxs.tracing.tracer import span
 from saxs.core.stage.abstract_cond_stage import (
     IAbstractRequestingStage,
 )
@@ -55,6 +56,15 @@ from saxs.processing.stage.peak.types import (
 logger = get_stage_logger(__name__)
 
 
+def _format_peaks(
+    label: str,
+    values: NDArray[np.float64],
+    indices: NDArray[np.int64],
+    spec: str,
+) -> str:
+    return f"{label}={[f'{values[i]:{spec}}' for i in indices]}"
+
+
 class FindPeakStage(IAbstractRequestingStage[PeakFindStageMetadata]):
     """Find peak stage."""
 
@@ -100,22 +110,32 @@ class FindPeakStage(IAbstractRequestingStage[PeakFindStageMetadata]):
             "FindPeakStage",
             "Starting peak detection",
             data_points=len(intensity),
-            intensity_range=f"[{min(intensity):.2f}, {max(intensity):.2f}]",
+            intensity_range=lazy_range(intensity, ".2f"),
         )
 
         # Find peaks
         peak_indices, properties = self.find_peaks(intensity)
 
         if len(peak_indices) > 0:
-            peak_positions = [q_values[i] for i in peak_indices]
-            peak_heights = [intensity[i] for i in peak_indices]
             logger.stage_info(
                 "FindPeakStage",
                 "Peaks detected",
-                peaks_found=f"{len(peak_indices)}",
-                peak_indices=f"{peak_indices}",
-                peak_positions=f"q={[f'{p:.4f}' for p in peak_positions]}",
-                peak_heights=f"I={[f'{h:.2f}' for h in peak_heights]}",
+                peaks_found=len(peak_indices),
+                peak_indices=peak_indices,
+                peak_positions=lazy(
+                    _format_peaks,
+                    "q",
+                    q_values,
+                    peak_indices,
+                    ".4f",
+                ),
+                peak_heights=lazy(
+                    _format_peaks,
+                    "I",
+                    intensity,
+                    peak_indices,
+                    ".2f",
+                ),
             )
         else:
             logger.stage_info(
@@ -131,6 +151,50 @@ class FindPeakStage(IAbstractRequestingStage[PeakFindStageMetadata]):
 
     def create_request(self, metadata: FlowMetadata) -> IAbstractStageRequest:
         """Create a request for peak processing."""
+        _current = self._next_current_peak(metadata)
+
+        if _current is ERuntimeConstants.UNDEFINED_PEAK:
+            # if no peaks found create an empty request to finish
+            return StageRequest(
+                condition_eval_metadata=EvalMetadata(
+                    {FlowMetadataKeys.CURRENT.value: _current},
+                ),
+                flow_metadata=FlowMetadata({}),
+            )
+
+        eval_metadata = EvalMetadata(
+            {FlowMetadataKeys.CURRENT.value: _current},
+        )
+
+        return StageRequest(
+            condition_eval_metadata=eval_metadata,
+            flow_metadata=metadata,
+        )
+
+    def update_eval_metadata(
+        self,
+        metadata: FlowMetadata,
+        eval_metadata: EvalMetadata,
+    ) -> bool:
+        """Select the next peak without building a request."""
+        eval_metadata.unwrap()[FlowMetadataKeys.CURRENT.value] = (
+            self._next_current_peak(metadata)
+        )
+        return True
+
+    def _next_current_peak(
+        self,
+        metadata: FlowMetadata,
+    ) -> dict[int, np.float64] | ERuntimeConstants:
+        """
+        Pop the highest unprocessed peak and mark it as current.
+
+        Returns
+        -------
+        dict[int, np.float64] | ERuntimeConstants
+            The `{index: intensity}` pair of the selected peak, or
+            `UNDEFINED_PEAK` if none is left.
+        """
         _current_peaks: dict[int, np.float64] = metadata[
             FlowMetadataKeys.UNPROCESSED
         ]
@@ -143,49 +207,38 @@ class FindPeakStage(IAbstractRequestingStage[PeakFindStageMetadata]):
             else ERuntimeConstants.UNDEFINED_PEAK
         )
 
-        if _current_peak != ERuntimeConstants.UNDEFINED_PEAK:
-            _current_peaks.pop(_current_peak)  # pop from the set
-            logger.stage_info(
-                "FindPeakStage",
-                "Requesting peak processing",
-                peak_index=f"Current peak {int(_current_peak)}",
-                remaining_peaks="Remaining peaks len: {len(_current_peaks)}",
-            )
-        else:
-            # if no peaks found create an empty request to finish
-            _undefined = ERuntimeConstants.UNDEFINED_PEAK
-            return StageRequest(
-                condition_eval_metadata=EvalMetadata(
-                    {FlowMetadataKeys.CURRENT.value: _undefined},
-                ),
-                flow_metadata=FlowMetadata({}),
-            )
+        if _current_peak == ERuntimeConstants.UNDEFINED_PEAK:
+            return ERuntimeConstants.UNDEFINED_PEAK
 
         _current = {
-            _current_peak: _current_peaks[_current_peak],
+            _current_peak: _current_peaks.pop(_current_peak),
         }  # pair q:I
 
-        metadata[FlowMetadata.Keys.CURRENT] = _current
-
-        eval_metadata = EvalMetadata(
-            {FlowMetadataKeys.CURRENT.value: _current},
+        logger.stage_info(
+            "FindPeakStage",
+            "Requesting peak processing",
+            peak_index=lazy("Current peak {}".format, int(_current_peak)),
+            remaining_peaks=lazy(
+                "Remaining peaks len: {}".format,
+                len(_current_peaks),
+            ),
         )
 
-        return StageRequest(
-            condition_eval_metadata=eval_metadata,
-            flow_metadata=metadata,
-        )
+        metadata[FlowMetadata.Keys.CURRENT] = _current
+
+        return _current
 
     def find_peaks(
         self,
         intensity: NDArray[np.float64],
     ) -> tuple[list[int], dict[str, Any]]:
         """Find peak func."""
-        peaks_indices, peaks_properties = find_peaks(  # type: ignore  # noqa: PGH003
-            x=intensity,
-            height=self.metadata[EPeakFindMetadataKeys.HEIGHT],
-            prominence=self.metadata[EPeakFindMetadataKeys.PROMINENCE],
-            distance=self.metadata[EPeakFindMetadataKeys.DISTANCE],
-        )
+        with span("find_peaks", "peaks", points=len(intensity)):
+            peaks_indices, peaks_properties = find_peaks(  # type: ignore  # noqa: PGH003
+                x=intensity,
+                height=self.metadata[EPeakFindMetadataKeys.HEIGHT],
+                prominence=self.metadata[EPeakFindMetadataKeys.PROMINENCE],
+                distance=self.metadata[EPeakFindMetadataKeys.DISTANCE],
+            )
 
         return peaks_indices, peaks_properties  # pyright: ignore[reportUnknownVariableType]
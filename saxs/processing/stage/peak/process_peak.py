@@ -17,10 +17,14 @@ ProcessPeakStage
 
 # Created by Isai Gordeev on 20/09/2025.
 
+import functools
+from collections.abc import Callable
+from typing import Any, ClassVar
+
 import numpy as np
 from numpy.typing import NDArray
 
-from saxs.logging.logger import get_stage_logger
+from saxs.logging.logger import get_stage_logger, lazy
 from saxs.core.stage.abstract_cond_stage import (
     IAbstractRequestingStage,
 )
@@ -40,7 +44,16 @@ from saxs.core.types.scheduler_metadata import (
     ERuntimeConstants,
 )
 from saxs.processing.functions import gauss, parabole
+from saxs.processing.stage.common.engine import FitResult
 from saxs.processing.stage.common.fitting import Fitting
+from saxs.processing.stage.common.warm_start import (
+    DEFAULT_WARM_START_CACHE,
+)
+from saxs.processing.stage.peak.estimator import (
+    PEAK_ESTIMATORS,
+    EPeakEstimator,
+    estimate_window,
+)
 from saxs.processing.stage.peak.types import (
     DEFAULT_PEAK_PROCESS_META,
     ProcessPeakStageMetadata,
@@ -48,13 +61,91 @@ from saxs.processing.stage.peak.types import (
 
 logger = get_stage_logger(__name__)
 
+# Half-width of the subtracted window in Gaussian sigmas, beyond
+# which exp(-x^2) is below the float64 resolution of the amplitude
+GAUSS_WINDOW_SIGMAS = 6.0
+
+
+def _current_peak_index(
+    flow_metadata: FlowMetadata,
+) -> int | ERuntimeConstants:
+    """
+    Return the index of the current peak of the flow metadata.
+
+    `FindPeakStage` passes the current peak as an `{index: intensity}`
+    pair, or a runtime constant if there is none.
+    """
+    _current = flow_metadata[FlowMetadata.Keys.CURRENT]
+    if isinstance(_current, dict):
+        return int(next(iter(_current)))
+    return _current
+
+
+class _CenteredPeakModel:
+    """Peak profile `f(x, sigma, ampl)` centered on a fixed `mu`.
+
+    Built per fit, so that the fitting engines see a two-parameter
+    model and the stage keeps no state between samples. Its
+    `cache_key` identifies the function and the center for the fit
+    cache.
+    """
+
+    def __init__(
+        self,
+        function: Callable[..., NDArray[np.float64]],
+        mu: float,
+    ):
+        self.function = function
+        self.__name__ = function.__name__
+        self.mu = float(mu)
+
+    @property
+    def cache_key(self) -> tuple[Callable[..., NDArray[np.float64]], float]:
+        """Return the identity of the model."""
+        return self.function, self.mu
+
+    def __call__(
+        self,
+        x: NDArray[np.float64],
+        sigma: float,
+        ampl: float,
+    ) -> NDArray[np.float64]:
+        return self.function(x, self.mu, sigma, ampl)
+
+
+def _fit_window(  # noqa: PLR0913
+    p0: tuple[float, ...] | None,
+    *,
+    model: _CenteredPeakModel,
+    x_data: NDArray[np.float64],
+    y_data: NDArray[np.float64],
+    error: NDArray[np.float64] | None,
+    bounds: tuple[Any, ...],
+    engine: str | None,
+) -> FitResult:
+    """Fit a centered peak model over a window, from `p0`.
+
+    Bound with `functools.partial` to the fit call of the warm start
+    cache, which passes the initial guess.
+    """
+    return Fitting.fit(
+        model,
+        x_data=x_data,
+        y_data=y_data,
+        error=error,
+        p0=p0,
+        bounds=bounds,
+        engine=engine,
+    )
+
 
 class ProcessPeakStage(IAbstractRequestingStage[ProcessPeakStageMetadata]):
     """Processing stage for fitting and subtracting individual peaks.
 
     This stage processes a single peak in SAXS intensity data using a
     two-step fitting approach:
-    1. Initial parabolic fit to estimate peak width
+    1. Initial estimate of the peak width, either with a parabolic
+       fit (legacy) or a closed-form estimator (moments, Caruana)
     2. Refined Gaussian fit for accurate peak characterization
 
     After fitting, the Gaussian approximation is subtracted from the
@@ -77,7 +168,7 @@ class ProcessPeakStage(IAbstractRequestingStage[ProcessPeakStageMetadata]):
     Notes
     -----
     The two-step fitting process:
-    1. Parabolic fit provides initial sigma estimate
+    1. Parabolic fit or closed-form estimate provides initial sigma
     2. Sigma determines Gaussian fit range
     3. Gaussian fit provides final peak characterization
     4. Gaussian subtracted from intensity data
@@ -88,6 +179,8 @@ class ProcessPeakStage(IAbstractRequestingStage[ProcessPeakStageMetadata]):
     SingleStageChainingPolicy : Controls stage chaining behavior
     """
 
+    inplace: ClassVar[bool] = True
+
     def __init__(
         self,
         policy: SingleStageChainingPolicy,
@@ -129,7 +222,7 @@ class ProcessPeakStage(IAbstractRequestingStage[ProcessPeakStageMetadata]):
         SAXSSample
             Sample with updated metadata containing current peak index.
         """
-        _current: int = _flow_metadata[FlowMetadata.Keys.CURRENT]
+        _current = _current_peak_index(_flow_metadata)
         _sample.set_metadata(ESampleMetadataKeys.CURRENT, _current)
         return _sample
 
@@ -160,7 +253,7 @@ class ProcessPeakStage(IAbstractRequestingStage[ProcessPeakStageMetadata]):
             Updated flow metadata with current peak marked as
             processed.
         """
-        _current: int = _flow_metadata[FlowMetadata.Keys.CURRENT]
+        _current = _current_peak_index(_flow_metadata)
 
         if FlowMetadata.Keys.PROCESSED not in _flow_metadata:
             _flow_metadata[FlowMetadata.Keys.PROCESSED] = set()
@@ -187,10 +280,14 @@ class ProcessPeakStage(IAbstractRequestingStage[ProcessPeakStageMetadata]):
         Implements a two-step fitting approach to accurately
         characterize and remove a peak:
 
-        Step 1: Parabolic Fit
-        - Fits a parabolic function around the peak using FIT_RANGE
+        Step 1: Parabolic Fit or Closed-Form Estimate
+        - Fits a parabolic function around the peak using FIT_RANGE,
+          or estimates the Gaussian parameters in closed form
+          depending on the ESTIMATOR metadata key, over a window
+          of a few half maxima (see `estimate_window`)
         - Extracts initial sigma estimate
         - Uses sigma to determine optimal Gaussian fit range
+        - Closed-form estimates also seed the Gaussian `p0`
 
         Step 2: Gaussian Fit
         - Refits with Gaussian function using improved range
@@ -198,7 +295,8 @@ class ProcessPeakStage(IAbstractRequestingStage[ProcessPeakStageMetadata]):
         - Subtracts Gaussian approximation from intensity
 
         The fitted Gaussian is subtracted from the intensity data,
-        with negative values clipped to zero.
+        with negative values clipped to zero, over the window where
+        it is non-negligible (see `_subtract_gauss`).
 
         Parameters
         ----------
@@ -240,72 +338,108 @@ class ProcessPeakStage(IAbstractRequestingStage[ProcessPeakStageMetadata]):
             ProcessPeakStageMetadata.Keys.FIT_RANGE
         ]
 
-        _delta_q = min(np.diff(q_state))
-        _max_intensity = max(i_state)
-
-        def _current_peak_parabole(
-            x: NDArray[np.float64],
-            sigma: float,
-            ampl: float,
-        ) -> NDArray[np.float64]:
-            """Temporary parabole."""
-            return parabole(
-                x,
-                mu=q_state[_current_peak_index],
-                sigma=sigma,
-                ampl=ampl,
-            )
-
-        def _current_peak_gauss(
-            x: NDArray[np.float64],
-            sigma: float,
-            ampl: float,
-        ) -> NDArray[np.float64]:
-            """Temporary gauss."""
-            return gauss(
-                x,
-                q_state[_current_peak_index],
-                sigma,
-                ampl,
-            )
+        _delta_q = float(np.diff(q_state).min())
+        _max_intensity = float(i_state.max())
+        _mu = q_state[_current_peak_index]
 
         if _current_peak_index is not ERuntimeConstants:
             logger.stage_info(
                 "ProcessPeakStage",
                 "Starting peak fitting",
                 peak_index=_current_peak_index,
-                peak_q=f"{q_state[_current_peak_index]:.4f}",
-                peak_I=f"{i_state[_current_peak_index]:.2f}",
+                peak_q=lazy("{:.4f}".format, q_state[_current_peak_index]),
+                peak_I=lazy("{:.2f}".format, i_state[_current_peak_index]),
             )
 
-        # --- First parabola fit ---
+        _bounds = ([_delta_q**2, 1], [0.05, 4 * _max_intensity])
+        _estimator = self.metadata.get_estimator()
+        _engine = self.metadata.get_fit_engine()
+
+        # Warm start from the same peak of the previous frame. A peak
+        # is revisited after subtraction, so entries are keyed by
+        # the visit order too: the residual of the n-th visit seeds
+        # only the n-th visit of the next frame.
+        _sample_metadata = sample.get_metadata().unwrap()
+        _series = (
+            _sample_metadata.get(ESampleMetadataKeys.SERIES.value)
+            if self.metadata.get_warm_start()
+            else None
+        )
+        _visits = _sample_metadata.setdefault(
+            ESampleMetadataKeys.PEAK_VISITS.value,
+            {},
+        )
+        _first_visit = not _visits
+        _visit = _visits.get(_current_peak_index, 0)
+        _visits[_current_peak_index] = _visit + 1
+
+        # --- Window selection and initial guess ---
         left_range = max(_current_peak_index - _fit_range, 0)
         right_range = _current_peak_index + _fit_range
 
-        logger.stage_info(
-            "ProcessPeakStage",
-            "Parabolic fit",
-            window=f"[{left_range}:{right_range}]",
-            points=right_range - left_range,
-        )
+        if _estimator is EPeakEstimator.PARABOLA:
+            logger.stage_info(
+                "ProcessPeakStage",
+                "Parabolic fit",
+                window=lazy("[{}:{}]".format, left_range, right_range),
+                points=right_range - left_range,
+            )
 
-        popt_parabola, _pcov = Fitting.curve_fit(
-            _func=_current_peak_parabole,
-            x_data=q_state[left_range:right_range],
-            y_data=i_state[left_range:right_range],
-            p0=None,
-            bounds=([_delta_q**2, 1], [0.05, 4 * _max_intensity]),
-            error=ierr_state[left_range:right_range],
-        )
+            popt_parabola = DEFAULT_WARM_START_CACHE.fit(
+                _series,
+                f"parabole#{_visit}",
+                _current_peak_index,
+                None,
+                functools.partial(
+                    _fit_window,
+                    model=_CenteredPeakModel(parabole, _mu),
+                    x_data=q_state[left_range:right_range],
+                    y_data=i_state[left_range:right_range],
+                    error=ierr_state[left_range:right_range],
+                    bounds=_bounds,
+                    engine=_engine,
+                ),
+                _bounds,
+            ).popt
+
+            gauss_range = int(popt_parabola[0] / _delta_q)
+            _p0 = None
 
-        gauss_range = int(popt_parabola[0] / _delta_q)
+            logger.stage_info(
+                "ProcessPeakStage",
+                "Parabola OK",
+                sigma=lazy("{:.5f}".format, popt_parabola[0]),
+                ampl=lazy("{:.2f}".format, popt_parabola[1]),
+            )
+        else:
+            left_range, right_range = estimate_window(
+                i_state,
+                _current_peak_index,
+                _fit_range,
+            )
+            _estimate = PEAK_ESTIMATORS[_estimator](
+                q_state[left_range:right_range],
+                i_state[left_range:right_range],
+            )
 
-        logger.stage_info(
-            "ProcessPeakStage",
-            "Parabola OK",
-            sigma=f"{popt_parabola[0]:.5f}",
-            ampl=f"{popt_parabola[1]:.2f}",
-        )
+            # p0 must be feasible for the bounded Gaussian fit
+            _p0 = tuple(
+                np.clip(
+                    (_estimate.sigma, _estimate.ampl),
+                    _bounds[0],
+                    _bounds[1],
+                ),
+            )
+            gauss_range = max(int(_p0[0] / _delta_q), _fit_range)
+
+            logger.stage_info(
+                "ProcessPeakStage",
+                "Closed-form estimate OK",
+                estimator=_estimator.value,
+                window=lazy("[{}:{}]".format, left_range, right_range),
+                sigma=lazy("{:.5f}".format, _p0[0]),
+                ampl=lazy("{:.2f}".format, _p0[1]),
+            )
 
         # --- Refined Gaussian fit ---
         left_range = max(_current_peak_index - gauss_range, 0)
@@ -314,46 +448,104 @@ class ProcessPeakStage(IAbstractRequestingStage[ProcessPeakStageMetadata]):
         logger.stage_info(
             "ProcessPeakStage",
             "Gaussian fit",
-            window=f"[{left_range}:{right_range}]",
+            window=lazy("[{}:{}]".format, left_range, right_range),
             points=right_range - left_range,
         )
 
-        popt, _pcov = Fitting.curve_fit(
-            _func=_current_peak_gauss,
-            x_data=q_state[left_range:right_range],
-            y_data=i_state[left_range:right_range],
-            bounds=([_delta_q**2, 1], [0.05, 4 * _max_intensity]),
-            p0=None,
-            error=ierr_state[left_range:right_range],
-        )
+        _gauss = _CenteredPeakModel(gauss, _mu)
+        popt = DEFAULT_WARM_START_CACHE.fit(
+            _series,
+            f"gauss#{_visit}",
+            _current_peak_index,
+            _p0,
+            functools.partial(
+                _fit_window,
+                model=_gauss,
+                x_data=q_state[left_range:right_range],
+                y_data=i_state[left_range:right_range],
+                error=ierr_state[left_range:right_range],
+                bounds=_bounds,
+                engine=_engine,
+            ),
+            _bounds,
+        ).popt
 
         logger.stage_info(
             "ProcessPeakStage",
             "Gaussian OK",
-            sigma=f"{popt[0]:.5f}",
-            ampl=f"{popt[1]:.2f}",
+            sigma=lazy("{:.5f}".format, popt[0]),
+            ampl=lazy("{:.2f}".format, popt[1]),
         )
 
-        # Subtract Gaussian approximation
-        _current_gauss_approximation = _current_peak_gauss(
-            q_state,
+        _left, _right = self._subtract_gauss(
+            sample,
+            _gauss.mu,
             popt[0],
             popt[1],
+            _first_visit,
         )
 
-        new_intensity_state = i_state - _current_gauss_approximation
-        new_intensity_state = np.maximum(new_intensity_state, 0)
-        sample[SAXSSample.Keys.INTENSITY] = new_intensity_state
-
         logger.stage_info(
             "ProcessPeakStage",
             "Peak subtracted",
-            max_removed=f"{max(_current_gauss_approximation):.2f}",
-            new_range=f"[{min(new_intensity_state):.2f}, {max(new_intensity_state):.2f}]",
+            max_removed=lazy("{:.2f}".format, popt[1]),
+            window=lazy("[{}:{}]".format, _left, _right),
         )
 
         return sample
 
+    @staticmethod
+    def _subtract_gauss(
+        sample: SAXSSample,
+        mu: float,
+        sigma: float,
+        ampl: float,
+        first_visit: bool,
+    ) -> tuple[int, int]:
+        """Subtract the fitted Gaussian from the intensity in place.
+
+        The Gaussian is evaluated only over the `GAUSS_WINDOW_SIGMAS`
+        window around the peak, and the intensity outside of it is
+        left untouched. Negative values of the whole intensity are
+        clipped on the first visit of a sample, so later visits clip
+        the window only.
+
+        Parameters
+        ----------
+        sample : SAXSSample
+            Sample whose intensity is updated.
+        mu : float
+            Fitted Gaussian center.
+        sigma : float
+            Fitted Gaussian width.
+        ampl : float
+            Fitted Gaussian amplitude.
+        first_visit : bool
+            Whether this is the first peak processed for the sample.
+
+        Returns
+        -------
+        tuple[int, int]
+            Bounds of the subtracted window.
+        """
+        q_state = sample[SAXSSample.Keys.Q_VALUES]
+        i_state = sample.get_writable(SAXSSample.Keys.INTENSITY)
+
+        if first_visit:
+            np.maximum(i_state, 0.0, out=i_state)
+
+        _half_width = GAUSS_WINDOW_SIGMAS * abs(sigma)
+        _left = int(np.searchsorted(q_state, mu - _half_width))
+        _right = int(
+            np.searchsorted(q_state, mu + _half_width, side="right"),
+        )
+
+        _window = i_state[_left:_right]
+        _approximation = gauss(q_state[_left:_right], mu, sigma, ampl)
+        np.subtract(_window, _approximation, out=_window)
+        np.maximum(_window, 0.0, out=_window)
+        return _left, _right
+
     def create_request(
         self,
         metadata: FlowMetadata,
@@ -385,3 +577,14 @@ class ProcessPeakStage(IAbstractRequestingStage[ProcessPeakStageMetadata]):
             condition_eval_metadata=eval_metadata,
             flow_metadata=metadata,
         )
+
+    def update_eval_metadata(
+        self,
+        metadata: FlowMetadata,
+        eval_metadata: EvalMetadata,
+    ) -> bool:
+        """Pass the current peak without building a request."""
+        eval_metadata.unwrap()[FlowMetadata.Keys.CURRENT.value] = metadata[
+            FlowMetadata.Keys.CURRENT
+        ]
+        return True
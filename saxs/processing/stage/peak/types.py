@@ -6,7 +6,8 @@ for peak finding and processing stages in the SAXS pipeline.
 It provides:
 - Enumeration of metadata keys for peak finding (height, prominence,
   distance)
-- Enumeration of metadata keys for peak processing (fit_range)
+- Enumeration of metadata keys for peak processing (fit_range,
+  estimator)
 - Typed dictionaries for stage metadata schemas
 - Default metadata instances for both peak finding and processing
   stages
@@ -36,6 +37,7 @@ from saxs.core.types.metadata import (
 from saxs.core.types.stage_metadata import (
     TAbstractStageMetadata,
 )
+from saxs.processing.stage.peak.estimator import EPeakEstimator
 
 
 class EPeakFindMetadataKeys(EMetadataSchemaKeys):
@@ -99,6 +101,9 @@ class EPeakProcessMetadataKeys(EMetadataSchemaKeys):
     """Enum of keys used in PeakFindStageMetadataDict."""
 
     FIT_RANGE = "fit_range"
+    ESTIMATOR = "estimator"
+    FIT_ENGINE = "fit_engine"
+    WARM_START = "warm_start"
 
 
 class PeakProcessStageMetadataDict(MetadataSchemaDict, total=False):
@@ -110,9 +115,19 @@ class PeakProcessStageMetadataDict(MetadataSchemaDict, total=False):
     cut_point : int
         Index or position representing the cut point
         in the SAXS data array.
+    estimator : str
+        Peak estimation path, one of `EPeakEstimator` values.
+    fit_engine : str
+        Registered fitting engine name, see
+        `saxs.processing.stage.common.engine`.
+    warm_start : bool
+        Seed fits with the previous frame of the sample series.
     """
 
     fit_range: int
+    estimator: str
+    fit_engine: str
+    warm_start: bool
 
 
 class ProcessPeakStageMetadata(
@@ -138,10 +153,57 @@ class ProcessPeakStageMetadata(
     Keys = EPeakProcessMetadataKeys
     Dict = PeakProcessStageMetadataDict
 
+    def get_estimator(self) -> EPeakEstimator:
+        """
+        Return the configured peak estimation path.
+
+        Returns
+        -------
+        EPeakEstimator
+            The estimator from metadata, defaulting to the legacy
+            parabola fit if not set.
+        """
+        return EPeakEstimator(
+            self.unwrap().get(
+                EPeakProcessMetadataKeys.ESTIMATOR.value,
+                EPeakEstimator.PARABOLA.value,
+            ),
+        )
+
+    def get_fit_engine(self) -> str | None:
+        """
+        Return the configured fitting engine name.
+
+        Returns
+        -------
+        str | None
+            The engine name, None to use the `Fitting` default.
+        """
+        return self.unwrap().get(EPeakProcessMetadataKeys.FIT_ENGINE.value)
+
+    def get_warm_start(self) -> bool:
+        """
+        Return whether fits are warm-started across frames.
+
+        Returns
+        -------
+        bool
+            The warm-start switch, disabled if not set.
+        """
+        return bool(
+            self.unwrap().get(
+                EPeakProcessMetadataKeys.WARM_START.value,
+                False,
+            ),
+        )
+
 
 DEFAULT_PEAK_PROCESS_DICT = PeakProcessStageMetadataDict(
     {
         EPeakProcessMetadataKeys.FIT_RANGE.value: 2,
+        EPeakProcessMetadataKeys.ESTIMATOR.value: (
+            EPeakEstimator.PARABOLA.value
+        ),
     },
 )
 
@@ -0,0 +1,27 @@
+"""SAXS timeline tracing package."""
+
+from saxs.tracing.profiler import (
+    EProfileMode,
+    StageProfiler,
+    get_env_profiler,
+)
+from saxs.tracing.tracer import (
+    Tracer,
+    get_active_tracer,
+    merge_traces,
+    sample_trace_id,
+    span,
+    tracing,
+)
+
+__all__ = [
+    "EProfileMode",
+    "StageProfiler",
+    "Tracer",
+    "get_active_tracer",
+    "get_env_profiler",
+    "merge_traces",
+    "sample_trace_id",
+    "span",
+    "tracing",
+]
@@ -0,0 +1,296 @@
+"""
+Module: profiler.
+
+Per-stage profiling of kernel runs.
+
+`StageProfiler` is a scheduler hook (see
+`saxs.core.pipeline.scheduler.hooks`) aggregating profiles per stage
+class across all processed samples, in one of two modes:
+
+- "cprofile": every stage execution runs under the `cProfile`
+  profiler of its stage class. `dump` writes one pstats file per
+  stage class, e.g. `ProcessPeakStage.pstats`, readable with
+  `pstats` or snakeviz.
+- "sampling": a timer thread samples the stack of the threads
+  running a stage. `dump` writes `stacks.collapsed`, one
+  "Stage;frame;...;frame count" line per distinct stack, the input
+  of flamegraph.pl and speedscope. The overhead is independent of
+  the number of calls, so this mode suits fine-grained stages.
+
+Profiling is off by default. It is turned on per kernel (see
+`BaseKernel`) or for every kernel of the process with the
+environment variable `SAXS_PROFILE` set to a mode; the profiles of
+the latter are written to `SAXS_PROFILE_DIR` (default
+"saxs_profile") at interpreter exit.
+
+Classes
+-------
+EProfileMode
+    Profiling modes.
+StageProfiler
+    Scheduler hook profiling stages.
+
+Functions
+---------
+get_env_profiler
+    Return the process-wide profiler requested by `SAXS_PROFILE`.
+"""
+
+import atexit
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from enum import Enum
+from pathlib import Path
+from types import FrameType
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.pipeline.scheduler.hooks import IAbstractSchedulerHook
+
+if TYPE_CHECKING:
+    from saxs.core.stage.abstract_stage import IAbstractStage
+    from saxs.core.types.sample import SAXSSample
+
+PROFILE_ENV = "SAXS_PROFILE"
+PROFILE_DIR_ENV = "SAXS_PROFILE_DIR"
+DEFAULT_PROFILE_DIR = "saxs_profile"
+DEFAULT_SAMPLING_INTERVAL = 0.001
+COLLAPSED_STACKS_FILE = "stacks.collapsed"
+
+# Outermost frame of a stage execution, see `IAbstractScheduler`
+_STAGE_ROOT_FRAME = "_run_stage"
+
+_ENV_PROFILER: "StageProfiler | None" = None
+_ENV_LOCK = threading.Lock()
+
+
+class EProfileMode(Enum):
+    """Profiling modes."""
+
+    CPROFILE = "cprofile"
+    SAMPLING = "sampling"
+
+
+def _frame_name(frame: FrameType) -> str:
+    _code = frame.f_code
+    return (
+        f"{_code.co_name} "
+        f"({Path(_code.co_filename).name}:{_code.co_firstlineno})"
+    )
+
+
+class StageProfiler(IAbstractSchedulerHook):
+    """
+    Scheduler hook profiling stages, aggregated per stage class.
+
+    In "cprofile" mode, stages must run in one thread at a time;
+    the "sampling" mode follows any number of threads.
+
+    Parameters
+    ----------
+    mode : EProfileMode | str, optional
+        "cprofile" (default) or "sampling".
+    interval : float, optional
+        Seconds between stack samples in "sampling" mode.
+
+    Examples
+    --------
+    >>> profiler = StageProfiler("sampling")
+    >>> kernel = DefaultKernel(LeanScheduler(), profile=profiler)
+    >>> kernel.run_many(samples)
+    >>> profiler.dump("profiles")
+    """
+
+    def __init__(
+        self,
+        mode: EProfileMode | str = EProfileMode.CPROFILE,
+        interval: float = DEFAULT_SAMPLING_INTERVAL,
+    ):
+        self.mode = EProfileMode(mode)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._active: cProfile.Profile | None = None
+        # Stage class running in each thread, for the sampler
+        self._running: dict[int, str] = {}
+        self._stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def on_stage_start(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: "SAXSSample",
+        queue_depth: int,
+    ) -> None:
+        """Start profiling the stage."""
+        _ = sample, queue_depth
+        _name = type(stage).__name__
+        if self.mode is EProfileMode.SAMPLING:
+            self._running[threading.get_ident()] = _name
+            if self._sampler is None:
+                self._start_sampler()
+            return
+
+        # A stage that raised never reached `on_stage_end`
+        if self._active is not None:
+            self._active.disable()
+
+        _profile = self._profiles.get(_name)
+        if _profile is None:
+            with self._lock:
+                _profile = self._profiles.setdefault(_name, cProfile.Profile())
+        self._active = _profile
+        _profile.enable()
+
+    def on_stage_end(
+        self,
+        stage: "IAbstractStage[Any]",
+        sample: "SAXSSample",
+    ) -> None:
+        """Stop profiling the stage."""
+        _ = sample
+        if self.mode is EProfileMode.SAMPLING:
+            self._running.pop(threading.get_ident(), None)
+            return
+        self._profiles[type(stage).__name__].disable()
+        self._active = None
+
+    def get_stats(self) -> dict[str, pstats.Stats]:
+        """Return the cProfile statistics per stage class."""
+        with self._lock:
+            _profiles = dict(self._profiles)
+        return {
+            _name: pstats.Stats(_profile)
+            for _name, _profile in _profiles.items()
+            if _profile.getstats()
+        }
+
+    def get_collapsed_stacks(self) -> dict[str, int]:
+        """Return the sample count per collapsed stack."""
+        with self._lock:
+            return dict(self._stacks)
+
+    def dump(self, output_dir: str | Path) -> list[Path]:
+        """
+        Write the aggregated profiles.
+
+        Parameters
+        ----------
+        output_dir : str | Path
+            Directory, created if missing.
+
+        Returns
+        -------
+        list[Path]
+            Written files: one pstats file per stage class, or the
+            collapsed stacks.
+        """
+        _dir = Path(output_dir)
+        _dir.mkdir(parents=True, exist_ok=True)
+
+        if self.mode is EProfileMode.CPROFILE:
+            _paths: list[Path] = []
+            for _name, _stats in self.get_stats().items():
+                _path = _dir / f"{_name}.pstats"
+                _stats.dump_stats(_path)
+                _paths.append(_path)
+            return _paths
+
+        _path = _dir / COLLAPSED_STACKS_FILE
+        with open(_path, "w", encoding="utf-8") as _file:
+            for _stack, _count in sorted(self.get_collapsed_stacks().items()):
+                _file.write(f"{_stack} {_count}\n")
+        return [_path]
+
+    def stop(self) -> None:
+        """Stop the sampler thread, if running."""
+        _sampler = self._sampler
+        if _sampler is not None:
+            self._stop.set()
+            _sampler.join()
+            self._sampler = None
+
+    def reset(self) -> None:
+        """Drop the collected profiles."""
+        with self._lock:
+            self._profiles.clear()
+            self._stacks.clear()
+
+    def _start_sampler(self) -> None:
+        with self._lock:
+            if self._sampler is not None:
+                return
+            self._stop.clear()
+            self._sampler = threading.Thread(
+                target=self._sample_loop,
+                name="saxs-stage-sampler",
+                daemon=True,
+            )
+            self._sampler.start()
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            _frames = sys._current_frames()  # noqa: SLF001
+            for _thread, _stage in list(self._running.items()):
+                _frame = _frames.get(_thread)
+                if _frame is None:
+                    continue
+                _stack = self._collapse(_stage, _frame)
+                with self._lock:
+                    self._stacks[_stack] += 1
+
+    @staticmethod
+    def _collapse(stage: str, frame: FrameType) -> str:
+        """Return "stage;outer;...;inner" up to the stage root frame."""
+        _names: list[str] = []
+        _frame: FrameType | None = frame
+        while _frame is not None:
+            if _frame.f_code.co_name == _STAGE_ROOT_FRAME:
+                break
+            _names.append(_frame_name(_frame))
+            _frame = _frame.f_back
+        return ";".join([stage, *reversed(_names)])
+
+
+def get_env_profiler() -> StageProfiler | None:
+    """
+    Return the process-wide profiler requested by `SAXS_PROFILE`.
+
+    The profiler is created on the first call and its profiles are
+    written to `SAXS_PROFILE_DIR` at interpreter exit.
+
+    Returns
+    -------
+    StageProfiler | None
+        Shared profiler, None if `SAXS_PROFILE` is unset or empty.
+
+    Raises
+    ------
+    ValueError
+        If `SAXS_PROFILE` is not a profiling mode.
+    """
+    global _ENV_PROFILER  # noqa: PLW0603
+
+    _mode = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if not _mode:
+        return None
+
+    with _ENV_LOCK:
+        if _ENV_PROFILER is None:
+            _ENV_PROFILER = StageProfiler(_mode)
+            _dir = os.environ.get(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+            atexit.register(_dump_at_exit, _ENV_PROFILER, _dir)
+        return _ENV_PROFILER
+
+
+def _dump_at_exit(profiler: StageProfiler, output_dir: str) -> None:
+    profiler.stop()
+    _paths = profiler.dump(output_dir)
+    sys.stderr.write(
+        f"saxs.tracing: {len(_paths)} profile file(s) written to "
+        f"{output_dir}\n",
+    )
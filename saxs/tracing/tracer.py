@@ -0,0 +1,264 @@
+"""
+Module: tracer.
+
+Timeline tracing of kernel runs in the Chrome Trace Event format.
+
+A `Tracer` records one complete event ("X" phase) per span: stage
+executions, fits, peak searches and consumer frame decodes. Spans
+nest, and a nested span inherits the arguments of the enclosing one,
+so a fit carries the sample id and step of the stage running it. The
+output opens in Perfetto (ui.perfetto.dev) or chrome://tracing.
+
+Tracing is off by default and costs one global lookup per
+instrumented call. It is turned on for a block of code with the
+`tracing` context manager. Timestamps come from the monotonic clock,
+so traces written by several worker processes of a batch run can be
+merged into one timeline with `merge_traces`.
+
+Classes
+-------
+Tracer
+    Collector of trace events.
+
+Functions
+---------
+tracing
+    Context manager enabling a tracer.
+get_active_tracer
+    Return the enabled tracer, if any.
+span
+    Open a span on the enabled tracer.
+sample_trace_id
+    Return the trace id of a sample.
+merge_traces
+    Merge trace files into one timeline.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from saxs.core.types.sample_objects import ESampleMetadataKeys
+
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+
+    from saxs.core.types.sample import SAXSSample
+
+_ACTIVE_TRACER: "Tracer | None" = None
+_NULL_SPAN = nullcontext()
+_SPAN_ARGS: ContextVar[dict[str, Any] | None] = ContextVar(
+    "span_args",
+    default=None,
+)
+_SAMPLE_IDS = itertools.count()
+
+
+class _Span:
+    """Span recorded as a complete event on exit."""
+
+    __slots__ = ("_args", "_category", "_name", "_start", "_token", "tracer")
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        category: str,
+        args: dict[str, Any],
+    ):
+        self.tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = {**(_SPAN_ARGS.get() or {}), **args}
+        self._start = 0
+
+    def __enter__(self) -> dict[str, Any]:
+        self._token = _SPAN_ARGS.set(self._args)
+        self._start = time.perf_counter_ns()
+        return self._args
+
+    def __exit__(self, *exc_info: object) -> None:
+        _end = time.perf_counter_ns()
+        _SPAN_ARGS.reset(self._token)
+        self.tracer.add_event(
+            {
+                "name": self._name,
+                "cat": self._category,
+                "ph": "X",
+                "ts": self._start / 1000,
+                "dur": (_end - self._start) / 1000,
+                "pid": self.tracer.pid,
+                "tid": threading.get_ident(),
+                "args": self._args,
+            },
+        )
+
+
+class Tracer:
+    """
+    Collector of trace events.
+
+    Parameters
+    ----------
+    process_name : str | None, optional
+        Name of the process track, e.g. the worker name.
+
+    Examples
+    --------
+    >>> with tracing("kernel.trace.json"):
+    ...     kernel.run(sample)
+    """
+
+    def __init__(self, process_name: str | None = None):
+        self.pid = os.getpid()
+        self.process_name = process_name or f"saxs-{self.pid}"
+        self._events: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str, category: str, **args: Any) -> _Span:
+        """
+        Open a span, recorded when its block exits.
+
+        Parameters
+        ----------
+        name : str
+            Event name, e.g. the stage class.
+        category : str
+            Event category, e.g. "stage" or "fit".
+        **args : Any
+            JSON-serializable event arguments.
+
+        Returns
+        -------
+        _Span
+            Context manager yielding the mutable event arguments.
+        """
+        return _Span(self, name, category, args)
+
+    def add_event(self, event: dict[str, Any]) -> None:
+        """Append a raw trace event."""
+        with self._lock:
+            self._events.append(event)
+
+    def get_events(self) -> list[dict[str, Any]]:
+        """Return the recorded events, with the process name."""
+        with self._lock:
+            _events = list(self._events)
+        return [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "args": {"name": self.process_name},
+            },
+            *_events,
+        ]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the trace as a Chrome Trace Event document."""
+        return {"traceEvents": self.get_events(), "displayTimeUnit": "ms"}
+
+    def write(self, path: str | Path) -> None:
+        """Write the trace as JSON."""
+        with open(path, "w", encoding="utf-8") as _file:
+            json.dump(self.to_dict(), _file, default=str)
+
+
+def get_active_tracer() -> Tracer | None:
+    """Return the enabled tracer, None if tracing is off."""
+    return _ACTIVE_TRACER
+
+
+@contextmanager
+def tracing(
+    path: str | Path | None = None,
+    tracer: Tracer | None = None,
+) -> Iterator[Tracer]:
+    """
+    Enable tracing for the duration of a block.
+
+    Parameters
+    ----------
+    path : str | Path | None, optional
+        File the trace is written to when the block exits.
+    tracer : Tracer | None, optional
+        Tracer to enable, a new one if None.
+
+    Yields
+    ------
+    Tracer
+        The enabled tracer.
+    """
+    global _ACTIVE_TRACER  # noqa: PLW0603
+
+    _tracer = tracer or Tracer()
+    _previous = _ACTIVE_TRACER
+    _ACTIVE_TRACER = _tracer
+    try:
+        yield _tracer
+    finally:
+        _ACTIVE_TRACER = _previous
+        if path is not None:
+            _tracer.write(path)
+
+
+def span(
+    name: str,
+    category: str,
+    **args: Any,
+) -> "AbstractContextManager[dict[str, Any] | None]":
+    """Open a span on the enabled tracer, a no-op if tracing is off."""
+    _tracer = _ACTIVE_TRACER
+    if _tracer is None:
+        return _NULL_SPAN
+    return _tracer.span(name, category, **args)
+
+
+def sample_trace_id(sample: "SAXSSample") -> str:
+    """
+    Return the trace id of a sample.
+
+    Samples without `ESampleMetadataKeys.SAMPLE_ID` get a
+    process-unique id, stored in their metadata so that it stays
+    stable across stages.
+    """
+    _key = ESampleMetadataKeys.SAMPLE_ID
+    _id = sample.get_metadata().unwrap().get(_key.value)
+    if _id is None:
+        _id = f"{os.getpid()}-{next(_SAMPLE_IDS)}"
+        sample.set_metadata(_key, _id)
+    return str(_id)
+
+
+def merge_traces(
+    paths: list[str | Path],
+    output: str | Path,
+) -> None:
+    """
+    Merge trace files, e.g. of batch workers, into one timeline.
+
+    Parameters
+    ----------
+    paths : list[str | Path]
+        Trace files written by `Tracer.write`.
+    output : str | Path
+        Merged trace file.
+    """
+    _events: list[dict[str, Any]] = []
+    for _path in paths:
+        with open(_path, encoding="utf-8") as _file:
+            _events.extend(json.load(_file)["traceEvents"])
+
+    with open(output, "w", encoding="utf-8") as _file:
+        json.dump(
+            {"traceEvents": _events, "displayTimeUnit": "ms"},
+            _file,
+            default=str,
+        )
@@ -0,0 +1,33 @@
+"""Smoke test of the memory budget benchmark."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parents[2]
+
+
+def test_memory_budget_runs_from_the_repository_root(tmp_path):
+    stats_path = tmp_path / "memory.json"
+
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.memory_budget",
+            "--json",
+            str(stats_path),
+        ],
+        cwd=ROOT_PATH,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    stats = json.loads(stats_path.read_text())
+    assert stats["samples"]["count"] == len(
+        list((ROOT_PATH / "assets" / "samples").glob("*.csv")),
+    )
+    assert "ProcessPeakStage" in stats["stages"]
@@ -2,15 +2,22 @@
 
 """Pytest configuration and shared fixtures for SAXS testing."""
 
+from pathlib import Path
 from unittest.mock import MagicMock
 
 import numpy as np
 import pytest
+from saxs.core.data.reader import DataReader
 from saxs.core.pipeline.scheduler.abstract_stage_request import (
     StageApprovalRequest,
 )
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
 from saxs.core.stage.abstract_stage import IAbstractStage
-from saxs.core.types.sample import SAXSSample
+from saxs.core.types.sample import (
+    ESAXSSampleKeys,
+    SAXSSample,
+    SAXSSampleDict,
+)
 from saxs.core.types.sample_objects import (
     Intensity,
     IntensityError,
@@ -18,6 +25,9 @@ from saxs.core.types.sample_objects import (
     SampleMetadata,
 )
 from saxs.core.types.stage_metadata import TAbstractStageMetadata
+from saxs.processing.kernel.default_kernel import DefaultKernel
+
+SAMPLES_PATH = Path(__file__).resolve().parents[1] / "assets" / "samples"
 
 
 @pytest.fixture
@@ -138,3 +148,56 @@ def complex_metadata():
             "flux": 1e12,
         },
     )
+
+
+@pytest.fixture
+def make_saxs_sample():
+    """Create a factory of SAXSSample from raw arrays."""
+
+    def _make(q_values, intensity, intensity_error=None, metadata=None):
+        if intensity_error is None:
+            intensity_error = np.ones_like(intensity)
+        return SAXSSample(
+            SAXSSampleDict(
+                {
+                    ESAXSSampleKeys.Q_VALUES.value: QValues(q_values),
+                    ESAXSSampleKeys.INTENSITY.value: Intensity(intensity),
+                    ESAXSSampleKeys.INTENSITY_ERROR.value: IntensityError(
+                        intensity_error,
+                    ),
+                    ESAXSSampleKeys.METADATA.value: SampleMetadata(
+                        dict(metadata or {}),
+                    ),
+                },
+            ),
+        )
+
+    return _make
+
+
+def read_bundled_samples() -> list[SAXSSample]:
+    """Read the bundled samples, in name order."""
+    _samples = []
+    for _path in sorted(SAMPLES_PATH.glob("*.csv")):
+        _reader = DataReader(_path)
+        _samples.append(_reader.create_sample(*_reader.read_data()))
+    return _samples
+
+
+@pytest.fixture
+def bundled_samples():
+    """Fresh copies of the bundled samples."""
+    return read_bundled_samples()
+
+
+@pytest.fixture
+def read_samples():
+    """Reader of fresh copies of the bundled samples."""
+    return read_bundled_samples
+
+
+@pytest.fixture(scope="session")
+def sequential_results():
+    """Results of the bundled samples run one by one."""
+    _kernel = DefaultKernel(BaseScheduler())
+    return [_kernel.run(_sample) for _sample in read_bundled_samples()]
@@ -0,0 +1,113 @@
+"""Tests of the process-wide compiled kernel sharing."""
+
+import threading
+
+import numpy as np
+import pytest
+from saxs.core.kernel.compiled_kernel import DEFAULT_COMPILED_KERNEL_CACHE
+from saxs.core.pipeline.condition.chaining_condition import (
+    ChainingPeakCondition,
+)
+from saxs.core.pipeline.scheduler.interleaving_scheduler import (
+    InterleavingScheduler,
+)
+from saxs.core.pipeline.scheduler.scheduler import (
+    BaseScheduler,
+    LeanScheduler,
+)
+from saxs.core.types.sample import SAXSSample
+from saxs.processing.kernel.default_kernel import DefaultKernel
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+
+@pytest.fixture(autouse=True)
+def compiled_cache():
+    DEFAULT_COMPILED_KERNEL_CACHE.clear()
+    yield DEFAULT_COMPILED_KERNEL_CACHE
+    DEFAULT_COMPILED_KERNEL_CACHE.clear()
+
+
+def assert_same_result(result, expected):
+    np.testing.assert_array_equal(
+        result[SAXSSample.Keys.INTENSITY],
+        expected[SAXSSample.Keys.INTENSITY],
+    )
+    assert result.get_metadata().unwrap() == expected.get_metadata().unwrap()
+
+
+def test_kernels_of_one_definition_share_stages(compiled_cache):
+    first = DefaultKernel(BaseScheduler(), share_compiled=True)
+    second = DefaultKernel(BaseScheduler(), share_compiled=True)
+    private = DefaultKernel(BaseScheduler())
+
+    assert (compiled_cache.hits, compiled_cache.misses) == (1, 1)
+    assert first.pipeline.init_stages == second.pipeline.init_stages
+    assert not set(map(id, private.pipeline.init_stages)) & set(
+        map(id, first.pipeline.init_stages),
+    )
+
+
+def test_shared_stages_keep_no_sample_state(
+    read_samples,
+    sequential_results,
+):
+    first = DefaultKernel(BaseScheduler(), share_compiled=True)
+    second = DefaultKernel(InterleavingScheduler(), share_compiled=True)
+
+    # Alternate the kernels so every sample follows another one
+    # through the same stage instances
+    for _index, _sample in enumerate(read_samples()):
+        _kernel = second if _index % 2 else first
+        assert_same_result(_kernel.run(_sample), sequential_results[_index])
+
+    results = second.run_many(read_samples()[::-1])
+
+    for result, expected in zip(
+        results[::-1],
+        sequential_results,
+        strict=True,
+    ):
+        assert_same_result(result, expected)
+
+
+def test_lean_runs_sharing_the_table_keep_their_own_conditions(
+    monkeypatch,
+    read_samples,
+    sequential_results,
+):
+    first, second = (
+        DefaultKernel(LeanScheduler(), share_compiled=True) for _ in range(2)
+    )
+    assert (
+        first.scheduler.get_transition_table()
+        is second.scheduler.get_transition_table()
+    )
+
+    # A whole run of the second kernel between each condition input
+    # of the first and its evaluation, as a concurrent thread could
+    evaluate = ChainingPeakCondition.evaluate
+    interleaved = []
+    nested = threading.Event()
+
+    def interleaved_evaluate(self, eval_metadata):
+        if not nested.is_set():
+            nested.set()
+            try:
+                interleaved.append(second.run(read_samples()[1]))
+            finally:
+                nested.clear()
+        return evaluate(self, eval_metadata)
+
+    monkeypatch.setattr(
+        ChainingPeakCondition,
+        "evaluate",
+        interleaved_evaluate,
+    )
+
+    assert_same_result(first.run(read_samples()[0]), sequential_results[0])
+    assert interleaved
+    for result in interleaved:
+        assert_same_result(result, sequential_results[1])
@@ -0,0 +1,184 @@
+"""Tests of the persistent kernel result cache."""
+
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+from saxs.core.data.reader import DataReader
+from saxs.core.kernel.result_cache import KernelResultCache
+from saxs.core.pipeline.scheduler.budget import SchedulerBudget
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.core.types.digest import ContentIdentityError
+from saxs.core.types.sample import SAXSSample
+from saxs.processing.kernel.default_kernel import DefaultKernel
+from saxs.processing.stage.common.fitting import Fitting
+
+SAMPLE_PATH = (
+    Path(__file__).resolve().parents[4] / "assets" / "samples" / "sample1.csv"
+)
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+
+def read_sample() -> SAXSSample:
+    reader = DataReader(SAMPLE_PATH)
+    return reader.create_sample(*reader.read_data())
+
+
+@pytest.fixture
+def result_cache(tmp_path):
+    return KernelResultCache(tmp_path)
+
+
+@pytest.fixture
+def default_engine():
+    engine = Fitting.resolve_engine(None)
+    yield
+    Fitting.configure(engine=engine)
+
+
+def test_rerun_hits(result_cache):
+    kernel = DefaultKernel(BaseScheduler(), result_cache=result_cache)
+
+    first = kernel.run(read_sample())
+    second = kernel.run(read_sample())
+
+    assert (result_cache.hits, result_cache.misses) == (1, 1)
+    np.testing.assert_array_equal(
+        first[SAXSSample.Keys.INTENSITY],
+        second[SAXSSample.Keys.INTENSITY],
+    )
+
+
+def test_fitting_engine_is_part_of_the_key(result_cache, default_engine):
+    kernel = DefaultKernel(BaseScheduler(), result_cache=result_cache)
+    sample = read_sample()
+    key = KernelResultCache.make_key(sample, kernel.fingerprint)
+
+    Fitting.configure(engine="least_squares")
+
+    assert KernelResultCache.make_key(sample, kernel.fingerprint) != key
+
+
+def test_budget_is_part_of_the_key(result_cache):
+    limited = DefaultKernel(
+        BaseScheduler(budget=SchedulerBudget(maxfev=100)),
+        result_cache=result_cache,
+    )
+    unlimited = DefaultKernel(BaseScheduler(), result_cache=result_cache)
+    sample = read_sample()
+
+    assert limited.fingerprint == unlimited.fingerprint
+    assert limited._result_key(sample) != unlimited._result_key(sample)
+
+
+def test_partial_results_are_not_stored(result_cache):
+    kernel = DefaultKernel(
+        BaseScheduler(budget=SchedulerBudget(max_steps=2)),
+        result_cache=result_cache,
+    )
+
+    result = kernel.run(read_sample())
+
+    assert not KernelResultCache.is_cacheable(result)
+    assert list(result_cache.directory.iterdir()) == []
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"truncated",
+        b"cno_such_module_for_saxs\nThing\n.",
+        b"cos\nno_such_attribute\n.",
+        pickle.dumps({"not": "a sample"})[:-3],
+    ],
+)
+def test_unloadable_entries_are_misses(result_cache, payload):
+    result_cache._path("key").write_bytes(payload)
+
+    assert result_cache.get("key") is None
+    assert result_cache.misses == 1
+    assert not result_cache._path("key").exists()
+
+
+def test_kernel_without_identity_runs_uncached(result_cache, monkeypatch):
+    def fingerprint(*_args):
+        msg = "opaque metadata"
+        raise ContentIdentityError(msg)
+
+    monkeypatch.setattr(KernelResultCache, "fingerprint", fingerprint)
+
+    kernel = DefaultKernel(BaseScheduler(), result_cache=result_cache)
+    kernel.run(read_sample())
+
+    assert kernel.fingerprint is None
+    assert (result_cache.hits, result_cache.misses) == (0, 0)
+
+
+@pytest.fixture
+def evictions(monkeypatch):
+    """Count the directory scans of `KernelResultCache.evict`."""
+    calls = []
+    evict = KernelResultCache.evict
+
+    def _evict(self):
+        calls.append(self)
+        evict(self)
+
+    monkeypatch.setattr(KernelResultCache, "evict", _evict)
+    return calls
+
+
+def test_eviction_drops_least_recently_used_entries(tmp_path):
+    sample = read_sample()
+    probe = KernelResultCache(tmp_path / "probe")
+    probe.put("probe", sample)
+    size = probe._path("probe").stat().st_size
+    result_cache = KernelResultCache(tmp_path / "cache", int(2.5 * size))
+
+    result_cache.put("old", sample)
+    result_cache.put("recent", sample)
+    os.utime(result_cache._path("old"), (1, 1))
+    os.utime(result_cache._path("recent"), (2, 2))
+    result_cache.put("new", sample)
+
+    assert sorted(_p.stem for _p in result_cache.directory.iterdir()) == [
+        "new",
+        "recent",
+    ]
+
+
+def test_put_scans_only_beyond_the_bound(tmp_path, evictions):
+    sample = read_sample()
+    result_cache = KernelResultCache(tmp_path)
+
+    for _key in ("a", "b", "c"):
+        result_cache.put(_key, sample)
+    # Replacing an entry does not grow the tracked size
+    size = result_cache._path("a").stat().st_size
+    result_cache.max_bytes = 3 * size
+    for _ in range(3):
+        result_cache.put("a", sample)
+
+    assert len(evictions) == 1
+
+    result_cache.put("d", sample)
+
+    assert len(evictions) == 2
+    assert len(list(result_cache.directory.iterdir())) == 3
+
+
+def test_clear_resets_the_tracked_size(tmp_path, evictions):
+    sample = read_sample()
+    result_cache = KernelResultCache(tmp_path)
+    result_cache.put("a", sample)
+
+    result_cache.clear()
+    result_cache.put("a", sample)
+
+    assert len(evictions) == 1
+    assert list(result_cache.directory.iterdir()) == [result_cache._path("a")]
@@ -0,0 +1,120 @@
+"""Tests of the prefix-sharing sweep runner."""
+
+import dataclasses
+
+import numpy as np
+import pytest
+from saxs.core.kernel.back.buffer import Buffer
+from saxs.core.kernel.sweep_runner import SweepPoint, SweepRunner
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.core.types.sample import SAXSSample
+from saxs.processing.kernel.default_kernel import DefaultKernel
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+GRID = {
+    "cut": {"cut_point": [50, 100]},
+    "filter": {"window_size": [5, 10]},
+}
+
+
+class OverriddenKernel(DefaultKernel):
+    """Default kernel with metadata overrides, or no metadata."""
+
+    def __init__(self, scheduler, overrides=None, unset=()):
+        self.overrides = overrides or {}
+        self.unset = unset
+        super().__init__(scheduler)
+
+    def define(self):
+        _stage_specs, _policy_specs, _execution_order = super().define()
+        _specs = Buffer()
+        for _stage_id, _spec in _stage_specs.items():
+            if _stage_id in self.unset:
+                _spec = dataclasses.replace(_spec, metadata=None)
+            elif _stage_id in self.overrides:
+                _spec = dataclasses.replace(
+                    _spec,
+                    metadata=dataclasses.replace(
+                        _spec.metadata,
+                        value={
+                            **_spec.metadata.unwrap(),
+                            **self.overrides[_stage_id],
+                        },
+                    ),
+                )
+            _specs.register(_stage_id, _spec)
+        return _specs, _policy_specs, _execution_order
+
+
+def test_results_match_independent_runs(read_samples):
+    sample = read_samples()[0]
+    runner = SweepRunner(DefaultKernel(BaseScheduler()), GRID)
+
+    results = runner.run(sample)
+
+    assert [_result.point for _result in results] == runner.points
+    assert len(results) == 4
+    for _result in results:
+        expected = OverriddenKernel(
+            BaseScheduler(),
+            _result.point.overrides,
+        ).run(read_samples()[0])
+        for _key in (SAXSSample.Keys.Q_VALUES, SAXSSample.Keys.INTENSITY):
+            np.testing.assert_array_equal(
+                _result.sample[_key],
+                expected[_key],
+            )
+        assert (
+            _result.sample.get_metadata().unwrap()
+            == expected.get_metadata().unwrap()
+        )
+
+
+def test_prefix_runs_once_per_distinct_parameters(read_samples):
+    runner = SweepRunner(DefaultKernel(BaseScheduler()), GRID)
+
+    runner.run(read_samples()[0])
+
+    assert runner.prefix == ["cut", "filter", "background"]
+    # cut: 2 runs, filter and background: 2 per cut branch
+    assert runner.stage_runs == 10
+
+
+def test_input_sample_is_not_modified(read_samples):
+    sample = read_samples()[0]
+    intensity = np.array(sample[SAXSSample.Keys.INTENSITY])
+
+    SweepRunner(DefaultKernel(BaseScheduler()), GRID).run(sample)
+
+    np.testing.assert_array_equal(
+        sample[SAXSSample.Keys.INTENSITY],
+        intensity,
+    )
+
+
+def test_unknown_stage_is_rejected():
+    with pytest.raises(KeyError, match="unknown stage 'smooth'"):
+        SweepRunner(
+            DefaultKernel(BaseScheduler()),
+            {"smooth": {"window_size": [5]}},
+        )
+
+
+def test_override_without_metadata_is_rejected(read_samples):
+    runner = SweepRunner(
+        OverriddenKernel(BaseScheduler(), unset=("filter",)),
+        {"filter": {"window_size": [5]}},
+    )
+
+    with pytest.raises(ValueError, match="no metadata to override"):
+        runner.run(read_samples()[0])
+
+
+def test_stage_key_ignores_other_stages():
+    point = SweepPoint({"cut": {"cut_point": 50}, "filter": {"x": 1}})
+
+    assert point.stage_key("cut") == (("cut_point", "50"),)
+    assert point.stage_key("background") == ()
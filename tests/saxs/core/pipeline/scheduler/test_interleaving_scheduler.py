@@ -0,0 +1,81 @@
+"""Tests of the InterleavingScheduler."""
+
+import numpy as np
+import pytest
+from saxs.core.pipeline.scheduler.interleaving_scheduler import (
+    InterleavingScheduler,
+)
+from saxs.core.pipeline.scheduler.policy.insertion_policy import (
+    SaturationInsertPolicy,
+)
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.core.types.sample import SAXSSample
+from saxs.processing.kernel.default_kernel import DefaultKernel
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+
+def assert_same_results(results, expected_results):
+    for result, expected in zip(results, expected_results, strict=True):
+        np.testing.assert_array_equal(
+            result[SAXSSample.Keys.INTENSITY],
+            expected[SAXSSample.Keys.INTENSITY],
+        )
+        assert (
+            result.get_metadata().unwrap()
+            == expected.get_metadata().unwrap()
+        )
+
+
+def test_interleaved_samples_match_sequential_runs(
+    bundled_samples,
+    sequential_results,
+):
+    kernel = DefaultKernel(InterleavingScheduler())
+
+    results = kernel.run_many(bundled_samples)
+
+    assert_same_results(results, sequential_results)
+
+
+def test_samples_retire_independently(bundled_samples, sequential_results):
+    kernel = DefaultKernel(InterleavingScheduler())
+    scheduler = kernel.scheduler
+    scheduler.enqueue_initial_stages(kernel.pipeline.init_stages)
+    tickets = [scheduler.submit(_sample) for _sample in bundled_samples]
+
+    retired = dict(scheduler.iter_completed())
+
+    assert sorted(retired) == tickets
+    assert_same_results(
+        [retired[_ticket] for _ticket in tickets],
+        sequential_results,
+    )
+
+
+def test_repeated_batches_match_sequential_runs(
+    read_samples,
+    sequential_results,
+):
+    kernel = DefaultKernel(InterleavingScheduler())
+    kernel.run_many(read_samples()[::-1])
+
+    results = kernel.run_many(read_samples()[::-1])
+
+    assert_same_results(results[::-1], sequential_results)
+
+
+def test_stateful_policy_counts_each_sample(read_samples):
+    sequential = DefaultKernel(
+        BaseScheduler(insertion_policy=SaturationInsertPolicy(2)),
+    )
+    expected_results = [sequential.run(_s) for _s in read_samples()]
+    kernel = DefaultKernel(
+        InterleavingScheduler(insertion_policy=SaturationInsertPolicy(2)),
+    )
+
+    results = kernel.run_many(read_samples())
+
+    assert_same_results(results, expected_results)
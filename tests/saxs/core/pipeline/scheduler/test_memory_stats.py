@@ -0,0 +1,90 @@
+"""Tests of the memory statistics collector."""
+
+import pytest
+from saxs.core.pipeline.scheduler.interleaving_scheduler import (
+    InterleavingScheduler,
+)
+from saxs.core.pipeline.scheduler.memory_stats import (
+    MemoryBudgetError,
+    MemoryStatsCollector,
+)
+from saxs.core.pipeline.scheduler.priority_scheduler import (
+    PriorityScheduler,
+)
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.core.stage.abstract_stage import IAbstractStage
+from saxs.core.types.flow_metadata import FlowMetadata
+
+BUDGET = 1 << 16
+
+
+class AllocatingStage(IAbstractStage):
+    """Stage holding a buffer beyond the budget, then maybe failing."""
+
+    def __init__(self, fail):
+        super().__init__(metadata=None)
+        self.fail = fail
+
+    def _process(self, sample):
+        buffer = bytearray(4 * BUDGET)
+        if self.fail:
+            msg = "stage failed"
+            raise RuntimeError(msg)
+        del buffer
+        return sample
+
+
+@pytest.fixture
+def memory():
+    """Strict collector, tracing stopped after the test."""
+    collector = MemoryStatsCollector(default_budget=BUDGET, strict=True)
+    yield collector
+    collector.close()
+
+
+@pytest.mark.parametrize(
+    "scheduler_cls",
+    [BaseScheduler, PriorityScheduler, InterleavingScheduler],
+)
+def test_strict_budget_raises_after_the_stage(
+    scheduler_cls,
+    memory,
+    make_saxs_sample,
+):
+    scheduler = scheduler_cls(
+        init_stages=[AllocatingStage(fail=False)],
+        hooks=[memory],
+    )
+    sample = make_saxs_sample([0.1, 0.2], [1.0, 2.0])
+
+    with pytest.raises(MemoryBudgetError, match="AllocatingStage"):
+        scheduler.run(sample, FlowMetadata({}))
+
+    [violation] = memory.get_violations()
+    assert violation["budget"] == BUDGET
+    assert violation["peak"] > BUDGET
+
+
+@pytest.mark.parametrize(
+    "scheduler_cls",
+    [BaseScheduler, PriorityScheduler, InterleavingScheduler],
+)
+def test_strict_budget_keeps_the_stage_error(
+    scheduler_cls,
+    memory,
+    make_saxs_sample,
+):
+    scheduler = scheduler_cls(
+        init_stages=[AllocatingStage(fail=True)],
+        hooks=[memory],
+    )
+    sample = make_saxs_sample([0.1, 0.2], [1.0, 2.0])
+
+    with pytest.raises(RuntimeError, match="stage failed") as info:
+        scheduler.run(sample, FlowMetadata({}))
+
+    assert not isinstance(info.value, MemoryBudgetError)
+    assert info.value.__context__ is None
+    [violation] = memory.get_violations()
+    assert violation["stage"] == "AllocatingStage"
+    assert not memory._running
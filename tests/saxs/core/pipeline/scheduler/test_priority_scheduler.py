@@ -0,0 +1,93 @@
+"""Tests of the PriorityScheduler and its cost models."""
+
+import numpy as np
+import pytest
+from saxs.core.pipeline.scheduler.cost_model import (
+    CheapestPeakFirstCostModel,
+    ShortestJobFirstCostModel,
+)
+from saxs.core.pipeline.scheduler.policy.insertion_policy import (
+    SaturationInsertPolicy,
+)
+from saxs.core.pipeline.scheduler.priority_scheduler import (
+    PriorityScheduler,
+)
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.core.types.flow_metadata import FlowMetadata
+from saxs.core.types.sample import SAXSSample
+from saxs.core.types.scheduler_metadata import ERuntimeConstants
+from saxs.processing.kernel.default_kernel import DefaultKernel
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+
+@pytest.mark.parametrize(
+    "unprocessed",
+    [None, ERuntimeConstants.UNDEFINED_PEAK, {}, {3: 1.0, 8: 2.0}],
+)
+def test_cheapest_peak_first_accepts_any_unprocessed_value(
+    make_saxs_sample,
+    unprocessed,
+):
+    sample = make_saxs_sample(np.linspace(0.1, 1.0, 10), np.ones(10))
+    flow_metadata = FlowMetadata({})
+    if unprocessed is not None:
+        flow_metadata.unwrap()[FlowMetadata.Keys.UNPROCESSED.value] = (
+            unprocessed
+        )
+
+    cost = CheapestPeakFirstCostModel().cost(None, sample, flow_metadata)
+
+    peaks = len(unprocessed) if isinstance(unprocessed, dict) else 0
+    assert cost == (peaks + 1) * 10
+
+
+@pytest.mark.parametrize(
+    "cost_model",
+    [CheapestPeakFirstCostModel(), ShortestJobFirstCostModel()],
+)
+def test_interleaved_samples_match_sequential_runs(
+    bundled_samples,
+    sequential_results,
+    cost_model,
+):
+    kernel = DefaultKernel(PriorityScheduler(cost_model=cost_model))
+
+    results = kernel.run_many(bundled_samples)
+
+    for result, expected in zip(results, sequential_results, strict=True):
+        np.testing.assert_array_equal(
+            result[SAXSSample.Keys.INTENSITY],
+            expected[SAXSSample.Keys.INTENSITY],
+        )
+        assert (
+            result.get_metadata().unwrap()
+            == expected.get_metadata().unwrap()
+        )
+
+
+def test_stateful_policy_counts_each_sample(read_samples):
+    sequential = DefaultKernel(
+        BaseScheduler(insertion_policy=SaturationInsertPolicy(2)),
+    )
+    expected_results = [sequential.run(_s) for _s in read_samples()]
+    kernel = DefaultKernel(
+        PriorityScheduler(
+            insertion_policy=SaturationInsertPolicy(2),
+            cost_model=CheapestPeakFirstCostModel(),
+        ),
+    )
+
+    results = kernel.run_many(read_samples())
+
+    for result, expected in zip(results, expected_results, strict=True):
+        np.testing.assert_array_equal(
+            result[SAXSSample.Keys.INTENSITY],
+            expected[SAXSSample.Keys.INTENSITY],
+        )
+        assert (
+            result.get_metadata().unwrap()
+            == expected.get_metadata().unwrap()
+        )
@@ -0,0 +1,55 @@
+"""Tests of the scheduler statistics collector."""
+
+import pytest
+from saxs.core.pipeline.scheduler.interleaving_scheduler import (
+    InterleavingScheduler,
+)
+from saxs.core.pipeline.scheduler.priority_scheduler import (
+    PriorityScheduler,
+)
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.core.pipeline.scheduler.scheduler_stats import (
+    SchedulerStatsCollector,
+)
+from saxs.core.stage.abstract_stage import IAbstractStage
+from saxs.core.types.flow_metadata import FlowMetadata
+
+
+class FailingStage(IAbstractStage):
+    def __init__(self):
+        super().__init__(metadata=None)
+
+    def _process(self, sample):
+        msg = "stage failed"
+        raise RuntimeError(msg)
+
+
+def test_keeps_the_most_recent_step_counts():
+    stats = SchedulerStatsCollector(max_step_samples=2)
+
+    for steps in (5, 1, 2):
+        stats.on_sample_end(None, steps)
+
+    assert stats.to_dict()["samples"] == {
+        "count": 3,
+        "total_steps": 8,
+        "max_steps": 5,
+        "steps": [1, 2],
+    }
+
+
+@pytest.mark.parametrize(
+    "scheduler_cls",
+    [BaseScheduler, PriorityScheduler, InterleavingScheduler],
+)
+def test_failing_stage_is_timed(scheduler_cls, make_saxs_sample):
+    stats = SchedulerStatsCollector()
+    scheduler = scheduler_cls(init_stages=[FailingStage()], hooks=[stats])
+    sample = make_saxs_sample([0.1, 0.2], [1.0, 2.0])
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        scheduler.run(sample, FlowMetadata({}))
+
+    assert not stats._running
+    wall_time = stats.to_dict()["stages"]["FailingStage"]["wall_time"]
+    assert wall_time["count"] == 1
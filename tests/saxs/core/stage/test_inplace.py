@@ -0,0 +1,115 @@
+"""Tests of the in-place contract of stages."""
+
+import numpy as np
+import pytest
+from saxs.core.pipeline.scheduler.interleaving_scheduler import (
+    InterleavingScheduler,
+)
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.core.stage.fused_stage import FusedStage
+from saxs.core.types.flow_metadata import FlowMetadata
+from saxs.core.types.sample import SAXSSample
+from saxs.processing.functions import gauss
+from saxs.processing.kernel.default_kernel import DefaultKernel
+from saxs.processing.stage.cut.cut import CutStage
+from saxs.processing.stage.cut.types import CutStageMetadata
+from saxs.processing.stage.filter.filter import FilterStage
+from saxs.processing.stage.peak.process_peak import ProcessPeakStage
+
+Q_VALUES = np.linspace(0.01, 0.3, 600)
+INTENSITY = 2.0 + gauss(Q_VALUES, Q_VALUES[300], 0.004, 100.0)
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+
+@pytest.fixture
+def caller_sample(make_saxs_sample):
+    return make_saxs_sample(Q_VALUES.copy(), INTENSITY.copy())
+
+
+def caller_arrays(sample):
+    return [sample[_key] for _key in SAXSSample.ARRAY_KEYS]
+
+
+def snapshot(arrays):
+    return [(_array.copy(), _array.flags.writeable) for _array in arrays]
+
+
+def assert_untouched(arrays, expected):
+    for array, (values, writeable) in zip(arrays, expected, strict=True):
+        assert array.flags.writeable == writeable
+        np.testing.assert_array_equal(array, values)
+
+
+def make_fused_stage():
+    return FusedStage(
+        [
+            CutStage(CutStageMetadata({"cut_point": 10})),
+            FilterStage(),
+        ],
+    )
+
+
+@pytest.mark.parametrize("run_many", [False, True])
+def test_kernel_leaves_caller_arrays_untouched(bundled_samples, run_many):
+    kernel = DefaultKernel(InterleavingScheduler())
+    arrays = [caller_arrays(_sample) for _sample in bundled_samples]
+    expected = [snapshot(_arrays) for _arrays in arrays]
+
+    if run_many:
+        kernel.run_many(bundled_samples)
+    else:
+        for _sample in bundled_samples:
+            kernel.run(_sample)
+
+    for _arrays, _expected in zip(arrays, expected, strict=True):
+        assert_untouched(_arrays, _expected)
+
+
+@pytest.mark.parametrize(
+    "make_stage",
+    [
+        FilterStage,
+        make_fused_stage,
+        lambda: ProcessPeakStage(None),
+    ],
+)
+def test_stage_leaves_caller_arrays_untouched(caller_sample, make_stage):
+    arrays = caller_arrays(caller_sample)
+    expected = snapshot(arrays)
+    flow_metadata = FlowMetadata(
+        {FlowMetadata.Keys.CURRENT.value: {300: float(INTENSITY[300])}},
+    )
+
+    result, _ = make_stage().process(caller_sample, flow_metadata)
+
+    assert_untouched(arrays, expected)
+    assert not np.array_equal(result[SAXSSample.Keys.INTENSITY], INTENSITY)
+
+
+def test_scheduler_leaves_caller_arrays_untouched(caller_sample):
+    arrays = caller_arrays(caller_sample)
+    expected = snapshot(arrays)
+    scheduler = BaseScheduler(init_stages=[FilterStage(), FilterStage()])
+
+    scheduler.run(caller_sample, FlowMetadata({}))
+
+    assert_untouched(arrays, expected)
+
+
+def test_owned_arrays_are_overwritten(caller_sample):
+    owned = INTENSITY.copy()
+    caller_sample.set_owned(SAXSSample.Keys.INTENSITY, owned)
+
+    result, _ = make_fused_stage().process(caller_sample, FlowMetadata({}))
+
+    intensity = result[SAXSSample.Keys.INTENSITY]
+    assert np.shares_memory(intensity, owned)
+    assert result.is_owned(SAXSSample.Keys.INTENSITY)
+    np.testing.assert_allclose(
+        intensity,
+        FilterStage().smooth(INTENSITY[10:]),
+        rtol=1e-14,
+    )
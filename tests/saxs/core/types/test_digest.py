@@ -0,0 +1,99 @@
+"""Tests of the canonical content hashing."""
+
+import hashlib
+
+import numpy as np
+import pytest
+from saxs.core.types.digest import ContentIdentityError, update_digest
+from saxs.processing.stage.common.engine import CurveFitEngine
+from saxs.processing.stage.common.fit_cache import FitCache
+
+
+def digest_of(value):
+    digest = hashlib.blake2b(digest_size=20)
+    update_digest(digest, value)
+    return digest.hexdigest()
+
+
+def define(source, **namespace):
+    exec(source, namespace)  # noqa: S102
+    return namespace["model"]
+
+
+def test_functions_differing_in_a_constant_differ():
+    a = 2.0
+    square = lambda x: a * x**2  # noqa: E731
+    cube = lambda x: a * x**3  # noqa: E731
+
+    assert digest_of(square) != digest_of(cube)
+
+
+def test_nested_code_constants_are_hashed():
+    first = define("def model(x):\n    return (lambda y: y + 1)(x)\n")
+    second = define("def model(x):\n    return (lambda y: y + 2)(x)\n")
+
+    assert digest_of(first) != digest_of(second)
+
+
+def test_referenced_globals_are_hashed_by_value():
+    source = "def model(x):\n    return SCALE * x\n"
+
+    assert digest_of(define(source, SCALE=1.0)) == digest_of(
+        define(source, SCALE=1.0),
+    )
+    assert digest_of(define(source, SCALE=1.0)) != digest_of(
+        define(source, SCALE=2.0),
+    )
+
+
+def test_closures_and_defaults_are_hashed():
+    def make(power, offset=0.0):
+        def model(x, shift=offset):
+            return x**power + shift
+
+        return model
+
+    assert digest_of(make(2)) == digest_of(make(2))
+    assert digest_of(make(2)) != digest_of(make(3))
+    assert digest_of(make(2)) != digest_of(make(2, 1.0))
+
+
+def test_recursive_functions_terminate():
+    model = define(
+        "def model(n):\n    return 1 if n < 2 else n * model(n - 1)\n",
+    )
+
+    assert digest_of(model) == digest_of(model)
+
+
+def test_unhashable_globals_refuse_identity():
+    model = define("def model(x):\n    return STATE.scale * x\n")
+    model.__globals__["STATE"] = object()
+
+    with pytest.raises(ContentIdentityError):
+        digest_of(model)
+
+
+def test_fit_cache_keys_do_not_collide():
+    x = np.linspace(0.0, 1.0, 5)
+    a = 2.0
+    square = lambda x, b: a * x**2 + b  # noqa: E731
+    cube = lambda x, b: a * x**3 + b  # noqa: E731
+
+    def key(func):
+        return FitCache.make_key(
+            func,
+            x,
+            x,
+            None,
+            None,
+            (-np.inf, np.inf),
+            CurveFitEngine(),
+        )
+
+    assert key(square) is not None
+    assert key(square) != key(cube)
+
+    opaque = define("def model(x, b):\n    return STATE(x) + b\n")
+    opaque.__globals__["STATE"] = object()
+    assert key(opaque) is None
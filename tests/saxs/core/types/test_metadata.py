@@ -0,0 +1,28 @@
+"""Tests of the runtime type check of metadata assignment."""
+
+import pytest
+from saxs.core.types.flow_metadata import FlowMetadata
+from saxs.core.types.scheduler_metadata import ERuntimeConstants
+
+
+def test_setitem_accepts_union_members():
+    metadata = FlowMetadata({})
+
+    metadata[FlowMetadata.Keys.CURRENT] = {3: 1.5}
+    assert metadata[FlowMetadata.Keys.CURRENT] == {3: 1.5}
+
+    metadata[FlowMetadata.Keys.CURRENT] = ERuntimeConstants.PROCESSED_PEAK
+    assert (
+        metadata[FlowMetadata.Keys.CURRENT]
+        is ERuntimeConstants.PROCESSED_PEAK
+    )
+
+
+def test_setitem_checks_the_value_not_the_container():
+    metadata = FlowMetadata({})
+
+    metadata[FlowMetadata.Keys.PROCESSED] = {1, 2}
+    metadata[FlowMetadata.Keys.SAMPLE] = "sample1"
+
+    with pytest.raises(TypeError):
+        metadata[FlowMetadata.Keys.SAMPLE] = 1
@@ -0,0 +1,30 @@
+"""Tests of the array ownership of SAXSSample."""
+
+import numpy as np
+from saxs.core.types.sample import SAXSSample
+
+
+def test_get_writable_copies_caller_arrays_once(make_saxs_sample):
+    intensity = np.array([1.0, 2.0, 3.0])
+    sample = make_saxs_sample(np.array([0.1, 0.2, 0.3]), intensity)
+
+    writable = sample.get_writable(SAXSSample.Keys.INTENSITY)
+    writable[0] = 10.0
+
+    assert writable is not intensity
+    assert sample.get_writable(SAXSSample.Keys.INTENSITY) is writable
+    np.testing.assert_array_equal(intensity, [1.0, 2.0, 3.0])
+    assert intensity.flags.writeable
+
+
+def test_storing_an_array_drops_its_ownership(make_saxs_sample):
+    sample = make_saxs_sample(np.array([0.1, 0.2]), np.array([1.0, 2.0]))
+    owned = np.array([3.0, 4.0])
+    sample.set_owned(SAXSSample.Keys.INTENSITY, owned)
+
+    assert sample.is_owned(SAXSSample.Keys.INTENSITY)
+    assert sample.get_writable(SAXSSample.Keys.INTENSITY) is owned
+
+    sample[SAXSSample.Keys.INTENSITY] = owned
+    assert not sample.is_owned(SAXSSample.Keys.INTENSITY)
+    assert sample.get_writable(SAXSSample.Keys.INTENSITY) is not owned
@@ -0,0 +1,156 @@
+"""Tests of the asynchronous logging mode."""
+
+import logging
+import threading
+
+import numpy as np
+import pytest
+from saxs.logging.logger import (
+    ELogQueueOverflow,
+    LogEvent,
+    LoggerFactory,
+    get_logger,
+    get_stage_logger,
+    lazy,
+    lazy_range,
+)
+
+
+class BlockingHandler(logging.Handler):
+    """Handler holding the writer thread until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.unblock = threading.Event()
+
+    def emit(self, record):
+        self.started.set()
+        assert self.unblock.wait(timeout=10)
+
+
+@pytest.fixture
+def async_logging():
+    """Configure the asynchronous mode, synchronous again after."""
+
+    def _configure(**kwargs):
+        LoggerFactory.configure(
+            enable_colors=False,
+            async_mode=True,
+            **kwargs,
+        )
+
+    yield _configure
+    LoggerFactory.configure()
+
+
+def block_writer():
+    """Occupy the writer thread until the handler is released."""
+    handler = BlockingHandler()
+    LoggerFactory._async_writer.put(
+        handler,
+        logging.makeLogRecord({"msg": "block"}),
+    )
+    assert handler.started.wait(timeout=10)
+    return handler
+
+
+def test_records_keep_call_order(async_logging, capsys):
+    async_logging(overflow=ELogQueueOverflow.BLOCK)
+    logger = get_logger("test_async_logging")
+
+    for _n in range(200):
+        logger.info("message %d", _n)
+    LoggerFactory.shutdown()
+
+    lines = [
+        _line.split("message ")[1]
+        for _line in capsys.readouterr().out.splitlines()
+        if "message " in _line
+    ]
+    assert lines == [str(_n) for _n in range(200)]
+
+
+def test_shutdown_writes_pending_records(async_logging, capsys):
+    async_logging()
+    logger = get_logger("test_async_logging")
+    handler = block_writer()
+
+    logger.info("pending")
+    assert "pending" not in capsys.readouterr().out
+
+    handler.unblock.set()
+    LoggerFactory.shutdown()
+
+    assert "pending" in capsys.readouterr().out
+
+
+def test_drop_counts_records_beyond_the_queue(async_logging, capsys):
+    async_logging(queue_size=2, overflow=ELogQueueOverflow.DROP)
+    logger = get_logger("test_async_logging")
+    dropped = LoggerFactory.get_dropped_records()
+    handler = block_writer()
+
+    for _n in range(5):
+        logger.info("message %d", _n)
+
+    assert LoggerFactory.get_dropped_records() == dropped + 3
+    handler.unblock.set()
+    LoggerFactory.shutdown()
+
+    captured = capsys.readouterr()
+    assert "message 1" in captured.out
+    assert "message 2" not in captured.out
+    assert "3 log record(s) dropped" in captured.err
+    assert LoggerFactory.get_dropped_records() == dropped + 3
+
+
+def test_block_waits_for_the_queue(async_logging, capsys):
+    async_logging(queue_size=2, overflow=ELogQueueOverflow.BLOCK)
+    logger = get_logger("test_async_logging")
+    dropped = LoggerFactory.get_dropped_records()
+    handler = block_writer()
+
+    caller = threading.Thread(
+        target=lambda: [logger.info("message %d", _n) for _n in range(5)],
+    )
+    caller.start()
+    caller.join(timeout=0.2)
+    assert caller.is_alive()
+
+    handler.unblock.set()
+    caller.join(timeout=10)
+    LoggerFactory.shutdown()
+
+    out = capsys.readouterr().out
+    assert all(f"message {_n}" in out for _n in range(5))
+    assert LoggerFactory.get_dropped_records() == dropped
+
+
+def test_freeze_evaluates_lazy_fields_at_call_time():
+    values = np.array([-1.0, 2.0])
+    event = LogEvent(
+        "stage",
+        ("Stage", "Step"),
+        {"values_range": lazy_range(values), "count": lazy(len, values)},
+    )
+
+    frozen = event.freeze()
+    values[:] = 0.0
+
+    assert frozen.fields == {"values_range": "[-1.0000, 2.0000]", "count": 2}
+    assert "[0.0000, 0.0000]" in str(event)
+
+
+def test_queued_records_keep_call_time_values(async_logging, capsys):
+    async_logging()
+    stage_logger = get_stage_logger("test_async_logging")
+    values = np.array([-1.0, 2.0])
+    handler = block_writer()
+
+    stage_logger.stage_info("Stage", "Step", values_range=lazy_range(values))
+    values[:] = 0.0
+    handler.unblock.set()
+    LoggerFactory.shutdown()
+
+    assert "[-1.0000, 2.0000]" in capsys.readouterr().out
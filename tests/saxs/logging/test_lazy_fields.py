@@ -0,0 +1,81 @@
+"""Tests of the deferred log context fields."""
+
+import logging
+
+import pytest
+from saxs.logging.logger import (
+    ComponentLogger,
+    LoggerFactory,
+    lazy,
+    lazy_range,
+)
+
+
+class CountingValues:
+    """Sequence counting the evaluations of its bounds."""
+
+    def __init__(self, values):
+        self.values = values
+        self.evaluations = 0
+
+    def min(self):
+        self.evaluations += 1
+        return min(self.values)
+
+    def max(self):
+        return max(self.values)
+
+
+@pytest.fixture
+def emitted(monkeypatch):
+    """Collect the messages reaching the handlers."""
+    _messages = []
+    monkeypatch.setattr(
+        ComponentLogger,
+        "callHandlers",
+        lambda self, record: _messages.append(record.getMessage()),
+    )
+    return _messages
+
+
+def log_all(name, level, values, calls):
+    """Log lazy fields through every component call at `level`."""
+
+    def _count():
+        calls.append(None)
+        return len(values.values)
+
+    loggers = {
+        _component: LoggerFactory.get_logger(name, _component, level)
+        for _component in ("stage", "scheduler", "pipeline", "kernel")
+    }
+    fields = {"values_range": lazy_range(values), "count": lazy(_count)}
+    loggers["stage"].stage_info("Stage", "Step", **fields)
+    loggers["scheduler"].scheduler_info("Step", 1, **fields)
+    loggers["pipeline"].pipeline_info("Step", **fields)
+    loggers["kernel"].kernel_info("Step", **fields)
+
+
+def test_fields_are_not_evaluated_while_info_is_disabled(emitted):
+    values = CountingValues([-1.0, 2.0])
+    calls = []
+
+    log_all("test_lazy_fields.disabled", logging.WARNING, values, calls)
+
+    assert values.evaluations == 0
+    assert calls == []
+    assert emitted == []
+
+
+def test_fields_are_evaluated_once_per_record_while_info_is_enabled(
+    emitted,
+):
+    values = CountingValues([-1.0, 2.0])
+    calls = []
+
+    log_all("test_lazy_fields.enabled", logging.INFO, values, calls)
+
+    assert values.evaluations == 4
+    assert len(calls) == 4
+    assert len(emitted) == 4
+    assert all("[-1.0000, 2.0000]" in _message for _message in emitted)
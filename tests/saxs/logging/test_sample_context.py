@@ -0,0 +1,113 @@
+"""Tests of the per-sample log buffer."""
+
+import numpy as np
+import pytest
+from saxs.core.pipeline.scheduler.scheduler import (
+    BaseScheduler,
+    SchedulerBudget,
+)
+from saxs.logging.logger import (
+    ComponentLogger,
+    LogEvent,
+    get_stage_logger,
+    lazy_range,
+)
+from saxs.logging.sample_context import sample_log_context
+from saxs.processing.kernel.default_kernel import DefaultKernel
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+
+@pytest.fixture
+def emitted(monkeypatch):
+    """Collect the records reaching the handlers, formatted on arrival."""
+    _records = []
+    monkeypatch.setattr(
+        ComponentLogger,
+        "callHandlers",
+        lambda self, record: _records.append(
+            (record, record.getMessage()),
+        ),
+    )
+    return _records
+
+
+def events(records):
+    return [
+        _record.msg
+        for _record, _ in records
+        if isinstance(_record.msg, LogEvent)
+    ]
+
+
+def messages_with(records, text):
+    return [_message for _, _message in records if text in _message]
+
+
+def test_exception_dumps_buffer(emitted):
+    stage_logger = get_stage_logger("test_sample_context")
+
+    with pytest.raises(RuntimeError), sample_log_context(sample_id="s"):
+        stage_logger.stage_info("Stage", "Step", value=1)
+        assert not emitted
+        raise RuntimeError("boom")
+
+    assert "reason=RuntimeError: boom" in emitted[0][1]
+    (event,) = events(emitted)
+    assert event.fields == {"value": 1}
+
+
+def test_successful_block_discards_buffer(emitted):
+    stage_logger = get_stage_logger("test_sample_context")
+
+    with sample_log_context() as buffer:
+        stage_logger.stage_info("Stage", "Step", value=1)
+        assert len(buffer) == 1
+
+    assert len(buffer) == 0
+    assert not emitted
+
+
+def test_buffered_field_keeps_call_time_value(emitted):
+    stage_logger = get_stage_logger("test_sample_context")
+    values = np.array([-1.0, 2.0])
+
+    with pytest.raises(RuntimeError), sample_log_context():
+        stage_logger.stage_info(
+            "Stage",
+            "Step",
+            values_range=lazy_range(values),
+        )
+        values[:] = 0.0
+        raise RuntimeError
+
+    (event,) = events(emitted)
+    assert str(event.fields["values_range"]) == "[-1.0000, 2.0000]"
+
+
+def test_successful_sample_discards_buffer(emitted, read_samples):
+    sample = read_samples()[0]
+
+    DefaultKernel(BaseScheduler(), sample_log_capacity=1000).run(sample)
+
+    assert not messages_with(emitted, "Sample log dump")
+    assert not [_event for _event in events(emitted) if _event.kind == "stage"]
+
+
+def test_partial_sample_dumps_call_time_values(emitted, read_samples):
+    """In-place stages after background must not alter its dump."""
+    kernel = DefaultKernel(
+        BaseScheduler(budget=SchedulerBudget(max_steps=8)),
+    )
+    kernel.run(read_samples()[0])
+    direct = messages_with(emitted, "final_intensity")
+    assert direct
+    emitted.clear()
+
+    kernel.sample_log_capacity = 1000
+    kernel.run(read_samples()[0])
+
+    assert "reason=partial result" in emitted[0][1]
+    assert messages_with(emitted, "final_intensity") == direct
@@ -0,0 +1,142 @@
+"""Tests of the structured log sink."""
+
+import logging
+
+import numpy as np
+import pytest
+from saxs.logging.logger import (
+    LoggerFactory,
+    get_logger,
+    get_stage_logger,
+    lazy,
+)
+from saxs.logging.structured import (
+    StructuredLogHandler,
+    add_structured_sink,
+    read_structured_log,
+    summarize_structured_log,
+)
+
+
+@pytest.fixture
+def structured_sink():
+    """Add structured sinks, detached and closed after the test."""
+    handlers = []
+
+    def _add(path, **kwargs):
+        handler = add_structured_sink(path, **kwargs)
+        handlers.append(handler)
+        return handler
+
+    yield _add
+    for _handler in handlers:
+        LoggerFactory.remove_sink(_handler)
+        _handler.close()
+
+
+def emit_records(structured_sink, path, **kwargs):
+    """Write stage, scheduler and plain records to `path`."""
+    handler = structured_sink(path, **kwargs)
+    stage_logger = get_stage_logger("test_structured")
+    stage_logger.stage_info(
+        "CutStage",
+        "Truncation complete",
+        removed_points=np.int64(100),
+        q_max=lazy(float, np.float64(0.5)),
+    )
+    stage_logger.stage_info(
+        "CutStage",
+        "Truncation complete",
+        removed_points=40,
+    )
+    stage_logger.stage_info("FilterStage", "Filtered", window="hann")
+    get_logger("test_structured", "scheduler").scheduler_info("Step", 3)
+    get_logger("test_structured").info("plain %s", "message")
+    handler.flush()
+
+
+@pytest.mark.parametrize(
+    ("name", "fmt", "read_fmt"),
+    [
+        ("run.jsonl", "jsonl", None),
+        ("run.msgpack", "msgpack", None),
+        ("run.log", "msgpack", "msgpack"),
+    ],
+)
+def test_records_round_trip(structured_sink, tmp_path, name, fmt, read_fmt):
+    path = tmp_path / name
+    emit_records(structured_sink, path, fmt=fmt)
+
+    records = list(read_structured_log([path], read_fmt))
+
+    assert [_r["kind"] for _r in records] == [
+        "stage",
+        "stage",
+        "stage",
+        "scheduler",
+        None,
+    ]
+    assert records[0]["stage"] == "CutStage"
+    assert records[0]["action"] == "Truncation complete"
+    assert records[0]["component"] == "stage"
+    assert records[0]["level"] == "INFO"
+    assert records[0]["fields"] == {"removed_points": 100, "q_max": 0.5}
+    assert records[3]["action"] == "Step"
+    assert records[3]["queue_size"] == 3
+    assert records[4]["action"] == "plain message"
+    assert records[4]["fields"] == {}
+
+
+def test_file_rotates_by_size(tmp_path):
+    path = tmp_path / "run.jsonl"
+    handler = StructuredLogHandler(
+        path,
+        buffer_size=1,
+        max_bytes=300,
+        backup_count=2,
+    )
+    try:
+        for _n in range(20):
+            handler.handle(
+                logging.makeLogRecord(
+                    {"msg": "message %d", "args": (_n,), "levelname": "INFO"},
+                ),
+            )
+    finally:
+        handler.close()
+
+    files = [path.with_name("run.jsonl.2"), path.with_name("run.jsonl.1")]
+    assert all(_file.exists() for _file in files)
+    assert not path.with_name("run.jsonl.3").exists()
+    assert all(_file.stat().st_size <= 300 for _file in [*files, path])
+
+    actions = [_r["action"] for _r in read_structured_log([*files, path])]
+    first = int(actions[0].split()[1])
+    assert first > 0
+    assert actions == [f"message {_n}" for _n in range(first, 20)]
+
+
+def test_summary_aggregates_stage_fields(structured_sink, tmp_path):
+    path = tmp_path / "run.jsonl"
+    emit_records(structured_sink, path)
+
+    summary = summarize_structured_log([path])
+
+    assert summary["records"] == 5
+    assert summary["levels"] == {"INFO": 5}
+    assert summary["components"] == {
+        "stage": 3,
+        "scheduler": 1,
+        "default": 1,
+    }
+    cut = summary["stages"]["CutStage"]
+    assert cut["records"] == 2
+    assert cut["actions"] == {"Truncation complete": 2}
+    assert cut["fields"]["removed_points"] == {
+        "count": 2,
+        "total": 140.0,
+        "min": 40,
+        "max": 100,
+        "mean": 70.0,
+    }
+    assert summary["stages"]["FilterStage"]["fields"] == {}
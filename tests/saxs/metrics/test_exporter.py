@@ -0,0 +1,93 @@
+"""Tests of the Prometheus text export."""
+
+import stat
+import threading
+
+import pytest
+from saxs.metrics.exporter import (
+    TextfileExporter,
+    render_text,
+    write_textfile,
+)
+from saxs.metrics.registry import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    """Registry with a labelled counter and a histogram."""
+    registry = MetricsRegistry()
+    frames = registry.counter("saxs_frames_total", "Frames read.", ("type",))
+    frames.labels("sample").inc(3)
+    frames.labels('da"rk').inc()
+    seconds = registry.histogram(
+        "saxs_fit_seconds",
+        "Fit\nduration.",
+        buckets=(0.1, 1.0),
+    )
+    seconds.observe(0.05)
+    seconds.observe(0.5)
+    seconds.observe(2.5)
+    registry.gauge("saxs_unused", "Never set.")
+    return registry
+
+
+def test_render_text(registry):
+    assert render_text(registry, {"worker": "3"}) == (
+        "# HELP saxs_fit_seconds Fit\\nduration.\n"
+        "# TYPE saxs_fit_seconds histogram\n"
+        'saxs_fit_seconds_bucket{worker="3",le="0.1"} 1\n'
+        'saxs_fit_seconds_bucket{worker="3",le="1"} 2\n'
+        'saxs_fit_seconds_bucket{worker="3",le="+Inf"} 3\n'
+        'saxs_fit_seconds_sum{worker="3"} 3.05\n'
+        'saxs_fit_seconds_count{worker="3"} 3\n'
+        "# HELP saxs_frames_total Frames read.\n"
+        "# TYPE saxs_frames_total counter\n"
+        'saxs_frames_total{worker="3",type="da\\"rk"} 1\n'
+        'saxs_frames_total{worker="3",type="sample"} 3\n'
+    )
+
+
+def test_render_text_of_an_empty_registry():
+    assert render_text(MetricsRegistry()) == ""
+
+
+def test_write_textfile_replaces_the_file(registry, tmp_path):
+    path = tmp_path / "saxs.prom"
+    path.write_text("stale\n")
+
+    write_textfile(path, registry)
+
+    assert path.read_text() == render_text(registry)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+    assert [_p.name for _p in tmp_path.iterdir()] == ["saxs.prom"]
+
+
+def test_concurrent_writes_leave_a_complete_file(registry, tmp_path):
+    path = tmp_path / "saxs.prom"
+    errors = []
+
+    def _write():
+        try:
+            for _ in range(50):
+                write_textfile(path, registry)
+        except OSError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_write) for _ in range(4)]
+    for _thread in threads:
+        _thread.start()
+    for _thread in threads:
+        _thread.join()
+
+    assert errors == []
+    assert path.read_text() == render_text(registry)
+    assert [_p.name for _p in tmp_path.iterdir()] == ["saxs.prom"]
+
+
+def test_exporter_writes_the_final_values(registry, tmp_path):
+    path = tmp_path / "saxs.prom"
+
+    with TextfileExporter(path, registry, interval=60.0):
+        registry.counter("saxs_frames_total", "").labels("sample").inc()
+
+    assert 'saxs_frames_total{type="sample"} 4' in path.read_text()
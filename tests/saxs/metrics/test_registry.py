@@ -0,0 +1,95 @@
+"""Tests of the metrics registry."""
+
+import threading
+
+import pytest
+from saxs.metrics.registry import MetricsRegistry, _Metric
+
+THREADS = 8
+UPDATES = 1000
+
+
+def run_threads(target):
+    """Run `target` in several threads started together."""
+    barrier = threading.Barrier(THREADS)
+
+    def _run():
+        barrier.wait()
+        target()
+
+    threads = [threading.Thread(target=_run) for _ in range(THREADS)]
+    for _thread in threads:
+        _thread.start()
+    for _thread in threads:
+        _thread.join()
+
+
+def test_counter_sums_updates_of_all_threads():
+    counter = MetricsRegistry().counter("frames", "Frames.", ("type",))
+
+    def _update():
+        for _ in range(UPDATES):
+            counter.labels("sample").inc()
+            counter.labels("dark").inc(0.5)
+
+    run_threads(_update)
+
+    assert dict(counter.collect()) == {
+        ("sample",): THREADS * UPDATES,
+        ("dark",): THREADS * UPDATES * 0.5,
+    }
+
+
+def test_histogram_sums_buckets_of_all_threads():
+    histogram = MetricsRegistry().histogram(
+        "seconds",
+        "Durations.",
+        buckets=(1.0, 2.0),
+    )
+
+    def _update():
+        for _ in range(UPDATES):
+            histogram.observe(0.5)
+            histogram.observe(2.0)
+            histogram.observe(3.0)
+
+    run_threads(_update)
+
+    [(labels, (counts, total))] = histogram.collect()
+    assert labels == ()
+    assert counts == [THREADS * UPDATES] * 3
+    assert total == THREADS * UPDATES * 5.5
+
+
+def test_labels_must_match_the_label_names():
+    counter = MetricsRegistry().counter("frames", "Frames.", ("type",))
+
+    with pytest.raises(ValueError, match="takes labels"):
+        counter.labels("sample", "extra")
+
+
+def test_register_returns_the_existing_metric():
+    registry = MetricsRegistry()
+    counter = registry.counter("frames", "Frames.")
+
+    assert registry.counter("frames", "Other help.") is counter
+    with pytest.raises(ValueError, match="already registered as a counter"):
+        registry.gauge("frames", "Frames.")
+
+
+def test_reset_drops_values_and_keeps_metrics():
+    registry = MetricsRegistry()
+    counter = registry.counter("frames", "Frames.")
+    counter.inc(3)
+
+    registry.reset()
+
+    assert registry.get("frames") is counter
+    assert counter.collect() == []
+    counter.inc()
+    assert counter.collect() == [((), 1.0)]
+
+
+def test_metric_family_needs_a_child_type():
+    with pytest.raises(TypeError, match="_new_child"):
+        _Metric("frames", "Frames.")
@@ -0,0 +1,49 @@
+"""End-to-end tests of the default kernel on the bundled samples."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from saxs.core.data.reader import DataReader
+from saxs.core.pipeline.scheduler.scheduler import (
+    BaseScheduler,
+    LeanScheduler,
+)
+from saxs.core.types.sample import SAXSSample
+from saxs.core.types.sample_objects import ESampleMetadataKeys
+from saxs.processing.kernel.default_kernel import DefaultKernel
+
+SAMPLES_PATH = (
+    Path(__file__).resolve().parents[4] / "assets" / "samples"
+)
+
+
+def read_sample(name: str) -> SAXSSample:
+    reader = DataReader(SAMPLES_PATH / name)
+    q_values, intensity, intensity_error = reader.read_data()
+    return reader.create_sample(q_values, intensity, intensity_error)
+
+
+@pytest.mark.filterwarnings("ignore::scipy.optimize.OptimizeWarning")
+@pytest.mark.parametrize("name", ["sample1.csv", "sample3.csv"])
+def test_kernel_processes_peaks(name):
+    sample = read_sample(name)
+
+    result = DefaultKernel(BaseScheduler()).run(sample)
+
+    visits = result.get_metadata().unwrap()[
+        ESampleMetadataKeys.PEAK_VISITS.value
+    ]
+    assert visits
+    assert np.all(np.isfinite(result[SAXSSample.Keys.INTENSITY]))
+
+
+@pytest.mark.filterwarnings("ignore::scipy.optimize.OptimizeWarning")
+def test_lean_scheduler_matches_base_scheduler():
+    base = DefaultKernel(BaseScheduler()).run(read_sample("sample1.csv"))
+    lean = DefaultKernel(LeanScheduler()).run(read_sample("sample1.csv"))
+
+    np.testing.assert_array_equal(
+        lean[SAXSSample.Keys.INTENSITY],
+        base[SAXSSample.Keys.INTENSITY],
+    )
@@ -0,0 +1,93 @@
+"""Tests of the batched Levenberg-Marquardt solver."""
+
+import numpy as np
+import pytest
+from saxs.processing.functions import gauss
+from saxs.processing.stage.common.batched_lm import (
+    EBatchedFitStatus,
+    batched_levenberg_marquardt,
+    pad_windows,
+)
+from scipy.optimize import curve_fit
+
+BOUNDS = ([0.0, 1e-4, 0.0], [1.0, 0.05, 10.0])
+
+
+@pytest.fixture
+def gauss_windows():
+    rng = np.random.default_rng(1)
+    windows = []
+    for _ in range(20):
+        size = rng.integers(15, 40)
+        mu = rng.uniform(0.1, 0.3)
+        sigma = rng.uniform(0.005, 0.02)
+        x = np.linspace(mu - 2 * sigma, mu + 2 * sigma, size)
+        y = gauss(x, mu, sigma, rng.uniform(1.0, 5.0))
+        y += 0.02 * rng.standard_normal(size)
+        p0 = (x[size // 2], (x[-1] - x[0]) / 3, y.max())
+        windows.append((x, y, np.full(size, 0.02), p0))
+    return windows
+
+
+def test_matches_curve_fit(gauss_windows):
+    x, y, error, mask = pad_windows(
+        [_w[0] for _w in gauss_windows],
+        [_w[1] for _w in gauss_windows],
+        [_w[2] for _w in gauss_windows],
+    )
+    p0 = np.array([_w[3] for _w in gauss_windows])
+
+    result = batched_levenberg_marquardt(
+        gauss,
+        x,
+        y,
+        p0,
+        error=error,
+        mask=mask,
+        bounds=BOUNDS,
+    )
+
+    reference = np.array(
+        [
+            curve_fit(gauss, _x, _y, _p0, sigma=_e, bounds=BOUNDS)[0]
+            for _x, _y, _e, _p0 in gauss_windows
+        ],
+    )
+    assert result.success.all()
+    assert set(result.status) == {EBatchedFitStatus.CONVERGED.value}
+    np.testing.assert_allclose(result.popt, reference, rtol=1e-5, atol=1e-8)
+
+
+def test_stalled_problems_do_not_converge():
+    x = np.linspace(0.0, 1.0, 10)
+    y = np.stack((2.0 * x + 1.0, np.sin(7.0 * x)))
+
+    def line(x, slope, offset):
+        return slope * x + offset
+
+    def flat(x, slope, offset):  # noqa: ARG001
+        return np.zeros_like(x + slope)
+
+    result = batched_levenberg_marquardt(line, x, y[:1], (0.0, 0.0))
+    assert result.success.all()
+
+    stalled = batched_levenberg_marquardt(flat, x, y, (1.0, 1.0))
+    assert not stalled.success.any()
+    assert list(stalled.status) == [EBatchedFitStatus.STALLED.value] * 2
+
+
+def test_iteration_limit_is_reported(gauss_windows):
+    x, y, error, p0 = gauss_windows[0]
+
+    result = batched_levenberg_marquardt(
+        gauss,
+        x,
+        y[None, :],
+        (p0[0] + 0.01, p0[1] * 2.0, 1.0),
+        error=error[None, :],
+        bounds=BOUNDS,
+        max_iter=1,
+    )
+
+    assert not result.success[0]
+    assert result.status[0] == EBatchedFitStatus.MAX_ITER.value
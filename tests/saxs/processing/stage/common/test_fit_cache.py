@@ -0,0 +1,93 @@
+"""Tests of the content-addressed fit cache."""
+
+import numpy as np
+import pytest
+from saxs.processing.functions import background_hyperbole
+from saxs.processing.stage.common.fit_cache import FitCache
+from saxs.processing.stage.common.fitting import Fitting
+
+
+@pytest.fixture
+def power_law():
+    q_values = np.linspace(0.05, 0.5, 50)
+    return q_values, background_hyperbole(q_values, 2.0, 0.8)
+
+
+@pytest.fixture
+def fit_cache():
+    cache = FitCache()
+    Fitting.configure(cache=cache)
+    yield cache
+    Fitting.configure(cache=None)
+
+
+def fit(q_values, intensity):
+    return Fitting.fit(
+        background_hyperbole,
+        q_values,
+        intensity,
+        None,
+        p0=(3.0, 2.0),
+    )
+
+
+def test_identical_fits_hit(fit_cache, power_law):
+    first = fit(*power_law)
+    second = fit(*power_law)
+
+    assert fit_cache.get_counters()["hits"] == 1
+    np.testing.assert_array_equal(first.popt, second.popt)
+
+
+def test_changed_window_misses(fit_cache, power_law):
+    q_values, intensity = power_law
+    fit(q_values, intensity)
+
+    changed = intensity.copy()
+    changed[10] *= 1.0 + 1e-12
+    fit(q_values, changed)
+
+    assert fit_cache.get_counters()["hits"] == 0
+    assert fit_cache.get_counters()["misses"] == 2
+
+
+def make_key(power_law):
+    return FitCache.make_key(
+        background_hyperbole,
+        *power_law,
+        None,
+        (3.0, 2.0),
+        (-np.inf, np.inf),
+        Fitting.resolve_engine(None),
+    )
+
+
+def test_disk_tier_serves_a_new_cache(tmp_path, power_law):
+    key = make_key(power_law)
+    FitCache(directory=tmp_path).fit(key, lambda: fit(*power_law))
+
+    cache = FitCache(directory=tmp_path)
+    result = cache.fit(key, pytest.fail)
+
+    assert cache.get_counters()["disk_hits"] == 1
+    assert result.success
+
+
+def test_store_leaves_only_the_entry(tmp_path, power_law):
+    key = make_key(power_law)
+
+    FitCache(directory=tmp_path).fit(key, lambda: fit(*power_law))
+
+    assert [_path.name for _path in tmp_path.iterdir()] == [f"{key}.npz"]
+
+
+@pytest.mark.parametrize("content", [b"PK\x03\x04truncated", b"garbage"])
+def test_corrupt_disk_entry_is_a_deleted_miss(tmp_path, power_law, content):
+    entry = tmp_path / f"{make_key(power_law)}.npz"
+    entry.write_bytes(content)
+
+    cache = FitCache(directory=tmp_path)
+
+    assert cache.get(make_key(power_law)) is None
+    assert cache.get_counters()["misses"] == 1
+    assert not entry.exists()
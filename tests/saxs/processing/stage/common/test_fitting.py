@@ -0,0 +1,158 @@
+"""Tests of the fitting facade."""
+
+import numpy as np
+import pytest
+from saxs.core.pipeline.scheduler.budget import BudgetExhaustedError
+from saxs.processing.functions import gauss
+from saxs.processing.stage.common import fitting
+from saxs.processing.stage.common.engine import (
+    CurveFitEngine,
+    IAbstractFittingEngine,
+    LeastSquaresEngine,
+    get_fitting_engine,
+)
+from saxs.processing.stage.common.fit_cache import FitCache
+from saxs.processing.stage.common.fitting import Fitting
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+X = np.linspace(-1.0, 1.0, 50)
+Y = gauss(X, 0.1, 0.3, 2.0)
+
+
+def gauss_model(x, mu, sigma, ampl):
+    return gauss(x, mu, sigma, ampl)
+
+
+class FailingEngine(IAbstractFittingEngine):
+    name = "failing"
+
+    def fit(self, *args, **kwargs):
+        msg = "singular input"
+        raise RuntimeError(msg)
+
+
+@pytest.fixture
+def fitting_settings():
+    """Restore the class-wide fitting settings after the test."""
+    engine = Fitting.resolve_engine(None)
+    cache = Fitting.get_cache()
+    yield
+    Fitting.configure(engine=engine, collect_stats=False, cache=cache)
+    Fitting.get_stats().reset()
+
+
+@pytest.fixture
+def fit_limit(monkeypatch):
+    """Set the fit evaluation limit as a scheduler budget would."""
+
+    def _set(limit):
+        monkeypatch.setattr(
+            fitting,
+            "get_fit_evaluation_limit",
+            lambda: limit,
+        )
+
+    return _set
+
+
+@pytest.mark.parametrize(
+    "bounds",
+    [(-np.inf, np.inf), ([-1.0, 0.01, 0.0], [1.0, 1.0, 10.0])],
+)
+def test_fit_at_the_limit_exhausts_the_budget(fit_limit, bounds):
+    fit_limit(3)
+
+    with pytest.raises(BudgetExhaustedError):
+        Fitting.fit(
+            gauss_model,
+            X,
+            Y,
+            None,
+            (0.5, 0.8, 0.5),
+            bounds,
+            engine=CurveFitEngine(),
+        )
+
+
+def test_fit_within_the_limit_converges(fit_limit):
+    fit_limit(1000)
+
+    result = Fitting.fit(
+        gauss_model,
+        X,
+        Y,
+        None,
+        None,
+        engine=CurveFitEngine(),
+    )
+
+    assert result.success
+    np.testing.assert_allclose(result.popt, [0.1, 0.3, 2.0], rtol=1e-6)
+
+
+def test_other_engine_errors_propagate_unchanged(fit_limit):
+    fit_limit(1000)
+
+    with pytest.raises(RuntimeError, match="singular input") as info:
+        Fitting.fit(gauss_model, X, Y, None, None, engine=FailingEngine())
+
+    assert not isinstance(info.value, BudgetExhaustedError)
+
+
+def test_engines_are_built_by_name():
+    engine = get_fitting_engine("least_squares", method="dogbox")
+
+    assert isinstance(engine, LeastSquaresEngine)
+    assert engine.method == "dogbox"
+    with pytest.raises(ValueError, match="no_such_engine"):
+        get_fitting_engine("no_such_engine")
+
+
+@pytest.mark.usefixtures("fitting_settings")
+def test_configured_engine_is_the_default():
+    Fitting.configure(engine="least_squares", method="trf")
+
+    assert Fitting.get_settings() == ("least_squares", {"method": "trf"})
+    result = Fitting.fit(gauss_model, X, Y, None, (0.0, 0.5, 1.0))
+    np.testing.assert_allclose(result.popt, [0.1, 0.3, 2.0], rtol=1e-6)
+
+
+@pytest.mark.usefixtures("fitting_settings")
+def test_per_call_engine_overrides_the_default():
+    Fitting.configure(engine="curve_fit", collect_stats=True)
+
+    Fitting.fit(
+        gauss_model,
+        X,
+        Y,
+        None,
+        (0.0, 0.5, 1.0),
+        engine=LeastSquaresEngine(),
+    )
+
+    (record,) = Fitting.get_stats().get_records()
+    assert (record.engine, record.model) == ("least_squares", "gauss_model")
+    assert record.success
+    assert record.nfev > 0
+    assert Fitting.get_settings()[0] == "curve_fit"
+
+
+@pytest.mark.usefixtures("fitting_settings")
+def test_configure_changes_only_the_given_settings():
+    cache = FitCache()
+    Fitting.configure(collect_stats=True, cache=cache)
+
+    Fitting.configure(engine="least_squares")
+
+    assert Fitting.get_cache() is cache
+    Fitting.fit(gauss_model, X, Y, None, (0.0, 0.5, 1.0))
+    assert len(Fitting.get_stats().get_records()) == 1
+
+    Fitting.configure(cache=None)
+
+    assert Fitting.get_cache() is None
+    Fitting.fit(gauss_model, X, Y, None, (0.0, 0.5, 1.0))
+    assert len(Fitting.get_stats().get_records()) == 2  # noqa: PLR2004
@@ -0,0 +1,125 @@
+"""Tests of the closed-form linearized fits."""
+
+import numpy as np
+import pytest
+from saxs.processing.functions import (
+    background_exponent,
+    background_hyperbole,
+)
+from saxs.processing.stage.common.engine import LinearizedEngine
+from saxs.processing.stage.common.linearized import fit_linearized
+
+
+@pytest.fixture
+def power_law():
+    q_values = np.linspace(0.01, 0.5, 200)
+    rng = np.random.default_rng(0)
+    intensity = background_hyperbole(q_values, 2.5, 3.0)
+    intensity *= 1.0 + 0.02 * rng.standard_normal(q_values.size)
+    error = 0.02 * intensity
+    return q_values, intensity, error
+
+
+def chi2(q_values, intensity, error, params):
+    residual = (intensity - background_hyperbole(q_values, *params)) / error
+    return float(residual @ residual)
+
+
+def test_recovers_power_law(power_law):
+    q_values, intensity, error = power_law
+
+    params = fit_linearized(
+        background_hyperbole,
+        q_values,
+        intensity,
+        error,
+        refine_steps=2,
+    )
+
+    np.testing.assert_allclose(params, [2.5, 3.0], rtol=0.02)
+
+
+def test_ignores_non_finite_intensities(power_law):
+    q_values, intensity, error = power_law
+    corrupted = intensity.copy()
+    corrupted[[3, 50, 120]] = [np.nan, np.inf, -np.inf]
+    keep = np.isfinite(corrupted)
+
+    params = fit_linearized(background_hyperbole, q_values, corrupted, error)
+
+    np.testing.assert_allclose(
+        params,
+        fit_linearized(
+            background_hyperbole,
+            q_values[keep],
+            intensity[keep],
+            error[keep],
+        ),
+        rtol=1e-12,
+    )
+
+
+def test_ignores_non_positive_q_of_the_power_law(power_law):
+    q_values, intensity, error = power_law
+    shifted = q_values.copy()
+    shifted[:2] = [-0.01, 0.0]
+
+    params = fit_linearized(
+        background_hyperbole,
+        shifted,
+        intensity,
+        error,
+        refine_steps=1,
+    )
+
+    assert np.all(np.isfinite(params))
+    np.testing.assert_allclose(
+        params,
+        fit_linearized(
+            background_hyperbole,
+            q_values[2:],
+            intensity[2:],
+            error[2:],
+            refine_steps=1,
+        ),
+        rtol=1e-12,
+    )
+
+
+def test_singular_systems_fail_per_sample(power_law):
+    q_values, intensity, _ = power_law
+    batch = np.stack((intensity, np.full_like(intensity, -1.0)))
+    batch[1, 7] = 2.0  # a single valid point
+
+    params = fit_linearized(background_exponent, q_values, batch)
+
+    assert np.all(np.isfinite(params[0]))
+    assert np.all(np.isnan(params[1]))
+
+    result = LinearizedEngine().fit(
+        background_exponent,
+        q_values,
+        batch[1],
+        None,
+        None,
+    )
+    assert not result.success
+
+
+def test_refinement_never_increases_the_residual(power_law):
+    q_values, intensity, error = power_law
+    outliers = intensity.copy()
+    outliers[::25] *= 5.0
+
+    previous = np.inf
+    for steps in range(4):
+        params = fit_linearized(
+            background_hyperbole,
+            q_values,
+            outliers,
+            error,
+            refine_steps=steps,
+        )
+        current = chi2(q_values, outliers, error, params)
+        assert current <= previous
+        previous = current
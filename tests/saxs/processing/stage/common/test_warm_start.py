@@ -0,0 +1,74 @@
+"""Tests of the warm-start cache."""
+
+import numpy as np
+import pytest
+from saxs.core.pipeline.scheduler.budget import BudgetExhaustedError
+from saxs.processing.stage.common.engine import FitResult
+from saxs.processing.stage.common.warm_start import WarmStartCache
+
+
+def make_result(popt, success=True):
+    return FitResult(
+        popt=np.asarray(popt, dtype=np.float64),
+        pcov=np.full((2, 2), np.nan),
+        nfev=1,
+        nit=1,
+        success=success,
+        status="",
+    )
+
+
+def test_lookup_matches_drifted_positions():
+    cache = WarmStartCache(position_tolerance=2)
+    cache.update("series", "gauss", 100, (1.0, 2.0))
+
+    assert cache.get("series", "gauss", 102) == (1.0, 2.0)
+    assert cache.get("series", "gauss", 103) is None
+    assert cache.get("other", "gauss", 100) is None
+
+
+def test_evicts_least_recently_used_series():
+    cache = WarmStartCache(maxsize=2)
+    cache.update("a", "gauss", 0, (1.0,))
+    cache.update("b", "gauss", 0, (2.0,))
+
+    assert cache.get("a", "gauss") == (1.0,)
+    cache.update("c", "gauss", 0, (3.0,))
+
+    assert cache.get("b", "gauss") is None
+    assert cache.get("a", "gauss") == (1.0,)
+    assert cache.get("c", "gauss") == (3.0,)
+
+
+def test_failed_warm_fit_falls_back_to_cold_start():
+    cache = WarmStartCache()
+    cache.update("series", "gauss", 0, (5.0, 5.0))
+    seen = []
+
+    def fit(p0):
+        seen.append(p0)
+        return make_result((1.0, 1.0), success=p0 == (0.5, 0.5))
+
+    result = cache.fit("series", "gauss", 0, (0.5, 0.5), fit)
+
+    assert seen == [(5.0, 5.0), (0.5, 0.5)]
+    assert result.success
+    assert cache.fallbacks == 1
+    assert cache.get("series", "gauss") == (1.0, 1.0)
+
+
+def test_exhausted_budget_skips_the_cold_retry():
+    cache = WarmStartCache()
+    cache.update("series", "gauss", 0, (5.0, 5.0))
+    seen = []
+
+    def fit(p0):
+        seen.append(p0)
+        msg = "Fit exceeded the budget of 1 evaluations."
+        raise BudgetExhaustedError(msg)
+
+    with pytest.raises(BudgetExhaustedError):
+        cache.fit("series", "gauss", 0, (0.5, 0.5), fit)
+
+    assert seen == [(5.0, 5.0)]
+    assert cache.fallbacks == 0
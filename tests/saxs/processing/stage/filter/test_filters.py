@@ -0,0 +1,124 @@
+"""Tests of the smoothing filters of FilterStage."""
+
+import numpy as np
+import pytest
+from saxs.core.types.flow_metadata import FlowMetadata
+from saxs.core.types.sample import SAXSSample
+from saxs.processing.stage.filter.filter import FilterStage
+from saxs.processing.stage.filter.filters import apply_filter
+from saxs.processing.stage.filter.types import (
+    EFilterStageMetadataKeys,
+    EFilterType,
+    FilterStageMetadata,
+)
+from scipy.signal import savgol_filter
+
+RNG = np.random.default_rng(0)
+Q_VALUES = np.linspace(0.01, 0.5, 300)
+PROFILES = np.stack(
+    [
+        1e3 * Q_VALUES**-2 * (1 + 0.05 * RNG.standard_normal(Q_VALUES.size))
+        for _ in range(3)
+    ],
+)
+SIGMA = 1.5
+
+
+def box_reference(data, window_size):
+    return np.convolve(data, np.ones(window_size) / window_size, "same")
+
+
+def savgol_reference(data, window_size):
+    return savgol_filter(data, window_size, 2, mode="constant", cval=0.0)
+
+
+def gaussian_reference(data, window_size):
+    _x = np.arange(-(window_size // 2), window_size // 2 + 1)
+    _kernel = np.exp(-0.5 * (_x / SIGMA) ** 2)
+    return np.convolve(data, _kernel / _kernel.sum(), "same")
+
+
+CASES = [
+    (EFilterType.BOX, {}, box_reference),
+    (EFilterType.SAVGOL, {"polyorder": 2}, savgol_reference),
+    (EFilterType.GAUSSIAN, {"sigma": SIGMA}, gaussian_reference),
+]
+
+
+@pytest.mark.parametrize("window_size", [7, 9])
+@pytest.mark.parametrize(
+    ("filter_type", "options", "reference"),
+    CASES,
+    ids=[_case[0].value for _case in CASES],
+)
+def test_filter_matches_reference(
+    filter_type,
+    options,
+    reference,
+    window_size,
+):
+    expected = np.stack(
+        [reference(_profile, window_size) for _profile in PROFILES],
+    )
+
+    single = apply_filter(PROFILES[0], filter_type, window_size, **options)
+    batch = apply_filter(PROFILES, filter_type, window_size, **options)
+    inplace = PROFILES.copy()
+    result = apply_filter(
+        inplace,
+        filter_type,
+        window_size,
+        out=inplace,
+        **options,
+    )
+
+    np.testing.assert_allclose(single, expected[0], rtol=1e-12)
+    np.testing.assert_allclose(batch, expected, rtol=1e-12)
+    assert result is inplace
+    np.testing.assert_allclose(inplace, expected, rtol=1e-12)
+
+
+def test_even_box_window_extends_to_the_left():
+    data = np.zeros(9)
+    data[4] = 1.0
+
+    result = apply_filter(data, EFilterType.BOX, 4, out=np.empty(9))
+
+    np.testing.assert_array_equal(np.nonzero(result)[0], [3, 4, 5, 6])
+
+
+def test_savgol_rejects_even_window():
+    with pytest.raises(ValueError, match="odd window"):
+        apply_filter(PROFILES[0], EFilterType.SAVGOL, 8, polyorder=2)
+
+
+@pytest.mark.parametrize(
+    ("filter_type", "options", "reference"),
+    CASES,
+    ids=[_case[0].value for _case in CASES],
+)
+def test_stage_smooths_owned_intensity_in_place(
+    make_saxs_sample,
+    filter_type,
+    options,
+    reference,
+):
+    metadata = FilterStageMetadata(
+        {
+            EFilterStageMetadataKeys.FILTER_TYPE.value: filter_type.value,
+            EFilterStageMetadataKeys.WINDOW_SIZE.value: 9,
+            **options,
+        },
+    )
+    sample = make_saxs_sample(Q_VALUES, PROFILES[0])
+    owned = PROFILES[0].copy()
+    sample.set_owned(SAXSSample.Keys.INTENSITY, owned)
+
+    result, _ = FilterStage(metadata).process(sample, FlowMetadata({}))
+
+    assert result[SAXSSample.Keys.INTENSITY] is owned
+    np.testing.assert_allclose(
+        owned,
+        reference(PROFILES[0], 9),
+        rtol=1e-12,
+    )
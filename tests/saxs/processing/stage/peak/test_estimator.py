@@ -0,0 +1,66 @@
+"""Tests of the closed-form peak estimators."""
+
+import numpy as np
+import pytest
+from saxs.processing.functions import gauss
+from saxs.processing.stage.peak.estimator import (
+    estimate_peak_caruana,
+    estimate_peak_moments,
+    estimate_window,
+)
+
+PEAK_INDEX = 240
+SIGMA = 0.01
+
+
+@pytest.fixture
+def peak():
+    q_values = np.linspace(0.01, 0.5, 491)
+    rng = np.random.default_rng(0)
+    intensity = gauss(q_values, q_values[PEAK_INDEX], SIGMA, 50.0)
+    intensity += rng.normal(0.0, 0.1, q_values.size)
+    return q_values, intensity
+
+
+def test_window_spans_the_peak(peak):
+    _, intensity = peak
+
+    left, right = estimate_window(intensity, PEAK_INDEX, 2)
+
+    # about 2.5 sigmas on each side, 10 points per sigma
+    assert 20 <= PEAK_INDEX - left <= 30
+    assert right - PEAK_INDEX == PEAK_INDEX - left + 1
+
+
+def test_window_is_clipped_to_the_profile(peak):
+    _, intensity = peak
+
+    left, right = estimate_window(intensity, PEAK_INDEX, 2, 5)
+
+    assert (left, right) == (PEAK_INDEX - 5, PEAK_INDEX + 6)
+    assert estimate_window(intensity[:PEAK_INDEX + 3], PEAK_INDEX, 2)[1] == (
+        PEAK_INDEX + 3
+    )
+
+
+@pytest.mark.parametrize(
+    "estimator",
+    [estimate_peak_moments, estimate_peak_caruana],
+)
+def test_estimates_width_over_the_window(peak, estimator):
+    q_values, intensity = peak
+    left, right = estimate_window(intensity, PEAK_INDEX, 2)
+
+    estimate = estimator(q_values[left:right], intensity[left:right])
+
+    assert estimate.sigma == pytest.approx(SIGMA, rel=0.15)
+    assert estimate.mu == pytest.approx(q_values[PEAK_INDEX], abs=1e-3)
+
+
+def test_fit_range_window_truncates_the_width(peak):
+    q_values, intensity = peak
+    window = slice(PEAK_INDEX - 2, PEAK_INDEX + 2)
+
+    estimate = estimate_peak_moments(q_values[window], intensity[window])
+
+    assert estimate.sigma < 0.5 * SIGMA
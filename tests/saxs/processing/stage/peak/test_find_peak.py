@@ -0,0 +1,43 @@
+"""Tests of the peak selection of FindPeakStage."""
+
+from saxs.core.stage.request.abst_request import EvalMetadata
+from saxs.core.types.flow_metadata import FlowMetadata
+from saxs.core.types.scheduler_metadata import ERuntimeConstants
+from saxs.processing.stage.peak.find_peak import FindPeakStage
+
+
+def make_flow_metadata() -> FlowMetadata:
+    return FlowMetadata(
+        {FlowMetadata.Keys.UNPROCESSED.value: {5: 10.0, 7: 20.0}},
+    )
+
+
+def test_create_request_pops_the_highest_peak():
+    metadata = make_flow_metadata()
+
+    request = FindPeakStage(None).create_request(metadata)
+
+    assert request.condition_eval_metadata.unwrap() == {
+        FlowMetadata.Keys.CURRENT.value: {7: 20.0},
+    }
+    assert metadata[FlowMetadata.Keys.CURRENT] == {7: 20.0}
+    assert metadata[FlowMetadata.Keys.UNPROCESSED] == {5: 10.0}
+
+
+def test_update_eval_metadata_walks_peaks_until_undefined():
+    stage = FindPeakStage(None)
+    metadata = make_flow_metadata()
+    eval_metadata = EvalMetadata({})
+    selected = []
+
+    for _ in range(3):
+        stage.update_eval_metadata(metadata, eval_metadata)
+        selected.append(
+            eval_metadata.unwrap()[FlowMetadata.Keys.CURRENT.value],
+        )
+
+    assert selected == [
+        {7: 20.0},
+        {5: 10.0},
+        ERuntimeConstants.UNDEFINED_PEAK,
+    ]
@@ -0,0 +1,81 @@
+"""Tests of the peak fit and subtraction of ProcessPeakStage."""
+
+import hashlib
+
+import numpy as np
+import pytest
+from saxs.core.types.digest import update_digest
+from saxs.core.types.flow_metadata import FlowMetadata
+from saxs.core.types.sample import SAXSSample
+from saxs.processing.functions import gauss
+from saxs.processing.stage.peak.process_peak import (
+    ProcessPeakStage,
+    _CenteredPeakModel,
+)
+
+Q_VALUES = np.linspace(0.01, 0.3, 600)
+PEAK_INDEX = 300
+MU, SIGMA, AMPL = Q_VALUES[PEAK_INDEX], 0.004, 100.0
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+
+def digest(value):
+    _digest = hashlib.blake2b()
+    update_digest(_digest, value)
+    return _digest.hexdigest()
+
+
+@pytest.fixture
+def peak_sample(make_saxs_sample):
+    return make_saxs_sample(Q_VALUES, gauss(Q_VALUES, MU, SIGMA, AMPL))
+
+
+def test_model_identity_covers_function_and_center():
+    model = _CenteredPeakModel(gauss, MU)
+
+    assert digest(model) == digest(_CenteredPeakModel(gauss, MU))
+    assert digest(model) != digest(_CenteredPeakModel(gauss, 2 * MU))
+    assert digest(model) != digest(
+        _CenteredPeakModel(lambda x, mu, sigma, ampl: x, MU),
+    )
+
+
+@pytest.mark.parametrize("first_visit", [True, False])
+def test_windowed_subtraction_matches_full_subtraction(
+    peak_sample,
+    first_visit,
+):
+    intensity = peak_sample[SAXSSample.Keys.INTENSITY].copy()
+    sigma, ampl = 1.1 * SIGMA, 0.9 * AMPL
+
+    left, right = ProcessPeakStage._subtract_gauss(
+        peak_sample,
+        MU,
+        sigma,
+        ampl,
+        first_visit,
+    )
+
+    expected = np.maximum(intensity - gauss(Q_VALUES, MU, sigma, ampl), 0)
+    result = peak_sample[SAXSSample.Keys.INTENSITY]
+    assert 0 < left < PEAK_INDEX < right < len(Q_VALUES)
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-12 * ampl)
+    np.testing.assert_array_equal(result[:left], intensity[:left])
+    np.testing.assert_array_equal(result[right:], intensity[right:])
+
+
+def test_fitted_peak_is_subtracted(peak_sample):
+    flow_metadata = FlowMetadata(
+        {FlowMetadata.Keys.CURRENT.value: {PEAK_INDEX: AMPL}},
+    )
+
+    result, _ = ProcessPeakStage(None).process(peak_sample, flow_metadata)
+
+    np.testing.assert_allclose(
+        result[SAXSSample.Keys.INTENSITY],
+        0.0,
+        atol=1e-6 * AMPL,
+    )
@@ -0,0 +1,47 @@
+"""Tests of the model and smoothing functions."""
+
+import numpy as np
+import pytest
+from saxs.processing.functions import moving_average
+
+Q_VALUES = np.linspace(0.01, 1.0, 2000)
+
+HIGH_DYNAMIC_RANGE_PROFILES = {
+    "power_law": 1e6 * Q_VALUES**-3,
+    "range_1.25e8": np.geomspace(1.25e8, 1.0, Q_VALUES.size),
+    "range_6e10": np.geomspace(6e10, 1.0, Q_VALUES.size),
+}
+
+
+def reference_moving_average(data, window_size):
+    return np.convolve(data, np.ones(window_size) / window_size, "same")
+
+
+@pytest.mark.parametrize("window_size", [4, 9, 10])
+@pytest.mark.parametrize(
+    "profile",
+    HIGH_DYNAMIC_RANGE_PROFILES.values(),
+    ids=HIGH_DYNAMIC_RANGE_PROFILES.keys(),
+)
+def test_moving_average_keeps_relative_precision(profile, window_size):
+    expected = reference_moving_average(profile, window_size)
+
+    result = moving_average(profile, window_size, out=np.empty_like(profile))
+    inplace = profile.copy()
+    moving_average(inplace, window_size, out=inplace)
+
+    np.testing.assert_allclose(result, expected, rtol=1e-13)
+    np.testing.assert_allclose(inplace, expected, rtol=1e-13)
+
+
+def test_moving_average_smooths_rows():
+    profiles = np.stack(list(HIGH_DYNAMIC_RANGE_PROFILES.values()))
+
+    result = moving_average(profiles, 10)
+
+    for row, profile in zip(result, profiles, strict=True):
+        np.testing.assert_allclose(
+            row,
+            reference_moving_average(profile, 10),
+            rtol=1e-13,
+        )
@@ -0,0 +1,131 @@
+"""Tests of the per-stage profiler."""
+
+import pstats
+import re
+
+import pytest
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.processing.kernel.default_kernel import DefaultKernel
+from saxs.tracing import profiler as profiler_module
+from saxs.tracing.profiler import (
+    COLLAPSED_STACKS_FILE,
+    PROFILE_DIR_ENV,
+    PROFILE_ENV,
+    EProfileMode,
+    StageProfiler,
+    get_env_profiler,
+)
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+STAGES = {
+    "CutStage",
+    "FilterStage",
+    "BackgroundStage",
+    "FindPeakStage",
+    "ProcessPeakStage",
+}
+
+
+@pytest.fixture
+def env_profiler(monkeypatch):
+    """Fresh process-wide profiler, exit callbacks kept in a list."""
+    callbacks = []
+    monkeypatch.setattr(profiler_module, "_ENV_PROFILER", None)
+    monkeypatch.setattr(
+        profiler_module.atexit,
+        "register",
+        lambda *args: callbacks.append(args),
+    )
+    return callbacks
+
+
+def test_cprofile_writes_one_pstats_file_per_stage(read_samples, tmp_path):
+    kernel = DefaultKernel(BaseScheduler(), profile="cprofile")
+    kernel.run_many(read_samples())
+
+    paths = kernel.profiler.dump(tmp_path)
+
+    assert {_path.name for _path in paths} == {
+        f"{_stage}.pstats" for _stage in STAGES
+    }
+    for _path in paths:
+        assert pstats.Stats(str(_path)).total_calls > 0
+
+
+def test_sampling_writes_collapsed_stacks(read_samples, tmp_path):
+    profiler = StageProfiler(EProfileMode.SAMPLING, interval=0.0005)
+    kernel = DefaultKernel(BaseScheduler(), profile=profiler)
+    assert kernel.profiler is profiler
+
+    for _ in range(20):
+        kernel.run_many(read_samples())
+        if profiler.get_collapsed_stacks():
+            break
+    profiler.stop()
+
+    [path] = profiler.dump(tmp_path)
+    assert path == tmp_path / COLLAPSED_STACKS_FILE
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines
+    for _line in lines:
+        stack, count = _line.rsplit(" ", 1)
+        stage, *frames = stack.split(";")
+        assert stage in STAGES
+        assert all(re.fullmatch(r".+ \(.+:\d+\)", _f) for _f in frames)
+        assert int(count) > 0
+
+
+def test_reset_drops_the_profiles(read_samples):
+    kernel = DefaultKernel(BaseScheduler(), profile="cprofile")
+    kernel.run(read_samples()[0])
+    assert kernel.profiler.get_stats()
+
+    kernel.profiler.reset()
+
+    assert kernel.profiler.get_stats() == {}
+
+
+def test_env_profiler_is_off_without_the_variable(
+    env_profiler,
+    monkeypatch,
+):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+
+    assert get_env_profiler() is None
+    assert DefaultKernel(BaseScheduler()).profiler is None
+    assert env_profiler == []
+
+
+def test_env_profiler_is_shared_and_dumped_at_exit(
+    env_profiler,
+    monkeypatch,
+    read_samples,
+    tmp_path,
+    capsys,
+):
+    monkeypatch.setenv(PROFILE_ENV, " Sampling ")
+    monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path / "profiles"))
+
+    profiler = get_env_profiler()
+
+    assert profiler.mode is EProfileMode.SAMPLING
+    assert get_env_profiler() is profiler
+    kernel = DefaultKernel(BaseScheduler())
+    assert kernel.profiler is profiler
+    kernel.run(read_samples()[0])
+
+    [(callback, *args)] = env_profiler
+    callback(*args)
+
+    assert (tmp_path / "profiles" / COLLAPSED_STACKS_FILE).exists()
+    assert "1 profile file(s) written" in capsys.readouterr().err
+
+
+def test_env_profiler_rejects_unknown_modes(env_profiler, monkeypatch):
+    monkeypatch.setenv(PROFILE_ENV, "perf")
+
+    with pytest.raises(ValueError, match="perf"):
+        get_env_profiler()
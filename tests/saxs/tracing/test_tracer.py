@@ -0,0 +1,198 @@
+"""Tests of the Chrome Trace Event tracer."""
+
+import io
+import json
+import struct
+import zlib
+from types import SimpleNamespace
+
+import msgpack
+import pytest
+from saxs.consumer.consumer import (
+    COMPRESSION_NONE,
+    FOOTER_SIZE,
+    HEADER_SIZE,
+    MAGIC_NUMBER,
+    MSG_TYPE_SAMPLE,
+    PROTOCOL_VERSION,
+    GoStreamConsumer,
+)
+from saxs.core.pipeline.scheduler.scheduler import BaseScheduler
+from saxs.processing.kernel.default_kernel import DefaultKernel
+from saxs.tracing.tracer import (
+    Tracer,
+    get_active_tracer,
+    merge_traces,
+    sample_trace_id,
+    span,
+    tracing,
+)
+
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::scipy.optimize.OptimizeWarning",
+)
+
+
+def load_events(path):
+    with open(path, encoding="utf-8") as _file:
+        document = json.load(_file)
+    assert document["displayTimeUnit"] == "ms"
+    return document["traceEvents"]
+
+
+def assert_chrome_trace(events):
+    """Check the fields the Chrome Trace Event format requires."""
+    for event in events:
+        assert isinstance(event["name"], str)
+        assert isinstance(event["pid"], int)
+        if event["ph"] == "M":
+            assert event["name"] == "process_name"
+            continue
+        assert event["ph"] == "X"
+        assert isinstance(event["cat"], str)
+        assert isinstance(event["tid"], int)
+        assert event["ts"] > 0
+        assert event["dur"] >= 0
+        assert isinstance(event["args"], dict)
+
+
+def encode_frame(msg_type, message):
+    payload = msgpack.packb(message)
+    return (
+        struct.pack(
+            "<IHBBQ",
+            MAGIC_NUMBER,
+            PROTOCOL_VERSION,
+            msg_type,
+            COMPRESSION_NONE,
+            len(payload),
+        )
+        + payload
+        + struct.pack("<I", zlib.crc32(payload) & 0xFFFFFFFF)
+    )
+
+
+@pytest.fixture
+def kernel_trace(tmp_path, read_samples):
+    path = tmp_path / "kernel.trace.json"
+    sample = read_samples()[0]
+    with tracing(path):
+        DefaultKernel(BaseScheduler()).run(sample)
+    return sample_trace_id(sample), load_events(path)
+
+
+def test_kernel_trace_is_a_chrome_trace(kernel_trace):
+    _, events = kernel_trace
+
+    assert_chrome_trace(events)
+    assert events[0]["ph"] == "M"
+    assert get_active_tracer() is None
+
+
+def test_stage_spans_carry_sample_and_step(kernel_trace):
+    sample_id, events = kernel_trace
+
+    stages = [_event for _event in events if _event.get("cat") == "stage"]
+
+    assert [_event["name"] for _event in stages[:4]] == [
+        "CutStage",
+        "FilterStage",
+        "BackgroundStage",
+        "FindPeakStage",
+    ]
+    assert [_event["args"]["step"] for _event in stages] == list(
+        range(1, len(stages) + 1),
+    )
+    assert {_event["args"]["sample_id"] for _event in stages} == {sample_id}
+
+
+@pytest.mark.parametrize(
+    ("category", "stage", "name"),
+    [
+        ("fit", "BackgroundStage", None),
+        ("fit", "ProcessPeakStage", "gauss"),
+        ("peaks", "FindPeakStage", "find_peaks"),
+    ],
+)
+def test_nested_spans_inherit_the_stage_arguments(
+    kernel_trace,
+    category,
+    stage,
+    name,
+):
+    sample_id, events = kernel_trace
+    steps = {
+        _event["args"]["step"]: _event
+        for _event in events
+        if _event.get("cat") == "stage" and _event["name"] == stage
+    }
+
+    nested = [
+        _event
+        for _event in events
+        if _event.get("cat") == category
+        and _event["args"]["step"] in steps
+        and name in (None, _event["name"])
+    ]
+
+    assert nested
+    for _event in nested:
+        _stage = steps[_event["args"]["step"]]
+        assert _event["args"]["sample_id"] == sample_id
+        assert _stage["ts"] <= _event["ts"]
+        assert (
+            _event["ts"] + _event["dur"] <= _stage["ts"] + _stage["dur"]
+        )
+    if category == "fit":
+        assert all("engine" in _event["args"] for _event in nested)
+
+
+def test_consumer_decode_span_carries_the_sample_id():
+    stream = encode_frame(
+        MSG_TYPE_SAMPLE,
+        {"ID": "frame-1", "Q": [0.1, 0.2], "I": [1.0, 2.0], "Err": [0, 0]},
+    )
+    consumer = GoStreamConsumer()
+    consumer._proc = SimpleNamespace(stdout=io.BytesIO(stream))
+
+    with tracing() as tracer:
+        samples = list(consumer.consume())
+
+    assert [_sample.id for _sample, _ in samples] == ["frame-1"]
+    (decode,) = [
+        _event
+        for _event in tracer.get_events()
+        if _event.get("cat") == "consumer"
+    ]
+    assert decode["name"] == "decode_frame"
+    assert decode["args"] == {
+        "msg_type": MSG_TYPE_SAMPLE,
+        "payload_bytes": len(stream) - HEADER_SIZE - FOOTER_SIZE,
+        "sample_id": "frame-1",
+    }
+
+
+def test_merge_traces_keeps_every_process(tmp_path):
+    paths = []
+    for _name in ("worker-0", "worker-1"):
+        _tracer = Tracer(process_name=_name)
+        with tracing(tmp_path / f"{_name}.json", tracer=_tracer):
+            with span("work", "test", worker=_name):
+                pass
+        paths.append(tmp_path / f"{_name}.json")
+
+    merge_traces(paths, tmp_path / "merged.json")
+
+    events = load_events(tmp_path / "merged.json")
+    assert_chrome_trace(events)
+    assert [
+        _event["args"]["name"] for _event in events if _event["ph"] == "M"
+    ] == ["worker-0", "worker-1"]
+    assert [
+        _event["args"]["worker"] for _event in events if _event["ph"] == "X"
+    ] == ["worker-0", "worker-1"]
+
+
+def test_span_is_a_no_op_without_a_tracer():
+    with span("work", "test") as args:
+        assert args is None